@@ -20,6 +20,45 @@ from gi.repository import GObject, Gst
 from .util import libgst, libgobject, G_VALUE_ARRAY_POINTER, GValueArray, GValue, G_VALUE_POINTER
 from .util import GVATensorMeta
 
+# GType values are constant for the process lifetime, so hash them once instead of on every field access
+_G_TYPE_INVALID = hash(GObject.TYPE_INVALID)
+_G_TYPE_STRING = hash(GObject.TYPE_STRING)
+_G_TYPE_INT = hash(GObject.TYPE_INT)
+_G_TYPE_DOUBLE = hash(GObject.TYPE_DOUBLE)
+_G_TYPE_VARIANT = hash(GObject.TYPE_VARIANT)
+_G_TYPE_POINTER = hash(GObject.TYPE_POINTER)
+
+# numpy type of value stored in GValue.data for GValueArray element types
+_GVALUE_ARRAY_NUMPY_DTYPE = {
+    hash(GObject.TYPE_FLOAT): numpy.float32,
+    hash(GObject.TYPE_DOUBLE): numpy.float64,
+    hash(GObject.TYPE_INT): numpy.int32,
+    hash(GObject.TYPE_UINT): numpy.uint32,
+    hash(GObject.TYPE_INT64): numpy.int64,
+    hash(GObject.TYPE_UINT64): numpy.uint64,
+}
+
+# GValue is {GType g_type; union data[2]}, value of fundamental type is at offset of data[0]
+_GVALUE_SIZE = ctypes.sizeof(ctypes.c_size_t) + 2 * ctypes.sizeof(ctypes.c_uint64)
+_GVALUE_DATA_OFFSET = ctypes.sizeof(ctypes.c_size_t)
+
+
+## @brief Decode GValueArray of numbers to numpy.ndarray without per-element ctypes calls
+def _gvalue_array_to_numpy(gvalue_array) -> numpy.ndarray:
+    n_values = gvalue_array.contents.n_values
+    if n_values == 0:
+        return numpy.empty(0, dtype=numpy.uint32)
+
+    raw = (ctypes.c_ubyte * (n_values * _GVALUE_SIZE)).from_address(gvalue_array.contents.values)
+    gtypes = numpy.frombuffer(raw, dtype=numpy.uintp)[::_GVALUE_SIZE // ctypes.sizeof(ctypes.c_size_t)]
+    dtype = _GVALUE_ARRAY_NUMPY_DTYPE.get(int(gtypes[0]))
+    if dtype is None or (gtypes != gtypes[0]).any():
+        raise TypeError("Unsupported value type for GValue array")
+
+    values = numpy.ndarray(shape=(n_values,), dtype=dtype, buffer=raw,
+                           offset=_GVALUE_DATA_OFFSET, strides=(_GVALUE_SIZE,))
+    return values.copy()
+
 ## @brief This class represents tensor - map-like storage for inference result information, such as output blob
 # description (output layer dims, layout, rank, precision, etc.), inference result in a raw and interpreted forms.
 # Tensor is based on GstStructure and, in general, can contain arbitrary (user-defined) fields of simplest data types,
@@ -190,26 +229,60 @@ class Tensor:
     def __getitem__(self, key):
         key = key.encode('utf-8')
         gtype = libgst.gst_structure_get_field_type(self.__structure, key)
-        if gtype == hash(GObject.TYPE_INVALID):  # key is not found
+        return self.__get_field(key, gtype, as_numpy=False)
+
+    ## @brief Read several fields in one pass. This is cheaper than accessing fields one by one via getters
+    # if many fields of the same Tensor are needed
+    #  @param fields names of fields to read, all fields if None. Missing fields are mapped to None
+    #  @param as_numpy if True, array fields (e.g. "dims") are returned as numpy.ndarray instead of list
+    #  @return dictionary of field name to value
+    def to_dict(self, fields: List[str] = None, as_numpy: bool = True) -> dict:
+        structure = self.__structure
+        if fields is None:
+            keys = [libgst.gst_structure_nth_field_name(structure, i)
+                    for i in range(libgst.gst_structure_n_fields(structure))]
+        else:
+            keys = [field.encode('utf-8') for field in fields]
+
+        result = {}
+        for key in keys:
+            gtype = libgst.gst_structure_get_field_type(structure, key)
+            result[key.decode('utf-8')] = self.__get_field(key, gtype, as_numpy)
+        return result
+
+    ## @brief Get array field (e.g. "dims") as numpy.ndarray
+    #  @param key Field name
+    #  @return numpy.ndarray of values, None if field is not found or it is not an array
+    def get_array(self, key: str) -> numpy.ndarray:
+        gvalue_array = G_VALUE_ARRAY_POINTER()
+        if not libgst.gst_structure_get_array(self.__structure, key.encode('utf-8'), ctypes.byref(gvalue_array)):
             return None
-        elif gtype == hash(GObject.TYPE_STRING):
+        try:
+            return _gvalue_array_to_numpy(gvalue_array)
+        finally:
+            libgst.g_value_array_free(gvalue_array)
+
+    def __get_field(self, key: bytes, gtype: int, as_numpy: bool):
+        if gtype == _G_TYPE_INVALID:  # key is not found
+            return None
+        elif gtype == _G_TYPE_STRING:
             res = libgst.gst_structure_get_string(self.__structure, key)
             return res.decode("utf-8") if res else None
-        elif gtype == hash(GObject.TYPE_INT):
+        elif gtype == _G_TYPE_INT:
             value = ctypes.c_int()
             res = libgst.gst_structure_get_int(
                 self.__structure, key, ctypes.byref(value))
             return value.value if res else None
-        elif gtype == hash(GObject.TYPE_DOUBLE):
+        elif gtype == _G_TYPE_DOUBLE:
             value = ctypes.c_double()
             res = libgst.gst_structure_get_double(
                 self.__structure, key, ctypes.byref(value))
             return value.value if res else None
-        elif gtype == hash(GObject.TYPE_VARIANT):
+        elif gtype == _G_TYPE_VARIANT:
             # TODO Returning pointer for now that can be used with other ctypes functions
             #      Return more useful python value
             return libgst.gst_structure_get_value(self.__structure,key)
-        elif gtype == hash(GObject.TYPE_POINTER):
+        elif gtype == _G_TYPE_POINTER:
             # TODO Returning pointer for now that can be used with other ctypes functions
             #      Return more useful python value
             return libgst.gst_structure_get_value(self.__structure,key)
@@ -221,19 +294,11 @@ class Tensor:
                 # Fallback return value
                 libgst.g_value_array_free(gvalue_array)
                 return libgst.gst_structure_get_value(self.__structure,key)
-            else:
-                value = list()
-                for i in range(0, gvalue_array.contents.n_values):
-                    g_value = libgobject.g_value_array_get_nth(gvalue_array, ctypes.c_uint(i))
-                    if g_value.contents.g_type == hash(GObject.TYPE_FLOAT):
-                        value.append(libgobject.g_value_get_float(g_value))
-                    elif g_value.contents.g_type == hash(GObject.TYPE_UINT):
-                        value.append(libgobject.g_value_get_uint(g_value))
-                    else:
-                        raise TypeError(
-                            "Unsupported value type for GValue array")
+            try:
+                value = _gvalue_array_to_numpy(gvalue_array)
+            finally:
                 libgst.g_value_array_free(gvalue_array)
-                return value
+            return value if as_numpy else value.tolist()
 
     ## @brief Get number of fields contained in Tensor instance
     #  @return Number of fields contained in Tensor instance
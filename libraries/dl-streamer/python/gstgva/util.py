@@ -312,6 +312,9 @@ libgstvideo.gst_video_region_of_interest_meta_get_param.restype = ctypes.c_void_
 libgstvideo.gst_video_region_of_interest_meta_add_param.argtypes = [
     VIDEO_REGION_OF_INTEREST_POINTER, ctypes.c_void_p]
 libgstvideo.gst_video_region_of_interest_meta_add_param.restype = None
+libgstvideo.gst_buffer_add_video_region_of_interest_meta_id.argtypes = [
+    ctypes.c_void_p, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_uint]
+libgstvideo.gst_buffer_add_video_region_of_interest_meta_id.restype = VIDEO_REGION_OF_INTEREST_POINTER
 
 # GVATensorMeta
 class GVATensorMeta(ctypes.Structure):
@@ -11,7 +11,7 @@
 import ctypes
 import numpy
 from contextlib import contextmanager
-from typing import List
+from typing import List, Tuple
 from warnings import warn
 import json
 
@@ -20,14 +20,38 @@ gi.require_version('Gst', '1.0')
 gi.require_version("GstVideo", "1.0")
 gi.require_version('GObject', '2.0')
 
-from gi.repository import Gst, GstVideo
+from gi.repository import Gst, GstVideo, GLib, GObject
 from .util import VideoRegionOfInterestMeta
 from .util import GVATensorMeta
 from .util import GVAJSONMeta
 from .util import GVAJSONMetaStr
 from .region_of_interest import RegionOfInterest
 from .tensor import Tensor
-from .util import libgst, gst_buffer_data, VideoInfoFromCaps
+from .util import libgst, libgstvideo, gst_buffer_data, VideoInfoFromCaps
+
+## @brief numpy dtype of record array returned by VideoFrame.regions_as_arrays() and accepted by
+# VideoFrame.add_regions(). "label_index" is index in the label table returned alongside the array.
+# Missing values are represented by NaN confidence and -1 for label_id, object_id and label_index
+REGION_DTYPE = numpy.dtype([('x', numpy.int32), ('y', numpy.int32), ('w', numpy.int32), ('h', numpy.int32),
+                            ('confidence', numpy.float64), ('label_id', numpy.int32),
+                            ('object_id', numpy.int64), ('label_index', numpy.int32)])
+
+_DETECTION = b"detection"
+_OBJECT_ID = b"object_id"
+
+# Per-plane layout used by VideoFrame.planes(): (height divider, width divider, components per pixel, dtype)
+_PLANE_LAYOUTS = {
+    GstVideo.VideoFormat.BGR: [(1, 1, 3, numpy.uint8)],
+    GstVideo.VideoFormat.RGB: [(1, 1, 3, numpy.uint8)],
+    GstVideo.VideoFormat.BGRA: [(1, 1, 4, numpy.uint8)],
+    GstVideo.VideoFormat.BGRX: [(1, 1, 4, numpy.uint8)],
+    GstVideo.VideoFormat.RGBA: [(1, 1, 4, numpy.uint8)],
+    GstVideo.VideoFormat.RGBX: [(1, 1, 4, numpy.uint8)],
+    GstVideo.VideoFormat.GRAY8: [(1, 1, 1, numpy.uint8)],
+    GstVideo.VideoFormat.NV12: [(1, 1, 1, numpy.uint8), (2, 2, 2, numpy.uint8)],
+    GstVideo.VideoFormat.I420: [(1, 1, 1, numpy.uint8), (2, 2, 1, numpy.uint8), (2, 2, 1, numpy.uint8)],
+    GstVideo.VideoFormat.P010_10LE: [(1, 1, 1, numpy.uint16), (2, 2, 2, numpy.uint16)],
+}
 
 
 ## @brief This class represents video frame - object for working with RegionOfInterest and Tensor objects which
@@ -121,6 +145,131 @@ class VideoFrame:
 
         return roi
 
+    ## @brief Get all RegionOfInterest attached to VideoFrame in one pass as numpy record array.
+    # Bounding box is read from GstVideoRegionOfInterestMeta, confidence and label_id from detection Tensor and
+    # object_id from "object_id" Tensor. It is much cheaper than walking regions() and tensors() for every object
+    #  @return tuple of numpy record array of REGION_DTYPE and label table. Label of i-th region is
+    # labels[array[i]['label_index']]
+    def regions_as_arrays(self) -> Tuple[numpy.ndarray, List[str]]:
+        rows = []
+        labels = []
+        label_indices = {}
+        double_value = ctypes.c_double()
+        int_value = ctypes.c_int()
+
+        for roi in RegionOfInterest._iterate(self.__buffer):
+            meta = roi.meta()
+
+            label_index = label_indices.get(meta.roi_type)
+            if label_index is None:
+                label_index = len(labels)
+                label_indices[meta.roi_type] = label_index
+                labels.append(GLib.quark_to_string(meta.roi_type) or "")
+
+            confidence, label_id, object_id = numpy.nan, -1, -1
+            detection_found = False
+            param = meta._params
+            while param:
+                structure = param.contents.data
+                name = libgst.gst_structure_get_name(structure)
+                if name == _DETECTION and not detection_found:
+                    detection_found = True
+                    if libgst.gst_structure_get_double(structure, b"confidence", ctypes.byref(double_value)):
+                        confidence = double_value.value
+                    if libgst.gst_structure_get_int(structure, b"label_id", ctypes.byref(int_value)):
+                        label_id = int_value.value
+                elif name == _OBJECT_ID:
+                    if libgst.gst_structure_get_int(structure, b"id", ctypes.byref(int_value)):
+                        object_id = int_value.value
+                param = param.contents.next
+
+            rows.append((meta.x, meta.y, meta.w, meta.h, confidence, label_id, object_id, label_index))
+
+        return numpy.array(rows, dtype=REGION_DTYPE), labels
+
+    ## @brief Attach many RegionOfInterest to this VideoFrame at once. Each region gets detection Tensor filled
+    # the same way as in add_region()
+    #  @param regions numpy record array with at least "x", "y", "w", "h" fields. Optional fields are "confidence",
+    # "label_id", "object_id" and "label_index" (see REGION_DTYPE), regions_as_arrays() output can be passed as is
+    #  @param labels label table indexed by "label_index" field
+    #  @param normalized if True, input coordinates are assumed to be normalized (in [0,1] interval).
+    # If False, input coordinates are assumed to be expressed in pixels (this is behavior by default)
+    #  @return numpy array with ids of new regions
+    def add_regions(self, regions: numpy.ndarray, labels: List[str] = None, normalized: bool = False) -> numpy.ndarray:
+        fields = regions.dtype.names or ()
+        for field in ('x', 'y', 'w', 'h'):
+            if field not in fields:
+                raise ValueError("VideoFrame.add_regions: '{}' field is required".format(field))
+
+        frame_width, frame_height = self.video_info().width, self.video_info().height
+        x, y, w, h = (regions[field] for field in ('x', 'y', 'w', 'h'))
+        if normalized:
+            x, w = x * frame_width, w * frame_width
+            y, h = y * frame_height, h * frame_height
+        x, y, w, h = (numpy.asarray(v).astype(numpy.int64) for v in (x, y, w, h))
+
+        # Same clipping as in add_region(), but for all regions at once
+        clipped_x, clipped_y = numpy.clip(x, 0, frame_width), numpy.clip(y, 0, frame_height)
+        clipped_w, clipped_h = numpy.maximum(w, 0), numpy.maximum(h, 0)
+        clipped_w = numpy.where(clipped_w + clipped_x > frame_width, frame_width - clipped_x, clipped_w)
+        clipped_h = numpy.where(clipped_h + clipped_y > frame_height, frame_height - clipped_y, clipped_h)
+        out_of_borders = (clipped_x != x) | (clipped_y != y) | (clipped_w != w) | (clipped_h != h)
+        if out_of_borders.any():
+            warn("{} ROI(s) are out of image borders and will be clipped".format(
+                int(numpy.count_nonzero(out_of_borders))), stacklevel=2)
+
+        count = len(regions)
+        confidence = regions['confidence'] if 'confidence' in fields else numpy.zeros(count)
+        label_id = regions['label_id'] if 'label_id' in fields else numpy.full(count, -1)
+        object_id = regions['object_id'] if 'object_id' in fields else numpy.full(count, -1)
+        label_index = regions['label_index'] if 'label_index' in fields else numpy.full(count, -1)
+
+        quarks = [GLib.quark_from_string(label) for label in (labels or [])]
+        empty_quark = GLib.quark_from_string("")
+
+        gvalue_double = GObject.Value()
+        gvalue_double.init(GObject.TYPE_DOUBLE)
+        gvalue_int = GObject.Value()
+        gvalue_int.init(GObject.TYPE_INT)
+
+        def set_double(structure, key, value):
+            gvalue_double.set_double(value)
+            libgst.gst_structure_set_value(structure, key, hash(gvalue_double))
+
+        def set_int(structure, key, value):
+            gvalue_int.set_int(value)
+            libgst.gst_structure_set_value(structure, key, hash(gvalue_int))
+
+        buffer = hash(self.__buffer)
+        ids = numpy.empty(count, dtype=numpy.int32)
+        rows = zip(clipped_x.tolist(), clipped_y.tolist(), clipped_w.tolist(), clipped_h.tolist(),
+                   numpy.asarray(confidence, dtype=numpy.float64).tolist(), numpy.asarray(label_id).tolist(),
+                   numpy.asarray(object_id).tolist(), numpy.asarray(label_index).tolist())
+        for i, (rx, ry, rw, rh, rconfidence, rlabel_id, robject_id, rlabel_index) in enumerate(rows):
+            quark = quarks[rlabel_index] if 0 <= rlabel_index < len(quarks) else empty_quark
+            roi_meta = libgstvideo.gst_buffer_add_video_region_of_interest_meta_id(buffer, quark, rx, ry, rw, rh)
+            if not roi_meta:
+                raise RuntimeError("VideoFrame.add_regions: Failed to add GstVideoRegionOfInterestMeta")
+            roi_meta.contents.id = libgst.gst_util_seqnum_next()
+            ids[i] = roi_meta.contents.id
+
+            detection = libgst.gst_structure_new_empty(_DETECTION)
+            set_double(detection, b"confidence", 0.0 if rconfidence != rconfidence else rconfidence)  # NaN -> 0
+            set_double(detection, b"x_min", rx / frame_width)
+            set_double(detection, b"x_max", (rx + rw) / frame_width)
+            set_double(detection, b"y_min", ry / frame_height)
+            set_double(detection, b"y_max", (ry + rh) / frame_height)
+            if rlabel_id >= 0:
+                set_int(detection, b"label_id", rlabel_id)
+            libgstvideo.gst_video_region_of_interest_meta_add_param(roi_meta, detection)
+
+            if robject_id >= 0:
+                object_id_structure = libgst.gst_structure_new_empty(_OBJECT_ID)
+                set_int(object_id_structure, b"id", robject_id)
+                libgstvideo.gst_video_region_of_interest_meta_add_param(roi_meta, object_id_structure)
+
+        return ids
+
     ## @brief Attach empty Tensor to this VideoFrame
     #  @return new Tensor instance
     def add_tensor(self) -> Tensor:
@@ -152,7 +301,8 @@ class VideoFrame:
             raise RuntimeError("VideoFrame: Underlying GstVideoRegionOfInterestMeta for RegionOfInterest "
                                "doesn't belong to this VideoFrame")
 
-    ## @brief Get buffer data wrapped by numpy.ndarray
+    ## @brief Get buffer data wrapped by numpy.ndarray. Planes of padded YUV buffers are copied into one
+    # contiguous array, use planes() to access them without copying
     #  @return numpy array instance
     @contextmanager
     def data(self, flag: Gst.MapFlags = Gst.MapFlags.READ) -> numpy.ndarray:
@@ -166,7 +316,11 @@ class VideoFrame:
                 h = int(self.__video_info.height * 1.5)
             elif self.__video_info.finfo.format in [GstVideo.VideoFormat.BGR,
                                                     GstVideo.VideoFormat.BGRA,
-                                                    GstVideo.VideoFormat.BGRX]:
+                                                    GstVideo.VideoFormat.BGRX,
+                                                    GstVideo.VideoFormat.RGB,
+                                                    GstVideo.VideoFormat.RGBA,
+                                                    GstVideo.VideoFormat.RGBX,
+                                                    GstVideo.VideoFormat.GRAY8]:
                 h = self.__video_info.height
             else:
                 raise RuntimeError("VideoFrame.data: Unsupported format")
@@ -204,6 +358,45 @@ class VideoFrame:
                     mapped_data_size, requested_size), stacklevel=2)
                 raise e
 
+    ## @brief Get buffer data as list of per-plane numpy.ndarray views. Views are built from plane strides and
+    # offsets (taken from GstVideo.VideoMeta if attached, otherwise from GstVideo.VideoInfo), so padded buffers
+    # (e.g. produced by vaapi decoder) are exposed without copying. Single-component planes have (height, width)
+    # shape, others have (height, width, components) shape. Supported formats: BGR, RGB, BGRA, BGRX, RGBA, RGBX,
+    # GRAY8, NV12, I420 and P010_10LE
+    #  @param flag Gst.MapFlags to map buffer with, views are writable if Gst.MapFlags.WRITE is passed
+    #  @return list of numpy array views, valid only inside of "with" block
+    @contextmanager
+    def planes(self, flag: Gst.MapFlags = Gst.MapFlags.READ) -> List[numpy.ndarray]:
+        video_format = self.__video_info.finfo.format
+        layouts = _PLANE_LAYOUTS.get(video_format)
+        if layouts is None:
+            raise RuntimeError("VideoFrame.planes: Unsupported format {}".format(video_format))
+
+        meta = self.video_meta()
+        if meta and meta.n_planes == len(layouts):
+            strides, offsets = meta.stride, meta.offset
+        else:
+            strides, offsets = self.__video_info.stride, self.__video_info.offset
+        h, w = self.__video_info.height, self.__video_info.width
+
+        with gst_buffer_data(self.__buffer, flag) as data:
+            planes = []
+            for i, (h_div, w_div, components, dtype) in enumerate(layouts):
+                plane_h, plane_w = -(-h // h_div), -(-w // w_div)  # round up for odd sizes
+                itemsize = numpy.dtype(dtype).itemsize
+                stride, offset = strides[i], offsets[i]
+                if offset + (plane_h - 1) * stride + plane_w * components * itemsize > len(data):
+                    raise RuntimeError("VideoFrame.planes: Corrupted buffer")
+
+                if components == 1:
+                    shape, plane_strides = (plane_h, plane_w), (stride, itemsize)
+                else:
+                    shape = (plane_h, plane_w, components)
+                    plane_strides = (stride, components * itemsize, itemsize)
+                planes.append(numpy.ndarray(shape, dtype=dtype, buffer=data,
+                                            offset=offset, strides=plane_strides))
+            yield planes
+
     def __is_bounded(self, x, y, w, h):
         return x >= 0 and y >= 0 and w >= 0 and h >= 0 and x + w <= self.__video_info.width and y + h <= self.__video_info.height
 
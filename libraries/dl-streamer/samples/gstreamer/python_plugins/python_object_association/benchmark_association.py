@@ -0,0 +1,113 @@
+# ==============================================================================
+# Copyright (C) 2025 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+# ==============================================================================
+
+# Benchmark of python_object_association hot paths for growing number of objects per frame:
+#  - region to track association: per-pair iou() loop vs iou_matrix() + linear_sum_assignment()
+#  - appearance distance: deep_sort NearestNeighborDistanceMetric vs ring-buffer GalleryDistanceMetric
+# Usage: python3 benchmark_association.py [--objects 10 50 100 200 500] [--module-dir <dir with element>]
+
+import argparse
+import os
+import sys
+import timeit
+
+import numpy as np
+
+DEFAULT_MODULE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "..", "..", "..", "..", "src", "gst", "python")
+
+
+def make_boxes(rng, count):
+    xy = rng.uniform(0, 1800, (count, 2))
+    wh = rng.uniform(20, 120, (count, 2))
+    return np.concatenate((xy, wh), axis=1)
+
+
+def iou(bbox_1, bbox_2):
+    # per-pair IoU used by the element before iou_matrix()
+    xA = max(bbox_1[0], bbox_2[0])
+    yA = max(bbox_1[1], bbox_2[1])
+    xB = min(bbox_1[0] + bbox_1[2], bbox_2[0] + bbox_2[2])
+    yB = min(bbox_1[1] + bbox_1[3], bbox_2[1] + bbox_2[3])
+
+    intersection_area = max(0, xB - xA + 1) * max(0, yB - yA + 1)
+    box1_area = bbox_1[2] * bbox_1[3]
+    box2_area = bbox_2[2] * bbox_2[3]
+    if box1_area + box2_area == intersection_area:
+        union_area = intersection_area
+    else:
+        union_area = box1_area + box2_area - intersection_area
+
+    return intersection_area / union_area
+
+
+def associate_loop(region_boxes, track_boxes, threshold):
+    ids = []
+    for region_box in region_boxes:
+        for track_id, track_box in enumerate(track_boxes):
+            if iou(list(region_box), list(track_box)) > threshold:
+                ids.append(track_id)
+                break
+    return ids
+
+
+def associate_matrix(poa, region_boxes, track_boxes, threshold):
+    ious = poa.iou_matrix(region_boxes, track_boxes)
+    rows, cols = poa.linear_sum_assignment(ious, maximize=True)
+    return cols[ious[rows, cols] > threshold]
+
+
+def fill_metric(metric, features, budget, rng):
+    count = len(features)
+    for _ in range(budget):
+        noisy = features + rng.normal(0, 0.05, features.shape).astype(np.float32)
+        metric.partial_fit(noisy, np.arange(count), list(range(count)))
+
+
+def run(poa, objects, iterations, budget, dim):
+    rng = np.random.default_rng(0)
+    print("{:>8} {:>16} {:>16} {:>9} {:>16} {:>16} {:>9}".format(
+        "objects", "iou loop, ms", "iou matrix, ms", "speedup", "deep_sort, ms", "gallery, ms", "speedup"))
+
+    for count in objects:
+        region_boxes = make_boxes(rng, count)
+        track_boxes = region_boxes + rng.normal(0, 3, region_boxes.shape)
+        features = rng.normal(size=(count, dim)).astype(np.float32)
+        targets = list(range(count))
+
+        loop_time = timeit.timeit(lambda: associate_loop(region_boxes, track_boxes, 0.7),
+                                  number=iterations) / iterations
+        matrix_time = timeit.timeit(lambda: associate_matrix(poa, region_boxes, track_boxes, 0.7),
+                                    number=iterations) / iterations
+
+        reference_metric = poa.NearestNeighborDistanceMetric("cosine", 0.7, budget)
+        gallery_metric = poa.GalleryDistanceMetric(0.7, budget)
+        fill_metric(reference_metric, features, budget, rng)
+        fill_metric(gallery_metric, features, budget, rng)
+        reference_time = timeit.timeit(lambda: reference_metric.distance(features, targets),
+                                       number=iterations) / iterations
+        gallery_time = timeit.timeit(lambda: gallery_metric.distance(features, targets),
+                                     number=iterations) / iterations
+
+        print("{:>8} {:>16.3f} {:>16.3f} {:>8.1f}x {:>16.3f} {:>16.3f} {:>8.1f}x".format(
+            count, loop_time * 1e3, matrix_time * 1e3, loop_time / matrix_time,
+            reference_time * 1e3, gallery_time * 1e3, reference_time / gallery_time))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="python_object_association benchmark")
+    parser.add_argument("--objects", type=int, nargs="+", default=[10, 25, 50, 100, 200, 500])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--nn-budget", type=int, default=100)
+    parser.add_argument("--embedding-size", type=int, default=256)
+    parser.add_argument("--module-dir", default=DEFAULT_MODULE_DIR,
+                        help="Directory containing python_object_association.py")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(args.module_dir))
+    import python_object_association as poa
+
+    run(poa, args.objects, args.iterations, args.nn_budget, args.embedding_size)
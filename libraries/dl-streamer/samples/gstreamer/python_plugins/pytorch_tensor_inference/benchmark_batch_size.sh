@@ -0,0 +1,50 @@
+#!/bin/bash
+# ==============================================================================
+# Copyright (C) 2025 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+# ==============================================================================
+# Compares throughput of pytorch_tensor_inference element for different batch sizes.
+# Frames are generated by videotestsrc, so no input video is required.
+
+set -e
+
+MODEL=${1:-torchvision.models.resnet18}  # torchvision model or path to .pt/.pth file
+NUMBER_STREAMS=${2:-16}
+NUMBER_FRAMES=${3:-256}                  # frames per stream
+DEVICE=${4:-cpu}
+BATCH_SIZES=${5:-"1 4 8 16"}
+BATCH_TIMEOUT_MS=${6:-100}
+INPUT_SIZE=${7:-224}
+
+if [ "$NUMBER_STREAMS" -lt 1 ]; then
+  echo "ERROR: NUMBER_STREAMS must be greater than 0"
+  echo "Usage : ./benchmark_batch_size.sh [MODEL] [NUMBER_STREAMS] [NUMBER_FRAMES] [DEVICE] [BATCH_SIZES] [BATCH_TIMEOUT_MS] [INPUT_SIZE]"
+  exit 1
+fi
+
+PREPROC="videoconvert ! video/x-raw,format=RGBP,width=${INPUT_SIZE},height=${INPUT_SIZE} ! tensor_convert ! \
+opencv_tensor_normalize range=\"<0,1>\" mean=\"<0.485,0.456,0.406>\" std=\"<0.229,0.224,0.225>\""
+
+TOTAL_FRAMES=$((NUMBER_STREAMS * NUMBER_FRAMES))
+
+echo "Model: ${MODEL}, device: ${DEVICE}, streams: ${NUMBER_STREAMS}, frames per stream: ${NUMBER_FRAMES}"
+printf "%-12s %-12s %-12s\n" "batch-size" "time, s" "FPS"
+
+for BATCH_SIZE in $BATCH_SIZES; do
+  # Frames of all streams are merged into one inference element, same as multi-camera deployments with one model instance
+  PIPELINE="funnel name=f ! queue max-size-buffers=$((BATCH_SIZE * 2)) ! \
+pytorch_tensor_inference model=${MODEL} device=${DEVICE} batch-size=${BATCH_SIZE} batch-timeout-ms=${BATCH_TIMEOUT_MS} ! \
+fakesink sync=false async=false"
+  for ((i = 0; i < NUMBER_STREAMS; i++)); do
+    PIPELINE+=" videotestsrc num-buffers=${NUMBER_FRAMES} pattern=ball ! ${PREPROC} ! f."
+  done
+
+  START=$(date +%s.%N)
+  eval gst-launch-1.0 -q "$PIPELINE" > /dev/null
+  END=$(date +%s.%N)
+
+  ELAPSED=$(echo "$END - $START" | bc -l)
+  FPS=$(echo "$TOTAL_FRAMES / $ELAPSED" | bc -l)
+  printf "%-12s %-12.2f %-12.2f\n" "$BATCH_SIZE" "$ELAPSED" "$FPS"
+done
@@ -13,14 +13,95 @@ gi.require_version('GstVideo', '1.0')
 
 from gi.repository import Gst, GObject, GLib, GstBase, GstVideo
 import numpy as np
+import threading
 
-from openvino.runtime import Core, Layout, Type, InferRequest, AsyncInferQueue
+from openvino.runtime import Core, Layout, Type, Tensor, InferRequest, AsyncInferQueue
 from openvino.preprocess import PrePostProcessor
 
 Gst.init(None)
 
 TENSORS_CAPS = Gst.Caps.from_string("other/tensors")
 
+# Output memory slots kept by the pool, results are copied into new memory once all are in use
+OUTPUT_POOL_MAX_SLOTS = 32
+
+
+class OutputMemorySlot:
+    """Set of Gst.Memory blocks, one per model output, shared with OpenVINO™ output tensors"""
+
+    def __init__(self, allocator: Gst.Allocator, outputs):
+        self.mems = list()
+        self.maps = list()
+        self.tensors = list()
+        self.in_use = False
+
+        for output in outputs:
+            dtype = output.element_type.to_dtype()
+            shape = tuple(output.shape)
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            mem = allocator.alloc(nbytes)
+            if not mem:
+                raise RuntimeError(
+                    "Unable to allocate memory using default gst allocator")
+            # Memory stays mapped for the whole slot lifetime, so OpenVINO™ writes results directly into it
+            res, map = mem.map(Gst.MapFlags.READ | Gst.MapFlags.WRITE)
+            if not res:
+                raise RuntimeError("Unable to map gst memory to write")
+            array = np.ndarray(shape=shape, buffer=map.data, dtype=dtype)
+            self.mems.append(mem)
+            self.maps.append(map)
+            self.tensors.append(Tensor(array, shared_memory=True))
+
+    def is_free(self) -> bool:
+        # Only reference held by this slot left, i.e. downstream released all buffers with these memories
+        return not self.in_use and all(mem.mini_object.refcount == 1 for mem in self.mems)
+
+    def bind(self, infer_request: InferRequest):
+        for i, tensor in enumerate(self.tensors):
+            infer_request.set_output_tensor(i, tensor)
+
+    def release(self):
+        # Must be called once no infer request has these tensors bound, numpy arrays on mapped
+        # memory are dropped with them before unmapping
+        self.tensors = list()
+        for mem, map in zip(self.mems, self.maps):
+            mem.unmap(map)
+        self.maps = list()
+        self.mems = list()
+
+
+class OutputMemoryPool:
+    """Grows on demand up to max_slots and recycles output memory once downstream releases it"""
+
+    def __init__(self, allocator: Gst.Allocator, outputs, max_slots: int = OUTPUT_POOL_MAX_SLOTS):
+        self.allocator = allocator
+        self.outputs = outputs
+        self.max_slots = max_slots
+        self.slots = list()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> OutputMemorySlot:
+        # Returns None if all max_slots slots are in use
+        with self.lock:
+            for slot in self.slots:
+                if slot.is_free():
+                    slot.in_use = True
+                    return slot
+
+            if len(self.slots) >= self.max_slots:
+                return None
+            slot = OutputMemorySlot(self.allocator, self.outputs)
+            slot.in_use = True
+            self.slots.append(slot)
+            Gst.debug(f"Output memory pool grown to {len(self.slots)} slots")
+            return slot
+
+    def clear(self):
+        with self.lock:
+            for slot in self.slots:
+                slot.release()
+            self.slots = list()
+
 
 class InferenceOpenVINO(GstBase.BaseTransform):
     __gstmetadata__ = ('OpenVINO inference', 'Transform',
@@ -47,6 +128,8 @@ class InferenceOpenVINO(GstBase.BaseTransform):
         self.model = None
         self.compiled_model = None
         self.infer_queue = None
+        self.infer_request = None
+        self.output_pool = None
 
     def do_set_property(self, prop: GObject.GParamSpec, value):
         self.property[prop.name] = value
@@ -65,10 +148,16 @@ class InferenceOpenVINO(GstBase.BaseTransform):
         if not self.compiled_model:
             self.compiled_model = self.core.compile_model(
                 self.model, self.property['device'])
+            # Slots are sized from static output shapes, dynamic outputs are copied per result
+            if not any(output.partial_shape.is_dynamic for output in self.compiled_model.outputs):
+                self.output_pool = OutputMemoryPool(
+                    Gst.Allocator.find(), self.compiled_model.outputs)
             if self.property['nireq'] != 1:
                 self.infer_queue = AsyncInferQueue(
                     self.compiled_model, self.property['nireq'])
                 self.infer_queue.set_callback(self.completion_callback)
+            else:
+                self.infer_request = self.compiled_model.create_infer_request()
 
     def do_transform_caps(self, direction, caps, filter):
         self.read_model()
@@ -98,31 +187,53 @@ class InferenceOpenVINO(GstBase.BaseTransform):
         tensors = [np.ndarray(shape=info.shape, buffer=map.data, dtype=np.uint8)
                    for map, info in zip(maps, self.model.inputs)]
 
+        # Inference results are written directly into Gst.Memory from the pool if there is a free slot
+        slot = self.output_pool.acquire() if self.output_pool else None
+
         # Submit async inference request or run inference synchronously
         if self.infer_queue:
-            self.infer_queue.start_async(tensors, (src, mems, maps))
+            # start_async() takes the same idle request
+            infer_request = self.infer_queue[self.infer_queue.get_idle_request_id()]
+            if slot:
+                slot.bind(infer_request)
+            elif self.output_pool:
+                # Detach the request from memory of a slot it was bound to before
+                self.unbind_outputs(infer_request)
+            self.infer_queue.start_async(
+                tensors, (src, mems, maps, slot), share_inputs=True)
+        elif slot:
+            slot.bind(self.infer_request)
+            self.infer_request.infer(tensors, share_inputs=True)
+            self.push_results(src, mems, maps, slot)
         else:
             results = self.compiled_model.infer_new_request(tensors)
-            self.push_results(src, mems, maps, results.values())
+            self.push_results(src, mems, maps, None, results.values())
 
         # Return GST_BASE_TRANSFORM_FLOW_DROPPED as we push buffer in function push_results()
         return Gst.FlowReturn.CUSTOM_SUCCESS
 
     def completion_callback(self, infer_request, args):
-        (src, mems, maps) = args
-        self.push_results(src, mems, maps, infer_request.results.values())
+        (src, mems, maps, slot) = args
+        self.push_results(src, mems, maps, slot,
+                          None if slot else infer_request.results.values())
 
-    def push_results(self, src, mems, maps, tensors):
+    def push_results(self, src, mems, maps, slot, tensors=None):
         # Unmap input Gst.Memory
         for mem, map in zip(mems, maps):
             mem.unmap(map)
 
-        # Wrap output tensors into Gst.Memory and attach to Gst.Buffer
         dst = Gst.Buffer.new()
-        for tensor in tensors:
-            mem = Gst.Memory.new_wrapped(
-                0, tensor.tobytes(), tensor.nbytes, 0, None, None)
-            dst.append_memory(mem)
+        if slot:
+            # Attach output Gst.Memory from the pool to Gst.Buffer. Slot is reused once downstream releases it
+            for mem in slot.mems:
+                dst.append_memory(mem)
+            slot.in_use = False
+        else:
+            # Wrap copies of output tensors into Gst.Memory
+            for tensor in tensors:
+                mem = Gst.Memory.new_wrapped(
+                    0, tensor.tobytes(), tensor.nbytes, 0, None, None)
+                dst.append_memory(mem)
 
         # Copy timestamps from input buffer
         dst.copy_into(src, Gst.BufferCopyFlags.TIMESTAMPS, 0, 0)
@@ -135,9 +246,22 @@ class InferenceOpenVINO(GstBase.BaseTransform):
             self.infer_queue.wait_all()
         return GstBase.BaseTransform.do_sink_event(self, event)
 
+    def unbind_outputs(self, infer_request):
+        # Bind output tensors owned by OpenVINO™, so the request no longer references pool memory
+        for i, output in enumerate(self.compiled_model.outputs):
+            infer_request.set_output_tensor(i, Tensor(output.element_type, output.shape))
+
     def do_stop(self):
         if self.infer_queue:
             self.infer_queue.wait_all()
+        if self.output_pool:
+            # Requests keep the tensors of the last slot bound to them, unmap pool memory only once
+            # no request references it
+            infer_requests = [self.infer_queue[i] for i in range(len(self.infer_queue))] \
+                if self.infer_queue else [self.infer_request]
+            for infer_request in infer_requests:
+                self.unbind_outputs(infer_request)
+            self.output_pool.clear()
         return True
 
     TYPE_NAME = {
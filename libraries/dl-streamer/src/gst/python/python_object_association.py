@@ -13,10 +13,14 @@ gi.require_version('GstVideo', '1.0')
 from gi.repository import Gst, GObject, GstBase, GLib
 
 from gstgva import VideoFrame
+from gstgva.video_frame import REGION_DTYPE
 
 import traceback
 import warnings
 
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
 from deep_sort_realtime.deep_sort.tracker import Tracker
 from deep_sort_realtime.deep_sort.detection import Detection
 from deep_sort_realtime.deep_sort.nn_matching import NearestNeighborDistanceMetric
@@ -36,21 +40,92 @@ MAX_IOU_DISTANCE_DEFAULT = 0.7
 NN_BUDGET_DEFAULT = 100
 
 
-def iou(bbox_1: list, bbox_2: list) -> float:
-    xA = max(bbox_1[0], bbox_2[0])
-    yA = max(bbox_1[1], bbox_2[1])
-    xB = min(bbox_1[0] + bbox_1[2], bbox_2[0] + bbox_2[2])
-    yB = min(bbox_1[1] + bbox_1[3], bbox_2[1] + bbox_2[3])
-
-    intersection_area = max(0, xB - xA + 1) * max(0, yB - yA + 1)
-    box1_area = bbox_1[2] * bbox_1[3]
-    box2_area = bbox_2[2] * bbox_2[3]
-    if box1_area + box2_area == intersection_area:
-        union_area = intersection_area
-    else:
-        union_area = box1_area + box2_area - intersection_area
-
-    return intersection_area / union_area
+def iou_matrix(bboxes_1: np.ndarray, bboxes_2: np.ndarray) -> np.ndarray:
+    """IoU between every pair of [x, y, w, h] boxes of two (N, 4) and (M, 4) arrays. Returns (N, M) array"""
+    bboxes_1 = np.asarray(bboxes_1, dtype=np.float64).reshape(-1, 4)
+    bboxes_2 = np.asarray(bboxes_2, dtype=np.float64).reshape(-1, 4)
+    x1, y1, w1, h1 = (bboxes_1[:, i:i + 1] for i in range(4))
+    x2, y2, w2, h2 = (bboxes_2[:, i] for i in range(4))
+
+    xA = np.maximum(x1, x2)
+    yA = np.maximum(y1, y2)
+    xB = np.minimum(x1 + w1, x2 + w2)
+    yB = np.minimum(y1 + h1, y2 + h2)
+
+    intersection_area = np.maximum(0, xB - xA + 1) * np.maximum(0, yB - yA + 1)
+    sum_area = w1 * h1 + w2 * h2
+    union_area = np.where(sum_area == intersection_area,
+                          intersection_area, sum_area - intersection_area)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nan_to_num(intersection_area / union_area)
+
+
+def normalize_rows(features: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return features / np.maximum(norms, np.finfo(np.float32).eps)
+
+
+class EmbeddingRingBuffer:
+    """Preallocated storage of last `capacity` embeddings of one track. Grows if capacity is not limited"""
+
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, dim: int, capacity: int = 0):
+        self.limited = capacity > 0
+        self.data = np.empty(
+            (capacity if self.limited else self.INITIAL_CAPACITY, dim), dtype=np.float32)
+        self.size = 0
+        self.next = 0
+
+    def append(self, embedding: np.ndarray):
+        if not self.limited and self.size == len(self.data):
+            self.data = np.concatenate((self.data, np.empty_like(self.data)))
+        self.data[self.next] = embedding
+        self.next = (self.next + 1) % len(self.data)
+        self.size = min(self.size + 1, len(self.data))
+
+    def samples(self) -> np.ndarray:
+        # Order of samples doesn't matter for nearest neighbor distance
+        return self.data[:self.size]
+
+
+class GalleryDistanceMetric(NearestNeighborDistanceMetric):
+    """Cosine nearest neighbor metric with embeddings kept normalized in per-track ring buffers.
+    Distances to all requested tracks are computed with a single matrix product"""
+
+    def __init__(self, matching_threshold: float, budget: int = 0):
+        super(GalleryDistanceMetric, self).__init__(
+            "cosine", matching_threshold, budget or None)
+        self.budget = budget
+        self.galleries = {}
+
+    def partial_fit(self, features, targets, active_targets):
+        if len(features):
+            features = normalize_rows(np.asarray(features, dtype=np.float32))
+        for feature, target in zip(features, targets):
+            gallery = self.galleries.get(target)
+            if gallery is None:
+                gallery = EmbeddingRingBuffer(feature.shape[0], self.budget)
+                self.galleries[target] = gallery
+            gallery.append(feature)
+        self.galleries = {target: self.galleries[target]
+                          for target in active_targets if target in self.galleries}
+
+    def distance(self, features, targets):
+        cost_matrix = np.full((len(targets), len(features)), np.inf)
+        samples = [self.galleries[target].samples() if target in self.galleries else None
+                   for target in targets]
+        rows = [i for i, s in enumerate(samples) if s is not None and len(s)]
+        if not rows or not len(features):
+            return cost_matrix
+
+        features = normalize_rows(np.asarray(features, dtype=np.float32))
+        gallery = np.concatenate([samples[i] for i in rows])
+        distances = 1. - gallery @ features.T
+        starts = np.cumsum([0] + [len(samples[i]) for i in rows[:-1]])
+        cost_matrix[rows] = np.minimum.reduceat(distances, starts, axis=0)
+        return cost_matrix
 
 
 class Identifier(GstBase.BaseTransform):
@@ -123,8 +198,8 @@ class Identifier(GstBase.BaseTransform):
     def __init_on_start(self):
         self.__get_properties()
 
-        metric = NearestNeighborDistanceMetric(
-            "cosine", self._max_iou_distance, self._nn_budget
+        metric = GalleryDistanceMetric(
+            self._max_iou_distance, self._nn_budget
         )
         self._tracker = Tracker(
             metric,
@@ -155,9 +230,10 @@ class Identifier(GstBase.BaseTransform):
     def do_start(self):
         return self.__init_on_start()
 
-    def __get_detections(self, regions):
-        detections = []
-        for region in regions:
+    def __get_detections(self, regions, boxes):
+        embeddings = []
+        indices = []
+        for i, region in enumerate(regions):
             tensors = [t for t in region.tensors()]
             if len(tensors) > 2:
                 # TODO: create special label for embedding
@@ -168,17 +244,25 @@ class Identifier(GstBase.BaseTransform):
             embedding = None
             for tensor in tensors:
                 if not tensor.is_detection():
-                    embedding = tensor.data().copy()
+                    embedding = tensor.data()
                     break
             if embedding is None:
                 continue
 
-            bounding_box = list(region.rect())
-            confidence = region.confidence()
-            detections.append(
-                Detection(bounding_box, confidence, embedding))
+            embeddings.append(embedding)
+            indices.append(i)
+
+        if not embeddings:
+            return []
 
-        return detections
+        # Copy all embeddings at once into one contiguous matrix instead of copying each of them separately
+        features = np.stack(embeddings).astype(np.float32, copy=False)
+        boxes = boxes[indices]
+        bounding_boxes = np.stack(
+            (boxes['x'], boxes['y'], boxes['w'], boxes['h']), axis=1)
+
+        return [Detection(bounding_box, confidence, embedding)
+                for bounding_box, confidence, embedding in zip(bounding_boxes, boxes['confidence'], features)]
 
     def __get_tracks(self, detections):
         self._tracker.predict()
@@ -191,36 +275,61 @@ class Identifier(GstBase.BaseTransform):
 
         return confirmed_tracks
 
-    def __rewrite_regions_with_tracks(self, dst_vf, regions, tracks):
+    def __rewrite_regions_with_tracks(self, dst_vf, regions, boxes, tracks):
         for region in regions:
             dst_vf.remove_region(region)
+        if not tracks:
+            return
+
+        # Fields not set below keep the missing values of REGION_DTYPE, same as regions added by add_region()
+        new_regions = np.zeros(len(tracks), dtype=REGION_DTYPE)
+        new_regions['confidence'] = np.nan
+        new_regions['label_id'] = -1
+        new_regions['object_id'] = -1
+        tlwh = np.array([track.to_tlwh() for track in tracks])
+        for i, field in enumerate(('x', 'y', 'w', 'h')):
+            new_regions[field] = tlwh[:, i]
+        new_regions['object_id'] = [int(track.track_id) for track in tracks]
+        new_regions['label_index'] = 0
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            for track in tracks:
-                region = dst_vf.add_region(
-                    *track.to_tlwh(), label=self._label_to_save)
-                region.set_object_id(int(track.track_id))
+            dst_vf.add_regions(new_regions, [self._label_to_save])
 
-    def __write_ids_to_regions(self, dst_vf, regions, tracks):
-        for region in regions:
-            for track in tracks:
-                if iou(list(region.rect()), track.to_tlwh()) > self._max_iou_distance:
-                    region.set_object_id(int(track.track_id))
-                    break
+    def __write_ids_to_regions(self, dst_vf, regions, boxes, tracks):
+        if not regions or not tracks:
+            return
+
+        region_boxes = np.stack(
+            (boxes['x'], boxes['y'], boxes['w'], boxes['h']), axis=1)
+        track_boxes = np.array([track.to_tlwh() for track in tracks])
+        ious = iou_matrix(region_boxes, track_boxes)
+
+        # Optimal one-to-one assignment of tracks to regions maximizing total IoU
+        region_indices, track_indices = linear_sum_assignment(ious, maximize=True)
+        for region_index, track_index in zip(region_indices, track_indices):
+            if ious[region_index, track_index] > self._max_iou_distance:
+                regions[region_index].set_object_id(
+                    int(tracks[track_index].track_id))
 
     def do_transform_ip(self, in_buffer: Gst.Buffer):
         try:
             dst_vf = VideoFrame(in_buffer)
 
-            regions = [r for r in dst_vf.regions()
-                       if self._object_class and r.label() == self._object_class
-                       or not self._object_class]
+            # Boxes and confidences of all regions are read in one pass, in the same order as regions()
+            regions = list(dst_vf.regions())
+            boxes, labels = dst_vf.regions_as_arrays()
+            if self._object_class:
+                label_index = labels.index(
+                    self._object_class) if self._object_class in labels else -1
+                mask = boxes['label_index'] == label_index
+                regions = [r for r, keep in zip(regions, mask) if keep]
+                boxes = boxes[mask]
 
-            detections = self.__get_detections(regions)
+            detections = self.__get_detections(regions, boxes)
 
             confirmed_tracks = self.__get_tracks(detections)
 
-            self.__write_result(dst_vf, regions, confirmed_tracks)
+            self.__write_result(dst_vf, regions, boxes, confirmed_tracks)
 
             return Gst.FlowReturn.OK
         except Exception as exc:
@@ -11,10 +11,12 @@ gi.require_version('Gst', '1.0')
 gi.require_version('GstBase', '1.0')
 gi.require_version('GstVideo', '1.0')
 
-from gi.repository import Gst, GObject, GstBase
+from gi.repository import Gst, GObject, GLib, GstBase
 
 import torch
 import numpy as np
+import threading
+import time
 import traceback
 import importlib
 
@@ -145,11 +147,12 @@ class InferencePyTorch(GstBase.BaseTransform):
     __gsttemplates__ = (Gst.PadTemplate.new("sink", Gst.PadDirection.SINK, Gst.PadPresence.ALWAYS, TENSORS_CAPS),
                         Gst.PadTemplate.new("src", Gst.PadDirection.SRC, Gst.PadPresence.ALWAYS, TENSORS_CAPS))
 
-    # TODO: support batching
     __gproperties__ = {
         "model": (GObject.TYPE_STRING, "model", "The full module name of the PyTorch model to be imported from torchvision or model path. Ex. 'torchvision.models.resnet50' or '/path/to/model.pth'", "", GObject.ParamFlags.READWRITE),
         "model-weights": (GObject.TYPE_STRING, "model_weights", "PyTorch model weights path. If model-weights is empty, the default weights will be used", "", GObject.ParamFlags.READWRITE),
-        "device": (GObject.TYPE_STRING, "device", "Inference device", "cpu", GObject.ParamFlags.READWRITE)
+        "device": (GObject.TYPE_STRING, "device", "Inference device", "cpu", GObject.ParamFlags.READWRITE),
+        "batch-size": (GObject.TYPE_UINT, "batch_size", "Maximum number of frames collected into one forward pass", 1, 1024, 1, GObject.ParamFlags.READWRITE),
+        "batch-timeout-ms": (GObject.TYPE_UINT, "batch_timeout_ms", "Maximum time in milliseconds to wait for a batch to fill up before running inference on a partial batch. 0 means wait until the batch is full", 0, GLib.MAXUINT, 0, GObject.ParamFlags.READWRITE)
     }
 
     def __init__(self, gproperties=__gproperties__):
@@ -167,6 +170,12 @@ class InferencePyTorch(GstBase.BaseTransform):
         self.output_tensors_info = list()
         self.gst_alloc = Gst.Allocator.find()
 
+        # Buffers waiting for the batch to be filled up
+        self.pending_bufs = list()
+        self.pending_since = 0.0
+        self.batch_lock = threading.Lock()
+        self.batch_timer = None
+
     def init_pytorch_model(self):
         model_str = self.property["model"]
         if not model_str:
@@ -276,7 +285,7 @@ class InferencePyTorch(GstBase.BaseTransform):
             # The forward function can contain arbitrary python code. Forward dummy tensor to see the output
             x = torch.randn(input_tensor_info.shape, device=self.device)
             x = x.unsqueeze(0)  # add batch dimension
-            output = self.model(x)[0]  # TODO: support batching
+            output = self.model(x)[0]  # output of the single sample in batch
         except Exception as model_exc:
             Gst.debug(
                 f"Model inferencing failed at caps transform stage: {str(model_exc)}")
@@ -354,55 +363,130 @@ class InferencePyTorch(GstBase.BaseTransform):
         gva_tensor["input_names"] = ""
         gva_tensor["output_names"] = ""
 
-    def do_generate_output(self):
-        try:
-            dst = Gst.Buffer.new()
-            self.add_model_info(dst)
-
-            # Input Gst.Buffer
-            src = self.queued_buf
-            mems = [src.get_memory(i) for i in range(src.n_memory())]
+    def do_sink_event(self, event):
+        serialized = Gst.EventType.get_flags(event.type) & Gst.EventTypeFlags.SERIALIZED
+        if serialized and event.type != Gst.EventType.FLUSH_STOP:
+            # Run inference on incomplete batch before EOS, SEGMENT, CAPS, GAP or other
+            # serialized events go downstream, so buffers stay ordered with them
+            with self.batch_lock:
+                if self.flush_batch() < Gst.FlowReturn.EOS:
+                    Gst.error(f"Failed to process pending buffers on {Gst.EventType.get_name(event.type)} event")
+        elif event.type == Gst.EventType.FLUSH_START:
+            # Unblock streaming thread downstream first, then discard incomplete batch
+            ret = GstBase.BaseTransform.do_sink_event(self, event)
+            with self.batch_lock:
+                self.drop_batch()
+            return ret
+        return GstBase.BaseTransform.do_sink_event(self, event)
+
+    def do_stop(self):
+        with self.batch_lock:
+            self.drop_batch()
+        return True
 
-            # TODO: remove tensors limitation
-            if len(self.input_tensors_info) != 1:
-                raise RuntimeError("Input tensors size != 1")
+    def do_generate_output(self):
+        batch_size = self.property["batch-size"]
+        timeout = self.property["batch-timeout-ms"] / 1000.0
 
-            for mem in mems:
-                res, map = mem.map(Gst.MapFlags.READ | Gst.MapFlags.WRITE)
-                if not res:
-                    raise RuntimeError("Unable to map gst buffer memory")
+        with self.batch_lock:
+            if not self.pending_bufs:
+                self.pending_since = time.monotonic()
+            self.pending_bufs.append(self.queued_buf)
 
-                input_tensor_info = self.input_tensors_info[0]
+            if len(self.pending_bufs) >= batch_size or \
+                    (timeout and time.monotonic() - self.pending_since >= timeout):
+                return self.flush_batch()
 
-                if not input_tensor_info.shape:
-                    raise RuntimeError(
-                        "Input shape is empty. Unable to create tensor")
+            # Make sure partial batch is not held forever if upstream stops producing buffers
+            if timeout and not self.batch_timer:
+                self.batch_timer = threading.Timer(timeout, self.on_batch_timeout)
+                self.batch_timer.daemon = True
+                self.batch_timer.start()
 
-                nd_arr = np.ndarray(shape=input_tensor_info.shape,
-                                    buffer=map.data, dtype=input_tensor_info.data_type)
-                tensor = torch.Tensor(nd_arr, device=self.device).float(
-                ).unsqueeze(0)  # FIXME: support batching
+        return Gst.FlowReturn.OK
 
-                with torch.no_grad():
-                    output_tensor = self.model.forward(
-                        tensor)[0]  # FIXME: support batching
+    def on_batch_timeout(self):
+        with self.batch_lock:
+            self.batch_timer = None
+            # Flushing, EOS and not linked are expected during seeks, flushes and teardown
+            if self.pending_bufs and self.flush_batch() < Gst.FlowReturn.EOS:
+                self.post_message(Gst.Message.new_error(
+                    self, GLib.Error("Inference on batch failed"), "Batch timeout flush failed"))
+
+    def cancel_batch_timer(self):
+        if self.batch_timer:
+            self.batch_timer.cancel()
+            self.batch_timer = None
+
+    def drop_batch(self):
+        self.cancel_batch_timer()
+        self.pending_bufs = list()
+
+    def flush_batch(self) -> Gst.FlowReturn:
+        # Must be called with batch_lock held
+        self.cancel_batch_timer()
+        bufs = self.pending_bufs
+        self.pending_bufs = list()
+        if not bufs:
+            return Gst.FlowReturn.OK
 
-                # Unmap input Gst.Memory
-                mem.unmap(map)
+        try:
+            # TODO: remove tensors limitation
+            if len(self.input_tensors_info) != 1:
+                raise RuntimeError("Input tensors size != 1")
 
+            input_tensor_info = self.input_tensors_info[0]
+            if not input_tensor_info.shape:
+                raise RuntimeError(
+                    "Input shape is empty. Unable to create tensor")
+
+            # Collect samples from every memory of every buffer. owners[i] is index of buffer for sample i
+            samples = list()
+            owners = list()
+            for buf_idx, src in enumerate(bufs):
+                for i in range(src.n_memory()):
+                    mem = src.get_memory(i)
+                    res, map = mem.map(Gst.MapFlags.READ)
+                    if not res:
+                        raise RuntimeError("Unable to map gst buffer memory")
+                    try:
+                        samples.append(np.ndarray(shape=input_tensor_info.shape,
+                                                  buffer=map.data, dtype=input_tensor_info.data_type).copy())
+                    finally:
+                        # Unmap input Gst.Memory
+                        mem.unmap(map)
+                    owners.append(buf_idx)
+
+            # Single forward pass over the whole batch
+            tensor = torch.from_numpy(np.stack(samples)).to(self.device).float()
+            with torch.no_grad():
+                outputs = self.model.forward(tensor)
+
+            dsts = list()
+            for _ in bufs:
+                dst = Gst.Buffer.new()
+                self.add_model_info(dst)
+                dsts.append(dst)
+
+            # Split outputs back onto buffers they were produced from
+            for sample_idx, buf_idx in enumerate(owners):
+                output_tensor = outputs[sample_idx]
                 if isinstance(output_tensor, dict):
                     for tensor in output_tensor.values():
-                        self.append_tensor_to_buffer(dst, tensor)
+                        self.append_tensor_to_buffer(dsts[buf_idx], tensor)
                 elif isinstance(output_tensor, torch.Tensor):
-                    self.append_tensor_to_buffer(dst, output_tensor)
+                    self.append_tensor_to_buffer(dsts[buf_idx], output_tensor)
                 else:
                     raise RuntimeError(
                         f"Unsupported inference output type: '{type(output_tensor)}'")
 
-            # Copy timestamps from input buffer
-            dst.copy_into(src, Gst.BufferCopyFlags.TIMESTAMPS, 0, 0)
-            # Push buffer downstream
-            self.srcpad.push(dst)
+            for src, dst in zip(bufs, dsts):
+                # Copy timestamps from input buffer
+                dst.copy_into(src, Gst.BufferCopyFlags.TIMESTAMPS, 0, 0)
+                # Push buffer downstream
+                ret = self.srcpad.push(dst)
+                if ret != Gst.FlowReturn.OK:
+                    return ret
         except Exception as exc:
             Gst.error(f"Error during generating output buffer: {exc}")
             traceback.print_exc()
@@ -411,7 +495,7 @@ class InferencePyTorch(GstBase.BaseTransform):
         return Gst.FlowReturn.OK
 
     def append_tensor_to_buffer(self, buf: Gst.Buffer, tensor: torch.Tensor):
-        tensor_nd_arr = tensor.numpy()
+        tensor_nd_arr = np.ascontiguousarray(tensor.cpu().numpy())
 
         mem = self.gst_alloc.alloc(tensor_nd_arr.nbytes)
         if not mem:
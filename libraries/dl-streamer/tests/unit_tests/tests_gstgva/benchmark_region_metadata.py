@@ -0,0 +1,91 @@
+# ==============================================================================
+# Copyright (C) 2025 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+# ==============================================================================
+
+# Microbenchmark comparing bulk VideoFrame.regions_as_arrays()/add_regions() with per-object
+# VideoFrame.regions()/add_region() access. Usage: python3 benchmark_region_metadata.py [objects] [iterations]
+
+import sys
+import timeit
+
+import numpy
+
+import gi
+gi.require_version('Gst', '1.0')
+gi.require_version("GstVideo", "1.0")
+from gi.repository import Gst, GstVideo
+
+import gstgva as va
+from gstgva.video_frame import REGION_DTYPE
+
+Gst.init(sys.argv)
+
+from tests_gstgva import register_metadata
+
+
+def make_frame():
+    video_info = GstVideo.VideoInfo.new()
+    video_info.set_format(GstVideo.VideoFormat.NV12, 1920, 1080)
+    return va.VideoFrame(Gst.Buffer.new_allocate(None, 0, None), video_info)
+
+
+def make_regions(objects_num):
+    regions = numpy.zeros(objects_num, dtype=REGION_DTYPE)
+    regions['x'] = numpy.arange(objects_num) % 1800
+    regions['y'] = numpy.arange(objects_num) % 1000
+    regions['w'] = 100
+    regions['h'] = 50
+    regions['confidence'] = numpy.linspace(0.1, 1.0, objects_num)
+    regions['label_id'] = numpy.arange(objects_num) % 10
+    regions['object_id'] = numpy.arange(objects_num) + 1
+    regions['label_index'] = numpy.arange(objects_num) % 2
+    return regions
+
+
+def read_per_object(frame):
+    result = []
+    for roi in frame.regions():
+        rect = roi.rect()
+        result.append((rect.x, rect.y, rect.w, rect.h, roi.confidence(),
+                       roi.label_id(), roi.object_id(), roi.label()))
+    return result
+
+
+def write_per_object(frame, regions, labels):
+    for region in regions:
+        roi = frame.add_region(int(region['x']), int(region['y']), int(region['w']), int(region['h']),
+                               labels[region['label_index']], float(region['confidence']))
+        roi.detection()['label_id'] = int(region['label_id'])
+        roi.set_object_id(int(region['object_id']))
+
+
+def run(objects_num, iterations):
+    labels = ["person", "car"]
+    regions = make_regions(objects_num)
+
+    frame = make_frame()
+    frame.add_regions(regions, labels)
+
+    read_single = timeit.timeit(lambda: read_per_object(frame), number=iterations) / iterations
+    read_bulk = timeit.timeit(lambda: frame.regions_as_arrays(), number=iterations) / iterations
+    write_single = timeit.timeit(lambda: write_per_object(make_frame(), regions, labels),
+                                 number=iterations) / iterations
+    write_bulk = timeit.timeit(lambda: make_frame().add_regions(regions, labels),
+                               number=iterations) / iterations
+
+    print("{:>8} {:>14.3f} {:>14.3f} {:>8.1f}x {:>14.3f} {:>14.3f} {:>8.1f}x".format(
+        objects_num, read_single * 1e3, read_bulk * 1e3, read_single / read_bulk,
+        write_single * 1e3, write_bulk * 1e3, write_single / write_bulk))
+
+
+if __name__ == '__main__':
+    register_metadata()
+    objects = [int(sys.argv[1])] if len(sys.argv) > 1 else [10, 100, 500]
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    print("{:>8} {:>14} {:>14} {:>9} {:>14} {:>14} {:>9}".format(
+        "objects", "read, ms", "bulk read, ms", "speedup", "write, ms", "bulk write, ms", "speedup"))
+    for objects_num in objects:
+        run(objects_num, iterations)
@@ -9,6 +9,7 @@ import unittest
 import test_tensor
 import test_region_of_interest
 import test_video_frame
+import test_python_object_association
 import test_audio_event
 import test_audio_frame
 
@@ -35,6 +36,7 @@ if __name__ == '__main__':
     suite_gstgva.addTests(loader.loadTestsFromModule(test_region_of_interest))
     suite_gstgva.addTests(loader.loadTestsFromModule(test_tensor))
     suite_gstgva.addTests(loader.loadTestsFromModule(test_video_frame))
+    suite_gstgva.addTests(loader.loadTestsFromModule(test_python_object_association))
     suite_gstgva.addTests(loader.loadTestsFromModule(
         test_pipeline_color_formats))
     suite_gstgva.addTests(loader.loadTestsFromModule(
@@ -0,0 +1,121 @@
+# ==============================================================================
+# Copyright (C) 2025 Intel Corporation
+#
+# SPDX-License-Identifier: MIT
+# ==============================================================================
+
+import os
+import sys
+import unittest
+import numpy
+
+import gi
+gi.require_version('Gst', '1.0')
+gi.require_version("GstVideo", "1.0")
+from gi.repository import Gst, GstVideo
+
+import gstgva as va
+
+Gst.init(sys.argv)
+
+from tests_gstgva import register_metadata
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", "..", "src", "gst", "python"))
+import python_object_association as poa
+
+
+class FakeTrack:
+    def __init__(self, track_id, tlwh):
+        self.track_id = track_id
+        self.tlwh = tlwh
+
+    def to_tlwh(self):
+        return numpy.array(self.tlwh, dtype=numpy.float64)
+
+
+class PythonObjectAssociationTestCase(unittest.TestCase):
+    def setUp(self):
+        register_metadata()
+
+        self.video_info = GstVideo.VideoInfo.new()
+        self.video_info.set_format(GstVideo.VideoFormat.NV12, 1920, 1080)  # FullHD
+        self.video_frame = va.VideoFrame(Gst.Buffer.new_allocate(None, 0, None), self.video_info)
+
+        self.element = poa.Identifier()
+        self.element._max_iou_distance = poa.MAX_IOU_DISTANCE_DEFAULT
+        self.element._label_to_save = "person"
+
+    def regions_with_boxes(self):
+        regions = list(self.video_frame.regions())
+        boxes, _ = self.video_frame.regions_as_arrays()
+        return regions, boxes
+
+    def test_iou_matrix(self):
+        ious = poa.iou_matrix(numpy.array([[0, 0, 10, 10], [100, 100, 10, 10]]),
+                              numpy.array([[0, 0, 10, 10], [5, 0, 10, 10], [500, 500, 10, 10]]))
+        self.assertEqual(ious.shape, (2, 3))
+        self.assertAlmostEqual(ious[0, 0], 121 / 79)  # inclusive pixel coordinates, same as before vectorization
+        self.assertGreater(ious[0, 0], ious[0, 1])
+        self.assertTrue(numpy.all(ious[1] == 0))
+        self.assertTrue(numpy.all(ious[:, 2] == 0))
+
+    def test_rewrite_regions_with_tracks(self):
+        self.video_frame.add_region(0, 0, 100, 100, "person", 0.9)
+        self.video_frame.add_region(500, 500, 50, 50, "person", 0.8)
+        tracks = [FakeTrack(3, (10, 20, 30, 40)), FakeTrack(8, (200, 300, 60, 70))]
+
+        regions, boxes = self.regions_with_boxes()
+        self.element._Identifier__rewrite_regions_with_tracks(self.video_frame, regions, boxes, tracks)
+
+        # Regions must be the same as the ones added one by one with add_region()
+        expected_frame = va.VideoFrame(Gst.Buffer.new_allocate(None, 0, None), self.video_info)
+        for track in tracks:
+            region = expected_frame.add_region(*track.tlwh, label="person")
+            region.set_object_id(track.track_id)
+
+        actual = list(self.video_frame.regions())
+        expected = list(expected_frame.regions())
+        self.assertEqual(len(actual), len(expected))
+        for actual_region, expected_region in zip(actual, expected):
+            self.assertEqual(actual_region.rect(), expected_region.rect())
+            self.assertEqual(actual_region.label(), expected_region.label())
+            self.assertEqual(actual_region.object_id(), expected_region.object_id())
+            self.assertAlmostEqual(actual_region.confidence(), expected_region.confidence())
+            self.assertIsNone(actual_region.label_id())
+            self.assertEqual(actual_region.label_id(), expected_region.label_id())
+
+    def test_rewrite_regions_without_tracks(self):
+        self.video_frame.add_region(0, 0, 100, 100, "person", 0.9)
+
+        regions, boxes = self.regions_with_boxes()
+        self.element._Identifier__rewrite_regions_with_tracks(self.video_frame, regions, boxes, [])
+
+        self.assertEqual(len(list(self.video_frame.regions())), 0)
+
+    def test_write_ids_to_regions(self):
+        self.video_frame.add_region(0, 0, 100, 100, "person", 0.9)
+        self.video_frame.add_region(500, 500, 50, 50, "person", 0.8)
+        self.video_frame.add_region(1000, 800, 40, 40, "person", 0.7)
+        tracks = [FakeTrack(5, (500, 500, 50, 50)), FakeTrack(9, (2, 2, 100, 100))]
+
+        regions, boxes = self.regions_with_boxes()
+        self.element._Identifier__write_ids_to_regions(self.video_frame, regions, boxes, tracks)
+
+        object_ids = [region.object_id() for region in self.video_frame.regions()]
+        self.assertEqual(object_ids, [9, 5, None])
+        self.assertEqual([region.rect() for region in self.video_frame.regions()],
+                         [region.rect() for region in regions])
+
+    def test_write_ids_below_threshold(self):
+        self.video_frame.add_region(0, 0, 100, 100, "person", 0.9)
+        tracks = [FakeTrack(5, (60, 60, 100, 100))]
+
+        regions, boxes = self.regions_with_boxes()
+        self.element._Identifier__write_ids_to_regions(self.video_frame, regions, boxes, tracks)
+
+        self.assertIsNone(list(self.video_frame.regions())[0].object_id())
+
+
+if __name__ == '__main__':
+    unittest.main()
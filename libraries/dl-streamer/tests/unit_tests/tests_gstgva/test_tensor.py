@@ -5,6 +5,7 @@
 # ==============================================================================
 
 import unittest
+import numpy
 
 import gi
 gi.require_version('Gst', '1.0')
@@ -96,6 +97,35 @@ class TensorTestCase(unittest.TestCase):
         #     self.assertEqual(i, libgobject.g_value_get_int(libgobject.g_value_array_get_nth(test_array, ctypes.c_uint(idx)))
         #     idx += 1
 
+    def test_to_dict(self):
+        structure = libgst.gst_structure_new_empty('detection'.encode("utf-8"))
+        tensor = Tensor(structure)
+        tensor["label_id"] = 3
+        tensor["confidence"] = 0.75
+        tensor["model_name"] = "test_model_name"
+
+        self.assertEqual(tensor.to_dict(), {"label_id": 3, "confidence": 0.75, "model_name": "test_model_name"})
+        self.assertEqual(tensor.to_dict(["confidence", "label_id", "missing"]),
+                         {"confidence": 0.75, "label_id": 3, "missing": None})
+
+    def test_arrays(self):
+        gst_structure = Gst.Structure.new_from_string("tensor, dims=(uint)<1, 3, 224, 224>, scale=(float)<0.5, 0.25>")
+        tensor = Tensor(hash(gst_structure))
+
+        self.assertEqual(tensor.dims(), [1, 3, 224, 224])
+        self.assertEqual(tensor["scale"], [0.5, 0.25])
+
+        dims = tensor.get_array("dims")
+        self.assertIsInstance(dims, numpy.ndarray)
+        self.assertEqual(dims.dtype, numpy.uint32)
+        self.assertEqual(dims.tolist(), [1, 3, 224, 224])
+        self.assertIsNone(tensor.get_array("missing"))
+
+        snapshot = tensor.to_dict()
+        self.assertEqual(snapshot["scale"].dtype, numpy.float32)
+        self.assertEqual(snapshot["scale"].tolist(), [0.5, 0.25])
+        self.assertEqual(tensor.to_dict(as_numpy=False)["dims"], [1, 3, 224, 224])
+
     def tearDown(self):
         pass
 
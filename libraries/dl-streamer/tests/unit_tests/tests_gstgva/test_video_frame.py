@@ -6,6 +6,7 @@
 
 import sys
 import unittest
+import numpy
 
 import gi
 gi.require_version('Gst', '1.0')
@@ -75,6 +76,55 @@ class VideoFrameTestCase(unittest.TestCase):
         self.assertEqual(len(list(self.video_frame_nv12.regions())), 1)
         self.assertEqual(len(regions), rois_num)
 
+    def test_regions_as_arrays(self):
+        regions, labels = self.video_frame_nv12.regions_as_arrays()
+        self.assertEqual(len(regions), 0)
+        self.assertEqual(labels, [])
+
+        rois_num = 100
+        for i in range(rois_num):
+            roi = self.video_frame_nv12.add_region(i, i, i + 100, i + 100, "label" + str(i % 3), i / 100.0)
+            roi.set_object_id(i + 1)
+
+        regions, labels = self.video_frame_nv12.regions_as_arrays()
+        self.assertEqual(len(regions), rois_num)
+        self.assertEqual(sorted(labels), ["label0", "label1", "label2"])
+        for region, roi in zip(regions, self.video_frame_nv12.regions()):
+            self.assertEqual((region['x'], region['y'], region['w'], region['h']), tuple(roi.rect()))
+            self.assertAlmostEqual(region['confidence'], roi.confidence())
+            self.assertEqual(region['object_id'], roi.object_id())
+            self.assertEqual(region['label_id'], -1)
+            self.assertEqual(labels[region['label_index']], roi.label())
+
+    def test_add_regions(self):
+        regions = numpy.zeros(3, dtype=va.video_frame.REGION_DTYPE)
+        regions['x'] = [0, 100, 1900]
+        regions['y'] = [0, 200, 1000]
+        regions['w'] = [50, 60, 100]
+        regions['h'] = [50, 70, 100]
+        regions['confidence'] = [0.5, 0.6, 0.7]
+        regions['label_id'] = [1, 2, -1]
+        regions['object_id'] = [-1, 5, 6]
+        regions['label_index'] = [0, 1, 0]
+
+        with self.assertWarns(UserWarning):
+            ids = self.video_frame_nv12.add_regions(regions, ["person", "car"])
+        self.assertEqual(len(ids), 3)
+
+        rois = list(self.video_frame_nv12.regions())
+        self.assertEqual(len(rois), 3)
+        self.assertEqual([roi.region_id() for roi in rois], list(ids))
+        self.assertEqual([roi.label() for roi in rois], ["person", "car", "person"])
+        self.assertEqual(tuple(rois[1].rect()), (100, 200, 60, 70))
+        self.assertEqual(tuple(rois[2].rect()), (1900, 1000, 20, 80))  # clipped
+        self.assertEqual([roi.label_id() for roi in rois[:2]], [1, 2])
+        self.assertEqual([roi.object_id() for roi in rois], [None, 5, 6])
+        self.assertAlmostEqual(rois[1].normalized_rect().x, 100 / 1920)
+
+        read_regions, labels = self.video_frame_nv12.regions_as_arrays()
+        self.assertEqual(list(read_regions['confidence']), [0.5, 0.6, 0.7])
+        self.assertEqual(list(read_regions['label_id']), [1, 2, -1])
+
     def test_tensors(self):
         self.assertEqual(len(list(self.video_frame_nv12.tensors())), 0)
 
@@ -147,5 +197,52 @@ class VideoFrameTestCase(unittest.TestCase):
             self.assertRaises(Exception, frame_from_buf.data())
 
 
+    def test_planes(self):
+        expected_shapes = {
+            GstVideo.VideoFormat.BGR: [(1080, 1920, 3)],
+            GstVideo.VideoFormat.RGBA: [(1080, 1920, 4)],
+            GstVideo.VideoFormat.GRAY8: [(1080, 1920)],
+            GstVideo.VideoFormat.NV12: [(1080, 1920), (540, 960, 2)],
+            GstVideo.VideoFormat.I420: [(1080, 1920), (540, 960), (540, 960)],
+            GstVideo.VideoFormat.P010_10LE: [(1080, 1920), (540, 960, 2)],
+        }
+        for video_format, shapes in expected_shapes.items():
+            info = GstVideo.VideoInfo.new()
+            info.set_format(video_format, 1920, 1080)
+            frame = va.VideoFrame(Gst.Buffer.new_allocate(None, info.size, None), info)
+            with frame.planes() as planes:
+                self.assertEqual([plane.shape for plane in planes], shapes)
+
+        with self.assertRaises(RuntimeError):  # empty buffer
+            with self.video_frame_nv12.planes():
+                pass
+
+    def test_planes_padded(self):
+        info = GstVideo.VideoInfo.new()
+        info.set_format(GstVideo.VideoFormat.NV12, 1920, 1080)
+        align = GstVideo.VideoAlignment()
+        align.reset()
+        align.padding_right = 64
+        align.padding_bottom = 8
+        info.align(align)
+
+        buffer = Gst.Buffer.new_allocate(None, info.size, None)
+        buffer.memset(0, 0, info.size)
+        frame = va.VideoFrame(buffer, info)
+        with frame.planes(Gst.MapFlags.WRITE) as (y_plane, uv_plane):
+            self.assertEqual(y_plane.shape, (1080, 1920))
+            self.assertEqual(uv_plane.shape, (540, 960, 2))
+            self.assertEqual(y_plane.strides[0], info.stride[0])
+            y_plane[:] = 1
+            uv_plane[:] = 2
+
+        # Views are not copies, values are written into the buffer, padding is untouched
+        _, map_info = buffer.map(Gst.MapFlags.READ)
+        data = numpy.frombuffer(map_info.data, dtype=numpy.uint8)
+        self.assertEqual(data[info.offset[0]], 1)
+        self.assertEqual(data[info.offset[0] + 1920], 0)
+        self.assertEqual(data[info.offset[1]], 2)
+        buffer.unmap(map_info)
+
 if __name__ == '__main__':
     unittest.main(verbosity=3)
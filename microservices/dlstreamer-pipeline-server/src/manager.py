@@ -4,7 +4,6 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
-import base64
 import copy
 import json
 import os
@@ -23,6 +22,7 @@ from src.publisher.publisher import Publisher
 from src.subscriber.cam_ingestor import XirisCamIngestor
 from src.subscriber.image_ingestor import ImageIngestor
 from src.publisher.image_publisher import ImagePublisher
+from src.publisher.common.encoded_frame import frame_base64
 from src.config import PipelineServerConfig
 from src.common.log import get_logger, LOG_LEVEL
 
@@ -63,6 +63,7 @@ class PipelineInstance:
         self.is_running = False
         self.subscriber = None
         self.ingestor = None
+        self.publisher = None
 
     def _mutable_deepcopy(self, obj):
         """creates a deepcopy of mutable objects"""
@@ -301,7 +302,7 @@ class PipelineInstance:
                     if not publish_frame:
                         enc_frame = ""
                     else:
-                        enc_frame = base64.b64encode(frame).decode("utf-8")
+                        enc_frame = frame_base64(frame)
 
                     resp_data = {"metadata":metadata, "blob":enc_frame} 
                     DATA= json.dumps(resp_data) 
@@ -317,6 +318,12 @@ class PipelineInstance:
         if self.instance_id is not None:
             return self.pipeline.status()
 
+    def get_publisher_status(self):
+        """Return per-destination publisher counters of pipeline instance"""
+        if self.publisher is None:
+            return {}
+        return self.publisher.get_publisher_status()
+
     def stop(self):
         """Stop the Pipeline instance and its thread."""
         self.publisher.stop()
@@ -547,13 +554,22 @@ class PipelineServerManager:
             self.log.error(errmsg)
             return None, errmsg
 
+    def _add_publisher_status(self, status: Optional[Dict]) -> Optional[Dict]:
+        """Add per-destination publisher counters to pipeline instance status"""
+        if status:
+            inst_book = Pipeline._INSTANCES.get(status.get("id"))
+            if inst_book and "obj" in inst_book:
+                status["publishers"] = inst_book["obj"].get_publisher_status()
+        return status
+
     def get_all_instance_status(self)-> List[Dict]:
         """GET /pipelines/status"""
-        return self.pserv.pipeline_manager.get_all_instance_status()
+        return [self._add_publisher_status(status)
+                for status in self.pserv.pipeline_manager.get_all_instance_status()]
 
     def get_instance_status(self, instance_id: str) -> List[Dict]:
         """GET /pipelines/{instance_id}/status"""
-        return self.pserv.pipeline_manager.get_instance_status(instance_id)
+        return self._add_publisher_status(self.pserv.pipeline_manager.get_instance_status(instance_id))
 
     def stop_instance(self, 
                       instance_id: str)->str:
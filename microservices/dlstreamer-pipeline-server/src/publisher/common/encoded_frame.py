@@ -0,0 +1,228 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+""" Frame shared by all publisher destinations.
+Encodes lazily, once per encoding type and level, and caches the base64 form.
+"""
+
+import base64
+import threading as th
+from concurrent.futures import CancelledError, Future
+
+import cv2
+
+from src.common.log import get_logger
+from utils import publisher_utils
+
+
+DEFAULT_ENCODING_TYPE = "jpeg"
+DEFAULT_ENCODING_LEVEL = 85
+
+log = get_logger(__name__)
+
+
+def resolve_encoding(enc_type, enc_level):
+    """Apply the same defaults as publisher_utils.encode_frame
+    :return: encoding type and level
+    :rtype: tuple
+    """
+    return enc_type or DEFAULT_ENCODING_TYPE, enc_level or DEFAULT_ENCODING_LEVEL
+
+
+class EncodedFrame():
+    """Frame handed to every destination queue.
+
+    Wraps either a frame that is published as is (raw or encoded by the pipeline), or a raw
+    frame together with the encoding requested by the publisher config. The encoded bytes and
+    their base64 string are computed once and shared by all destinations. When an executor is
+    given, the default encoding is started on it right away so that the publisher thread does
+    not wait for OpenCV.
+    """
+
+    def __init__(self, frame, meta_data=None, enc_type=None, enc_level=None, encode=False, executor=None,
+                 on_error=None):
+        """Constructor
+        :param bytes frame: Frame data
+        :param dict meta_data: Frame meta data with height, width, channels and img_format. Required if encode is True
+        :param str enc_type: Default encoding type, jpeg or png
+        :param int enc_level: Default encoding level
+        :param bool encode: Whether frame must be encoded before publishing
+        :param concurrent.futures.Executor executor: Executor for the default encoding. Encoded on first access if None
+        :param callable on_error: Called with the error if encoding fails
+        """
+        self._raw = frame
+        self._init_locks()
+        self._encoded = {}
+        self._b64 = {}
+        self.encode = encode
+        self.encoding_type, self.encoding_level = None, None
+        self._frame_info = None
+        self._meta_data = None
+        self._on_error = on_error
+        if not encode:
+            return
+
+        if meta_data is None:
+            raise ValueError("Meta data not given!")
+        # copy only what encoding needs, meta data keeps changing after this point
+        self._frame_info = {key: meta_data[key] for key in ('height', 'width', 'channels', 'img_format')}
+        # kept to clear the encoding labels of the frame if encoding fails
+        self._meta_data = meta_data
+        self.encoding_type, self.encoding_level = resolve_encoding(enc_type, enc_level)
+        if executor is not None:
+            self._encoded[(self.encoding_type, self.encoding_level)] = \
+                executor.submit(self._encode, self.encoding_type, self.encoding_level)
+
+    def _init_locks(self):
+        self._lock = th.Lock()
+        self._b64_lock = th.Lock()
+
+    def __getstate__(self):
+        """Keep only the raw frame, meta data and encoded bytes, so that frames can be
+        spilled to disk by the publish queues.
+        """
+        # raw data is read first, it is released only once the default encoding is done
+        raw = self._raw
+        with self._lock:
+            encoded = dict(self._encoded)
+        encoded_bytes = {}
+        for key, data in encoded.items():
+            if raw is None or data.done():
+                try:
+                    encoded_bytes[key] = data.result()
+                except BaseException:
+                    pass
+        return {
+            "raw": raw,
+            "encode": self.encode,
+            "encoding_type": self.encoding_type,
+            "encoding_level": self.encoding_level,
+            "frame_info": self._frame_info,
+            "encoded": encoded_bytes,
+        }
+
+    def __setstate__(self, state):
+        self._raw = state["raw"]
+        self._init_locks()
+        self.encode = state["encode"]
+        self.encoding_type = state["encoding_type"]
+        self.encoding_level = state["encoding_level"]
+        self._frame_info = state["frame_info"]
+        self._meta_data = None
+        self._on_error = None
+        self._encoded = {}
+        for key, data in state["encoded"].items():
+            self._encoded[key] = Future()
+            self._encoded[key].set_result(data)
+        self._b64 = {}
+
+    def get(self, enc_type=None, enc_level=None):
+        """Get frame data, encoding it if needed.
+        :param str enc_type: Encoding type. Default encoding of the frame if None
+        :param int enc_level: Encoding level. Default encoding of the frame if None
+        :return: Frame data. Frames that are not to be encoded are returned as is
+        :rtype: bytes
+        """
+        key = self._key(enc_type, enc_level)
+        if key is None:
+            return self._raw
+
+        with self._lock:
+            data = self._encoded.get(key)
+            owner = data is None
+            if owner:
+                # encode outside of the lock, other destinations wait on the future
+                data = self._encoded[key] = Future()
+                data.set_running_or_notify_cancel()
+
+        if owner:
+            try:
+                data.set_result(self._encode(*key))
+            except BaseException as e:
+                data.set_exception(e)
+        try:
+            return data.result()
+        except CancelledError:
+            log.error("Frame encoding cancelled, frame not available")
+            raise ValueError("Frame encoding cancelled")
+
+    def b64(self, enc_type=None, enc_level=None):
+        """Get frame data as base64 string, computed once per encoding.
+        :rtype: str
+        """
+        key = self._key(enc_type, enc_level)
+        with self._b64_lock:
+            data = self._b64.get(key)
+            if data is None:
+                data = self._b64[key] = base64.b64encode(self.get(enc_type, enc_level)).decode('utf-8')
+        return data
+
+    @property
+    def data(self):
+        """Frame data with default encoding
+        :rtype: bytes
+        """
+        return self.get()
+
+    def _key(self, enc_type, enc_level):
+        if not self.encode:
+            return None
+        key = resolve_encoding(enc_type or self.encoding_type, enc_level or self.encoding_level)
+        if self._raw is None and key not in self._encoded:
+            # raw data is gone, serve the default encoding instead
+            log.debug(f"Raw frame released, {key} encoding is not available")
+            return self.encoding_type, self.encoding_level
+        return key
+
+    def _encode(self, enc_type, enc_level):
+        """Encode raw frame. Raw frame is released once the default encoding succeeds, so queued frames
+        hold encoded data only. If encoding fails, the unencoded frame is published from then on, its
+        encoding labels are cleared from meta data and the error is reported to on_error.
+        """
+        raw = self._raw
+        info = self._frame_info
+        try:
+            enc_img, _, _ = publisher_utils.encode_frame(enc_type, enc_level, raw,
+                                                         info['height'], info['width'],
+                                                         channels=info['channels'], meta_data=info)
+            data = enc_img[1].tobytes()
+            if (enc_type, enc_level) == (self.encoding_type, self.encoding_level):
+                self._raw = None
+            return data
+        except ValueError as e:
+            log.error(f"Value error occured when encoding the image {e}")
+            self._encoding_failed(e)
+        except cv2.error as e:
+            log.error(f"CV2 error occured when encoding the image {e}")
+            self._encoding_failed(e)
+        return raw
+
+    def _encoding_failed(self, error):
+        self.encode = False
+        self.encoding_type, self.encoding_level = None, None
+        if self._meta_data is not None:
+            self._meta_data['encoding_type'] = None
+            self._meta_data['encoding_level'] = None
+        if self._on_error is not None:
+            self._on_error(error)
+
+
+def frame_bytes(frame):
+    """Frame data of a frame given as bytes or EncodedFrame
+    :rtype: bytes
+    """
+    if isinstance(frame, EncodedFrame):
+        return frame.data
+    return frame
+
+
+def frame_base64(frame):
+    """Base64 string of a frame given as bytes or EncodedFrame
+    :rtype: str
+    """
+    if isinstance(frame, EncodedFrame):
+        return frame.b64()
+    return base64.b64encode(frame).decode('utf-8')
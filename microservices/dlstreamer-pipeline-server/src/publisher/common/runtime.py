@@ -0,0 +1,274 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+""" Shared runtime for publisher threads.
+Bounded blocking queue with per-destination backpressure policy and a pool of worker threads.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import threading as th
+import time
+from collections import deque
+
+from src.common.log import get_logger
+
+
+BACKPRESSURE_DROP_OLDEST = "drop_oldest"
+BACKPRESSURE_BLOCK = "block"
+BACKPRESSURE_SPILL = "spill"
+BACKPRESSURE_POLICIES = (BACKPRESSURE_DROP_OLDEST, BACKPRESSURE_BLOCK, BACKPRESSURE_SPILL)
+
+# Max time a worker waits for an item before re-checking its stop event. Workers are woken
+# immediately on new items or on close(), so this only bounds the shutdown latency.
+DEFAULT_POLL_TIMEOUT = 0.5
+
+
+class PublishQueue():
+    """Bounded FIFO queue shared by the publisher and the destination workers.
+
+    Keeps the ``append()``/``popleft()`` interface of ``collections.deque`` so that publishers
+    can swap it in, but consumers block on a condition variable instead of polling, and the
+    behaviour on overflow is selected per destination:
+
+    - ``drop_oldest``: evict the oldest item (same as ``deque(maxlen=...)``), counted as dropped.
+    - ``block``: the producer waits for free space, up to ``block_timeout`` seconds
+      (``None`` waits forever). Items that still do not fit are dropped.
+    - ``spill``: overflow items are pickled to ``spill_dir`` and read back in order once
+      workers catch up, so nothing is lost while the disk has space.
+    """
+
+    def __init__(self, name, maxlen, policy=BACKPRESSURE_DROP_OLDEST, block_timeout=None, spill_dir=None):
+        """Constructor
+        :param str name: Destination name, used in logs and status
+        :param int maxlen: Max number of items held in memory
+        :param str policy: One of BACKPRESSURE_POLICIES
+        :param float block_timeout: Max seconds append() waits with ``block`` policy
+        :param str spill_dir: Directory for spilled items with ``spill`` policy. Temporary if not set
+        """
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unsupported backpressure policy '{policy}' for {name}. "
+                             f"Supported: {', '.join(BACKPRESSURE_POLICIES)}")
+        if maxlen <= 0:
+            raise ValueError(f"Queue size for {name} must be positive")
+
+        self.name = name
+        self.maxlen = maxlen
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.log = get_logger(f'{__name__} ({name})')
+
+        self._items = deque()
+        self._lock = th.Lock()
+        self._not_empty = th.Condition(self._lock)
+        self._not_full = th.Condition(self._lock)
+        self._closed = False
+        self._local = th.local()
+        # optional callable, called with each queued item evicted by the drop_oldest policy
+        self.on_drop = None
+
+        self._spill_dir = spill_dir
+        self._spill_dir_owned = False
+        self._spilled = deque()
+        self._spill_seq = 0
+
+        self._enqueued = 0
+        self._published = 0
+        self._dropped = 0
+        self._spilled_total = 0
+        self._latency_sum = 0.0
+        self._latency_max = 0.0
+
+    @classmethod
+    def from_config(cls, name, config, default_qsize):
+        """Create queue from destination config.
+
+        Recognized keys: ``queue_size``, ``backpressure``, ``block_timeout`` and ``spill_dir``.
+        :param str name: Destination name
+        :param dict config: Destination config
+        :param int default_qsize: Queue size used if ``queue_size`` is not configured
+        """
+        return cls(name,
+                   config.get("queue_size", default_qsize),
+                   policy=config.get("backpressure", BACKPRESSURE_DROP_OLDEST),
+                   block_timeout=config.get("block_timeout", None),
+                   spill_dir=config.get("spill_dir", None))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items) + len(self._spilled)
+
+    def append(self, item):
+        """Add item to the queue, applying the backpressure policy when it is full.
+        :param item: Item to publish, typically (frame, meta_data)
+        :return: True if item is queued, False if it was dropped
+        :rtype: bool
+        """
+        entry = (time.monotonic(), item)
+        evicted = None
+        with self._lock:
+            if self._closed:
+                self._dropped += 1
+                return False
+            self._enqueued += 1
+
+            if self.policy == BACKPRESSURE_SPILL and (self._spilled or len(self._items) >= self.maxlen):
+                # once spilling started, keep new items on disk until it is drained to preserve order
+                if self._spill(entry):
+                    return True
+                self._dropped += 1
+                return False
+
+            if len(self._items) >= self.maxlen:
+                if self.policy == BACKPRESSURE_BLOCK:
+                    if not self._not_full.wait_for(lambda: self._closed or len(self._items) < self.maxlen,
+                                                   timeout=self.block_timeout) or self._closed:
+                        self._dropped += 1
+                        self.log.debug("Queue is full, dropping item")
+                        return False
+                else:
+                    _, evicted = self._items.popleft()
+                    self._dropped += 1
+                    self.log.debug("Queue is full, dropping oldest item")
+
+            self._items.append(entry)
+            self._not_empty.notify()
+        if evicted is not None and self.on_drop is not None:
+            self.on_drop(evicted)
+        return True
+
+    def popleft(self, timeout=None):
+        """Remove and return the oldest item, waiting for one if the queue is empty.
+        :param float timeout: Max seconds to wait. Waits until an item arrives or the queue is closed if None
+        :return: Oldest item
+        :raises IndexError: if no item is available in time or the queue is closed, same as deque
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: self._items or self._closed, timeout=timeout) \
+                    or not self._items:
+                raise IndexError("pop from an empty publish queue")
+            enqueued_at, item = self._items.popleft()
+            self._unspill()
+            self._not_full.notify()
+        self._local.enqueued_at = enqueued_at
+        return item
+
+    def task_done(self):
+        """Mark the item last returned by popleft() in this thread as published.
+        Updates published counter and queue-to-publish latency.
+        """
+        enqueued_at = getattr(self._local, "enqueued_at", None)
+        if enqueued_at is None:
+            return
+        self._local.enqueued_at = None
+        latency = time.monotonic() - enqueued_at
+        with self._lock:
+            self._published += 1
+            self._latency_sum += latency
+            self._latency_max = max(self._latency_max, latency)
+
+    def close(self):
+        """Wake up all producers and consumers and drop spilled items.
+        """
+        with self._lock:
+            self._closed = True
+            self._dropped += len(self._spilled)
+            while self._spilled:
+                try:
+                    os.remove(self._spilled.popleft())
+                except OSError:
+                    pass
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        if self._spill_dir_owned:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+            self._spill_dir_owned = False
+
+    def stats(self):
+        """Counters of the destination, reported through pipeline status.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "backpressure": self.policy,
+                "queue_size": self.maxlen,
+                "queued": len(self._items) + len(self._spilled),
+                "enqueued": self._enqueued,
+                "published": self._published,
+                "dropped": self._dropped,
+                "spilled": self._spilled_total,
+                "avg_latency": self._latency_sum / self._published if self._published else None,
+                "max_latency": self._latency_max if self._published else None,
+            }
+
+    def _spill(self, entry):
+        """Write entry to spill directory. Called with lock held.
+        """
+        try:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix=f"dlsps_spill_{self.name}_")
+                self._spill_dir_owned = True
+            os.makedirs(self._spill_dir, exist_ok=True)
+            path = os.path.join(self._spill_dir, f"{id(self)}_{self._spill_seq:012d}.pkl")
+            with open(path, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            self.log.error(f"Failed to spill item to disk: {e}")
+            return False
+        self._spill_seq += 1
+        self._spilled_total += 1
+        self._spilled.append(path)
+        return True
+
+    def _unspill(self):
+        """Refill the in-memory queue with oldest spilled entries. Called with lock held.
+        """
+        while self._spilled and len(self._items) < self.maxlen:
+            path = self._spilled.popleft()
+            try:
+                with open(path, "rb") as f:
+                    self._items.append(pickle.load(f))
+                self._not_empty.notify()
+            except Exception as e:
+                self._dropped += 1
+                self.log.error(f"Failed to read spilled item: {e}")
+            finally:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class WorkerPool():
+    """Pool of threads running the same publisher loop. Exposes the subset of the
+    threading.Thread interface used by the publishers.
+    """
+
+    def __init__(self, target, count=1, name=None):
+        """Constructor
+        :param callable target: Worker loop
+        :param int count: Number of worker threads
+        :param str name: Thread name prefix
+        """
+        if count < 1:
+            raise ValueError("Publisher worker count must be at least 1")
+        self.threads = [th.Thread(target=target, name=f"{name}-{i}" if name else None, daemon=True)
+                        for i in range(count)]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def join(self, timeout=None):
+        for thread in self.threads:
+            if thread is not th.current_thread():
+                thread.join(timeout)
+
+    def is_alive(self):
+        return any(thread.is_alive() for thread in self.threads)
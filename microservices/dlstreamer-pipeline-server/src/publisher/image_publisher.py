@@ -9,14 +9,13 @@
 
 import os
 import queue
-import time
-from collections import deque
 import threading as th
 from distutils.util import strtobool
 
 import numpy as np
 
 from src.common.log import get_logger
+from src.publisher.common.runtime import PublishQueue, WorkerPool, DEFAULT_POLL_TIMEOUT
 
 DEFAULT_RESP_QUEUE_SIZE = 1    # if an old item is not picked, it is discarded as soon as new one comes synchronous
 
@@ -27,7 +26,7 @@ class ImagePublisher():
     def __init__(self, qsize=DEFAULT_RESP_QUEUE_SIZE):
         """Constructor
         """
-        self.queue = deque(maxlen=qsize)
+        self.queue = PublishQueue("image", qsize)
         self.response_queue = queue.Queue(maxsize=1)  # hold item from input request
         self.stop_ev = th.Event()
         # self.topic = pub_topic
@@ -39,7 +38,7 @@ class ImagePublisher():
         """Start publisher.
         """
         self.log.info("Starting publish thread for ImagePublisher")
-        self.th = th.Thread(target=self._run)
+        self.th = WorkerPool(self._run, name="image-publisher")
         self.th.start()
 
     def stop(self):
@@ -48,6 +47,7 @@ class ImagePublisher():
         if self.stop_ev.set():
             return
         self.stop_ev.set()
+        self.queue.close()
         self.th.join()
         self.th = None
         self.log.info('ImagePublisher thread stopped')
@@ -63,12 +63,12 @@ class ImagePublisher():
         try:
             while not self.stop_ev.is_set():
                 try:
-                    frame, meta_data = self.queue.popleft()
+                    frame, meta_data = self.queue.popleft(timeout=DEFAULT_POLL_TIMEOUT)
                     self.log.info('Received data from gst queue')
                     self._publish(frame, meta_data)
+                    self.queue.task_done()
                 except IndexError:
-                    self.log.debug("No data in request publisher queue")
-                    time.sleep(0.005)
+                    continue
                     
         except Exception as e:
             self.error_handler(e)
@@ -10,15 +10,15 @@ Publishes the metadata of frames to InfluxDB.
 
 # pylint: disable=wrong-import-position
 import os
-import time
 import threading as th
-from collections import deque
 
 from src.common.log import get_logger
+from src.publisher.common.runtime import PublishQueue, WorkerPool, DEFAULT_POLL_TIMEOUT
 from utils.influx_client import InfluxClient
 
 
 DEFAULT_APPDEST_INFLUX_QUEUE_SIZE = 1000
+DEFAULT_APPDEST_INFLUX_WORKERS = 1
 
 
 class InfluxdbWriter():
@@ -29,7 +29,8 @@ class InfluxdbWriter():
         """Constructor
         :param json config: Influx publisher config
         """
-        self.queue = deque(maxlen=qsize)
+        self.queue = PublishQueue.from_config("influx_write", config, qsize)
+        self.workers = config.get("workers", DEFAULT_APPDEST_INFLUX_WORKERS)
         self.stop_ev = th.Event()
         self.host = os.getenv("INFLUXDB_HOST")
         self.port = os.getenv("INFLUXDB_PORT")
@@ -58,7 +59,11 @@ class InfluxdbWriter():
             self.initialized=False
 
         self.log.info(f'Initializing Influx Writer for bucket - {self.influx_bucket_name}')
-        self.influx_client = InfluxClient(self.host, self.port, self.org, self.username, self.password)
+        # optional batching: {"batch_size", "flush_interval", "retry_interval", "max_retries",
+        # "max_retry_delay", "exponential_base", "buffer_size"}, intervals in ms
+        self.batch_config = config.get("batch", None)
+        self.influx_client = InfluxClient(self.host, self.port, self.org, self.username, self.password,
+                                          batch_config=self.batch_config)
         self.initialized=True
         self.log.info("InfluxDB Writer initialized")
 
@@ -66,7 +71,7 @@ class InfluxdbWriter():
         """Start publisher.
         """
         self.log.info("Starting influx writer thread")
-        self.th = th.Thread(target=self._run)
+        self.th = WorkerPool(self._run, self.workers, "influx_write-publisher")
         self.th.start()
 
     def stop(self):
@@ -76,10 +81,17 @@ class InfluxdbWriter():
         if self.stop_ev.set():
             return
         self.stop_ev.set()
+        self.queue.close()
         if self.th:
             self.th.join()
             self.th = None
             self.log.info('Influx writer thread stopped')
+        self.influx_client.stop()
+
+    def stats(self):
+        """Influx client counters, reported along with queue counters in pipeline status.
+        """
+        return self.influx_client.stats()
 
     def error_handler(self, msg):
         self.log.error('Error in influx thread: {}'.format(msg))
@@ -92,11 +104,11 @@ class InfluxdbWriter():
         try:
             while not self.stop_ev.is_set():
                 try:
-                    _, metadata = self.queue.popleft()
+                    _, metadata = self.queue.popleft(timeout=DEFAULT_POLL_TIMEOUT)
                     self._publish(metadata)
+                    self.queue.task_done()
                 except IndexError:
-                    self.log.debug("No data in client queue")
-                    time.sleep(0.005)
+                    continue
                     
         except Exception as e:
             self.error_handler(e)
@@ -11,17 +11,17 @@ Publishes data from a pipeline with gstreamer app destination.
 # pylint: disable=wrong-import-position
 import json
 import os
-import base64
-import time
 import threading as th
-from collections import deque
 
 from src.common.log import get_logger
+from src.publisher.common.encoded_frame import frame_base64
+from src.publisher.common.runtime import PublishQueue, WorkerPool, DEFAULT_POLL_TIMEOUT
 from src.publisher.common.filter import Filter
 from utils.mqtt_client import MQTTClient
 
 
 DEFAULT_APPDEST_MQTT_QUEUE_SIZE = 1000
+DEFAULT_APPDEST_MQTT_WORKERS = 1
 
 
 class MQTTPublisher():
@@ -33,7 +33,8 @@ class MQTTPublisher():
         :param json app_cfg: Application config
             the meta-data for the frame (df: True)
         """
-        self.queue = deque(maxlen=qsize)
+        self.queue = PublishQueue.from_config("mqtt", config, qsize)
+        self.workers = config.get("workers", DEFAULT_APPDEST_MQTT_WORKERS)
         self.stop_ev = th.Event()
         self.topic = config.get('topic', "dlstreamer_pipeline_results")
         assert len(self.topic) > 0, f'No specified topic'
@@ -71,7 +72,7 @@ class MQTTPublisher():
         """Start publisher.
         """
         self.log.info("Starting publish thread for MQTT")
-        self.th = th.Thread(target=self._run)
+        self.th = WorkerPool(self._run, self.workers, "mqtt-publisher")
         self.th.start()
 
     def stop(self):
@@ -80,6 +81,7 @@ class MQTTPublisher():
         if self.stop_ev.set():
             return
         self.stop_ev.set()
+        self.queue.close()
         self.th.join()
         self.th = None
         self.log.info('MQTT publisher thread stopped')
@@ -95,11 +97,11 @@ class MQTTPublisher():
         try:
             while not self.stop_ev.is_set():
                 try:
-                    frame, meta_data = self.queue.popleft()
+                    frame, meta_data = self.queue.popleft(timeout=DEFAULT_POLL_TIMEOUT)
                     self._publish(frame, meta_data)
+                    self.queue.task_done()
                 except IndexError:
-                    self.log.debug("No data in client queue")
-                    time.sleep(0.005)
+                    continue
                     
         except Exception as e:
             self.error_handler(e)
@@ -108,7 +110,7 @@ class MQTTPublisher():
         """Publish frame/metadata to mqtt broker
 
         :param frame: video frame
-        :type: bytes
+        :type: bytes or EncodedFrame
         :param meta_data: Meta data
         :type: Dict
         """
@@ -126,7 +128,7 @@ class MQTTPublisher():
         msg["metadata"]=meta_data
         if self.publish_frame:
             # Encode frame and convert to utf-8 string
-            msg["blob"]=base64.b64encode(frame).decode('utf-8') 
+            msg["blob"]=frame_base64(frame) 
             self.log.info(
                 f"Publishing frames along with meta data: {meta_data}")
         else:
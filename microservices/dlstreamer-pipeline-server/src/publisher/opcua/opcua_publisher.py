@@ -11,16 +11,16 @@ Publishes data from a pipeline with gstreamer app destination.
 # pylint: disable=wrong-import-position
 import json
 import os
-import base64
-import time
 import threading as th
-from collections import deque
 from asyncua.sync import Client, ua
 
 from src.common.log import get_logger
+from src.publisher.common.encoded_frame import frame_base64
+from src.publisher.common.runtime import PublishQueue, WorkerPool, DEFAULT_POLL_TIMEOUT
 from src.publisher.common.filter import Filter
 
 DEFAULT_APPDEST_OPCUA_QUEUE_SIZE = 1000
+DEFAULT_APPDEST_OPCUA_WORKERS = 1
 
 
 class OPCUAPublisher():
@@ -35,7 +35,8 @@ class OPCUAPublisher():
         self.publish_frame = False
         self.initialized=False
         self.stop_ev = th.Event()
-        self.queue = deque(maxlen=qsize)
+        self.queue = PublishQueue.from_config("opcua", opcua_cfg, qsize)
+        self.workers = opcua_cfg.get("workers", DEFAULT_APPDEST_OPCUA_WORKERS)
         self.log = get_logger(f'{__name__} (OPCUA)')
 
         opcua_server_ip = os.getenv("OPCUA_SERVER_IP", "").strip()
@@ -81,7 +82,7 @@ class OPCUAPublisher():
         """Start publisher.
         """
         self.log.info("Starting publish thread for OPCUA")
-        self.th = th.Thread(target=self._run)
+        self.th = WorkerPool(self._run, self.workers, "opcua-publisher")
         self.th.start()
 
     def stop(self):
@@ -90,6 +91,7 @@ class OPCUAPublisher():
         if self.stop_ev.set():
             return
         self.stop_ev.set()
+        self.queue.close()
         self.th.join()
         self.th = None
         self.log.info('OPCUA publisher thread stopped')
@@ -105,11 +107,11 @@ class OPCUAPublisher():
         try:
             while not self.stop_ev.is_set():
                 try:
-                    frame, meta_data = self.queue.popleft()
+                    frame, meta_data = self.queue.popleft(timeout=DEFAULT_POLL_TIMEOUT)
                     self._publish(frame, meta_data)
+                    self.queue.task_done()
                 except IndexError:
-                    self.log.debug("No data in client queue for OPCUA")
-                    time.sleep(0.005)
+                    continue
         except Exception as e:
             self.error_handler(e)
     
@@ -117,7 +119,7 @@ class OPCUAPublisher():
         """Publish frame/metadata to opcua broker
 
         :param frame: video frame
-        :type: bytes
+        :type: bytes or EncodedFrame
         :param meta_data: Meta data
         :type: Dict
         """
@@ -129,7 +131,7 @@ class OPCUAPublisher():
         msg = dict()
         msg["metadata"]=meta_data
         if self.publish_frame:
-            msg["blob"]=base64.b64encode(frame).decode('utf-8') 
+            msg["blob"]=frame_base64(frame) 
         else:
             msg["blob"]=""
             
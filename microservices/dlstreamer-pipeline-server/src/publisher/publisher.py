@@ -18,6 +18,8 @@ import cv2
 import threading as th
 import numpy as np
 import datetime
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from time import time_ns
 from gi.repository import Gst
 from distutils.util import strtobool
@@ -27,6 +29,7 @@ from typing import Dict
 from src.common.log import get_logger
 
 from utils import publisher_utils as utils
+from src.publisher.common.encoded_frame import EncodedFrame, resolve_encoding
 from src.publisher.mqtt.mqtt_publisher import MQTTPublisher
 from src.publisher.opcua.opcua_publisher import OPCUAPublisher
 from src.publisher.s3.s3_writer import S3Writer
@@ -38,6 +41,11 @@ except Exception as e:
     pass
 
 
+DEFAULT_ENCODING_WORKERS = 2
+# frames held back for S3 acknowledgement before the publisher thread blocks
+DEFAULT_S3_PENDING_FRAMES = 256
+
+
 class Publisher:
    
     def __init__(self, app_cfg, 
@@ -74,7 +82,19 @@ class Publisher:
             self.log.error(e)
             self.error_handler(e)
 
+        # OpenCV releases the GIL while encoding, so a few threads keep up with 1080p frames
+        self.encoding_workers = self.app_cfg.get('encoding_workers', DEFAULT_ENCODING_WORKERS)
+        self.encode_executor = None
+        if self.encoding_workers > 0:
+            self.encode_executor = ThreadPoolExecutor(max_workers=self.encoding_workers,
+                                                      thread_name_prefix="frame-encoder")
+
         self.frame_id = 0
+        # frames waiting for S3 acknowledgement before going to other publishers, in frame order
+        self.s3_pending = deque()
+        self.s3_pending_max = max(1, self.app_cfg.get('s3_pending_frames', DEFAULT_S3_PENDING_FRAMES))
+        self.s3_pending_cond = th.Condition()
+        self.s3_draining = False
 
         self.overlayed_frame = None
         self.send_overlayed_frame = False
@@ -100,6 +120,8 @@ class Publisher:
         self.stop_ev.set()
         self.th.join()
         self.th = None
+        if self.encode_executor is not None:
+            self.encode_executor.shutdown(wait=True)
         self.log.info("Stopped publisher thread")
 
     def error_handler(self, msg):
@@ -112,6 +134,19 @@ class Publisher:
         self.pipeline_instance_id = instance_id
         self.get_pipeline_status = get_pipeline_status
 
+    def get_publisher_status(self):
+        """Get queue and delivery counters of each publisher destination
+
+        :return: Counters keyed by destination name
+        :rtype: Dict
+        """
+        status = {}
+        for p in self.publishers:
+            status[p.queue.name] = p.queue.stats()
+            if hasattr(p, 'stats'):     # destination specific counters
+                status[p.queue.name].update(p.stats())
+        return status
+
     def _get_meta_publisher_config(self,meta_destination):
         """Get config for meta publishers
         :param meta_destination: Frame destination
@@ -496,19 +531,54 @@ class Publisher:
         if self.add_timestamp:
             meta_data['time'] = int(datetime.datetime.now(datetime.timezone.utc).timestamp()*1e9)
 
+        s3_ack = None
+        publishers = []
         for publisher in self.publishers:
-            # add data to S3, and block publish for others if enabled
-            if isinstance(publisher,S3Writer):
-                publisher.queue.append((frame, meta_data))
-                                
-                if publisher.s3_metadata_write_wait:
-                # we assume only one S3 writer is present in the list of publishers, and the very first publisher 
-                    if not publisher.s3write_complete.is_set():
-                        publisher.s3write_complete.wait()
-                    publisher.s3write_complete.clear()
+            # nothing consumes the queue of a publisher that failed to initialize,
+            # skip it so that blocking backpressure cannot stall the pipeline
+            if not publisher.initialized:
                 continue
-            
-            publisher.queue.append((frame, meta_data))
+            # add data to S3, and hold publish for others until it is stored if enabled
+            # we assume only one S3 writer is present in the list of publishers, and the very first publisher
+            if isinstance(publisher,S3Writer) and publisher.s3_metadata_write_wait:
+                s3_ack = publisher.submit(frame, meta_data)
+                continue
+            publishers.append(publisher)
+
+        if s3_ack is None:
+            for publisher in publishers:
+                publisher.queue.append((frame, meta_data))
+            return
+        with self.s3_pending_cond:
+            # backpressure on the pipeline when S3 writer falls behind
+            while len(self.s3_pending) >= self.s3_pending_max and not self.stop_ev.is_set():
+                self.s3_pending_cond.wait(timeout=0.5)
+            self.s3_pending.append((s3_ack, publishers, frame, meta_data))
+        s3_ack.add_done_callback(self._publish_stored_frames)
+
+    def _publish_stored_frames(self, _):
+        """Hand frames acknowledged by S3 writer to other publishers.
+        Frames are released in order, a frame waits for the acknowledgement of earlier frames.
+        Failed or dropped S3 writes are still published, as S3 writer already logged them.
+        A single callback drains at a time, so frames are appended to the other queues
+        in order and outside of the lock.
+        """
+        with self.s3_pending_cond:
+            if self.s3_draining:
+                return
+            self.s3_draining = True
+        while True:
+            with self.s3_pending_cond:
+                ready = []
+                while self.s3_pending and self.s3_pending[0][0].done():
+                    ready.append(self.s3_pending.popleft())
+                if not ready:
+                    self.s3_draining = False
+                    return
+                self.s3_pending_cond.notify_all()
+            for _, publishers, frame, meta_data in ready:
+                for publisher in publishers:
+                    publisher.queue.append((frame, meta_data))
 
     def _run(self):
         """Private thread run method.
@@ -558,14 +628,14 @@ class Publisher:
                                     if meta_data.get("task", None) is None and self.send_overlayed_frame:
                                         self.send_overlayed_frame = False
                                         self.log.debug("task key is missing in metadata. overriding overlaying annotation to False")
-                                    frame, meta_data['encoding_type'], meta_data[
-                                        'encoding_level'] = utils.encode_frame(
-                                            self.encoding_type, self.encoding_level,
-                                            frame, meta_data['height'],
-                                            meta_data['width'],
-                                            channels=meta_data['channels'],
-                                            meta_data=meta_data)
-                                    frame = frame[1].tobytes()
+                                    # labels are set first, encoding clears them if it fails
+                                    meta_data['encoding_type'], meta_data['encoding_level'] = \
+                                        resolve_encoding(self.encoding_type, self.encoding_level)
+                                    # encoded once, off this thread, and shared by all destinations
+                                    frame = EncodedFrame(frame, meta_data,
+                                                         self.encoding_type, self.encoding_level,
+                                                         encode=True, executor=self.encode_executor,
+                                                         on_error=self.error_handler)
                                     ret_ov = meta_data.pop('overlayText', None)  # upon overlay, discard overlay text, if present
                                     if ret_ov is not None:
                                         self.log.debug("Discarded overlay text from metadata")
@@ -600,7 +670,9 @@ class Publisher:
                         s3_metadata = self._add_s3_metadata(meta_data, self.s3_config)
                         meta_data.update(s3_metadata)
 
-                    # TODO: put into clients respective queues
+                    if not isinstance(frame, EncodedFrame):
+                        # share base64 form of the frame between destinations
+                        frame = EncodedFrame(frame)
                     self._publish(frame, meta_data)
 
                     # Discarding frame
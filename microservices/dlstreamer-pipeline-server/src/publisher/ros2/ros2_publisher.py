@@ -11,18 +11,18 @@ Publishes data from a pipeline with gstreamer app destination.
 # pylint: disable=wrong-import-position
 import json
 import os
-import base64
-import time
 import threading as th
-from collections import deque
 
 import rclpy
 from rclpy.node import Node
 from std_msgs.msg import String
 
 from src.common.log import get_logger
+from src.publisher.common.encoded_frame import frame_base64
+from src.publisher.common.runtime import PublishQueue, WorkerPool, DEFAULT_POLL_TIMEOUT
 
 DEFAULT_APPDEST_ROS2_QUEUE_SIZE = 1000
+DEFAULT_APPDEST_ROS2_WORKERS = 1
 
 
 class ROS2Publisher():
@@ -34,7 +34,8 @@ class ROS2Publisher():
         :param json app_cfg: Application config
             the meta-data for the frame (df: True)
         """
-        self.queue = deque(maxlen=qsize)
+        self.queue = PublishQueue.from_config("ros2", config, qsize)
+        self.workers = config.get("workers", DEFAULT_APPDEST_ROS2_WORKERS)
         self.stop_ev = th.Event()
         self.topic = config.get('topic', "/dlstreamer_pipeline_results")
         assert len(self.topic) > 0, f'No specified topic'
@@ -59,7 +60,7 @@ class ROS2Publisher():
         """Start publisher.
         """
         self.log.info("Starting publish thread for ROS2...")
-        self.th = th.Thread(target=self._run)
+        self.th = WorkerPool(self._run, self.workers, "ros2-publisher")
         self.th.start()
 
     def stop(self):
@@ -68,6 +69,7 @@ class ROS2Publisher():
         if self.stop_ev.set():
             return
         self.stop_ev.set()
+        self.queue.close()
         self.th.join()
         self.th = None
         self.node.destroy_node()
@@ -84,11 +86,11 @@ class ROS2Publisher():
         try:
             while not self.stop_ev.is_set():
                 try:
-                    frame, meta_data = self.queue.popleft()
+                    frame, meta_data = self.queue.popleft(timeout=DEFAULT_POLL_TIMEOUT)
                     self._publish(frame, meta_data)
+                    self.queue.task_done()
                 except IndexError:
-                    self.log.debug("No data in publisher queue for ROS2 publish thread")
-                    time.sleep(0.005)
+                    continue
 
         except Exception as e:
             self.error_handler(e)
@@ -96,7 +98,7 @@ class ROS2Publisher():
     def _publish(self, frame, meta_data):
         """Publish frame/metadata over ROS2
         :param frame: video frame
-        :type: bytes
+        :type: bytes or EncodedFrame
         :param meta_data: Meta data
         :type: Dict
         """
@@ -108,7 +110,7 @@ class ROS2Publisher():
         msg["metadata"]=meta_data
         if self.publish_frame:
             # Encode frame and convert to utf-8 string
-            msg["blob"]=base64.b64encode(frame).decode('utf-8') 
+            msg["blob"]=frame_base64(frame) 
             self.log.debug(
                 f"Publishing frame along with meta data: {meta_data}")
         else:
@@ -0,0 +1,259 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""S3 frame archiving.
+Groups frames into tar or zip shards with a JSON-lines metadata sidecar. Shards are uploaded
+with S3 multipart upload while they are being written, by a pool of upload workers.
+"""
+
+import io
+import json
+import tarfile
+import threading as th
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from src.common.log import get_logger
+
+
+ARCHIVE_FORMATS = ("tar", "zip")
+DEFAULT_ARCHIVE_FORMAT = "tar"
+DEFAULT_ARCHIVE_MAX_FRAMES = 100
+DEFAULT_ARCHIVE_MAX_INTERVAL = 10                 # seconds
+DEFAULT_ARCHIVE_PART_SIZE = 8 * 1024 * 1024       # bytes
+DEFAULT_ARCHIVE_UPLOAD_WORKERS = 4
+# S3 rejects multipart uploads with parts smaller than this, except for the last part
+MIN_ARCHIVE_PART_SIZE = 5 * 1024 * 1024
+
+
+class _PartStream():
+    """Write-only file object given to tarfile/zipfile. Written bytes are cut into
+    upload parts of part_size bytes.
+    """
+
+    def __init__(self, part_size, on_part):
+        self.part_size = part_size
+        self.on_part = on_part
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data
+        if len(self.buffer) >= self.part_size:
+            part = bytes(self.buffer)
+            self.buffer.clear()
+            self.on_part(part)
+        return len(data)
+
+    def flush(self):
+        pass
+
+
+class FrameShard():
+    """Archive of frames being written and uploaded to a single S3 object.
+
+    Parts are uploaded as soon as enough frame data is buffered. A shard that stays below one
+    part is stored with a single put request instead. The acknowledgement future of each frame
+    is resolved with its location once the shard and its sidecar are stored, or with the error
+    if the upload failed.
+    """
+
+    def __init__(self, s3_client, bucket, key, sidecar_key, fmt, part_size, executor, inflight):
+        self.log = get_logger(f'{__name__} ({key})')
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.key = key
+        self.sidecar_key = sidecar_key
+        self.created = time.monotonic()
+        self._executor = executor
+        self._inflight = inflight
+        self._acks = []
+        self._lines = []
+        self._parts = []
+        self._upload_id = None
+
+        self._stream = _PartStream(part_size, self._submit_part)
+        if fmt == "zip":
+            self._archive = zipfile.ZipFile(self._stream, mode="w", compression=zipfile.ZIP_STORED)
+        else:
+            self._archive = tarfile.open(fileobj=self._stream, mode="w|")
+
+    def __len__(self):
+        return len(self._lines)
+
+    def add(self, member, data, meta_data, ack=None):
+        """Append frame to the archive.
+
+        :param str member: Name of the frame inside the archive
+        :param bytes data: Frame data
+        :param dict meta_data: Frame meta data, written to the sidecar
+        :param concurrent.futures.Future ack: Resolved once the shard is stored
+        """
+        # serialize right away, meta data is shared with other publishers
+        line = json.dumps({"member": member, "metadata": meta_data}, default=str)
+        if isinstance(self._archive, zipfile.ZipFile):
+            self._archive.writestr(member, data)
+        else:
+            info = tarfile.TarInfo(member)
+            info.size = len(data)
+            info.mtime = time.time()
+            self._archive.addfile(info, io.BytesIO(data))
+        self._lines.append(line)
+        if ack is not None:
+            self._acks.append((member, ack))
+
+    def close(self):
+        """Finish the archive and schedule completion of the upload.
+        :return: Future of the completion
+        """
+        self._archive.close()
+        data = bytes(self._stream.buffer)
+        if self._upload_id is None:
+            return self._executor.submit(self._complete, data)
+        if data:
+            self._submit_part(data)
+        return self._executor.submit(self._complete, None)
+
+    def abort(self, error):
+        """Discard the shard, failing acknowledgements of its frames.
+        :param Exception error: Reason set on the acknowledgements
+        """
+        if self._upload_id is not None:
+            self.s3_client.abort_multipart_upload(self.bucket, self.key, self._upload_id)
+        self._fail(error)
+
+    def _fail(self, error):
+        for _, ack in self._acks:
+            if not ack.done():
+                ack.set_exception(error)
+
+    def _submit_part(self, data):
+        """Start multipart upload on first part and queue the part for upload
+        """
+        if self._upload_id is None:
+            self._upload_id = self.s3_client.create_multipart_upload(self.bucket, self.key)
+        # bound memory held by parts waiting for an upload worker
+        self._inflight.acquire()
+        part_number = len(self._parts) + 1
+        try:
+            future = self._executor.submit(self.s3_client.upload_part, self.bucket, self.key,
+                                           self._upload_id, part_number, data)
+        except BaseException:
+            self._inflight.release()
+            raise
+        future.add_done_callback(lambda _: self._inflight.release())
+        self._parts.append(future)
+
+    def _complete(self, data):
+        """Upload worker task run after all parts are queued. Parts were submitted earlier to
+        the same FIFO executor, so they are running or done by the time this runs.
+        """
+        try:
+            if self._upload_id is None:
+                self.s3_client.put_object(self.bucket, self.key, data)
+            else:
+                try:
+                    parts = [future.result() for future in self._parts]
+                    self.s3_client.complete_multipart_upload(self.bucket, self.key, self._upload_id, parts)
+                except Exception:
+                    self.s3_client.abort_multipart_upload(self.bucket, self.key, self._upload_id)
+                    raise
+            self.s3_client.put_object(self.bucket, self.sidecar_key,
+                                      ("\n".join(self._lines) + "\n").encode("utf-8"))
+        except Exception as e:
+            self.log.error(f"Error uploading frame archive: {e}")
+            self._fail(e)
+            return
+        self.log.debug(f"Uploaded {len(self)} frames at uri: s3://{self.bucket}/{self.key}")
+        for member, ack in self._acks:
+            ack.set_result({"bucket": self.bucket, "key": self.key, "member": member})
+
+
+class ShardArchiver():
+    """Rotates frame shards by frame count and age and owns the upload workers.
+
+    Recognized ``archive`` config keys: ``format`` (tar or zip), ``max_frames``,
+    ``max_interval`` (seconds), ``part_size`` (bytes) and ``upload_workers``.
+    """
+
+    def __init__(self, s3_client, bucket, object_path, config):
+        """Constructor
+        :param S3Client s3_client: S3 client
+        :param str bucket: Bucket name
+        :param str object_path: Key prefix of shards, empty or ending with '/'
+        :param dict config: Archive config
+        """
+        self.log = get_logger(f'{__name__} ({bucket})')
+        self.fmt = config.get("format", DEFAULT_ARCHIVE_FORMAT)
+        self.max_frames = config.get("max_frames", DEFAULT_ARCHIVE_MAX_FRAMES)
+        self.max_interval = config.get("max_interval", DEFAULT_ARCHIVE_MAX_INTERVAL)
+        self.part_size = config.get("part_size", DEFAULT_ARCHIVE_PART_SIZE)
+        upload_workers = config.get("upload_workers", DEFAULT_ARCHIVE_UPLOAD_WORKERS)
+        if self.fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format '{self.fmt}'. Supported: {', '.join(ARCHIVE_FORMATS)}")
+        if self.max_frames < 1 or upload_workers < 1:
+            raise ValueError("Archive max_frames and upload_workers must be at least 1")
+        if self.part_size < MIN_ARCHIVE_PART_SIZE:
+            raise ValueError(f"Archive part_size must be at least {MIN_ARCHIVE_PART_SIZE} bytes")
+
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.object_path = object_path
+        self.executor = ThreadPoolExecutor(upload_workers, thread_name_prefix="s3-archive-upload")
+        self._inflight = th.BoundedSemaphore(2 * upload_workers)
+        self._lock = th.Lock()
+        self._shard = None
+        self._seq = 0
+
+    def add(self, member, data, meta_data, ack=None):
+        """Add frame to the current shard, rotating it when full.
+        """
+        with self._lock:
+            if self._shard is None:
+                self._shard = self._new_shard(member)
+            try:
+                self._shard.add(member, data, meta_data, ack)
+            except Exception as e:
+                shard, self._shard = self._shard, None
+                self.log.error(f"Error writing frame archive {shard.key}: {e}")
+                shard.abort(e)
+                raise
+            if len(self._shard) >= self.max_frames:
+                self._rotate()
+
+    def poll(self):
+        """Rotate current shard if it is older than max_interval.
+        """
+        with self._lock:
+            if self._shard is not None and time.monotonic() - self._shard.created >= self.max_interval:
+                self._rotate()
+
+    def stop(self):
+        """Upload current shard and wait for all uploads to finish.
+        """
+        with self._lock:
+            if self._shard is not None:
+                self._rotate()
+        self.executor.shutdown(wait=True)
+
+    def _new_shard(self, first_member):
+        """Shards are named after the time and the first frame, which is unique per instance.
+        """
+        name = f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}_{self._seq:06d}_{first_member.split('.')[0]}"
+        self._seq += 1
+        return FrameShard(self.s3_client, self.bucket,
+                          f"{self.object_path}{name}.{self.fmt}", f"{self.object_path}{name}.jsonl",
+                          self.fmt, self.part_size, self.executor, self._inflight)
+
+    def _rotate(self):
+        """Close current shard. Called with lock held.
+        """
+        shard, self._shard = self._shard, None
+        try:
+            shard.close()
+        except Exception as e:
+            self.log.error(f"Error closing frame archive {shard.key}: {e}")
+            shard.abort(e)
@@ -12,16 +12,20 @@ Publishes data from a pipeline with gstreamer app destination.
 import json
 import os
 import base64
-import time
+import itertools
 import threading as th
-from collections import deque
+from concurrent.futures import Future
 
 from src.common.log import get_logger
+from src.publisher.common.encoded_frame import frame_bytes
+from src.publisher.common.runtime import PublishQueue, WorkerPool, DEFAULT_POLL_TIMEOUT
 from src.publisher.common.filter import Filter
+from src.publisher.s3.archive import ShardArchiver
 from utils.s3_client import S3Client
 
 
 DEFAULT_APPDEST_S3_QUEUE_SIZE = 1000
+DEFAULT_APPDEST_S3_WORKERS = 1
 
 
 class S3Writer():
@@ -33,7 +37,9 @@ class S3Writer():
         :param json config: S3 publisher config
             the meta-data for the frame (df: True)
         """
-        self.queue = deque(maxlen=qsize)
+        self.queue = PublishQueue.from_config("s3_write", config, qsize)
+        self.queue.on_drop = self._on_drop
+        self.workers = config.get("workers", DEFAULT_APPDEST_S3_WORKERS)
         self.stop_ev = th.Event()
 
         self.host = os.getenv("S3_STORAGE_HOST")
@@ -44,7 +50,12 @@ class S3Writer():
         self.s3_bucket_name = config.get("bucket")
         self.s3_folder_prefix = config.get("folder_prefix", "dlstreamer_pipeline_server")
         self.s3_metadata_write_wait = config.get("block", False)
-        self.s3write_complete = th.Event()
+        self.archive_config = config.get("archive", None)
+        self.archiver = None
+        # acknowledgement futures of submitted frames, by sequence number carried in the queue item
+        self._acks = {}
+        self._ack_seq = itertools.count()
+        self._ack_lock = th.Lock()
 
         self.th = None
         self.log = get_logger(f'{__name__} ({self.s3_bucket_name})')
@@ -73,24 +84,57 @@ class S3Writer():
             self.initialized=True    # success state  
             self.log.info("S3 Writer initialized")
 
+        self.object_path = str(self.s3_folder_prefix)
+        if not self.object_path.endswith("/"):
+            self.object_path += "/"
+        if self.initialized and self.archive_config is not None:
+            self.archiver = ShardArchiver(self.s3_client, self.s3_bucket_name, self.object_path, self.archive_config)
+            self.log.info(f"Archiving frames as {self.archiver.fmt} shards of up to {self.archiver.max_frames} frames")
+
     def start(self):
         """Start publisher.
         """
         self.log.info("Starting S3 writer thread")
-        self.th = th.Thread(target=self._run)
+        self.th = WorkerPool(self._run, self.workers, "s3_write-publisher")
         self.th.start()
 
     def stop(self):
         """Stop publisher.
         """
-        self.s3write_complete.set()
         if self.stop_ev.set():
             return
         self.stop_ev.set()
+        self.queue.close()
         if self.th:
             self.th.join()
             self.th = None
             self.log.info('S3 writer thread stopped')
+        if self.archiver:
+            self.archiver.stop()
+        # unblock waiters of frames that were never written
+        with self._ack_lock:
+            acks, self._acks = self._acks, {}
+        for ack in acks.values():
+            ack.set_exception(RuntimeError("S3 writer stopped"))
+
+    def submit(self, frame, meta_data):
+        """Queue frame for writing and get its acknowledgement.
+
+        :param frame: video frame
+        :type: bytes or EncodedFrame
+        :param meta_data: Meta data
+        :type: Dict
+        :return: Future resolved with the S3 location of the frame once it is stored, or
+            with the error if it could not be stored or was dropped
+        :rtype: concurrent.futures.Future
+        """
+        ack = Future()
+        with self._ack_lock:
+            seq = next(self._ack_seq)
+            self._acks[seq] = ack
+        if not self.queue.append((frame, meta_data, seq)):
+            self._resolve(seq, error=RuntimeError("Frame dropped from S3 write queue"))
+        return ack
 
     def error_handler(self, msg):
         self.log.error('Error in S3 thread: {}'.format(msg))
@@ -103,32 +147,78 @@ class S3Writer():
         try:
             while not self.stop_ev.is_set():
                 try:
-                    frame, meta_data = self.queue.popleft()
-                    self._publish(frame, meta_data)
+                    item = self.queue.popleft(timeout=DEFAULT_POLL_TIMEOUT)
+                    self._publish(*item)
+                    self.queue.task_done()
                 except IndexError:
-                    self.log.debug("No data in client queue")
-                    time.sleep(0.005)
+                    pass
+                # rotate shards by age under a steady stream as well as when idle
+                if self.archiver:
+                    self.archiver.poll()
                     
         except Exception as e:
             self.error_handler(e)
     
-    def _publish(self, frame, meta_data):
+    def _publish(self, frame, meta_data, seq=None):
         """Write object data to s3 storage. 
-        Upon successful upload, s3write_complete event is set which is required for unblock other publisher
-        when block is set to True.
+        Upon successful upload, the acknowledgement of the frame is resolved, which is required for
+        unblocking other publishers when block is set to True. In archive mode, the frame is added
+        to the current shard and acknowledged once the shard is uploaded.
 
         :param frame: video frame
-        :type: bytes
+        :type: bytes or EncodedFrame
         :param meta_data: Meta data
         :type: Dict
+        :param seq: acknowledgement sequence number, if frame was submitted
+        :type: int
         """
+        with self._ack_lock:
+            ack = self._acks.pop(seq, None)
+        # frame data first, encoding labels of meta data are cleared if encoding fails
+        try:
+            payload = frame_bytes(frame)
+        except Exception as e:
+            self.log.error(f"Frame data not available: {meta_data['img_handle']}: {e}")
+            if ack is not None:
+                ack.set_exception(e)
+            return
         ext = ""
         if meta_data['caps'].split(',')[0] == "image/jpeg" or meta_data['encoding_type']=='jpeg':
             ext = ".jpg"
         elif meta_data['caps'].split(',')[0] == "image/png" or meta_data['encoding_type']=='png':
             ext = ".png"
-                
-        object_path = self.s3_folder_prefix + "/" if not self.s3_folder_prefix.endswith("/") else self.s3_folder_prefix        
-        object_name = f"{object_path}{meta_data['img_handle']}" + ext
-        self.s3_client.publish(self.s3_bucket_name, object_name, payload=frame)
-        self.s3write_complete.set()
+
+        if self.archiver:
+            try:
+                self.archiver.add(f"{meta_data['img_handle']}{ext}", payload, meta_data, ack)
+            except Exception as e:
+                if ack is not None and not ack.done():
+                    ack.set_exception(e)
+            return
+
+        object_name = f"{self.object_path}{meta_data['img_handle']}" + ext
+        try:
+            stored = self.s3_client.publish(self.s3_bucket_name, object_name, payload=payload)
+        except Exception as e:
+            # e.g. connection errors, the frame is lost but the writer keeps going
+            self.log.error(f"Error uploading frame data: {object_name}: {e}")
+            if ack is not None:
+                ack.set_exception(e)
+            return
+        if ack is not None:
+            if stored:
+                ack.set_result({"bucket": self.s3_bucket_name, "key": object_name})
+            else:
+                ack.set_exception(RuntimeError(f"Error uploading frame data: {object_name}"))
+
+    def _on_drop(self, item):
+        """Fail acknowledgement of a frame dropped by queue backpressure
+        """
+        if len(item) > 2:
+            self._resolve(item[2], error=RuntimeError("Frame dropped from S3 write queue"))
+
+    def _resolve(self, seq, error):
+        with self._ack_lock:
+            ack = self._acks.pop(seq, None)
+        if ack is not None:
+            ack.set_exception(error)
@@ -20,6 +20,7 @@ from gi.repository import GLib, Gst, GstApp
 from src.server.app_destination import AppDestination
 from src.server.app_source import AppSource
 from src.server.common.utils import logging
+from src.server.latency_tracker import LatencyTracker
 from src.server.pipeline import Pipeline
 from src.server.rtsp.gstreamer_rtsp_destination import GStreamerRtspDestination
 from src.server.rtsp.gstreamer_rtsp_server import GStreamerRtspServer
@@ -47,6 +48,9 @@ class GStreamerPipeline(Pipeline):
                               "GvaVideoToTensorBackend"]
     G_PARAM_WRITABLE_FLAG = 2
 
+    # elements other than inference elements with a per-element latency breakdown
+    LATENCY_ELEMENT_FACTORIES = ("gvapython", "udfloader")
+
     SOURCE_ALIAS = "auto_source"
     GST_ELEMENTS_WITH_SOURCE_SETUP = ("GstURISourceBin")
     GST_ELEMENTS_THAT_EMIT_SOURCE = ("GstGvaMetaConvert")
@@ -83,9 +87,8 @@ class GStreamerPipeline(Pipeline):
         self.stop_time = None
         self._avg_fps = 0
         self._gst_launch_string = None
-        self.latency_times = dict()
-        self.sum_pipeline_latency = 0
-        self.count_pipeline_latency = 0
+        self.latency_tracker = LatencyTracker()
+        self.element_latency_trackers = {}
         self._real_base = None
         self._stream_base = None
         self._year_base = None
@@ -279,9 +282,15 @@ class GStreamerPipeline(Pipeline):
             "elapsed_time": elapsed_time,
             "message": message
         }
-        if self.count_pipeline_latency != 0:
-            status_obj["avg_pipeline_latency"] = self.sum_pipeline_latency / \
-                self.count_pipeline_latency
+        latency = self.latency_tracker.stats()
+        if latency:
+            status_obj["avg_pipeline_latency"] = latency["avg"]
+            status_obj["pipeline_latency"] = latency
+        element_latency = {name: tracker.stats()
+                           for name, tracker in self.element_latency_trackers.items()
+                           if tracker.count}
+        if element_latency:
+            status_obj["element_latency"] = element_latency
 
         return status_obj
 
@@ -566,6 +575,23 @@ class GStreamerPipeline(Pipeline):
             sink_pad.add_probe(Gst.PadProbeType.BUFFER,
                                 GStreamerPipeline.appsink_probe_callback, self)
 
+    def _set_element_latency_probes(self):
+        for element in self.pipeline.iterate_elements():
+            factory = element.get_factory()
+            if (element.__gtype__.name not in self.GVA_INFERENCE_ELEMENT_TYPES) and \
+                    not (factory and factory.get_name() in self.LATENCY_ELEMENT_FACTORIES):
+                continue
+            sink_pad = element.get_static_pad("sink")
+            src_pad = element.get_static_pad("src")
+            if not sink_pad or not src_pad:
+                continue
+            tracker = LatencyTracker()
+            self.element_latency_trackers[element.get_name()] = tracker
+            sink_pad.add_probe(Gst.PadProbeType.BUFFER,
+                               GStreamerPipeline.element_sink_probe_callback, tracker)
+            src_pad.add_probe(Gst.PadProbeType.BUFFER,
+                              GStreamerPipeline.element_src_probe_callback, tracker)
+
     def start(self):
         if self.model_manager:
             self.request["models"] = self.model_manager.models
@@ -595,6 +621,7 @@ class GStreamerPipeline(Pipeline):
                 self._cache_inference_elements()
                 self._set_model_instance_id()
                 self._set_source_and_sink()
+                self._set_element_latency_probes()
 
                 bus = self.pipeline.get_bus()
                 bus.add_signal_watch()
@@ -745,8 +772,7 @@ class GStreamerPipeline(Pipeline):
     @staticmethod
     def source_probe_callback(unused_pad, info, self):
         buffer = info.get_buffer()
-        pts = buffer.pts
-        self.latency_times[pts] = time.time()
+        self.latency_tracker.start(buffer.pts)
         return Gst.PadProbeReturn.OK
 
     def source_setup_callback(self, unused_bin, src_element, unused_udata):
@@ -757,11 +783,17 @@ class GStreamerPipeline(Pipeline):
     @staticmethod
     def appsink_probe_callback(unused_pad, info, self):
         buffer = info.get_buffer()
-        pts = buffer.pts
-        source_time = self.latency_times.pop(pts, -1)
-        if source_time != -1:
-            self.sum_pipeline_latency += time.time() - source_time
-            self.count_pipeline_latency += 1
+        self.latency_tracker.end(buffer.pts)
+        return Gst.PadProbeReturn.OK
+
+    @staticmethod
+    def element_sink_probe_callback(unused_pad, info, tracker):
+        tracker.start(info.get_buffer().pts)
+        return Gst.PadProbeReturn.OK
+
+    @staticmethod
+    def element_src_probe_callback(unused_pad, info, tracker):
+        tracker.end(info.get_buffer().pts)
         return Gst.PadProbeReturn.OK
 
     def on_sample_app_destination(self, sink):
@@ -0,0 +1,105 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import math
+import time
+from collections import OrderedDict, deque
+from threading import Lock
+
+DEFAULT_LATENCY_WINDOW = 1000   # latest samples kept for percentiles
+DEFAULT_MAX_IN_FLIGHT = 1000    # buffers tracked between start and end
+DEFAULT_IN_FLIGHT_TTL = 10.0    # seconds
+
+
+class LatencyTracker:
+    """Bounded latency tracker for buffers identified by a key such as the PTS.
+
+    Buffers that never reach the end point (dropped by videorate, leaky queues or UDFs) are
+    evicted once older than ``ttl`` seconds, or oldest first once ``max_in_flight`` buffers are
+    tracked, so memory does not grow on long running streams. Percentiles are computed over the
+    last ``window`` samples, the average over all samples.
+    """
+
+    def __init__(self,
+                 window=DEFAULT_LATENCY_WINDOW,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT,
+                 ttl=DEFAULT_IN_FLIGHT_TTL):
+        if window < 1 or max_in_flight < 1:
+            raise ValueError("Latency window and max in flight buffers must be at least 1")
+        self.max_in_flight = max_in_flight
+        self.ttl = ttl
+        self._lock = Lock()
+        self._in_flight = OrderedDict()
+        self._samples = deque(maxlen=window)
+        self._sum = 0.0
+        self._count = 0
+        self._evicted = 0
+
+    @property
+    def count(self):
+        return self._count
+
+    def start(self, key, now=None):
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            if key in self._in_flight:
+                self._in_flight.move_to_end(key)
+            elif len(self._in_flight) >= self.max_in_flight:
+                self._in_flight.popitem(last=False)
+                self._evicted += 1
+            self._in_flight[key] = now
+
+    def end(self, key, now=None):
+        """Complete the buffer started with the same key.
+
+        Returns the latency in seconds, or None if the buffer is not tracked.
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            start_time = self._in_flight.pop(key, None)
+            if start_time is None:
+                return None
+            latency = now - start_time
+            self._samples.append(latency)
+            self._sum += latency
+            self._count += 1
+            return latency
+
+    def stats(self):
+        """Latency statistics in seconds, or None if no buffer completed yet.
+        """
+        with self._lock:
+            if not self._count:
+                return None
+            samples = sorted(self._samples)
+            return {
+                "avg": self._sum / self._count,
+                "p50": self._percentile(samples, 50),
+                "p95": self._percentile(samples, 95),
+                "p99": self._percentile(samples, 99),
+                "max": samples[-1],
+                "count": self._count,
+                "in_flight": len(self._in_flight),
+                "evicted": self._evicted
+            }
+
+    def _evict(self, now):
+        # entries are ordered by start time, expired ones are at the front
+        while self._in_flight:
+            key, start_time = next(iter(self._in_flight.items()))
+            if now - start_time < self.ttl:
+                break
+            del self._in_flight[key]
+            self._evicted += 1
+
+    @staticmethod
+    def _percentile(samples, percent):
+        # nearest-rank percentile of sorted samples
+        rank = max(1, math.ceil(percent / 100 * len(samples)))
+        return samples[rank - 1]
@@ -69,8 +69,9 @@ class __PipelineServer:
             if (self._instance):
                 result = self._pipeline_server.pipeline_manager.get_instance_status(self._instance)
 
-                if 'avg_pipeline_latency' not in result:
-                    result['avg_pipeline_latency'] = None
+                for key in ('avg_pipeline_latency', 'pipeline_latency', 'element_latency'):
+                    if key not in result:
+                        result[key] = None
 
                 if (not self._status_named_tuple):
                     self._status_named_tuple = namedtuple(
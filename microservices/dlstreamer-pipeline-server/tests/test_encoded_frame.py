@@ -0,0 +1,93 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import pytest
+
+from src.publisher.common.encoded_frame import EncodedFrame, frame_base64, frame_bytes
+
+
+@pytest.fixture
+def raw_frame():
+    frame = np.zeros((16, 16, 3), dtype=np.uint8)
+    frame[4:12, 4:12] = (0, 128, 255)
+    meta_data = {'height': 16, 'width': 16, 'channels': 3, 'img_format': 'BGR'}
+    return frame.tobytes(), meta_data
+
+
+class TestEncodedFrame:
+
+    def test_passthrough(self):
+        frame = EncodedFrame(b'Test')
+        assert frame.data is frame.get()
+        assert frame.data == b'Test'
+        assert frame.b64() == base64.b64encode(b'Test').decode('utf-8')
+        assert frame.encoding_type is None
+
+    def test_encode_requires_meta_data(self):
+        with pytest.raises(ValueError):
+            EncodedFrame(b'Test', encode=True)
+
+    def test_default_encoding(self, raw_frame):
+        frame = EncodedFrame(raw_frame[0], raw_frame[1], encode=True)
+        assert (frame.encoding_type, frame.encoding_level) == ('jpeg', 85)
+        decoded = cv2.imdecode(np.frombuffer(frame.data, np.uint8), cv2.IMREAD_COLOR)
+        assert decoded.shape == (16, 16, 3)
+
+    @pytest.mark.parametrize('executor_workers', [0, 2])
+    def test_encodes_once(self, mocker, raw_frame, executor_workers):
+        enc_img = (True, np.frombuffer(b'encoded', np.uint8).reshape(-1, 1))
+        mock_encode = mocker.patch('utils.publisher_utils.encode_frame', return_value=(enc_img, 'png', 5))
+        executor = ThreadPoolExecutor(executor_workers) if executor_workers else None
+        frame = EncodedFrame(raw_frame[0], raw_frame[1], 'png', 5, encode=True, executor=executor)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(frame.b64())) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [base64.b64encode(b'encoded').decode('utf-8')] * 4
+        assert frame.data == b'encoded'
+        mock_encode.assert_called_once()
+        if executor:
+            executor.shutdown()
+
+    def test_raw_released_after_default_encoding(self, raw_frame):
+        frame = EncodedFrame(raw_frame[0], raw_frame[1], 'jpeg', 90, encode=True)
+        encoded = frame.data
+        assert frame._raw is None
+        # other encodings are no longer possible, default one is served
+        assert frame.get('png', 3) == encoded
+
+    @pytest.mark.parametrize('error', [cv2.error, ValueError])
+    def test_encode_error_publishes_raw(self, mocker, raw_frame, error):
+        mocker.patch('utils.publisher_utils.encode_frame', side_effect=error)
+        on_error = mocker.Mock()
+        meta_data = dict(raw_frame[1], encoding_type='jpeg', encoding_level=85)
+        executor = ThreadPoolExecutor(1)
+        frame = EncodedFrame(raw_frame[0], meta_data, encode=True, executor=executor, on_error=on_error)
+        assert frame.data == raw_frame[0]
+        # raw pixels are not labelled as jpeg
+        assert meta_data['encoding_type'] is None and meta_data['encoding_level'] is None
+        assert frame.encoding_type is None
+        assert frame.get('png', 3) == raw_frame[0]
+        assert isinstance(on_error.call_args.args[0], error)
+        on_error.assert_called_once()
+        executor.shutdown()
+
+    def test_helpers(self, raw_frame):
+        frame = EncodedFrame(raw_frame[0], raw_frame[1], encode=True)
+        assert frame_bytes(frame) == frame.data
+        assert frame_bytes(b'Test') == b'Test'
+        assert frame_base64(frame) == base64.b64encode(frame.data).decode('utf-8')
+        assert frame_base64(b'Test') == base64.b64encode(b'Test').decode('utf-8')
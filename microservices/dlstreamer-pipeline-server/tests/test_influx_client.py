@@ -0,0 +1,180 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from influxdb_client import WritePrecision
+
+from utils.influx_client import InfluxClient, InfluxBatchWriter
+
+
+class InfluxStandIn(BaseHTTPRequestHandler):
+    """Accepts influx v2 write requests and counts received points"""
+    points = 0
+    requests = 0
+    fail_requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path.startswith('/api/v2/signin'):
+            self.send_response(204)
+            self.send_header('Set-Cookie', 'session=test')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        with InfluxStandIn.lock:
+            InfluxStandIn.requests += 1
+            failing = InfluxStandIn.fail_requests > 0
+            if failing:
+                InfluxStandIn.fail_requests -= 1
+            else:
+                InfluxStandIn.points += len(body.splitlines())
+        self.send_response(503 if failing else 204)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def influx_server():
+    InfluxStandIn.points = 0
+    InfluxStandIn.requests = 0
+    InfluxStandIn.fail_requests = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), InfluxStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+def make_metadata(frame_id):
+    return {
+        'height': 1080, 'width': 1920, 'channels': 3, 'caps': 'video/x-raw', 'img_format': 'BGR',
+        'img_handle': f'img{frame_id:07d}', 'resolution': {'height': 1080, 'width': 1920},
+        'pipeline': {'name': 'user_defined_pipelines'}, 'frame_id': frame_id, 'time': time.time_ns(),
+        'objects': [{'label': 'Person', 'score': 0.9}],
+    }
+
+
+class TestInfluxBatchWriter:
+
+    def test_batches_and_counters(self):
+        write_api = MagicMock()
+        writer = InfluxBatchWriter(write_api, 'org', batch_size=3, flush_interval=10000)
+        for i in range(7):
+            writer.write('bucket', f'm f={i}')
+        assert writer.flush(timeout=5)
+        writer.stop(timeout=5)
+        bodies = [call.kwargs['record'] for call in write_api.write.call_args_list]
+        assert [len(body.splitlines()) for body in bodies] == [3, 3, 1]
+        assert writer.stats()['points_written'] == 7
+        assert writer.stats()['points_dropped'] == 0
+
+    def test_buffer_overflow_drops_oldest(self):
+        write_api = MagicMock()
+        writer = InfluxBatchWriter(write_api, 'org', batch_size=2, flush_interval=10000, buffer_size=2)
+        with writer._cond:  # keep the writer thread from draining the buffer
+            for i in range(4):
+                writer.write('bucket', f'm f={i}')
+        writer.stop(timeout=5)
+        assert writer.stats()['points_dropped'] == 2
+        write_api.write.assert_called_once_with(bucket='bucket', org='org', record='m f=2\nm f=3',
+                                                write_precision=WritePrecision.NS)
+
+    def test_retry_then_drop(self):
+        write_api = MagicMock()
+        write_api.write.side_effect = [Exception('unavailable'), None, Exception('a'), Exception('b')]
+        writer = InfluxBatchWriter(write_api, 'org', batch_size=1, flush_interval=10000,
+                                   retry_interval=1, max_retries=1)
+        writer.write('bucket', 'm f=1')
+        assert writer.flush(timeout=5)
+        writer.write('bucket', 'm f=2')
+        assert writer.flush(timeout=5)
+        writer.stop(timeout=5)
+        stats = writer.stats()
+        assert stats['points_written'] == 1
+        assert stats['points_dropped'] == 1
+        assert stats['retries'] == 2
+
+    def test_flush_interval(self):
+        write_api = MagicMock()
+        writer = InfluxBatchWriter(write_api, 'org', batch_size=100, flush_interval=20)
+        writer.write('bucket', 'm f=1')
+        deadline = time.time() + 5
+        while not write_api.write.called and time.time() < deadline:
+            time.sleep(0.01)
+        writer.stop(timeout=5)
+        write_api.write.assert_called_once()
+
+
+class TestInfluxClient:
+
+    def test_line_protocol_matches_point(self):
+        client = InfluxClient('127.0.0.1', 1, 'org', 'user', 'pass')
+        meta = make_metadata(3)
+        meta['img_handle'] = 'img, =\\'
+        meta['note'] = 'say "hi" \\ there'
+        meta['ratio'] = 2.0
+        meta['flag'] = True
+        assert client.get_line_protocol(meta, 'dl sps') == client.get_point_data(meta, 'dl sps').to_line_protocol()
+        point = client.get_point_data(meta, 'dl sps').time(1700000000123456789, WritePrecision.NS)
+        assert client.get_line_protocol(meta, 'dl sps', 1700000000123456789) == point.to_line_protocol()
+        client.stop()
+
+    def test_batched_points_are_stamped_when_queued(self):
+        client = InfluxClient('127.0.0.1', 1, 'org', 'user', 'pass',
+                              batch_config={'batch_size': 10, 'flush_interval': 10000})
+        client.batch_writer.write = MagicMock()
+        before = time.time_ns()
+        client.publish('bucket', 'dlsps', make_metadata(1))
+        after = time.time_ns()
+        line = client.batch_writer.write.call_args.args[1]
+        assert before <= int(line.rsplit(' ', 1)[1]) <= after
+        client.batch_writer.stop(timeout=5)
+        client.client.close()
+
+    def test_batched_throughput(self, influx_server):
+        host, port = influx_server
+        client = InfluxClient(host, port, 'org', 'user', 'pass',
+                              batch_config={'batch_size': 1000, 'flush_interval': 100})
+        points = 10000
+        start = time.perf_counter()
+        for i in range(points):
+            client.publish('bucket', 'dlsps', make_metadata(i))
+        assert client.batch_writer.flush(timeout=30)
+        elapsed = time.perf_counter() - start
+        client.stop()
+
+        assert InfluxStandIn.points == points
+        assert client.stats()['points_written'] == points
+        # interval flushes may send partial batches, but never one request per point
+        assert InfluxStandIn.requests <= points // 100
+        assert points / elapsed >= 5000, f"{points / elapsed:.0f} points/s"
+
+    def test_batched_retry_on_server_error(self, influx_server):
+        host, port = influx_server
+        InfluxStandIn.fail_requests = 1
+        client = InfluxClient(host, port, 'org', 'user', 'pass',
+                              batch_config={'batch_size': 10, 'flush_interval': 100,
+                                            'retry_interval': 10, 'max_retries': 2})
+        for i in range(10):
+            client.publish('bucket', 'dlsps', make_metadata(i))
+        assert client.batch_writer.flush(timeout=30)
+        client.stop()
+        assert InfluxStandIn.points == 10
+        assert client.stats()['retries'] == 1
@@ -324,6 +324,16 @@ class TestPipelineServerManager:
         pipeline_server_manager.pserv.pipeline_manager.get_all_instance_status.assert_called_once()
         assert result == status
 
+    def test_get_instance_status_adds_publisher_status(self, pipeline_server_manager):
+        mock_pinstance = MagicMock()
+        mock_pinstance.get_publisher_status.return_value = {"mqtt": {"dropped": 2}}
+        Pipeline._INSTANCES["instance_pub"] = {"obj": mock_pinstance, "params": {}}
+        pipeline_server_manager.pserv = MagicMock()
+        pipeline_server_manager.pserv.pipeline_manager.get_instance_status.return_value = {"id": "instance_pub", "state": "RUNNING"}
+        result = pipeline_server_manager.get_instance_status("instance_pub")
+        Pipeline._INSTANCES.pop("instance_pub")
+        assert result == {"id": "instance_pub", "state": "RUNNING", "publishers": {"mqtt": {"dropped": 2}}}
+
     def test_stop_instance(self, mocker, pipeline_server_manager):
         mock_pipeline_instance = MagicMock()
         mock_pipeline_instance.instance_id = "mock_instance_id"
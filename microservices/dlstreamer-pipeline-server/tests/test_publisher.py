@@ -10,6 +10,7 @@ import numpy as np
 import cv2
 from unittest.mock import MagicMock
 import sys
+import threading as th
 import src.common.log
 from gi.repository import Gst
 from gstgva.util import gst_buffer_data
@@ -17,6 +18,7 @@ from src.server.gstreamer_app_source import GvaFrameData
 
 from src.publisher.publisher import Publisher
 from src.publisher.mqtt.mqtt_publisher import MQTTPublisher
+from src.publisher.s3.s3_writer import S3Writer
 
 from collections import namedtuple
 from enum import Enum
@@ -217,6 +219,65 @@ class TestPublisher:
         pub_obj._publish(frame, meta_data)
         pub_obj.publishers[1].queue.append.assert_called_once_with((frame, meta_data))
 
+    def test_publish_skips_uninitialized(self, pub_obj, mocker):
+        pub_obj.add_timestamp = False
+        pub_obj.publishers = [MagicMock(), MagicMock()]
+        pub_obj.publishers[0].initialized = False
+        pub_obj._publish(b'frame', {})
+        pub_obj.publishers[0].queue.append.assert_not_called()
+        pub_obj.publishers[1].queue.append.assert_called_once_with((b'frame', {}))
+
+    def test_publish_waits_for_s3_ack_in_order(self, pub_obj):
+        from concurrent.futures import Future
+        pub_obj.add_timestamp = False
+        s3_writer = MagicMock(spec=S3Writer)
+        s3_writer.initialized = True
+        s3_writer.s3_metadata_write_wait = True
+        acks = [Future(), Future()]
+        s3_writer.submit.side_effect = acks
+        other = MagicMock()
+        pub_obj.publishers = [s3_writer, other]
+        pub_obj._publish(b'frame0', {'i': 0})
+        pub_obj._publish(b'frame1', {'i': 1})
+        other.queue.append.assert_not_called()
+        acks[1].set_result({})
+        other.queue.append.assert_not_called()
+        acks[0].set_exception(RuntimeError("upload failed"))
+        assert [call.args[0][1]['i'] for call in other.queue.append.call_args_list] == [0, 1]
+        assert not pub_obj.s3_pending
+
+    def test_publish_blocks_when_s3_pending_is_full(self, pub_obj):
+        from concurrent.futures import Future
+        pub_obj.add_timestamp = False
+        pub_obj.s3_pending_max = 1
+        s3_writer = MagicMock(spec=S3Writer)
+        s3_writer.initialized = True
+        s3_writer.s3_metadata_write_wait = True
+        acks = [Future(), Future()]
+        s3_writer.submit.side_effect = acks
+        other = MagicMock()
+        pub_obj.publishers = [s3_writer, other]
+        pub_obj._publish(b'frame0', {'i': 0})
+        second = th.Thread(target=pub_obj._publish, args=(b'frame1', {'i': 1}))
+        second.start()
+        second.join(timeout=1)
+        assert second.is_alive()
+        acks[0].set_result({})
+        second.join(timeout=5)
+        assert not second.is_alive()
+        acks[1].set_result({})
+        assert [call.args[0][1]['i'] for call in other.queue.append.call_args_list] == [0, 1]
+
+    def test_get_publisher_status(self, pub_obj):
+        pub_obj.publishers = [MagicMock(spec=['queue']), MagicMock(spec=['queue', 'stats'])]
+        pub_obj.publishers[0].queue.name = "mqtt"
+        pub_obj.publishers[0].queue.stats.return_value = {"dropped": 0}
+        pub_obj.publishers[1].queue.name = "influx_write"
+        pub_obj.publishers[1].queue.stats.return_value = {"dropped": 1}
+        pub_obj.publishers[1].stats.return_value = {"points_written": 5}
+        assert pub_obj.get_publisher_status() == {"mqtt": {"dropped": 0},
+                                                  "influx_write": {"dropped": 1, "points_written": 5}}
+
 
     @pytest.mark.parametrize('cfg, frame, meta_data, video_frame',
                              [({'encoding': {'level': 95,'type': 'jpeg'}}, 
@@ -0,0 +1,165 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import threading
+import time
+
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.publisher.common.encoded_frame import EncodedFrame
+from src.publisher.common.runtime import PublishQueue, WorkerPool
+
+
+class TestPublishQueue:
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            PublishQueue("mqtt", 10, policy="unknown")
+
+    def test_from_config(self):
+        q = PublishQueue.from_config("mqtt", {"queue_size": 5, "backpressure": "block", "block_timeout": 1}, 1000)
+        assert q.maxlen == 5
+        assert q.policy == "block"
+        assert q.block_timeout == 1
+        q = PublishQueue.from_config("mqtt", {}, 1000)
+        assert q.maxlen == 1000
+        assert q.policy == "drop_oldest"
+
+    def test_popleft_empty_raises_index_error(self):
+        q = PublishQueue("mqtt", 10)
+        with pytest.raises(IndexError):
+            q.popleft(timeout=0.01)
+
+    def test_drop_oldest(self):
+        q = PublishQueue("mqtt", 2)
+        for i in range(3):
+            assert q.append((b'frame', {"i": i}))
+        assert q.popleft()[1] == {"i": 1}
+        assert q.popleft()[1] == {"i": 2}
+        stats = q.stats()
+        assert stats["dropped"] == 1
+        assert stats["enqueued"] == 3
+
+    def test_block_timeout_drops_new_item(self):
+        q = PublishQueue("mqtt", 1, policy="block", block_timeout=0.01)
+        assert q.append((b'frame', {"i": 0}))
+        assert not q.append((b'frame', {"i": 1}))
+        assert q.popleft()[1] == {"i": 0}
+        assert q.stats()["dropped"] == 1
+
+    def test_block_waits_for_consumer(self):
+        q = PublishQueue("mqtt", 1, policy="block")
+        q.append((b'frame', {"i": 0}))
+        producer = threading.Thread(target=q.append, args=((b'frame', {"i": 1}),))
+        producer.start()
+        time.sleep(0.01)
+        assert producer.is_alive()
+        assert q.popleft(timeout=1)[1] == {"i": 0}
+        producer.join(timeout=1)
+        assert q.popleft(timeout=1)[1] == {"i": 1}
+        assert q.stats()["dropped"] == 0
+
+    def test_spill_preserves_order(self, tmp_path):
+        q = PublishQueue("s3_write", 2, policy="spill", spill_dir=str(tmp_path))
+        for i in range(5):
+            assert q.append((b'frame', {"i": i}))
+        assert len(q) == 5
+        assert len(os.listdir(tmp_path)) == 3
+        assert [q.popleft()[1]["i"] for _ in range(5)] == [0, 1, 2, 3, 4]
+        assert os.listdir(tmp_path) == []
+        stats = q.stats()
+        assert stats["spilled"] == 3
+        assert stats["dropped"] == 0
+
+    def test_spill_encoded_frames(self, tmp_path):
+        raw = np.full((16, 16, 3), 200, dtype=np.uint8).tobytes()
+        meta_data = {'height': 16, 'width': 16, 'channels': 3, 'img_format': 'BGR'}
+        q = PublishQueue("s3_write", 1, policy="spill", spill_dir=str(tmp_path))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            frames = [EncodedFrame(raw, meta_data, encode=True, executor=executor) for _ in range(2)]
+            frames.append(EncodedFrame(raw, meta_data, encode=True))
+            frames.append(EncodedFrame(b'Test'))
+            for i, frame in enumerate(frames):
+                assert q.append((frame, {"i": i}))
+        stats = q.stats()
+        assert stats["spilled"] == 3
+        assert stats["dropped"] == 0
+        for i, frame in enumerate(frames):
+            restored, meta = q.popleft()
+            assert meta == {"i": i}
+            assert restored.data == frame.data
+            assert restored.b64() == frame.b64()
+            assert restored.get("png") == frame.get("png")
+
+    def test_close_wakes_consumer(self):
+        q = PublishQueue("mqtt", 10)
+        errors = []
+
+        def consume():
+            try:
+                q.popleft()
+            except IndexError as e:
+                errors.append(e)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        q.close()
+        consumer.join(timeout=1)
+        assert not consumer.is_alive()
+        assert len(errors) == 1
+        assert not q.append((b'frame', {}))
+        assert q.stats()["dropped"] == 1
+
+    def test_task_done_updates_latency(self):
+        q = PublishQueue("mqtt", 10)
+        assert q.stats()["avg_latency"] is None
+        q.append((b'frame', {}))
+        q.popleft()
+        q.task_done()
+        stats = q.stats()
+        assert stats["published"] == 1
+        assert stats["avg_latency"] >= 0
+        assert stats["max_latency"] >= stats["avg_latency"]
+
+
+class TestWorkerPool:
+
+    def test_invalid_count(self):
+        with pytest.raises(ValueError):
+            WorkerPool(lambda: None, 0)
+
+    def test_workers_consume_queue(self):
+        q = PublishQueue("mqtt", 100)
+        stop_ev = threading.Event()
+        consumed = []
+
+        def run():
+            while not stop_ev.is_set():
+                try:
+                    consumed.append(q.popleft(timeout=0.05))
+                    q.task_done()
+                except IndexError:
+                    continue
+
+        pool = WorkerPool(run, 3, "test-publisher")
+        pool.start()
+        assert pool.is_alive()
+        for i in range(50):
+            q.append((b'frame', {"i": i}))
+        deadline = time.time() + 5
+        while len(consumed) < 50 and time.time() < deadline:
+            time.sleep(0.01)
+        stop_ev.set()
+        q.close()
+        pool.join()
+        assert not pool.is_alive()
+        assert sorted(meta["i"] for _, meta in consumed) == list(range(50))
+        assert q.stats()["published"] == 50
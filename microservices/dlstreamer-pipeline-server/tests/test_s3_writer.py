@@ -5,11 +5,18 @@
 #
 
 import base64
+import io
 import json
+import os
+import tarfile
+import time
+import zipfile
 from unittest.mock import MagicMock
 
+import boto3
 import pytest
 import src
+from moto.server import ThreadedMotoServer
 
 import src.common
 from src.publisher.s3.s3_writer import S3Writer
@@ -29,6 +36,27 @@ def setup(mocker):
     mocker.patch('src.publisher.s3.s3_writer.S3Client')
     yield app_cfg
 
+
+@pytest.fixture
+def s3_server(monkeypatch):
+    """Local S3 stand-in with an empty bucket"""
+    server = ThreadedMotoServer(ip_address="127.0.0.1", port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    for key, value in {"S3_STORAGE_HOST": host, "S3_STORAGE_PORT": str(port),
+                       "S3_STORAGE_USER": "testing", "S3_STORAGE_PASS": "testing",
+                       "AWS_DEFAULT_REGION": "us-east-1"}.items():
+        monkeypatch.setenv(key, value)
+    client = boto3.client("s3", endpoint_url=f"http://{host}:{port}",
+                          aws_access_key_id="testing", aws_secret_access_key="testing")
+    client.create_bucket(Bucket="frames")
+    yield client
+    server.stop()
+
+
+def frame_meta(i, caps="image/jpeg"):
+    return {"img_handle": f"img{i:04d}", "caps": caps, "encoding_type": None, "frame_id": i}
+
 class TestS3Writer:
     def test_stop(self, mocker, setup):
         app_cfg = setup
@@ -58,6 +86,91 @@ class TestS3Writer:
         mocker.patch('time.sleep', return_value=None)
         s3_obj._run()
         
+    def test_submit_acknowledges_stored_frame(self, setup):
+        s3_obj = S3Writer(setup)
+        s3_obj.s3_client.publish.return_value = True
+        ack = s3_obj.submit(b'frame', frame_meta(0))
+        assert not ack.done()
+        s3_obj._publish(*s3_obj.queue.popleft())
+        assert ack.result(timeout=0) == {"bucket": None, "key": "dlstreamer_pipeline_server/img0000.jpg"}
+
+    def test_submit_failed_upload(self, setup):
+        s3_obj = S3Writer(setup)
+        s3_obj.s3_client.publish.return_value = False
+        ack = s3_obj.submit(b'frame', frame_meta(0))
+        s3_obj._publish(*s3_obj.queue.popleft())
+        with pytest.raises(RuntimeError):
+            ack.result(timeout=0)
+
+    def test_upload_exception_fails_ack(self, setup):
+        s3_obj = S3Writer(setup)
+        s3_obj.s3_client.publish.side_effect = [ConnectionError("endpoint unreachable"), True]
+        failed = s3_obj.submit(b'frame', frame_meta(0))
+        stored = s3_obj.submit(b'frame', frame_meta(1))
+        s3_obj.start()
+        try:
+            with pytest.raises(ConnectionError):
+                failed.result(timeout=5)
+            # the writer keeps uploading the next frames
+            assert stored.result(timeout=5)["key"].endswith("img0001.jpg")
+        finally:
+            s3_obj.stop()
+
+    def test_dropped_frame_fails_ack(self, setup):
+        s3_obj = S3Writer({"queue_size": 1})
+        first = s3_obj.submit(b'frame', frame_meta(0))
+        second = s3_obj.submit(b'frame', frame_meta(1))
+        with pytest.raises(RuntimeError):
+            first.result(timeout=0)
+        assert not second.done()
+        s3_obj.stop()
+        with pytest.raises(RuntimeError):
+            second.result(timeout=0)
+
+    def test_invalid_archive_config(self, setup):
+        with pytest.raises(ValueError):
+            S3Writer({"archive": {"format": "rar"}})
+        with pytest.raises(ValueError):
+            S3Writer({"archive": {"part_size": 1024}})
+
+    def test_archive_multipart_tar(self, s3_server):
+        config = {"bucket": "frames", "folder_prefix": "shards", "block": True,
+                  "archive": {"format": "tar", "max_frames": 6, "max_interval": 60,
+                              "part_size": 5 * 1024 * 1024, "upload_workers": 2}}
+        s3_obj = S3Writer(config)
+        assert s3_obj.initialized
+        s3_obj.start()
+        frames = [os.urandom(1024 * 1024) for _ in range(6)]
+        acks = [s3_obj.submit(frame, frame_meta(i)) for i, frame in enumerate(frames)]
+        locations = [ack.result(timeout=30) for ack in acks]
+        s3_obj.stop()
+
+        key = locations[0]["key"]
+        assert key.startswith("shards/") and key.endswith(".tar")
+        assert [location["member"] for location in locations] == [f"img{i:04d}.jpg" for i in range(6)]
+        assert s3_server.head_object(Bucket="frames", Key=key, PartNumber=1)["PartsCount"] == 2
+        body = s3_server.get_object(Bucket="frames", Key=key)["Body"].read()
+        with tarfile.open(fileobj=io.BytesIO(body)) as tar:
+            assert [tar.extractfile(f"img{i:04d}.jpg").read() for i in range(6)] == frames
+        sidecar = s3_server.get_object(Bucket="frames", Key=key[:-len(".tar")] + ".jsonl")["Body"].read()
+        lines = [json.loads(line) for line in sidecar.decode("utf-8").splitlines()]
+        assert [line["metadata"]["frame_id"] for line in lines] == list(range(6))
+        assert lines[0]["member"] == "img0000.jpg"
+
+    def test_archive_zip_rotates_on_interval(self, s3_server):
+        config = {"bucket": "frames", "folder_prefix": "shards",
+                  "archive": {"format": "zip", "max_frames": 100, "max_interval": 0.2}}
+        s3_obj = S3Writer(config)
+        s3_obj.start()
+        acks = [s3_obj.submit(b'frame%d' % i, frame_meta(i, caps="image/png")) for i in range(3)]
+        location = acks[0].result(timeout=30)
+        s3_obj.stop()
+
+        body = s3_server.get_object(Bucket="frames", Key=location["key"])["Body"].read()
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            assert archive.read("img0002.png") == b'frame2'
+        assert location["key"].endswith(".zip")
+
     # def test_fetch_data(mocker):
     #     mock_response = {"key": "mocked value"}
 
@@ -7,6 +7,7 @@
 import pytest
 from unittest.mock import MagicMock, patch
 from src.server.gstreamer_pipeline import GStreamerPipeline
+from src.server.latency_tracker import LatencyTracker
 import time
 import json
 from gi.repository import Gst, GLib
@@ -292,16 +293,17 @@ class TestGStreamerPipeline:
             (123, 0, 0)
         ])
     def test_appsink_probe_callback(self, mocker,Gst,gstreamer_pipeline,pts,sum_latency,count_latency):
-        mocker.patch.object(time,'time',return_value = 30)
+        mocker.patch.object(time,'monotonic',return_value = 30)
         mock_info = MagicMock()
         mock_buffer = MagicMock()
         mock_buffer.pts = pts
         mock_info.get_buffer.return_value = mock_buffer
-        gstreamer_pipeline.latency_times = {1234: 10}
+        gstreamer_pipeline.latency_tracker.start(1234, now=10)
         result = gstreamer_pipeline.appsink_probe_callback(None, mock_info, gstreamer_pipeline)
         mock_info.get_buffer.assert_called_once()
-        assert gstreamer_pipeline.sum_pipeline_latency == sum_latency
-        assert gstreamer_pipeline.count_pipeline_latency == count_latency
+        assert gstreamer_pipeline.latency_tracker.count == count_latency
+        if count_latency:
+            assert gstreamer_pipeline.latency_tracker.stats()["avg"] == sum_latency
         assert result == Gst.PadProbeReturn.OK
 
     def test_source_setup_callback(self, mocker, gstreamer_pipeline):
@@ -322,12 +324,19 @@ class TestGStreamerPipeline:
         mock_buffer = MagicMock()
         mock_buffer.pts = 10
         mock_info.get_buffer.return_value = mock_buffer
-        mocker.patch.object(time,'time',return_value = 50)
+        mocker.patch.object(time,'monotonic',return_value = 50)
         result = gstreamer_pipeline.source_probe_callback(None, mock_info, gstreamer_pipeline)
-        assert 10 in gstreamer_pipeline.latency_times
-        assert gstreamer_pipeline.latency_times[10] == 50
+        assert gstreamer_pipeline.latency_tracker.end(10, now=55) == 5
         assert result == Gst.PadProbeReturn.OK
 
+    def test_element_probe_callbacks(self, Gst):
+        tracker = LatencyTracker()
+        mock_info = MagicMock()
+        mock_info.get_buffer.return_value.pts = 10
+        assert GStreamerPipeline.element_sink_probe_callback(None, mock_info, tracker) == Gst.PadProbeReturn.OK
+        assert GStreamerPipeline.element_src_probe_callback(None, mock_info, tracker) == Gst.PadProbeReturn.OK
+        assert tracker.count == 1
+
     def test_source_pad_added_callback(self, mocker, gstreamer_pipeline,Gst):
         mock_pad = MagicMock()
         mock_add_probe = mocker.patch.object(mock_pad, 'add_probe')
@@ -500,18 +509,20 @@ class TestGStreamerPipeline:
         mock_state = MagicMock()
         gstreamer_pipeline.state = mock_state
         mocker.patch.object(gstreamer_pipeline,'get_avg_fps',return_value = 10)
-        gstreamer_pipeline.count_pipeline_latency = 2
-        gstreamer_pipeline.sum_pipeline_latency = 50
-        expected_status = {
-            "id": "test_id",
-            "state": mock_state,
-            "avg_fps": 10,
-            "start_time": 15,
-            "elapsed_time": 0,
-            "message": "Debug",
-            "avg_pipeline_latency": 25}
+        for pts, latency in ((1, 20), (2, 30)):
+            gstreamer_pipeline.latency_tracker.start(pts, now=0)
+            gstreamer_pipeline.latency_tracker.end(pts, now=latency)
+        gstreamer_pipeline.element_latency_trackers = {"detection": LatencyTracker(),
+                                                      "classification": LatencyTracker()}
+        gstreamer_pipeline.element_latency_trackers["detection"].start(1, now=0)
+        gstreamer_pipeline.element_latency_trackers["detection"].end(1, now=5)
         result = gstreamer_pipeline.status()
-        assert result == expected_status
+        assert result["avg_pipeline_latency"] == 25
+        assert result["pipeline_latency"]["p50"] == 20
+        assert result["pipeline_latency"]["p99"] == 30
+        assert result["pipeline_latency"]["count"] == 2
+        assert list(result["element_latency"]) == ["detection"]
+        assert result["element_latency"]["detection"]["avg"] == 5
 
     def test_delete_pipeline_with_lock(self,gstreamer_pipeline,mocker):
         mock_state = MagicMock()
@@ -0,0 +1,63 @@
+#
+# Apache v2 license
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import pytest
+
+from src.server.latency_tracker import LatencyTracker
+
+
+class TestLatencyTracker:
+
+    def test_invalid_window(self):
+        with pytest.raises(ValueError):
+            LatencyTracker(window=0)
+
+    def test_no_samples(self):
+        tracker = LatencyTracker()
+        assert tracker.stats() is None
+        assert tracker.end(1) is None
+
+    def test_percentiles(self):
+        tracker = LatencyTracker()
+        for pts in range(1, 101):
+            tracker.start(pts, now=0)
+            assert tracker.end(pts, now=pts / 1000) == pts / 1000
+        stats = tracker.stats()
+        assert stats["count"] == 100
+        assert stats["avg"] == pytest.approx(0.0505)
+        assert stats["p50"] == 0.05
+        assert stats["p95"] == 0.095
+        assert stats["p99"] == 0.099
+        assert stats["max"] == 0.1
+        assert stats["in_flight"] == 0
+
+    def test_window_bounds_percentiles_not_average(self):
+        tracker = LatencyTracker(window=2)
+        for pts, latency in enumerate([10, 1, 2]):
+            tracker.start(pts, now=0)
+            tracker.end(pts, now=latency)
+        stats = tracker.stats()
+        assert stats["max"] == 2
+        assert stats["avg"] == pytest.approx(13 / 3)
+
+    def test_ttl_evicts_dropped_buffers(self):
+        tracker = LatencyTracker(ttl=1)
+        tracker.start(1, now=0)
+        tracker.start(2, now=0.5)
+        tracker.start(3, now=1.2)
+        assert tracker.end(1, now=1.3) is None
+        assert tracker.end(2, now=1.3) == pytest.approx(0.8)
+        assert tracker.stats()["evicted"] == 1
+
+    def test_max_in_flight(self):
+        tracker = LatencyTracker(max_in_flight=10)
+        for pts in range(10000):
+            tracker.start(pts, now=0)
+        assert len(tracker._in_flight) == 10
+        assert tracker.end(9999, now=1) == 1
+        stats = tracker.stats()
+        assert stats["evicted"] == 9990
+        assert stats["in_flight"] == 9
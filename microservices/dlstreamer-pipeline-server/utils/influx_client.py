@@ -6,17 +6,187 @@
 
 """ Influx Client for publishing the metadata to influxDB.
 """
-from influxdb_client import InfluxDBClient, Point
+import math
+import threading as th
+import time
+from collections import deque
+from itertools import groupby
+
+from influxdb_client import InfluxDBClient, Point, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
 from src.publisher.influx.influx_schema import DataSchema
 from src.common.log import get_logger
 
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL = 1000       # ms
+DEFAULT_RETRY_INTERVAL = 1000       # ms
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_MAX_RETRY_DELAY = 30000     # ms
+DEFAULT_EXPONENTIAL_BASE = 2
+DEFAULT_BUFFER_SIZE = 100000        # points
+
+# line protocol escaping, same as influxdb_client Point
+_ESCAPE_MEASUREMENT = str.maketrans({',': r'\,', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_KEY = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_STRING = str.maketrans({'"': r'\"', '\\': r'\\'})
+
+
+class InfluxBatchWriter():
+    """Coalesces points into line protocol batches written by a background thread.
+    """
+
+    def __init__(self, write_api, influx_org,
+                 batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 retry_interval=DEFAULT_RETRY_INTERVAL,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 max_retry_delay=DEFAULT_MAX_RETRY_DELAY,
+                 exponential_base=DEFAULT_EXPONENTIAL_BASE,
+                 buffer_size=DEFAULT_BUFFER_SIZE):
+        """Constructor
+        :param write_api: Synchronous influx write API
+        :param str influx_org: Influx organization
+        :param int batch_size: Max number of points in one write request
+        :param int flush_interval: Max time in ms a point waits for its batch to fill up
+        :param int retry_interval: Delay in ms before the first retry of a failed batch
+        :param int max_retries: Number of retries before a batch is dropped
+        :param int max_retry_delay: Max delay in ms between retries
+        :param int exponential_base: Base of the exponential retry backoff
+        :param int buffer_size: Max number of points waiting to be written, oldest are dropped beyond it
+        """
+        if batch_size < 1 or buffer_size < batch_size:
+            raise ValueError("Influx batch_size must be positive and not greater than buffer_size")
+        self.log = get_logger('Influx_Batch_Writer')
+        self.write_api = write_api
+        self.influx_org = influx_org
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval / 1000
+        self.retry_interval = retry_interval / 1000
+        self.max_retries = max_retries
+        self.max_retry_delay = max_retry_delay / 1000
+        self.exponential_base = exponential_base
+        self.buffer_size = buffer_size
+
+        self._buffer = deque()
+        self._cond = th.Condition()
+        self._in_flight = 0
+        self._flush_requested = False
+        self._stop_ev = th.Event()
+
+        self.points_written = 0
+        self.points_dropped = 0
+        self.batches_written = 0
+        self.retries = 0
+
+        self.th = th.Thread(target=self._run, name="influx-batch-writer", daemon=True)
+        self.th.start()
+
+    def write(self, influx_bucket_name, line):
+        """Queue one point for writing
+        :param str influx_bucket_name: bucket name
+        :param str line: point in line protocol
+        """
+        with self._cond:
+            if self._stop_ev.is_set():
+                self.points_dropped += 1
+                return
+            if len(self._buffer) >= self.buffer_size:
+                self._buffer.popleft()
+                self.points_dropped += 1
+            self._buffer.append((influx_bucket_name, line))
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """Write all queued points and wait for completion
+        :param float timeout: Max seconds to wait
+        :return: True if all points were processed in time
+        :rtype: bool
+        """
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._buffer and not self._in_flight, timeout=timeout)
+
+    def stop(self, timeout=None):
+        """Flush queued points and stop the writer thread. Retries are abandoned on stop.
+        """
+        self.flush(timeout)
+        self._stop_ev.set()
+        with self._cond:
+            self._cond.notify_all()
+        self.th.join(timeout)
+
+    def stats(self):
+        """Writer counters
+        :rtype: dict
+        """
+        with self._cond:
+            return {
+                "points_written": self.points_written,
+                "points_dropped": self.points_dropped,
+                "points_buffered": len(self._buffer) + self._in_flight,
+                "batches_written": self.batches_written,
+                "retries": self.retries,
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop_ev.is_set() or self._flush_requested
+                                    or len(self._buffer) >= self.batch_size,
+                                    timeout=self.flush_interval)
+                if not self._buffer:
+                    self._flush_requested = False
+                    self._cond.notify_all()
+                    if self._stop_ev.is_set():
+                        return
+                    continue
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._in_flight = len(batch)
+
+            for influx_bucket_name, lines in groupby(batch, key=lambda item: item[0]):
+                self._write_batch(influx_bucket_name, [line for _, line in lines])
+
+            with self._cond:
+                self._in_flight = 0
+                self._cond.notify_all()
+
+    def _write_batch(self, influx_bucket_name, lines):
+        body = "\n".join(lines)
+        delay = self.retry_interval
+        attempt = 0
+        while True:
+            try:
+                self.write_api.write(bucket=influx_bucket_name, org=self.influx_org, record=body,
+                                     write_precision=WritePrecision.NS)
+                with self._cond:
+                    self.points_written += len(lines)
+                    self.batches_written += 1
+                self.log.debug(f"Wrote batch of {len(lines)} points to influx bucket {influx_bucket_name}")
+                return
+            except Exception as e:
+                if attempt >= self.max_retries or self._stop_ev.is_set():
+                    self.log.error(f"Dropping batch of {len(lines)} points after {attempt} retries: {e}")
+                    with self._cond:
+                        self.points_dropped += len(lines)
+                    return
+                attempt += 1
+                with self._cond:
+                    self.retries += 1
+                self.log.warning(f"Influx write failed, retry {attempt}/{self.max_retries} in {delay:.2f}s: {e}")
+                self._stop_ev.wait(delay)
+                delay = min(delay * self.exponential_base, self.max_retry_delay)
+
+
 class InfluxClient():
     """Influx Client.
     """
 
-    def __init__(self, host, port, influx_org, username, password):
+    def __init__(self, host, port, influx_org, username, password, batch_config=None):
         """Constructor
+        :param dict batch_config: InfluxBatchWriter options. Points are written synchronously one by one if None
         """
         self.log = get_logger('Influx_Client')
         self.log.debug(f"In {__name__}...")
@@ -29,6 +199,9 @@ class InfluxClient():
         self.client = InfluxDBClient(url=self.influx_endpoint_url,username=self.username,password=self.password)
         self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
         self.schema = DataSchema()
+        self.batch_writer = None
+        if batch_config is not None:
+            self.batch_writer = InfluxBatchWriter(self.write_api, self.influx_org, **batch_config)
 
     def upload_metadata(self, influx_bucket_name, point, img_handle):
         """Uploads frame data to influx storage
@@ -46,6 +219,66 @@ class InfluxClient():
         except Exception as e:
             self.log.exception(f"Error writing data to InfluxDB for image handle: {img_handle}", e)
 
+    def _get_fields(self, metadata):
+        """Validate metadata against schema
+
+        :return: image handle and fields to store
+        :rtype: tuple
+        """
+        # loaded data already has the dumped layout, only complex fields need stringifying.
+        # Skipping the dump pass halves the per-frame schema cost.
+        result = self.schema.stringify_complex(self.schema.load(metadata))
+        image_handle = result.pop("img_handle", None)
+        # The time stamp stored in influx is db write time, or queue time when batching, not the frame time.
+        _ = result.pop("time", None)
+        return image_handle, result
+
+    def get_line_protocol(self, metadata, influx_measurement, time_ns=None):
+        """Convert metadata to line protocol, same output as Point.to_line_protocol()
+        without building a Point, which is a large part of per-frame cost in batching mode.
+
+        :param metadata: frame metadata
+        :type: dict
+        :param influx_measurement: measurement name
+        :type: string
+        :param time_ns: point timestamp in ns, server write time is used if None
+        :type: int
+        :return: line protocol or None if metadata is invalid
+        :rtype: string
+        """
+        try:
+            image_handle, result = self._get_fields(metadata)
+        except Exception as e:
+            self.log.exception(f'Validation or processing error for image handle: {metadata.get("img_handle")}: {e}')
+            return None
+        fields = []
+        for key, value in sorted(result.items()):
+            if value is None:
+                continue
+            if isinstance(value, bool):
+                value = "true" if value else "false"
+            elif isinstance(value, int):
+                value = f"{value}i"
+            elif isinstance(value, float):
+                if not math.isfinite(value):
+                    continue
+                value = str(value)
+                if value.endswith(".0"):
+                    value = value[:-2]
+            else:
+                value = '"' + str(value).translate(_ESCAPE_STRING) + '"'
+            fields.append(f"{key.translate(_ESCAPE_KEY)}={value}")
+        if not fields:
+            return None
+        line = influx_measurement.translate(_ESCAPE_MEASUREMENT)
+        if image_handle:
+            tag = image_handle.translate(_ESCAPE_KEY)
+            line += ",img_handle=" + (tag + " " if tag.endswith("\\") else tag)
+        line += " " + ",".join(fields)
+        if time_ns is not None:
+            line += f" {time_ns}"
+        return line
+
     def get_point_data(self, metadata,influx_measurement):
         """Convert metadata to InfluxDB Point object
 
@@ -55,11 +288,7 @@ class InfluxClient():
         :type: string
         """
         try:
-            loaded = self.schema.load(metadata)
-            result = self.schema.dump(loaded)
-            image_handle = result.pop("img_handle", None)
-            # The time stamp stored in influx is db write time, not the frame time.
-            _ = result.pop("time", None)
+            image_handle, result = self._get_fields(metadata)
             point = Point(influx_measurement).tag("img_handle", image_handle)
             for key, value in result.items():
                 if value is not None:
@@ -79,12 +308,26 @@ class InfluxClient():
         :type: json
         """
         # If this function is called, we are assuming the bucket is created
+        if self.batch_writer is not None:
+            # batches reach influx late, stamp points with the time they are queued at
+            line = self.get_line_protocol(metadata, influx_measurement, time.time_ns())
+            if line is not None:
+                self.batch_writer.write(influx_bucket_name, line)
+            return
         point = self.get_point_data(metadata,influx_measurement)
         self.upload_metadata(influx_bucket_name, point,metadata.get("img_handle", "na"))
     
+    def stats(self):
+        """Batch writer counters, empty if batching is disabled
+        :rtype: dict
+        """
+        if self.batch_writer is None:
+            return {}
+        return self.batch_writer.stats()
+
     def stop(self):
         """Stop influx Client
         """
-        # for compatibility with other publisher.
-        # TODO: Implement safe disconnect. 
-        pass
\ No newline at end of file
+        if self.batch_writer is not None:
+            self.batch_writer.stop()
+        self.client.close()
\ No newline at end of file
@@ -65,11 +65,14 @@ class S3Client():
             )
             if not (resp['ResponseMetadata']['HTTPStatusCode'] == 200):
                 self.log.error(f"Error uploading frame data: {object_name} to S3 storage")
+                return False
             else:
                 self.log.debug(f"Uploaded frame data at uri: s3://{s3_bucket_name}/{object_name} to S3 storage")
+                return True
             
         except botocore.exceptions.ClientError as e:
             self.log.info(f"Error uploading frame data: {e}")
+            return False
 
     def publish(self, s3_bucket_name, object_name, payload):
         """Store frame in S3 storage
@@ -78,11 +81,58 @@ class S3Client():
         :type: string
         :param payload: Frame blob
         :type: json
+        :return: True if frame is stored
+        :rtype: bool
         """
         
         ## If this function is called, we are assuming the bucket is created
         ## In cae the bucket is not created, this function will never be called. It will return from the S3Writer _publish method
-        self.upload_image_data(s3_bucket_name=s3_bucket_name, object_name=object_name, frame_data=payload, metadata=None)
+        return self.upload_image_data(s3_bucket_name=s3_bucket_name, object_name=object_name, frame_data=payload, metadata=None)
+
+    def put_object(self, s3_bucket_name, object_name, data):
+        """Store object in a single request
+
+        :raises botocore.exceptions.ClientError: if upload fails
+        """
+        self.client.put_object(Bucket=s3_bucket_name, Key=object_name, Body=data)
+        self.log.debug(f"Uploaded object at uri: s3://{s3_bucket_name}/{object_name}")
+
+    def create_multipart_upload(self, s3_bucket_name, object_name):
+        """Start multipart upload
+
+        :return: upload id
+        :rtype: string
+        """
+        resp = self.client.create_multipart_upload(Bucket=s3_bucket_name, Key=object_name)
+        return resp['UploadId']
+
+    def upload_part(self, s3_bucket_name, object_name, upload_id, part_number, data):
+        """Upload one part of a multipart upload. All parts except the last one must be at least 5 MiB
+
+        :return: part entry for complete_multipart_upload
+        :rtype: dict
+        """
+        resp = self.client.upload_part(Bucket=s3_bucket_name, Key=object_name, UploadId=upload_id,
+                                       PartNumber=part_number, Body=data)
+        return {'PartNumber': part_number, 'ETag': resp['ETag']}
+
+    def complete_multipart_upload(self, s3_bucket_name, object_name, upload_id, parts):
+        """Complete multipart upload
+
+        :param parts: part entries returned by upload_part
+        :type: list
+        """
+        self.client.complete_multipart_upload(Bucket=s3_bucket_name, Key=object_name, UploadId=upload_id,
+                                              MultipartUpload={'Parts': sorted(parts, key=lambda part: part['PartNumber'])})
+        self.log.debug(f"Uploaded object at uri: s3://{s3_bucket_name}/{object_name}")
+
+    def abort_multipart_upload(self, s3_bucket_name, object_name, upload_id):
+        """Abort multipart upload, discarding uploaded parts
+        """
+        try:
+            self.client.abort_multipart_upload(Bucket=s3_bucket_name, Key=object_name, UploadId=upload_id)
+        except botocore.exceptions.ClientError as e:
+            self.log.error(f"Error aborting multipart upload of {object_name}: {e}")
     
     def stop(self):
         """Stop S3 Client
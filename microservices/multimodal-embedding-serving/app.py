@@ -1,14 +1,16 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 from typing import List, Union
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from src.batcher import EmbeddingBatcher
 from src.common import ErrorMessages, logger, settings
 from src.models import VClipModel
-from src.utils import decode_base64_image, download_image
+from src.utils import decode_base64_image, download_image, download_video
 
 app = FastAPI(title=settings.APP_DISPLAY_NAME, description=settings.APP_DESC)
 
@@ -22,20 +24,33 @@ app.add_middleware(
 
 # Initialize the model once
 vclip_model = None
+batcher = None
 health_status = False
 
 
 @app.on_event("startup")
 async def startup_event():
-    global vclip_model, health_status
+    global vclip_model, batcher, health_status
     cfg = {"model_name": settings.MODEL_NAME}
     vclip_model = VClipModel(cfg)
     if settings.EMBEDDING_USE_OV:
         await vclip_model.async_init()
     health_status = vclip_model.check_health()
+    batcher = EmbeddingBatcher(
+        vclip_model,
+        max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+        timeout_ms=settings.EMBEDDING_BATCH_TIMEOUT_MS,
+        workers=settings.EMBEDDING_INFERENCE_WORKERS,
+    )
     logger.info("Model loaded successfully")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    if batcher:
+        batcher.shutdown()
+
+
 class TextInput(BaseModel):
     type: str
     text: Union[str, List[str]]
@@ -74,6 +89,12 @@ class VideoFileInput(BaseModel):
     segment_config: dict
 
 
+class VideoFileSegmentsInput(BaseModel):
+    type: str
+    video_path: str
+    segment_configs: List[dict]
+
+
 class EmbeddingRequest(BaseModel):
     model: str
     input: Union[
@@ -84,10 +105,48 @@ class EmbeddingRequest(BaseModel):
         VideoUrlInput,
         VideoBase64Input,
         VideoFileInput,
+        VideoFileSegmentsInput,
     ]
     encoding_format: str
 
 
+class BatchEmbeddingRequest(BaseModel):
+    model: str
+    input: List[Union[TextInput, ImageUrlInput, ImageBase64Input]]
+    encoding_format: str
+
+
+async def embed_text_or_image(
+    input_data: Union[TextInput, ImageUrlInput, ImageBase64Input],
+) -> Union[List[float], List[List[float]]]:
+    """
+    Embeds a text or image input, batched with concurrent texts and images.
+
+    Args:
+        input_data (Union[TextInput, ImageUrlInput, ImageBase64Input]): The input.
+
+    Returns:
+        Union[List[float], List[List[float]]]: The embedding, or a list of embeddings for
+        a list of texts.
+
+    Raises:
+        HTTPException: If the input type is not text or image.
+    """
+    if input_data.type == "text":
+        if isinstance(input_data.text, list):
+            return list(
+                await asyncio.gather(*(batcher.embed_text(t) for t in input_data.text))
+            )
+        return await batcher.embed_text(input_data.text)
+    elif input_data.type == "image_url":
+        image = await download_image(input_data.image_url)
+        return await batcher.embed_image(image)
+    elif input_data.type == "image_base64":
+        image = decode_base64_image(input_data.image_base64)
+        return await batcher.embed_image(image)
+    raise HTTPException(status_code=400, detail="Invalid input type")
+
+
 @app.get("/health")
 async def health_check() -> dict:
     """
@@ -123,19 +182,8 @@ async def create_embedding(request: EmbeddingRequest) -> dict:
     try:
         # logger.debug(f"Creating embedding for request: {request}")
         input_data = request.input
-        if input_data.type == "text":
-            if isinstance(input_data.text, list):
-                embedding = vclip_model.embed_documents(input_data.text)
-            else:
-                embedding = vclip_model.embed_query(input_data.text)
-        elif input_data.type == "image_url":
-            embedding = await vclip_model.get_image_embedding_from_url(
-                input_data.image_url
-            )
-        elif input_data.type == "image_base64":
-            embedding = vclip_model.get_image_embedding_from_base64(
-                input_data.image_base64
-            )
+        if input_data.type in ("text", "image_url", "image_base64"):
+            embedding = await embed_text_or_image(input_data)
         elif input_data.type == "video_frames":
             frames = []
             for frame in input_data.video_frames:
@@ -143,18 +191,32 @@ async def create_embedding(request: EmbeddingRequest) -> dict:
                     frames.append(await download_image(frame.image_url))
                 elif frame.type == "image_base64":
                     frames.append(decode_base64_image(frame.image_base64))
-            embedding = vclip_model.get_video_embeddings([frames])
+            embeddings = await batcher.run(vclip_model.get_video_embeddings, [frames])
+            embedding = embeddings[0]
         elif input_data.type == "video_url":
-            embedding = await vclip_model.get_video_embedding_from_url(
-                input_data.video_url, input_data.segment_config
+            video_path = await download_video(input_data.video_url)
+            embedding = await batcher.run(
+                vclip_model.get_video_embedding_from_downloaded_file,
+                video_path,
+                input_data.segment_config,
             )
         elif input_data.type == "video_base64":
-            embedding = vclip_model.get_video_embedding_from_base64(
-                input_data.video_base64, input_data.segment_config
+            embedding = await batcher.run(
+                vclip_model.get_video_embedding_from_base64,
+                input_data.video_base64,
+                input_data.segment_config,
             )
         elif input_data.type == "video_file":
-            embedding = await vclip_model.get_video_embedding_from_file(
-                input_data.video_path, input_data.segment_config
+            embedding = await batcher.run(
+                vclip_model.get_video_embedding_from_file,
+                input_data.video_path,
+                input_data.segment_config,
+            )
+        elif input_data.type == "video_file_segments":
+            embedding = await batcher.run(
+                vclip_model.get_video_embeddings_from_file_segments,
+                input_data.video_path,
+                input_data.segment_configs,
             )
         else:
             raise HTTPException(status_code=400, detail="Invalid input type")
@@ -169,3 +231,35 @@ async def create_embedding(request: EmbeddingRequest) -> dict:
         raise HTTPException(
             status_code=500, detail=f"{ErrorMessages.CREATE_EMBEDDING_ERROR}: {e}"
         )
+
+
+@app.post("/embeddings/batch")
+async def create_embeddings_batch(request: BatchEmbeddingRequest) -> dict:
+    """
+    Creates embeddings for a list of text and image inputs.
+
+    Inputs are coalesced with concurrent requests into one inference per modality.
+
+    Args:
+        request (BatchEmbeddingRequest): Request object containing model and input list.
+
+    Returns:
+        dict: Dictionary containing the embeddings, in the order of the inputs.
+
+    Raises:
+        HTTPException: If there is an error during the embedding process.
+    """
+    try:
+        embeddings = await asyncio.gather(
+            *(embed_text_or_image(input_data) for input_data in request.input)
+        )
+        logger.info(f"Created {len(embeddings)} embeddings successfully")
+        return {"embeddings": list(embeddings)}
+    except HTTPException as e:
+        logger.error(f"HTTP error creating embeddings: {e.detail}")
+        raise e
+    except Exception as e:
+        logger.error(f"Error creating embeddings: {e}")
+        raise HTTPException(
+            status_code=500, detail=f"{ErrorMessages.CREATE_EMBEDDING_ERROR}: {e}"
+        )
@@ -0,0 +1,139 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Union
+
+import numpy as np
+from PIL import Image
+from src.common import logger
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent text and image embedding requests into batched inferences.
+
+    Texts and images are queued separately. A queue is flushed into a single model call
+    when it holds ``max_batch_size`` items, or ``timeout_ms`` after its first item was
+    queued. Inference runs on a dedicated thread pool so the event loop stays responsive.
+
+    Attributes:
+        model (VClipModel): The model computing the embeddings.
+        max_batch_size (int): Maximum number of inputs per inference.
+        timeout (float): Maximum time in seconds an input waits for a batch to fill.
+        executor (ThreadPoolExecutor): The thread pool running inference.
+    """
+
+    def __init__(
+        self, model, max_batch_size: int, timeout_ms: float, workers: int
+    ) -> None:
+        """
+        Initializes the EmbeddingBatcher.
+
+        Args:
+            model (VClipModel): The model computing the embeddings.
+            max_batch_size (int): Maximum number of inputs per inference.
+            timeout_ms (float): Maximum time in milliseconds an input waits for a batch.
+            workers (int): Number of inference threads.
+        """
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.timeout = timeout_ms / 1000
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="embedding-inference"
+        )
+        self._infer = {"text": self._infer_texts, "image": self._infer_images}
+        self._pending = {"text": [], "image": []}
+        self._timers = {}
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Runs a blocking call on the inference thread pool.
+
+        Args:
+            func (Callable): The function to run.
+            *args: Arguments of the function.
+
+        Returns:
+            Any: The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args))
+
+    async def embed_text(self, text: str) -> List[float]:
+        """
+        Embeds a text query, batched with concurrent texts.
+
+        Args:
+            text (str): Text query.
+
+        Returns:
+            List[float]: Text features.
+        """
+        return await self._submit("text", text)
+
+    async def embed_image(self, image: Union[Image.Image, np.ndarray]) -> List[float]:
+        """
+        Embeds an image, batched with concurrent images.
+
+        Args:
+            image (PIL.Image or np.ndarray): The image.
+
+        Returns:
+            List[float]: Image features.
+        """
+        return await self._submit("image", image)
+
+    def shutdown(self) -> None:
+        """
+        Stops the inference thread pool once the running inferences complete.
+        """
+        self.executor.shutdown(wait=True)
+
+    async def _submit(self, kind: str, item) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending[kind]
+        pending.append((item, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(kind)
+        elif len(pending) == 1:
+            self._timers[kind] = loop.call_later(self.timeout, self._flush, kind)
+        return await future
+
+    def _flush(self, kind: str) -> None:
+        timer = self._timers.pop(kind, None)
+        if timer:
+            timer.cancel()
+        batch, self._pending[kind] = self._pending[kind], []
+        # Skip inputs whose request was cancelled while waiting
+        batch = [(item, future) for item, future in batch if not future.cancelled()]
+        if not batch:
+            return
+        logger.debug(f"Running {kind} inference for a batch of {len(batch)}")
+        items = [item for item, _ in batch]
+        futures = [future for _, future in batch]
+        inference = asyncio.get_running_loop().run_in_executor(
+            self.executor, self._infer[kind], items
+        )
+        inference.add_done_callback(functools.partial(self._resolve, futures))
+
+    @staticmethod
+    def _resolve(futures: List[asyncio.Future], inference: asyncio.Future) -> None:
+        error = inference.exception()
+        embeddings = [None] * len(futures) if error else inference.result()
+        for future, embedding in zip(futures, embeddings):
+            if future.done():
+                continue
+            if error:
+                future.set_exception(error)
+            else:
+                future.set_result(embedding)
+
+    def _infer_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.model.get_text_features(texts).tolist()
+
+    def _infer_images(self, images: List[Union[Image.Image, np.ndarray]]) -> List[List[float]]:
+        return self.model.get_image_embeddings(images).tolist()
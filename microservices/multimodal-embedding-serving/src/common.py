@@ -38,6 +38,12 @@ class Settings(BaseSettings):
         http_proxy (str): HTTP proxy setting.
         https_proxy (str): HTTPS proxy setting.
         no_proxy_env (str): No proxy setting.
+        EMBEDDING_BATCH_MAX_SIZE (int): Maximum number of texts or images per inference.
+        EMBEDDING_BATCH_TIMEOUT_MS (float): Maximum time a text or image waits for a batch.
+        EMBEDDING_INFERENCE_WORKERS (int): Number of inference threads.
+        EMBEDDING_IMAGE_CHUNK_SIZE (int): Video frames per OpenVINO infer request.
+        VIDEO_READER_CACHE_SIZE (int): Number of video files kept open.
+        VIDEO_DECODE_CHUNK_SIZE (int): Video frames decoded per read.
     """
 
     APP_NAME: str = "VClip-Embedding"
@@ -60,6 +66,18 @@ class Settings(BaseSettings):
         env="EMBEDDING_MODEL_PATH",
     )
     EMBEDDING_USE_OV: bool = Field(default=False, env="EMBEDDING_USE_OV")
+    EMBEDDING_BATCH_MAX_SIZE: int = Field(default=32, env="EMBEDDING_BATCH_MAX_SIZE")
+    EMBEDDING_BATCH_TIMEOUT_MS: float = Field(
+        default=5, env="EMBEDDING_BATCH_TIMEOUT_MS"
+    )
+    EMBEDDING_INFERENCE_WORKERS: int = Field(
+        default=1, env="EMBEDDING_INFERENCE_WORKERS"
+    )
+    EMBEDDING_IMAGE_CHUNK_SIZE: int = Field(
+        default=16, env="EMBEDDING_IMAGE_CHUNK_SIZE"
+    )
+    VIDEO_READER_CACHE_SIZE: int = Field(default=8, env="VIDEO_READER_CACHE_SIZE")
+    VIDEO_DECODE_CHUNK_SIZE: int = Field(default=64, env="VIDEO_DECODE_CHUNK_SIZE")
 
     @field_validator("http_proxy", "https_proxy", mode="before")
     def validate_proxy_url(cls, v):
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import threading
 import time
 from pathlib import Path
 from typing import List, Union
@@ -10,7 +11,6 @@ import numpy as np
 import openvino as ov
 import openvino.properties.hint as hints
 import torch
-from einops import rearrange
 from fastapi import HTTPException
 from PIL import Image
 from transformers import AutoProcessor, AutoTokenizer, CLIPModel
@@ -20,8 +20,8 @@ from src.utils import (
     decode_base64_video,
     delete_file,
     download_image,
-    download_video,
     extract_video_frames,
+    extract_video_segments,
 )
 
 
@@ -61,7 +61,7 @@ class VClipModel:
             Args:
                 frames_batch (list of list of PIL.Image or np.ndarray): List of list of frames in videos.
             Returns:
-                torch.Tensor: Video features tensor.
+                List[List[float]]: Video features, one per video.
     """
 
     def __init__(self, cfg: dict) -> None:
@@ -77,6 +77,8 @@ class VClipModel:
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
         self.text_model = None
         self.image_model = None
+        self.image_infer_queue = None
+        self.image_infer_lock = threading.Lock()
 
     async def async_init(self):
         """
@@ -111,6 +113,8 @@ class VClipModel:
             device_name=settings.EMBEDDING_DEVICE,
             config={hints.performance_mode(): hints.PerformanceMode.THROUGHPUT},
         )
+        # Infer requests of the video frame chunks, as many as the device runs in parallel
+        self.image_infer_queue = ov.AsyncInferQueue(self.image_model)
 
     async def download_convert_clip_model(self, text_model_path, image_model_path):
         """
@@ -264,15 +268,18 @@ class VClipModel:
 
     def get_video_embeddings(
         self, frames_batch: List[List[Union[Image.Image, np.ndarray]]]
-    ) -> torch.Tensor:
+    ) -> List[List[float]]:
         """
         Gets video features from the CLIP model.
 
+        The frames of all videos are embedded together, then the frame embeddings of each
+        video are normalized and mean aggregated.
+
         Args:
             frames_batch (list of list of PIL.Image or np.ndarray): List of list of frames in videos.
 
         Returns:
-            torch.Tensor: Video features tensor.
+            List[List[float]]: Video features, one per video.
 
         Raises:
             RuntimeError: If there is an error during the video feature extraction process.
@@ -280,36 +287,64 @@ class VClipModel:
         try:
             logger.debug("Getting video embeddings")
             start_time = time.time()
-            self.batch_size = len(frames_batch)
-            vid_embs = []
-            total_frames = 0
-            for frames in frames_batch:
-                total_frames += len(frames)
-                frame_embeddings = self.get_image_embeddings(frames)
-                frame_embeddings = rearrange(
-                    frame_embeddings, "(b n) d -> b n d", b=len(frames_batch)
-                )
-                if settings.EMBEDDING_USE_OV:
-                    frame_embeddings = torch.tensor(frame_embeddings)
-                # Normalize, mean aggregate and return normalized video_embeddings
-                frame_embeddings = frame_embeddings / frame_embeddings.norm(
-                    dim=-1, keepdim=True
-                )
-                video_embeddings = frame_embeddings.mean(dim=1)
-                video_embeddings = video_embeddings / video_embeddings.norm(
-                    dim=-1, keepdim=True
-                )
-                vid_embs.append(video_embeddings)
+            lengths = [len(frames) for frames in frames_batch]
+            if not lengths or 0 in lengths:
+                raise ValueError("Every video needs at least one frame")
+            frames = [frame for video_frames in frames_batch for frame in video_frames]
+            if settings.EMBEDDING_USE_OV:
+                frame_embeddings = torch.from_numpy(self.infer_image_chunks(frames))
+            else:
+                with torch.no_grad():
+                    frame_embeddings = self.get_image_embeddings(frames)
+            # Normalize, mean aggregate and return normalized video_embeddings
+            frame_embeddings = frame_embeddings / frame_embeddings.norm(
+                dim=-1, keepdim=True
+            )
+            video_embeddings = torch.stack(
+                [clip.mean(dim=0) for clip in frame_embeddings.split(lengths)]
+            )
+            video_embeddings = video_embeddings / video_embeddings.norm(
+                dim=-1, keepdim=True
+            )
             end_time = time.time()
             logger.info(
-                f"Processed {total_frames} frames in {end_time - start_time:.2f} seconds"
+                f"Processed {len(frames)} frames of {len(lengths)} videos in {end_time - start_time:.2f} seconds"
             )
             logger.info("Video embeddings extracted successfully")
-            return torch.cat(vid_embs, dim=0).tolist()[0]
+            return video_embeddings.tolist()
         except Exception as e:
             logger.error(f"Error getting video embeddings: {e}")
             raise RuntimeError(f"{ErrorMessages.GET_VIDEO_EMBEDDINGS_ERROR}: {e}")
 
+    def infer_image_chunks(
+        self, images: List[Union[Image.Image, np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Gets image features with the OpenVINO model, preprocessing the next chunk of
+        images while the previous chunks are inferred.
+
+        Args:
+            images (list of PIL.Image or np.ndarray): List of images.
+
+        Returns:
+            np.ndarray: Image features array.
+        """
+        chunk_size = max(1, settings.EMBEDDING_IMAGE_CHUNK_SIZE)
+        results = {}
+
+        def on_done(request, index):
+            results[index] = request.get_output_tensor(0).data.copy()
+
+        with self.image_infer_lock:
+            self.image_infer_queue.set_callback(on_done)
+            for index, start in enumerate(range(0, len(images), chunk_size)):
+                image_inputs = self.processor(
+                    images=images[start : start + chunk_size], return_tensors="np"
+                )
+                self.image_infer_queue.start_async(dict(image_inputs), userdata=index)
+            self.image_infer_queue.wait_all()
+        return np.concatenate([results[index] for index in sorted(results)])
+
     async def get_image_embedding_from_url(self, image_url: str) -> List[float]:
         """
         Gets image features from a URL.
@@ -358,14 +393,14 @@ class VClipModel:
                 f"{ErrorMessages.GET_IMAGE_EMBEDDING_FROM_BASE64_ERROR}: {e}"
             )
 
-    async def get_video_embedding_from_url(
-        self, video_url: str, segment_config: dict = None
+    def get_video_embedding_from_downloaded_file(
+        self, video_path: str, segment_config: dict = None
     ) -> List[float]:
         """
-        Gets video features from a URL.
+        Gets video features from a video downloaded from a URL, and deletes the download.
 
         Args:
-            video_url (str): URL of the video.
+            video_path (str): Path to the downloaded video.
             segment_config (dict, optional): Configuration for video segmentation. Defaults to None.
 
         Returns:
@@ -375,17 +410,19 @@ class VClipModel:
             RuntimeError: If there is an error during the video feature extraction process.
         """
         try:
-            logger.debug(f"Getting video embedding from URL: {video_url}")
-            video_path = await download_video(video_url)
-            clip_images = extract_video_frames(video_path, segment_config)
-            delete_file(video_path)
+            logger.debug(f"Getting video embedding from downloaded video: {video_path}")
+            clip_images = extract_video_frames(
+                video_path, segment_config, use_cache=False
+            )
             logger.info("Video embedding extracted successfully from URL")
-            return self.get_video_embeddings([clip_images])
+            return self.get_video_embeddings([clip_images])[0]
         except Exception as e:
             logger.error(f"Error getting video embedding from URL: {e}")
             raise RuntimeError(
                 f"{ErrorMessages.GET_VIDEO_EMBEDDING_FROM_URL_ERROR}: {e}"
             )
+        finally:
+            delete_file(video_path)
 
     def get_video_embedding_from_base64(
         self, video_base64: str, segment_config: dict = None
@@ -406,17 +443,19 @@ class VClipModel:
         try:
             logger.debug("Getting video embedding from base64")
             video_path = decode_base64_video(video_base64)
-            clip_images = extract_video_frames(video_path, segment_config)
+            clip_images = extract_video_frames(
+                video_path, segment_config, use_cache=False
+            )
             delete_file(video_path)
             logger.info("frames extracted successfully from base64")
-            return self.get_video_embeddings([clip_images])
+            return self.get_video_embeddings([clip_images])[0]
         except Exception as e:
             logger.error(f"Error getting video embedding from base64: {e}")
             raise RuntimeError(
                 f"{ErrorMessages.GET_VIDEO_EMBEDDING_FROM_BASE64_ERROR}: {e}"
             )
 
-    async def get_video_embedding_from_file(
+    def get_video_embedding_from_file(
         self, video_path: str, segment_config: dict = None
     ) -> List[float]:
         """
@@ -440,7 +479,7 @@ class VClipModel:
                 )
             clip_images = extract_video_frames(video_path, segment_config)
             logger.info("Video embedding extracted successfully from file")
-            return self.get_video_embeddings([clip_images])
+            return self.get_video_embeddings([clip_images])[0]
         except HTTPException as e:
             raise e
         except Exception as e:
@@ -449,6 +488,41 @@ class VClipModel:
                 f"{ErrorMessages.GET_VIDEO_EMBEDDING_FROM_FILE_ERROR}: {e}"
             )
 
+    def get_video_embeddings_from_file_segments(
+        self, video_path: str, segment_configs: List[dict]
+    ) -> List[List[float]]:
+        """
+        Gets video features of several segments of a local file, reading the file once.
+
+        Args:
+            video_path (str): Path to the video file.
+            segment_configs (List[dict]): Configurations of the video segments.
+
+        Returns:
+            List[List[float]]: Video features, one per segment.
+
+        Raises:
+            RuntimeError: If there is an error during the video feature extraction process.
+        """
+        try:
+            logger.debug(
+                f"Getting embeddings of {len(segment_configs)} segments from file: {video_path}"
+            )
+            if not os.path.exists(video_path):
+                raise HTTPException(
+                    status_code=400, detail=f"Video file not found: {video_path}"
+                )
+            segments = extract_video_segments(video_path, segment_configs)
+            logger.info("Video segment embeddings extracted successfully from file")
+            return self.get_video_embeddings(segments)
+        except HTTPException as e:
+            raise e
+        except Exception as e:
+            logger.error(f"Error getting video segment embeddings from file: {e}")
+            raise RuntimeError(
+                f"{ErrorMessages.GET_VIDEO_EMBEDDING_FROM_FILE_ERROR}: {e}"
+            )
+
     def check_health(self) -> bool:
         """
         Checks the health of the VClipModel.
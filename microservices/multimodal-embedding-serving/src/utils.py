@@ -4,20 +4,22 @@
 import base64
 import os
 import tempfile
+import threading
 import uuid
+from collections import OrderedDict
 from io import BytesIO
+from typing import List, Tuple
 from urllib.parse import urlparse
 
-import decord
 import httpx
 import numpy as np
 from decord import VideoReader, cpu
 from PIL import Image
-from torchvision.transforms import ToPILImage
 from src.common import ErrorMessages, logger, settings
 
-decord.bridge.set_bridge("torch")
-toPIL = ToPILImage()
+# Open video readers by (path, mtime), with a lock as a reader is not thread safe
+_video_readers = OrderedDict()
+_video_readers_lock = threading.Lock()
 
 # Only include proxies if they are defined
 proxies = {}
@@ -211,60 +213,128 @@ def decode_base64_video(video_base64: str) -> str:
         raise RuntimeError(f"{ErrorMessages.DECODE_BASE64_VIDEO_ERROR}: {e}")
 
 
-def extract_video_frames(video_path: str, segment_config: dict = None) -> list:
+def get_video_reader(video_path: str) -> Tuple[VideoReader, threading.Lock]:
     """
-    Extracts frames from a video.
+    Gets an open video reader from the reader cache, opening the video on a miss.
+
+    Readers are keyed by path and modification time, so a replaced file is reopened.
+    The least recently used reader is closed when more than VIDEO_READER_CACHE_SIZE
+    videos are open.
 
     Args:
         video_path (str): Path to the video file.
-        segment_config (dict, optional): Configuration for video segmentation. Defaults to None.
 
     Returns:
-        list: List of extracted video frames.
+        Tuple[VideoReader, threading.Lock]: The reader and the lock guarding it.
+    """
+    key = (video_path, os.stat(video_path).st_mtime_ns)
+    with _video_readers_lock:
+        entry = _video_readers.get(key)
+        if entry is not None:
+            _video_readers.move_to_end(key)
+            return entry
+    entry = (VideoReader(video_path, ctx=cpu(0)), threading.Lock())
+    with _video_readers_lock:
+        entry = _video_readers.setdefault(key, entry)
+        _video_readers.move_to_end(key)
+        while len(_video_readers) > max(settings.VIDEO_READER_CACHE_SIZE, 0):
+            _video_readers.popitem(last=False)
+    return entry
+
+
+def segment_frame_indices(vlen: int, fps: float, segment_config: dict) -> np.ndarray:
+    """
+    Gets the indices of the frames uniformly sampled from a video segment.
+
+    Args:
+        vlen (int): Number of frames of the video.
+        fps (float): Frame rate of the video.
+        segment_config (dict): Configuration for video segmentation.
+
+    Returns:
+        np.ndarray: Frame indices.
+    """
+    start_offset_sec = segment_config.get(
+        "startOffsetSec", settings.DEFAULT_START_OFFSET_SEC
+    )
+    clip_duration = segment_config.get("clip_duration", settings.DEFAULT_CLIP_DURATION)
+    num_frames = segment_config.get("num_frames", settings.DEFAULT_NUM_FRAMES)
+    start_idx = int(fps * start_offset_sec)
+    end_idx = (
+        min(vlen, start_idx + int(fps * clip_duration)) if clip_duration != -1 else vlen
+    )
+    # Uniform sampling
+    return np.linspace(start_idx, end_idx, num=num_frames, endpoint=False, dtype=int)
+
+
+def extract_video_segments(
+    video_path: str, segment_configs: List[dict], use_cache: bool = True
+) -> List[List[np.ndarray]]:
+    """
+    Extracts the frames of several segments of a video in one pass.
+
+    The frames of all segments are decoded in increasing order, so the video is read
+    once and frames shared by segments are decoded once.
+
+    Args:
+        video_path (str): Path to the video file.
+        segment_configs (List[dict]): Configurations of the video segments.
+        use_cache (bool): Whether to reuse an open reader of the video. Disable for
+            temporary files.
+
+    Returns:
+        List[List[np.ndarray]]: The RGB frames (H W C) of each segment.
 
     Raises:
         RuntimeError: If there is an error during the frame extraction process.
     """
     try:
-        logger.debug(f"Extracting frames from video: {video_path}")
-        if segment_config is None:
-            segment_config = {}
-
-        start_offset_sec = segment_config.get(
-            "startOffsetSec", settings.DEFAULT_START_OFFSET_SEC
-        )
-        clip_duration = segment_config.get(
-            "clip_duration", settings.DEFAULT_CLIP_DURATION
-        )
-        num_frames = segment_config.get("num_frames", settings.DEFAULT_NUM_FRAMES)
         logger.debug(
-            f"video_path: {video_path} start_offset_sec: {start_offset_sec}, clip_duration: {clip_duration}, num_frames: {num_frames}"
+            f"Extracting frames of {len(segment_configs)} segments from video: {video_path}"
         )
-
-        vr = VideoReader(video_path, ctx=cpu(0))
-        vlen = len(vr)
-        fps = vr.get_avg_fps()
-        start_idx = int(fps * start_offset_sec)
-        end_idx = (
-            min(vlen, start_idx + int(fps * clip_duration))
-            if clip_duration != -1
-            else vlen
-        )
-
-        frame_idx = np.linspace(
-            start_idx, end_idx, num=num_frames, endpoint=False, dtype=int
-        )  # Uniform sampling
-        video_frames = []
-
-        # read images
-        temp_frms = vr.get_batch(frame_idx.astype(int).tolist())
-        for idx in range(temp_frms.shape[0]):
-            im = temp_frms[idx]  # H W C
-            video_frames.append(toPIL(im.permute(2, 0, 1)))
+        if use_cache:
+            reader, lock = get_video_reader(video_path)
+        else:
+            reader, lock = VideoReader(video_path, ctx=cpu(0)), threading.Lock()
+        with lock:
+            vlen = len(reader)
+            fps = reader.get_avg_fps()
+            segment_indices = [
+                segment_frame_indices(vlen, fps, segment_config or {})
+                for segment_config in segment_configs
+            ]
+            unique_indices = np.unique(np.concatenate(segment_indices))
+            decoded = {}
+            chunk_size = max(1, settings.VIDEO_DECODE_CHUNK_SIZE)
+            for start in range(0, len(unique_indices), chunk_size):
+                chunk = unique_indices[start : start + chunk_size].tolist()
+                frames = reader.get_batch(chunk).asnumpy()
+                decoded.update(zip(chunk, frames))
         logger.info(
-            f"{len(video_frames)} Frames extracted successfully from video: {video_path}"
+            f"{len(decoded)} Frames extracted successfully from video: {video_path}"
         )
-        return video_frames
+        return [[decoded[idx] for idx in indices.tolist()] for indices in segment_indices]
     except Exception as e:
         logger.error(f"Error extracting video frames: {e}")
         raise RuntimeError(f"{ErrorMessages.EXTRACT_VIDEO_FRAMES_ERROR}: {e}")
+
+
+def extract_video_frames(
+    video_path: str, segment_config: dict = None, use_cache: bool = True
+) -> List[np.ndarray]:
+    """
+    Extracts frames from a video.
+
+    Args:
+        video_path (str): Path to the video file.
+        segment_config (dict, optional): Configuration for video segmentation. Defaults to None.
+        use_cache (bool): Whether to reuse an open reader of the video. Disable for
+            temporary files.
+
+    Returns:
+        List[np.ndarray]: List of extracted RGB video frames (H W C).
+
+    Raises:
+        RuntimeError: If there is an error during the frame extraction process.
+    """
+    return extract_video_segments(video_path, [segment_config], use_cache)[0]
@@ -4,8 +4,10 @@
 
 import os
 import io
+import queue
 import shutil
 import logging
+import numpy as np
 from pathlib import Path
 from PIL import Image
 
@@ -24,6 +26,8 @@ logger.addHandler(console_handler)
 DEVICE = os.getenv("DEVICE", "CPU")
 LOCAL_EMBED_MODEL_ID = os.getenv("LOCAL_EMBED_MODEL_ID", "CLIP-ViT-H-14")
 MODEL_DIR = "/home/user/models"
+# number of text infer requests running in parallel, 0 uses the optimal number of the device
+TEXT_INFER_REQUESTS = int(os.getenv("TEXT_INFER_REQUESTS", 0))
 
 class EmbeddingModel:
     def __init__(self):
@@ -32,7 +36,7 @@ class EmbeddingModel:
         self.device = DEVICE
         self.text_model = None
         self.image_model = None
-        self.text_ireq = None
+        self.text_ireqs = None
         self.image_ireq = None
         self.load_model()
         self.tokenizer = self.get_tokenizer()
@@ -59,10 +63,14 @@ class EmbeddingModel:
             print(f"Model already exists at {self.model_path}. Skipping download.")
 
         self.image_model = load_model(image_encoder_path, self.device)
-        self.text_model = load_model(text_encoder_path, self.device)
+        # throughput mode lets the pooled text infer requests run in parallel streams
+        self.text_model = load_model(text_encoder_path, self.device, throughputmode=True)
 
         self.image_ireq = self.image_model.create_infer_request()
-        self.text_ireq = self.text_model.create_infer_request()
+        num_requests = TEXT_INFER_REQUESTS or self.text_model.get_property("OPTIMAL_NUMBER_OF_INFER_REQUESTS")
+        self.text_ireqs = queue.Queue()
+        for _ in range(max(1, num_requests)):
+            self.text_ireqs.put(self.text_model.create_infer_request())
 
     def get_image_embedding(self, image):
         embedding = self.image_ireq.infer({'x': image[None]}).to_tuple()[0]
@@ -70,8 +78,40 @@ class EmbeddingModel:
     
     def get_text_embedding(self, text):
         tokens = self.tokenizer(text)
-        embedding = self.text_ireq.infer(tokens).to_tuple()[0]
+        ireq = self.text_ireqs.get()
+        try:
+            embedding = ireq.infer(tokens).to_tuple()[0]
+        finally:
+            self.text_ireqs.put(ireq)
         return embedding
+
+    def get_text_embeddings(self, texts):
+        """
+        Embed several texts with the free text infer requests running in parallel.
+
+        The text model has a static batch of 1, each text is inferred by its own request.
+        """
+        tokens = self.tokenizer(texts)
+        # wait for one request, then take the ones that are free without blocking
+        ireqs = [self.text_ireqs.get()]
+        while len(ireqs) < len(tokens):
+            try:
+                ireqs.append(self.text_ireqs.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            embeddings = []
+            for start in range(0, len(tokens), len(ireqs)):
+                chunk = tokens[start:start + len(ireqs)]
+                for ireq, token in zip(ireqs, chunk):
+                    ireq.start_async(token[None])
+                for ireq, _ in zip(ireqs, chunk):
+                    ireq.wait()
+                    embeddings.append(ireq.get_output_tensor(0).data.copy())
+        finally:
+            for ireq in ireqs:
+                self.text_ireqs.put(ireq)
+        return np.concatenate(embeddings)
     
     def get_model_id(self):
         return self.model_id
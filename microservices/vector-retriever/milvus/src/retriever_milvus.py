@@ -1,5 +1,3 @@
-
-
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
@@ -8,66 +6,128 @@ from pymilvus import MilvusClient
 from dependency.clip_ov.mm_embedding import EmbeddingModel
 
 import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
 
 MILVUS_HOST = os.getenv("MILVUS_HOST", "localhost")
 MILVUS_PORT = int(os.getenv("MILVUS_PORT", 19530))
 MILVUS_URI = f"http://{MILVUS_HOST}:{MILVUS_PORT}"
+# number of query embeddings cached, 0 disables the cache
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", 1024))
+# seconds a cached query embedding stays valid
+QUERY_CACHE_TTL = float(os.getenv("QUERY_CACHE_TTL", 3600))
+
+
+class QueryEmbeddingCache:
+    """
+    LRU cache of query embeddings with a time to live, keyed by the normalized query.
+    """
+
+    def __init__(self, max_size=QUERY_CACHE_SIZE, ttl=QUERY_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query):
+        # the CLIP tokenizers lower case and collapse whitespaces, such queries share an embedding
+        return " ".join(query.split()).lower()
+
+    def get(self, query):
+        key = self.normalize(query)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            embedding, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return embedding
+
+    def put(self, query, embedding):
+        if self.max_size <= 0:
+            return
+        key = self.normalize(query)
+        with self.lock:
+            self.entries[key] = (embedding, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
 
 class MilvusRetriever:
     def __init__(self, collection_name="default"):
         self.collection_name = collection_name
         self.client = MilvusClient(uri=MILVUS_URI)
         self.embedding_model = EmbeddingModel()
+        self.query_cache = QueryEmbeddingCache()
 
-    def search(self, query, filters=None, top_k=5):
-        # Get the embedding for the query
-        embedding = self.embedding_model.get_text_embedding(query)
-        if embedding is None:
-            raise Exception("Failed to get embedding for the query.")
+    def get_query_embeddings(self, queries):
+        # embed the distinct queries missing from the cache in one call
+        embeddings = [self.query_cache.get(query) for query in queries]
+        missing = {}
+        for index, embedding in enumerate(embeddings):
+            if embedding is None:
+                missing.setdefault(self.query_cache.normalize(queries[index]), []).append(index)
+        if missing:
+            indices = list(missing.values())
+            new_embeddings = self.embedding_model.get_text_embeddings([queries[group[0]] for group in indices])
+            if new_embeddings is None:
+                raise Exception("Failed to get embedding for the query.")
+            for group, embedding in zip(indices, new_embeddings):
+                for index in group:
+                    embeddings[index] = embedding
+                self.query_cache.put(queries[group[0]], embedding)
+        return np.stack(embeddings)
+
+    @staticmethod
+    def build_filter(filters):
+        search_filter = ''
+        filter_params = {}
+        for key, value in filters.items():
+            if key == "timestamp_start":
+                if search_filter:
+                    search_filter += ' AND '
+                filter_params["timestamp_start"] = filters["timestamp_start"]
+                search_filter += 'meta["timestamp"] >= {timestamp_start}'
+            if key == "timestamp_end":
+                filter_params["timestamp_end"] = filters["timestamp_end"]
+                if search_filter:
+                    search_filter += ' AND '
+                search_filter += 'meta["timestamp"] <= {timestamp_end}'
+            if key not in ["timestamp_start", "timestamp_end"]:
+                filter_params["label"] = [value]
+                if search_filter:
+                    search_filter += ' AND '
+                search_filter += f'meta["{key}"] IN '
+                search_filter += '{label}'
+        return search_filter, filter_params
 
+    def search_batch(self, queries, filters=None, top_k=5):
+        """
+        Search several queries with one multi-vector search, returns the hits of each query.
+        """
+        embeddings = self.get_query_embeddings(queries)
+
+        kwargs = {}
         if filters:
-            search_filter = ''
-            filter_params = {}
-            for key, value in filters.items():
-                if key == "timestamp_start":
-                    if search_filter:
-                        search_filter += ' AND '
-                    filter_params["timestamp_start"] = filters["timestamp_start"]
-                    search_filter += 'meta["timestamp"] >= {timestamp_start}'
-                if key == "timestamp_end":
-                    filter_params["timestamp_end"] = filters["timestamp_end"]
-                    if search_filter:
-                        search_filter += ' AND '
-                    search_filter += 'meta["timestamp"] <= {timestamp_end}'
-                if key not in ["timestamp_start", "timestamp_end"]:
-                    filter_params["label"] = [value]
-                    if search_filter:
-                        search_filter += ' AND '
-                    search_filter += f'meta["{key}"] IN '
-                    search_filter += '{label}'
-
-            results = self.client.search(
-                collection_name=self.collection_name,
-                data=embedding,
-                filter=search_filter,
-                filter_params=filter_params,
-                output_fields=["meta"],
-                limit=top_k,  # Max number of search results to return
-                search_params={"params": {}},  # Search parameters
-            )
-            if results:
-                results = results[0]
-
-        else:
-            results = self.client.search(
-                collection_name=self.collection_name,
-                data=embedding,
-                output_fields=["meta"],
-                limit=top_k,  # Max number of search results to return
-                search_params={"params": {}},  # Search parameters
-            )
-            if results:
-                results = results[0]
-
-        return results
+            kwargs["filter"], kwargs["filter_params"] = self.build_filter(filters)
+
+        results = self.client.search(
+            collection_name=self.collection_name,
+            data=embeddings,
+            output_fields=["meta"],
+            limit=top_k,  # Max number of search results to return
+            search_params={"params": {}},  # Search parameters
+            **kwargs,
+        )
+        return list(results) if results else [[] for _ in queries]
 
+    def search(self, query, filters=None, top_k=5):
+        return self.search_batch([query], filters, top_k)[0]
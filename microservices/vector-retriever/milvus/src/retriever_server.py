@@ -10,7 +10,7 @@ import logging
 from retriever_milvus import MilvusRetriever
 
 from pydantic import BaseModel
-from typing import Optional, Dict
+from typing import Optional, Dict, List
 
 logger = logging.getLogger("retriever")
 logging.basicConfig(
@@ -26,6 +26,11 @@ class RetrievalRequest(BaseModel):
     filter: Optional[Dict] = None
     max_num_results: int = 10
 
+class BatchRetrievalRequest(BaseModel):
+    queries: List[str]
+    filter: Optional[Dict] = None
+    max_num_results: int = 10
+
 app = FastAPI()
 
 retriever = MilvusRetriever()
@@ -42,6 +47,30 @@ def health():
         raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
 
 
+def validate_search_params(request):
+    """
+    Validate the max_num_results and filter fields of a retrieval request.
+    """
+    # Validate the max_num_results field
+    if not isinstance(request.max_num_results, int) or request.max_num_results <= 0:
+        raise HTTPException(status_code=400, detail="Invalid max_num_results. It must be a positive integer.")
+    if request.max_num_results > 16384:
+        raise HTTPException(status_code=400, detail="Invalid max_num_results. It must be in the range [1, 16384].")
+
+    # Validate the filter field (if provided)
+    if request.filter and not isinstance(request.filter, dict):
+        raise HTTPException(status_code=400, detail="Invalid filter. It must be a dictionary.")
+
+def format_hits(results):
+    ret = []
+    for hit in results:
+        ret.append({
+            "id": hit.get("id"),
+            "distance": hit.get('distance'),
+            "meta": hit.get("entity").get("meta")
+        })
+    return ret
+
 @app.post("/v1/retrieval")
 def retrieval(request: RetrievalRequest):
     """
@@ -58,29 +87,14 @@ def retrieval(request: RetrievalRequest):
         if not request.query or not isinstance(request.query, str):
             raise HTTPException(status_code=400, detail="Invalid query. It must be a non-empty string.")
 
-        # Validate the max_num_results field
-        if not isinstance(request.max_num_results, int) or request.max_num_results <= 0:
-            raise HTTPException(status_code=400, detail="Invalid max_num_results. It must be a positive integer.")
-        if request.max_num_results > 16384:
-            raise HTTPException(status_code=400, detail="Invalid max_num_results. It must be in the range [1, 16384].")
-
-        # Validate the filter field (if provided)
-        if request.filter and not isinstance(request.filter, dict):
-            raise HTTPException(status_code=400, detail="Invalid filter. It must be a dictionary.")
+        validate_search_params(request)
         
         results = retriever.search(request.query, request.filter, top_k=request.max_num_results)
-        ret = []
-        for hit in results:
-            ret.append({
-                "id": hit.get("id"),
-                "distance": hit.get('distance'),
-                "meta": hit.get("entity").get("meta")
-            })
 
         # Return the results
         return JSONResponse(
             content={
-                "results": ret
+                "results": format_hits(results)
             },
             status_code=200,
         )
@@ -91,4 +105,37 @@ def retrieval(request: RetrievalRequest):
         logger.error(f"Error during retrieval: {e}")
         raise HTTPException(status_code=500, detail=f"Error during retrieval: {str(e)}")
 
+@app.post("/v1/retrieval/batch")
+def retrieval_batch(request: BatchRetrievalRequest):
+    """
+    Perform retrieval tasks for several text queries with a single search.
+
+    Args:
+        request (BatchRetrievalRequest): The request body containing queries, filter, and max_num_results.
+            The filter and max_num_results apply to all queries.
+
+    Returns:
+        JSONResponse: A response containing the top-k retrieved results of each query, in the order of the queries.
+    """
+    try:
+        # Validate the queries field
+        if not request.queries or not all(query and isinstance(query, str) for query in request.queries):
+            raise HTTPException(status_code=400, detail="Invalid queries. It must be a non-empty list of non-empty strings.")
+
+        validate_search_params(request)
 
+        results = retriever.search_batch(request.queries, request.filter, top_k=request.max_num_results)
+
+        # Return the results
+        return JSONResponse(
+            content={
+                "results": [format_hits(hits) for hits in results]
+            },
+            status_code=200,
+        )
+    except HTTPException as http_exc:
+        # Re-raise HTTPExceptions to preserve their status code and message
+        raise http_exc
+    except Exception as e:
+        logger.error(f"Error during batch retrieval: {e}")
+        raise HTTPException(status_code=500, detail=f"Error during batch retrieval: {str(e)}")
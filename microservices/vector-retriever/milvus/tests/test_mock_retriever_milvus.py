@@ -77,4 +77,45 @@ def test_retrieval_error(mock_retriever):
 
     response = client.post("/v1/retrieval", json=request_data)
     assert response.status_code == 500
-    assert response.json() == {"detail": "Error during retrieval: Mocked retrieval error"}
\ No newline at end of file
+    assert response.json() == {"detail": "Error during retrieval: Mocked retrieval error"}
+
+def test_retrieval_batch_success(mock_retriever):
+    """
+    Test the batch retrieval endpoint with valid input.
+    """
+    mock_retriever.search_batch.return_value = [
+        [{"id": "1", "distance": 0.1, "entity": {"meta": {"key": "value1"}}}],
+        [],
+    ]
+
+    request_data = {
+        "queries": ["example query", "another query"],
+        "filter": {"type": "example"},
+        "max_num_results": 1
+    }
+
+    response = client.post("/v1/retrieval/batch", json=request_data)
+    assert response.status_code == 200
+    assert response.json() == {
+        "results": [
+            [{"id": "1", "distance": 0.1, "meta": {"key": "value1"}}],
+            []
+        ]
+    }
+    mock_retriever.search_batch.assert_called_once_with(
+        ["example query", "another query"], {"type": "example"}, top_k=1
+    )
+
+
+def test_retrieval_batch_invalid_queries(mock_retriever):
+    """
+    Test the batch retrieval endpoint with an empty query.
+    """
+    request_data = {
+        "queries": ["example query", ""],
+        "max_num_results": 2
+    }
+
+    response = client.post("/v1/retrieval/batch", json=request_data)
+    assert response.status_code == 400
+    mock_retriever.search_batch.assert_not_called()
@@ -4,6 +4,7 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Body
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+from fastapi.concurrency import run_in_threadpool
 import os
 import re
 import logging
@@ -12,6 +13,7 @@ from tqdm import tqdm
 from pathlib import Path
 
 from indexer import Indexer
+from jobs import IngestJobManager
 
 from pydantic import BaseModel
 from typing import Optional, Dict, Union
@@ -51,6 +53,7 @@ HOST_DATA_PATH = os.getenv("HOST_DATA_PATH", "/home/user/data")
 LOCAL_EMBED_MODEL_ID = os.getenv("LOCAL_EMBED_MODEL_ID", "CLIP-ViT-H-14")
 
 indexer = Indexer()
+job_manager = IngestJobManager()
 
 
 def helper_map2host(file_path: str):
@@ -119,6 +122,37 @@ async def ingest(request: Union[IngestHostDirRequest, IngestHostFileRequest] = B
     else:
         raise HTTPException(status_code=422, detail="Invalid request type. Provide either 'file_dir' or 'file_path'.")
 
+def list_dir_files(file_dir_cont: str):
+    """
+    List the supported files of a directory with their metadata.
+
+    Args:
+        file_dir_cont (str): The directory path in the container.
+
+    Returns:
+        list: (file path in the container, metadata) pairs.
+    """
+    files_with_meta = []
+    for root, _, files in os.walk(file_dir_cont): 
+        if root.split("/")[-1] == "meta":
+            continue
+        for file_name in tqdm(files):                
+            if not file_name.lower().endswith(('.jpg', '.png', '.jpeg', '.mp4')):
+                logger.debug(f"Unsupported file type: {file_name}, skipped. Supported types are: jpg, jpeg, png, mp4")
+                continue
+            file_path = os.path.join(root, file_name)
+            # find a json file with the same name as the file to get its metadata
+            base_name, _ = os.path.splitext(file_name)
+            meta_path = os.path.join(file_dir_cont, "meta", f"{base_name}.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, "r") as meta_file:
+                    meta = json.load(meta_file)
+            else:
+                meta = {}
+            meta["file_path"] = helper_map2host(file_path)
+            files_with_meta.append((file_path, meta))
+    return files_with_meta
+
 async def ingest_host_dir(request: IngestHostDirRequest = Body(...)):
     """
     Ingest files from a directory.
@@ -127,7 +161,7 @@ async def ingest_host_dir(request: IngestHostDirRequest = Body(...)):
         request (IngestHostDirRequest): The request body containing file_dir, frame_extract_interval, and do_detect_and_crop.
 
     Returns:
-        JSONResponse: A response indicating success or failure.
+        JSONResponse: The id of the background ingest job, or an error.
     """
     try:
         file_dir = request.file_dir
@@ -140,38 +174,20 @@ async def ingest_host_dir(request: IngestHostDirRequest = Body(...)):
         if not os.path.isdir(file_dir_cont):
             raise HTTPException(status_code=404, detail="Invalid directory path.")
 
-        proc_files = []
-        metas = []
-        for root, _, files in os.walk(file_dir_cont): 
-            if root.split("/")[-1] == "meta":
-                continue
-            for file_name in tqdm(files):                
-                if not file_name.lower().endswith(('.jpg', '.png', '.jpeg', '.mp4')):
-                    logger.debug(f"Unsupported file type: {file_name}, skipped. Supported types are: jpg, jpeg, png, mp4")
-                    continue
-                file_path = os.path.join(root, file_name)
-                # find a json file with the same name as the file to get its metadata
-                base_name, _ = os.path.splitext(file_name)
-                meta_path = os.path.join(file_dir_cont, "meta", f"{base_name}.json")
-                if os.path.exists(meta_path):
-                    with open(meta_path, "r") as meta_file:
-                        meta = json.load(meta_file)
-                    meta["file_path"] = helper_map2host(file_path)
-                    proc_files.append(file_path)
-                    metas.append(meta)
-                else:
-                    meta = {}
-                    meta["file_path"] = helper_map2host(file_path)
-                    proc_files.append(file_path)
-                    metas.append(meta)
-                
-        res = indexer.add_embedding(proc_files, metas, frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop)
+        job = job_manager.submit(
+            indexer,
+            lambda: list_dir_files(file_dir_cont),
+            frame_interval=frame_extract_interval,
+            do_detect_and_crop=do_detect_and_crop,
+        )
+        logger.info(f"Submitted ingest job {job.job_id} for {file_dir}")
 
         return JSONResponse(
             content={
-                "message": f"Files successfully processed. db returns {res}"
+                "message": f"Ingest job {job.job_id} submitted.",
+                "job_id": job.job_id,
             },
-            status_code=200,
+            status_code=202,
         )
     except HTTPException as http_exc:
         # Re-raise HTTPExceptions to preserve their status code and message
@@ -202,7 +218,9 @@ async def ingest_host_file(request: IngestHostFileRequest = Body(...)):
             raise HTTPException(status_code=404, detail="Invalid file path.")
                 
         meta["file_path"] = file_path
-        res = indexer.add_embedding([file_path_cont], [meta], frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop)
+        res = await run_in_threadpool(
+            indexer.add_embedding, [file_path_cont], [meta], frame_extract_interval=frame_extract_interval, do_detect_and_crop=do_detect_and_crop
+        )
 
         return JSONResponse(
             content={
@@ -216,6 +234,22 @@ async def ingest_host_file(request: IngestHostFileRequest = Body(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
     
+@app.get("/v1/dataprep/jobs/{job_id}")
+def get_job(job_id: str):
+    """
+    Get the progress of an ingest job.
+
+    Args:
+        job_id (str): The id returned when the job was submitted.
+
+    Returns:
+        JSONResponse: The job status and the status of each of its files.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return JSONResponse(content=job.to_dict(), status_code=200)
+
 @app.get("/v1/dataprep/get")
 def get_file_info(file_path: str):
     """
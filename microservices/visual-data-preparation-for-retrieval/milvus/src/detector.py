@@ -32,6 +32,9 @@ class Detector:
 
         self.exec_net = core.compile_model(self.net, self.device)
         _, _, self.h, self.w = self.exec_net.inputs[0].shape
+        # infer requests detecting a group of images in parallel
+        self.infer_queue = ov.AsyncInferQueue(self.exec_net)
+        self.infer_queue.set_callback(self._on_detection)
 
     def download_model(self):
         if not os.path.exists(self.model_file):
@@ -60,7 +63,9 @@ class Detector:
         # res = self.exec_net.infer(inputs={self.input_blob: image})
         res =  self.exec_net.infer_new_request(image)
         res = res["output"]
+        return self.postprocess(res, ratio)
 
+    def postprocess(self, res, ratio):
         predictions = demo_postprocess(res, (self.h, self.w))[0]
 
         boxes = predictions[:, :4]
@@ -78,12 +83,32 @@ class Detector:
             final_boxes = dets[:, :4]
             final_scores, final_cls_inds = dets[:, 4], dets[:, 5]
         return final_boxes, final_scores, final_cls_inds
-    
-    def get_cropped_images(self, image):
-        do_convert = isinstance(image, Image.Image)
-        if do_convert:
-            image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
-        boxes, _, _ = self.get_det_results(image)
+
+    def _on_detection(self, request, userdata):
+        results, index, ratio = userdata
+        results[index] = self.postprocess(request.get_tensor("output").data.copy(), ratio)
+
+    def get_cropped_images_batch(self, images):
+        """
+        Detect objects in a group of PIL images with parallel infer requests.
+        Returns the list of cropped PIL images of each image.
+        """
+        bgr_images = [cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR) for image in images]
+        results = {}
+        for index, image in enumerate(bgr_images):
+            blob, ratio = preproc(image, (self.h, self.w))
+            self.infer_queue.start_async(blob, userdata=(results, index, ratio))
+        self.infer_queue.wait_all()
+        cropped_images = []
+        for index, image in enumerate(bgr_images):
+            boxes, _, _ = results[index]
+            crops = self.crop(image, boxes)
+            cropped_images.append(
+                [Image.fromarray(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)) for crop in crops]
+            )
+        return cropped_images
+
+    def crop(self, image, boxes):
         cropped_images = []
         for box in boxes:
             x1, y1, x2, y2 = map(int, box)
@@ -93,7 +118,16 @@ class Detector:
             y2 = min(image.shape[0], y2)
             if x1 >= x2 or y1 >= y2:
                 continue
-            cropped_image = image[y1:y2, x1:x2]
+            cropped_images.append(image[y1:y2, x1:x2])
+        return cropped_images
+
+    def get_cropped_images(self, image):
+        do_convert = isinstance(image, Image.Image)
+        if do_convert:
+            image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+        boxes, _, _ = self.get_det_results(image)
+        cropped_images = []
+        for cropped_image in self.crop(image, boxes):
             if do_convert:
                 cropped_image = cv2.cvtColor(cropped_image, cv2.COLOR_BGR2RGB)
                 cropped_image = Image.fromarray(cropped_image)
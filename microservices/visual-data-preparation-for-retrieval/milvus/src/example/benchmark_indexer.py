@@ -0,0 +1,121 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+# Benchmark video ingestion of the Indexer against the previous frame-by-frame pipeline.
+# Run inside the dataprep container, from the src directory:
+#   python example/benchmark_indexer.py --video /home/user/data/video.mp4
+# Without --video, a 10 minute 1080p test video is generated first.
+
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from moviepy.editor import VideoFileClip
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indexer import Indexer, create_milvus_data
+from utils import preprocess_image, sample_video_frames
+
+
+def generate_video(path, duration=600, fps=30, size=(1920, 1080)):
+    print(f"Generating a {duration}s {size[0]}x{size[1]} test video at {path}")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    rng = np.random.default_rng(0)
+    background = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    for i in range(duration * fps):
+        frame = np.roll(background, i * 8, axis=1)
+        # moving box to give the detector something to find
+        x = (i * 10) % (size[0] - 400)
+        cv2.rectangle(frame, (x, 300), (x + 400, 700), (0, 0, 255), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def legacy_decode(video_path, frame_interval):
+    video = VideoFileClip(video_path)
+    frames = 0
+    for frame_counter, frame in enumerate(video.iter_frames()):
+        if frame_counter % frame_interval == 0:
+            frames += 1
+    video.close()
+    return frames
+
+
+def sampled_decode(video_path, frame_interval):
+    return sum(1 for _ in sample_video_frames(video_path, frame_interval))
+
+
+def legacy_process_video(indexer, video_path, meta, frame_interval, do_detect_and_crop):
+    # the previous pipeline: decode every frame, one synchronous inference per frame and crop
+    entities = []
+    video = VideoFileClip(video_path)
+    fps = video.fps
+    for frame_counter, frame in enumerate(video.iter_frames()):
+        if frame_counter % frame_interval == 0:
+            image = Image.fromarray(frame)
+            meta_data = copy.deepcopy(meta)
+            meta_data["video_pin_second"] = frame_counter / fps
+            if do_detect_and_crop:
+                for crop in indexer.detector.get_cropped_images(image):
+                    crop = preprocess_image(crop, shape=[indexer.w, indexer.h])
+                    embedding = indexer.ireq.infer({'x': crop[None]}).to_tuple()[0]
+                    entities.append(create_milvus_data(embedding, meta_data))
+            image = preprocess_image(image, shape=[indexer.w, indexer.h])
+            embedding = indexer.ireq.infer({'x': image[None]}).to_tuple()[0]
+            entities.append(create_milvus_data(embedding, meta_data))
+    video.close()
+    return entities
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--video", help="video to ingest, a 10 minute 1080p video is generated by default")
+    parser.add_argument("--frame-intervals", type=int, nargs="+", default=[15, 30])
+    parser.add_argument("--no-detect", action="store_true", help="skip detection and crops")
+    parser.add_argument("--decode-only", action="store_true", help="only benchmark decoding")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        video_path = args.video
+        if not video_path:
+            video_path = os.path.join(tmp_dir, "benchmark.mp4")
+            generate_video(video_path)
+
+        indexer = None if args.decode_only else Indexer(init_db=False)
+        meta = {"file_path": video_path}
+        do_detect_and_crop = not args.no_detect
+        for frame_interval in args.frame_intervals:
+            print(f"frame_interval={frame_interval}")
+            legacy_time, frames = timed(legacy_decode, video_path, frame_interval)
+            sampled_time, sampled = timed(sampled_decode, video_path, frame_interval)
+            assert frames == sampled, (frames, sampled)
+            print(f"  decode {frames} frames: previous {legacy_time:.1f}s, sampled {sampled_time:.1f}s")
+            if indexer is None:
+                continue
+            legacy_time, legacy = timed(
+                legacy_process_video, indexer, video_path, meta, frame_interval, do_detect_and_crop
+            )
+            batched_time, batched = timed(
+                indexer.process_video, video_path, meta, frame_interval, 1, do_detect_and_crop
+            )
+            print(
+                f"  ingest {len(batched)} entities: previous {legacy_time:.1f}s ({len(legacy)} entities), "
+                f"batched {batched_time:.1f}s, speedup {legacy_time / batched_time:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
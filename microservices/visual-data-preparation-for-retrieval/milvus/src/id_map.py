@@ -0,0 +1,94 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import sqlite3
+import threading
+
+
+class IdMap:
+    """
+    Persistent map from file paths to the ids of their entities in db, stored in SQLite.
+
+    Entities are indexed by file path, so that lookups and deletions of a file do not scan
+    the map, and the number of files is kept in a table of its own. Nothing is loaded in
+    memory, the pages are read from disk when they are needed.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS entities (id INTEGER PRIMARY KEY, file_path TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS entities_file_path ON entities (file_path)")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files (file_path TEXT PRIMARY KEY, num_entities INTEGER NOT NULL)"
+        )
+
+    def __contains__(self, file_path):
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM files WHERE file_path = ?", (file_path,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def get(self, file_path):
+        with self.lock:
+            rows = self.conn.execute("SELECT id FROM entities WHERE file_path = ?", (file_path,)).fetchall()
+        return [row[0] for row in rows]
+
+    def add(self, file_path, ids):
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entities (id, file_path) VALUES (?, ?)",
+                ((id, file_path) for id in ids),
+            )
+            self.conn.execute(
+                "INSERT INTO files (file_path, num_entities) VALUES (?, ?) "
+                "ON CONFLICT (file_path) DO UPDATE SET num_entities = num_entities + excluded.num_entities",
+                (file_path, len(ids)),
+            )
+
+    def add_all(self, items):
+        """
+        Add (file_path, id) pairs in a single transaction.
+        """
+        items = list(items)
+        counts = {}
+        for file_path, _ in items:
+            counts[file_path] = counts.get(file_path, 0) + 1
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entities (id, file_path) VALUES (?, ?)",
+                ((id, file_path) for file_path, id in items),
+            )
+            self.conn.executemany(
+                "INSERT INTO files (file_path, num_entities) VALUES (?, ?) "
+                "ON CONFLICT (file_path) DO UPDATE SET num_entities = num_entities + excluded.num_entities",
+                counts.items(),
+            )
+
+    def remove(self, file_path):
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM entities WHERE file_path = ?", (file_path,))
+            self.conn.execute("DELETE FROM files WHERE file_path = ?", (file_path,))
+
+    def all_ids(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT id FROM entities").fetchall()
+        return [row[0] for row in rows]
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute("DELETE FROM entities")
+            self.conn.execute("DELETE FROM files")
@@ -3,17 +3,24 @@
 
 import os
 import copy
+import json
+import queue
+import threading
+import time
 import faiss
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
 
-from moviepy.editor import VideoFileClip
+import openvino as ov
 from PIL import Image
 
 
 from dependency.clip_ov.mm_embedding import EmbeddingModel
 from detector import Detector
-from utils import preprocess_image, generate_unique_id
+from id_map import IdMap
+from utils import preprocess_image, generate_unique_id, sample_video_frames
 from milvus_client import MilvusClientWrapper
 
 
@@ -21,6 +28,17 @@ from milvus_client import MilvusClientWrapper
 DEVICE = os.getenv("DEVICE", "CPU")
 LOCAL_EMBED_MODEL_ID = os.getenv("LOCAL_EMBED_MODEL_ID", "CLIP-ViT-H-14")
 MODEL_DIR = "/home/user/models"
+# number of frames decoded, detected and embedded together
+FRAME_BATCH_SIZE = int(os.getenv("FRAME_BATCH_SIZE", 8))
+# entities are inserted to db every INSERT_BATCH_SIZE entities or INSERT_FLUSH_INTERVAL seconds
+INSERT_BATCH_SIZE = int(os.getenv("INSERT_BATCH_SIZE", 512))
+INSERT_FLUSH_INTERVAL = float(os.getenv("INSERT_FLUSH_INTERVAL", 5))
+# maximum number of frame groups waiting for insertion before ingestion blocks
+INSERT_QUEUE_SIZE = int(os.getenv("INSERT_QUEUE_SIZE", 16))
+# files whose ingestion started but whose entities are not all inserted yet
+CHECKPOINT_PATH = os.getenv("INGEST_CHECKPOINT_PATH", "/home/user/data/.ingest_checkpoint.json")
+# persisted map from file paths to the ids of their entities in db
+ID_MAP_PATH = os.getenv("ID_MAP_PATH", "/home/user/data/.id_map.db")
 
 
 def create_milvus_data(embedding, meta=None):
@@ -31,7 +49,7 @@ def create_milvus_data(embedding, meta=None):
     return data
 
 class Indexer:
-    def __init__(self):
+    def __init__(self, init_db=True):
         # if not self.check_db_service():
         #     print("DB service is not available. Exiting.")
         #     exit(1)
@@ -42,15 +60,23 @@ class Indexer:
 
         self.model = EmbeddingModel().image_model
         self.ireq = self.model.create_infer_request()
+        # infer requests embedding a group of frames and crops in parallel
+        self.embed_queue = ov.AsyncInferQueue(self.model)
+        self.embed_queue.set_callback(self._on_embedding)
         self.detector = Detector(device=DEVICE)
+        # the infer queues take one producer at a time, ingest workers share them in turn
+        self.infer_lock = threading.Lock()
 
         _, _, self.h, self.w = self.model.inputs[0].shape
 
-        self.init_db_client()
-
-        self.id_map = {}
-
-        self.recover_id_map()
+        if init_db:
+            self.id_map = IdMap(ID_MAP_PATH)
+            self.init_db_client()
+            self.recover_id_map()
+            self.load_checkpoint()
+            self._start_inserter()
+        else:
+            self.id_map = IdMap()
 
     def check_db_service(self, url="http://localhost:9091/healthz"):
         try:
@@ -70,34 +96,46 @@ class Indexer:
         m, dim = self.model.outputs[0].shape
         self.client.create_collection(dim, collection_name=self.collection_name)
 
-    def update_id_map(self, file_path, node_id):
-        if file_path not in self.id_map:
-            self.id_map[file_path] = []
-        self.id_map[file_path].append(node_id)
+    def update_id_map(self, file_path, node_ids):
+        self.id_map.add(file_path, node_ids)
 
     def recover_id_map(self):
-        res = self.client.query_all(self.collection_name, output_fields=["id", "meta"])
-        if not res:
+        # the id map is persisted, it is only rebuilt from db when it is missing or db was cleared
+        if self.client.is_empty(self.collection_name):
             print("No data found in the collection.")
+            self.id_map.clear()
+            return
+        if len(self.id_map):
             return
-        for item in res:
-            if "file_path" in item["meta"]:
-                file_path = item["meta"]["file_path"]
-                if file_path not in self.id_map:
-                    self.id_map[file_path] = []
-                self.id_map[file_path].append(item["id"])
+        print("Rebuilding the id map from the collection.")
+        for res in self.client.iterate_all(self.collection_name, output_fields=["id", "meta"]):
+            self.id_map.add_all(
+                (item["meta"]["file_path"], item["id"]) for item in res if "file_path" in item["meta"]
+            )
+
+    def load_checkpoint(self):
+        self.checkpoint_lock = threading.Lock()
+        self.pending_files = set()
+        if os.path.exists(CHECKPOINT_PATH):
+            with open(CHECKPOINT_PATH, "r") as f:
+                self.pending_files = set(json.load(f).get("pending_files", []))
+        if self.pending_files:
+            print(f"Found {len(self.pending_files)} partially ingested files, they will be ingested again.")
+
+    def update_checkpoint(self, started=(), completed=()):
+        with self.checkpoint_lock:
+            self.pending_files.update(started)
+            self.pending_files.difference_update(completed)
+            tmp_path = f"{CHECKPOINT_PATH}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"pending_files": sorted(self.pending_files)}, f)
+            os.replace(tmp_path, CHECKPOINT_PATH)
 
     def count_files(self):
-        files = set()
-        for key, value in self.id_map.items():
-            if key not in files:  
-                files.add(key)    
-        return len(files)
+        return len(self.id_map)
     
     def query_file(self, file_path):
-        ids = []
-        if file_path in self.id_map:
-            ids = self.id_map[file_path]
+        ids = self.id_map.get(file_path)
 
         res = None
         # TBD: are vector and meta needed from db?
@@ -111,24 +149,22 @@ class Indexer:
         
     
     def delete_by_file_path(self, file_path):
-        ids = []
-        if file_path in self.id_map:
-            ids = self.id_map[file_path]
+        res = None
+        ids = self.id_map.get(file_path)
+        if ids:
             res = self.client.delete(
                 collection_name=self.collection_name,
                 ids=ids,
             )
-            del self.id_map[file_path]
+            self.id_map.remove(file_path)
         else:
             print(f"File {file_path} not found in db.")
         return res, ids
     
     def delete_all(self):
-        if not self.id_map:
+        ids = self.id_map.all_ids()
+        if not ids:
             return None, []
-        ids = []
-        for key, value in self.id_map.items():
-            ids.extend(value)
         res = self.client.delete(
             collection_name=self.collection_name,
             ids=ids,
@@ -137,91 +173,209 @@ class Indexer:
 
         return res, ids
             
-    def process_video(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
+    def _on_embedding(self, request, userdata):
+        results, key = userdata
+        results[key] = request.get_output_tensor(0).data.copy()
+
+    def _start_embedding(self, results, key, image):
+        self.embed_queue.start_async({'x': image[None]}, userdata=(results, key))
+
+    def process_frames(self, frames, do_detect_and_crop=True):
+        """
+        Embed a group of (meta_data, PIL image) frames and their detected crops.
+
+        Frames are embedded while objects are detected, then the crops are embedded,
+        all with parallel infer requests. Frames are preprocessed before taking the infer
+        queues, so that threads ingesting other files preprocess while this one infers.
+        """
         entities = []
-        video = VideoFileClip(video_path)
-
-        frame_counter = 0
-        frame_interval = int(frame_interval)
-        fps = video.fps
-        for frame in video.iter_frames():
-            if frame_counter % frame_interval == 0:
-                image = Image.fromarray(frame)
-                seconds = frame_counter / fps
-                meta_data = copy.deepcopy(meta)
-                meta_data["video_pin_second"] = seconds
-                if do_detect_and_crop:
-                    crops = self.detector.get_cropped_images(image)
-                    for crop in crops:
-                        crop = preprocess_image(crop, shape=[self.w, self.h])
-                        embedding = self.ireq.infer({'x': crop[None]}).to_tuple()[0]
-                        node = create_milvus_data(embedding, meta_data)
-                        entities.append(node)
-                        self.update_id_map(meta_data["file_path"], node["id"])
-                image = preprocess_image(image, shape=[self.w, self.h])
-                embedding = self.ireq.infer({'x': image[None]}).to_tuple()[0]
-                node = create_milvus_data(embedding, meta_data)
+        results = {}
+        images = [image for _, image in frames]
+        inputs = [preprocess_image(image, shape=[self.w, self.h]) for image in images]
+        with self.infer_lock:
+            for index, image in enumerate(inputs):
+                self._start_embedding(results, (index, None), image)
+            crops = self.detector.get_cropped_images_batch(images) if do_detect_and_crop else [[] for _ in images]
+            for index, frame_crops in enumerate(crops):
+                for crop_index, crop in enumerate(frame_crops):
+                    self._start_embedding(results, (index, crop_index), preprocess_image(crop, shape=[self.w, self.h]))
+            self.embed_queue.wait_all()
+
+        node_ids = {}
+        for index, (meta_data, _) in enumerate(frames):
+            keys = [(index, crop_index) for crop_index in range(len(crops[index]))] + [(index, None)]
+            for key in keys:
+                node = create_milvus_data(results[key], meta_data)
                 entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-            frame_counter += 1
-            
+                node_ids.setdefault(meta_data["file_path"], []).append(node["id"])
+        for file_path, ids in node_ids.items():
+            self.update_id_map(file_path, ids)
         return entities
 
+    def process_video_batches(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
+        """
+        Yield the entities of the sampled frames of a video, one group of frames at a time.
+        """
+        frames = sample_video_frames(video_path, frame_interval)
+
+        def next_batch():
+            batch = []
+            for seconds, frame in islice(frames, FRAME_BATCH_SIZE):
+                meta_data = copy.deepcopy(meta)
+                meta_data["video_pin_second"] = seconds
+                batch.append((meta_data, Image.fromarray(frame)))
+            return batch
+
+        # decode the next group of frames while the current one is inferred
+        with ThreadPoolExecutor(max_workers=1) as decoder:
+            pending = decoder.submit(next_batch)
+            while True:
+                batch = pending.result()
+                if not batch:
+                    break
+                pending = decoder.submit(next_batch)
+                yield self.process_frames(batch, do_detect_and_crop)
+
+    def process_video(self, video_path, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
+        batches = self.process_video_batches(video_path, meta, frame_interval, minimal_duration, do_detect_and_crop)
+        return list(chain.from_iterable(batches))
+
     def process_image(self, image_path, meta, do_detect_and_crop=True):
-        entities = []
         image = Image.open(image_path).convert('RGB')
         meta_data = copy.deepcopy(meta)
-        if do_detect_and_crop:
-            crops = self.detector.get_cropped_images(image)
-            for crop in crops:
-                crop = preprocess_image(crop, shape=[self.w, self.h])
-                embedding = self.ireq.infer({'x': crop[None]}).to_tuple()[0]
-                node = create_milvus_data(embedding, meta_data)
-                entities.append(node)
-                self.update_id_map(meta_data["file_path"], node["id"])
-        
-        image = preprocess_image(image, shape=[self.w, self.h])
-        embedding = self.ireq.infer({'x': image[None]}).to_tuple()[0]
-        node = create_milvus_data(embedding, meta_data)
-        entities.append(node)
-        self.update_id_map(meta_data["file_path"], node["id"])
-        return entities
+        return self.process_frames([(meta_data, image)], do_detect_and_crop)
 
     def add_embedding(self, files, metas, **kwargs):
         if len(files) != len(metas):
             raise ValueError(f"Number of files and metas must be the same. files: {len(files)}, metas: {len(metas)}")
         
-        frame_interval = kwargs.get("frame_interval", 15)
+        frame_interval = kwargs.get("frame_extract_interval", kwargs.get("frame_interval", 15))
         minimal_duration = kwargs.get("minimal_duration", 1)
         do_detect_and_crop = kwargs.get("do_detect_and_crop", True)
-        entities = []
-        for file, meta in zip(files, metas):
-            # print("processing file: ", file)
-            if meta["file_path"] in self.id_map:
+        with self.ingest_lock:
+            inserted_count = self.begin_ingest()
+            try:
+                for file, meta in zip(files, metas):
+                    self.ingest_file(file, meta, frame_interval, minimal_duration, do_detect_and_crop)
+            except Exception:
+                self.flush_embedding()
+                raise
+            return self.finish_ingest(inserted_count)
+
+    def begin_ingest(self):
+        # start a bulk load, returns the number of entities inserted so far
+        self.insert_error = None
+        self.ingesting_files = set()
+        return self.inserted_count
+
+    def ingest_file(self, file, meta, frame_interval=15, minimal_duration=1, do_detect_and_crop=True):
+        """
+        Embed a file and submit its entities for insertion. Returns False if the file is skipped.
+
+        Several files of a bulk load can be ingested in parallel threads.
+        """
+        # print("processing file: ", file)
+        if file.lower().endswith(('.mp4')):
+            meta["type"] = "local_video"
+        elif file.lower().endswith(('.jpg', '.png', '.jpeg')):
+            meta["type"] = "local_image"
+        else:
+            print(f"Unsupported file type: {file}. Supported types are: jpg, png, mp4")
+            return False
+
+        file_path = meta["file_path"]
+        with self.checkpoint_lock:
+            if file_path in self.ingesting_files or (file_path in self.id_map and file_path not in self.pending_files):
                 print(f"File {file} already processed, skipping.")
-                continue
-            if file.lower().endswith(('.mp4')):
-                meta["type"] = "local_video"
-                entities.extend(self.process_video(file, meta, frame_interval, minimal_duration, do_detect_and_crop))
-            elif file.lower().endswith(('.jpg', '.png', '.jpeg')):
-                meta["type"] = "local_image"
-                entities.extend(self.process_image(file, meta, do_detect_and_crop))
-            else:
-                print(f"Unsupported file type: {file}. Supported types are: jpg, png, mp4")
+                return False
+            self.ingesting_files.add(file_path)
+        if file_path in self.id_map:
+            # the previous ingestion of this file was interrupted, drop its partial entities
+            print(f"File {file} was partially processed, processing it again.")
+            self.delete_by_file_path(file_path)
+        self.update_checkpoint(started=[file_path])
+
+        if meta["type"] == "local_video":
+            batches = self.process_video_batches(file, meta, frame_interval, minimal_duration, do_detect_and_crop)
+        else:
+            batches = [self.process_image(file, meta, do_detect_and_crop)]
+        for entities in batches:
+            self._submit_embedding(entities)
+        self.insert_queue.put(("completed", file_path))
+        return True
 
+    def finish_ingest(self, inserted_count):
+        # wait for the insertion of the bulk load and build the index once
+        self.flush_embedding()
+        if self.insert_error:
+            raise RuntimeError(f"Failed to insert entities to db: {self.insert_error}")
         res = {}
-        if entities:
-            res = self.client.insert(
-                collection_name=self.collection_name,
-                data=entities,
-            )
+        if self.inserted_count > inserted_count:
+            self._build_index()
+            res = {"insert_count": self.inserted_count - inserted_count}
         return res
 
+    def _start_inserter(self):
+        self.insert_queue = queue.Queue(maxsize=INSERT_QUEUE_SIZE)
+        self.insert_error = None
+        self.inserted_count = 0
+        self.ingest_lock = threading.Lock()
+        self.ingesting_files = set()
+        self.inserter = threading.Thread(target=self._run_inserter, name="milvus-inserter", daemon=True)
+        self.inserter.start()
+
+    def _run_inserter(self):
+        # collect entities from the queue and insert them to db in batches
+        entities = []
+        completed_files = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                kind, item = self.insert_queue.get(timeout=timeout)
+            except queue.Empty:
+                kind, item = "flush", None
+
+            if kind == "entities":
+                if not entities:
+                    deadline = time.monotonic() + INSERT_FLUSH_INTERVAL
+                entities.extend(item)
+            elif kind == "completed":
+                completed_files.append(item)
+
+            if kind == "flush" or len(entities) >= INSERT_BATCH_SIZE or not entities:
+                self._insert(entities, completed_files)
+                entities, completed_files, deadline = [], [], None
+            if kind == "flush" and item is not None:
+                item.set()
+
+    def _insert(self, entities, completed_files):
+        try:
+            if entities:
+                self.client.insert(
+                    collection_name=self.collection_name,
+                    data=entities,
+                )
+                self.inserted_count += len(entities)
+            # a file is completed once all of its entities are inserted without error
+            if completed_files and not self.insert_error:
+                self.update_checkpoint(completed=completed_files)
+        except Exception as e:
+            print(f"Failed to insert {len(entities)} entities to db: {e}")
+            self.insert_error = e
 
     def _submit_embedding(self, entities):
-        # aync thread which collects embeddings and insert to db in batch
-        pass
+        # hand the entities over to the inserter thread, blocks while the queue is full
+        if self.insert_error:
+            raise RuntimeError(f"Failed to insert entities to db: {self.insert_error}")
+        self.insert_queue.put(("entities", entities))
+
+    def flush_embedding(self):
+        # wait until all submitted entities are inserted
+        flushed = threading.Event()
+        self.insert_queue.put(("flush", flushed))
+        flushed.wait()
 
     def _build_index(self):
-        # build index
-        pass
+        # build the index of the bulk loaded entities once and refresh the loaded collection
+        self.client.build_index(self.collection_name)
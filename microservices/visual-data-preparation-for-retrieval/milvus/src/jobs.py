@@ -0,0 +1,142 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+# number of files embedded in parallel, they share the compiled models and infer queues of the indexer
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", os.cpu_count() or 1))
+# number of finished jobs kept for status queries
+INGEST_JOB_HISTORY = int(os.getenv("INGEST_JOB_HISTORY", 100))
+
+
+class IngestJob:
+    def __init__(self, job_id, collect_files, **kwargs):
+        self.job_id = job_id
+        self.collect_files = collect_files
+        self.kwargs = kwargs
+        self.status = "queued"
+        self.error = None
+        self.result = None
+        self.files = OrderedDict()
+        self.errors = {}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def set_file_status(self, file_path, status, error=None):
+        self.files[file_path] = status
+        if error is not None:
+            self.errors[file_path] = error
+
+    def set_embedded_files(self, status, error=None):
+        for file_path in [file_path for file_path, file_status in self.files.items() if file_status == "embedded"]:
+            self.set_file_status(file_path, status, error)
+
+    def to_dict(self):
+        files = dict(self.files)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error,
+            "result": self.result,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "total_files": len(files),
+            "file_counts": dict(Counter(files.values())),
+            "files": [
+                {"file_path": file_path, "status": status, "error": self.errors.get(file_path)}
+                for file_path, status in files.items()
+            ],
+        }
+
+
+class IngestJobManager:
+    """
+    Run ingestion jobs in the background and keep track of their progress.
+
+    Jobs run one after another. The files of a job are embedded by a pool of worker threads
+    sharing the indexer, so that decoding and preprocessing of several files overlap with
+    inference while the request handlers stay responsive. The workers take the infer queues
+    of the indexer in turn.
+    """
+
+    def __init__(self, workers=INGEST_WORKERS, history=INGEST_JOB_HISTORY):
+        self.history = history
+        self.jobs = OrderedDict()
+        self.lock = threading.Lock()
+        self.runner = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-job")
+        self.workers = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ingest-worker")
+
+    def submit(self, indexer, collect_files, **kwargs):
+        """
+        Queue a job ingesting the (file, meta) pairs returned by collect_files.
+        """
+        job = IngestJob(uuid.uuid4().hex, collect_files, **kwargs)
+        with self.lock:
+            self.jobs[job.job_id] = job
+            self._prune()
+        self.runner.submit(self._run, indexer, job)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in ("completed", "failed")]
+        for job_id in finished[:max(0, len(self.jobs) - self.history)]:
+            del self.jobs[job_id]
+
+    def _run(self, indexer, job):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            files = job.collect_files()
+            for _, meta in files:
+                job.set_file_status(meta["file_path"], "pending")
+            with indexer.ingest_lock:
+                inserted_count = indexer.begin_ingest()
+                try:
+                    futures = {
+                        self.workers.submit(self._ingest_file, indexer, job, file, meta): meta["file_path"]
+                        for file, meta in files
+                    }
+                    for future in as_completed(futures):
+                        file_path = futures[future]
+                        try:
+                            ingested = future.result()
+                            # embedded files are completed once their entities are inserted
+                            job.set_file_status(file_path, "embedded" if ingested else "skipped")
+                        except Exception as e:
+                            print(f"Failed to ingest {file_path}: {e}")
+                            job.set_file_status(file_path, "failed", str(e))
+                except Exception:
+                    indexer.flush_embedding()
+                    raise
+                try:
+                    job.result = indexer.finish_ingest(inserted_count)
+                except Exception as e:
+                    job.set_embedded_files("failed", str(e))
+                    raise
+                job.set_embedded_files("completed")
+            job.status = "failed" if job.errors else "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+
+    def _ingest_file(self, indexer, job, file, meta):
+        job.set_file_status(meta["file_path"], "processing")
+        return indexer.ingest_file(file, meta, **job.kwargs)
+
+    def shutdown(self):
+        self.runner.shutdown(wait=True)
+        self.workers.shutdown(wait=True)
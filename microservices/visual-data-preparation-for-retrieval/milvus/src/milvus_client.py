@@ -39,6 +39,18 @@ class MilvusClientWrapper:
         schema.add_field(field_name="vector", datatype=DataType.FLOAT_VECTOR, dim=dim)
         schema.add_field(field_name="meta", datatype=DataType.JSON)
 
+        index_params = self.prepare_index_params()
+
+        self.client.create_collection(
+            collection_name=collection_name,
+            auto_id=False,
+            dimension=dim,
+            index_params=index_params,
+            schema=schema,
+            enable_dynamic_field=True,
+        )
+
+    def prepare_index_params(self):
         index_params = MilvusClient.prepare_index_params()
 
         index_params.add_index(
@@ -49,14 +61,20 @@ class MilvusClientWrapper:
             params={} # No additional parameters required for FLAT
         )
 
-        self.client.create_collection(
-            collection_name=collection_name,
-            auto_id=False,
-            dimension=dim,
-            index_params=index_params,
-            schema=schema,
-            enable_dynamic_field=True,
-        )
+        return index_params
+
+    def build_index(self, collection_name: str):
+        # seal the growing segments so that they are indexed, create the index if it was dropped
+        # and refresh the loaded collection with the new segments
+        self.client.flush(collection_name=collection_name)
+        if "vector_index" not in self.client.list_indexes(collection_name=collection_name):
+            self.client.create_index(
+                collection_name=collection_name,
+                index_params=self.prepare_index_params(),
+            )
+            self.client.load_collection(collection_name=collection_name)
+        else:
+            self.client.refresh_load(collection_name=collection_name)
 
     def insert(self, data: list, collection_name):
         res = self.client.insert(
@@ -90,4 +108,31 @@ class MilvusClientWrapper:
                 output_fields=output_fields
             )
         
-        return res
\ No newline at end of file
+        return res
+    
+    def is_empty(self, collection_name: str):
+        res = self.client.query(
+                collection_name=collection_name,
+                filter="id >= 0",
+                output_fields=["id"],
+                limit=1,
+            )
+
+        return not res
+
+    def iterate_all(self, collection_name: str, output_fields: list = [], batch_size: int = 10000):
+        # page through the whole collection, query_all is limited to the query window of milvus
+        iterator = self.client.query_iterator(
+                collection_name=collection_name,
+                batch_size=batch_size,
+                filter="id >= 0",
+                output_fields=output_fields,
+            )
+        try:
+            while True:
+                res = iterator.next()
+                if not res:
+                    break
+                yield res
+        finally:
+            iterator.close()
@@ -3,6 +3,7 @@
 
 import os
 import uuid
+import cv2
 import numpy as np
 from pathlib import Path
 from PIL import Image
@@ -20,6 +21,48 @@ def preprocess_image(image, shape=[224,224]):
     img = normalize(np.asarray(img))
     return img.transpose(2,0,1)
 
+# seek rather than decode through gaps longer than this many frames. Seeking decodes from
+# the previous keyframe, so it only pays off for gaps longer than a typical GOP
+SEEK_MIN_GAP = int(os.getenv("VIDEO_SEEK_MIN_GAP", 60))
+
+def sample_video_frames(video_path, frame_interval=15):
+    """
+    Decode every frame_interval-th frame of a video.
+
+    Frames in between are grabbed without color conversion, or skipped by seeking when
+    the interval is longer than SEEK_MIN_GAP frames. With the default SEEK_MIN_GAP of 60,
+    the usual intervals of 15 and 30 frames never seek, only grabbing saves time for them.
+    The timestamp of a frame is read from the video when its frame rate is unknown.
+
+    Yields:
+        (seconds, frame) tuples, the frame as an RGB array.
+    """
+    frame_interval = max(int(frame_interval), 1)
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise ValueError(f"Unable to open video {video_path}")
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        position = 0  # index of the next frame to be decoded
+        target = 0
+        while True:
+            if target - position > SEEK_MIN_GAP:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+            while position < target:
+                if not cap.grab():
+                    return
+                position += 1
+            ok, frame = cap.read()
+            if not ok:
+                return
+            position += 1
+            seconds = target / fps if fps > 0 else cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            yield seconds, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            target += frame_interval
+    finally:
+        cap.release()
+
 def generate_unique_id():
     """
     Generate a random unique ID.
@@ -1,4 +1,5 @@
 import os
+import time
 import pytest
 from fastapi import HTTPException
 import requests
@@ -58,6 +59,21 @@ def download_test_data():
         import shutil
         shutil.rmtree(TEST_DATA_PATH)
 
+def wait_for_job(job_id, timeout=600):
+    """
+    Poll an ingest job until it is finished.
+    """
+    url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/jobs/{job_id}"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(url, timeout=10)
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(1)
+    raise TimeoutError(f"Ingest job {job_id} did not finish in {timeout} seconds")
+
 @pytest.fixture(scope="function", autouse=True)
 def clear_db():
     url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/delete_all"  
@@ -76,10 +92,11 @@ def test_ingest_host_dir_api(download_test_data):
     result = {}
 
     response = requests.post(url, json=payload, timeout=10)  
+    assert response.status_code == 202
 
-    result = response.json()
-    response_text = "\n".join(f"{key}: {value}" for key, value in result.items())
-    assert "Files successfully processed" in response_text, "Ingest endpoint did not return expected success message"
+    job = wait_for_job(response.json()["job_id"])
+    assert job["status"] == "completed", f"Ingest job failed: {job}"
+    assert job["file_counts"] == {"completed": len(download_test_data)}
 
     info_url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/info"  
     response = requests.get(info_url, timeout=10)  
@@ -181,7 +198,8 @@ def test_get_file_info_api(download_test_data):
     }
 
     response = requests.post(ingest_url, json=payload, timeout=10)
-    assert response.status_code == 200, "Ingest endpoint failed to process files"
+    assert response.status_code == 202, "Ingest endpoint failed to process files"
+    wait_for_job(response.json()["job_id"])
 
     url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/get"
 
@@ -201,17 +219,17 @@ def test_delete_file_api(download_test_data):
     }
 
     response = requests.post(ingest_url, json=payload, timeout=10)
-    result = response.json()
-    response_text = "\n".join(f"{key}: {value}" for key, value in result.items())
-    assert response.status_code == 200, "Ingest endpoint failed to process files"
+    assert response.status_code == 202, "Ingest endpoint failed to process files"
+    wait_for_job(response.json()["job_id"])
 
+    get_url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/get"
     url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/delete"
 
     for file_path in download_test_data:
+        ingested_ids = requests.get(get_url, params={"file_path": file_path}, timeout=10).json()["ids_in_db"]
         response = requests.delete(url, params={"file_path": file_path}, timeout=10)
         assert response.status_code == 200
-        for ids in response.json()["removed_ids"]:
-            assert str(ids) in response_text, f"File ID {ids} not found in response text after deletion for {file_path}"
+        assert response.json()["removed_ids"] == ingested_ids, f"Removed ids do not match ingested ids for {file_path}"
 
 def test_clear_db_api(download_test_data):
     ingest_url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/ingest"  
@@ -223,7 +241,8 @@ def test_clear_db_api(download_test_data):
     }
 
     response = requests.post(ingest_url, json=payload, timeout=10)
-    assert response.status_code == 200, "Ingest endpoint failed to process files"
+    assert response.status_code == 202, "Ingest endpoint failed to process files"
+    wait_for_job(response.json()["job_id"])
     
     url = f"{BACKEND_DATAPREP_BASE_URL}/v1/dataprep/delete_all"
     response = requests.delete(url, timeout=10)
@@ -0,0 +1,93 @@
+from unittest import mock
+
+from id_map import IdMap
+
+
+def test_add_get_remove():
+    """
+    Test adding, reading and removing the ids of files.
+    """
+    id_map = IdMap()
+    id_map.add("a.mp4", [1, 2, 3])
+    id_map.add_all([("b.jpg", 4), ("c.jpg", 5), ("b.jpg", 6)])
+
+    assert len(id_map) == 3
+    assert "a.mp4" in id_map and "b.jpg" in id_map
+    assert "d.jpg" not in id_map
+    assert sorted(id_map.get("a.mp4")) == [1, 2, 3]
+    assert sorted(id_map.get("b.jpg")) == [4, 6]
+    assert id_map.get("d.jpg") == []
+    assert sorted(id_map.all_ids()) == [1, 2, 3, 4, 5, 6]
+
+    id_map.remove("a.mp4")
+    assert len(id_map) == 2
+    assert "a.mp4" not in id_map
+    assert id_map.get("a.mp4") == []
+    assert sorted(id_map.all_ids()) == [4, 5, 6]
+
+
+def test_add_accumulates_entities():
+    """
+    Test that the entities of a file added in several batches are counted together.
+    """
+    id_map = IdMap()
+    id_map.add("a.mp4", [1, 2])
+    id_map.add("a.mp4", [3])
+    id_map.add_all([("a.mp4", 4)])
+
+    assert len(id_map) == 1
+    assert sorted(id_map.get("a.mp4")) == [1, 2, 3, 4]
+    num_entities = id_map.conn.execute(
+        "SELECT num_entities FROM files WHERE file_path = ?", ("a.mp4",)
+    ).fetchone()[0]
+    assert num_entities == 4
+
+
+def test_clear():
+    """
+    Test clearing the map.
+    """
+    id_map = IdMap()
+    id_map.add("a.mp4", [1, 2])
+    id_map.add("b.jpg", [3])
+    id_map.clear()
+
+    assert len(id_map) == 0
+    assert "a.mp4" not in id_map
+    assert id_map.all_ids() == []
+
+
+def test_persistence(tmp_path):
+    """
+    Test that a file backed map is found again after reopening it.
+    """
+    path = str(tmp_path / "id_map.db")
+    id_map = IdMap(path)
+    id_map.add("a.mp4", [1, 2])
+    id_map.add_all([("b.jpg", 3)])
+    id_map.remove("b.jpg")
+    id_map.conn.close()
+
+    reopened = IdMap(path)
+    assert len(reopened) == 1
+    assert "a.mp4" in reopened and "b.jpg" not in reopened
+    assert sorted(reopened.get("a.mp4")) == [1, 2]
+
+
+def test_recover_id_map_skips_rebuild_when_populated():
+    """
+    Test that a persisted map is not rebuilt from db on startup.
+    """
+    from indexer import Indexer
+
+    indexer = Indexer.__new__(Indexer)
+    indexer.collection_name = "default"
+    indexer.client = mock.Mock()
+    indexer.client.is_empty.return_value = False
+    indexer.id_map = IdMap()
+    indexer.id_map.add("a.mp4", [1, 2])
+
+    indexer.recover_id_map()
+
+    indexer.client.iterate_all.assert_not_called()
+    assert sorted(indexer.id_map.get("a.mp4")) == [1, 2]
@@ -0,0 +1,150 @@
+import json
+import time
+from unittest import mock
+
+import pytest
+
+from id_map import IdMap
+
+
+@pytest.fixture
+def make_indexer(tmp_path, monkeypatch):
+    """
+    Build indexers with a mocked db client, without models, sharing one checkpoint file.
+    """
+    from indexer import Indexer
+
+    monkeypatch.setattr("indexer.CHECKPOINT_PATH", str(tmp_path / "checkpoint.json"))
+    monkeypatch.setattr("indexer.INSERT_BATCH_SIZE", 4)
+    monkeypatch.setattr("indexer.INSERT_FLUSH_INTERVAL", 60)
+
+    def make(id_map=None):
+        indexer = Indexer.__new__(Indexer)
+        indexer.collection_name = "default"
+        indexer.client = mock.Mock()
+        indexer.id_map = id_map if id_map is not None else IdMap()
+        indexer._build_index = mock.Mock()
+        indexer.load_checkpoint()
+        indexer._start_inserter()
+        return indexer
+
+    return make
+
+
+def entities(*ids):
+    return [{"id": id, "meta": {}, "vector": [0.0]} for id in ids]
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def inserted_ids(indexer):
+    return [[entity["id"] for entity in call.kwargs["data"]] for call in indexer.client.insert.call_args_list]
+
+
+def test_insert_flushes_by_size(make_indexer):
+    """
+    Test that entities are inserted once a batch is full, and the rest on flush.
+    """
+    indexer = make_indexer()
+    indexer._submit_embedding(entities(1, 2))
+    indexer._submit_embedding(entities(3, 4))
+    indexer._submit_embedding(entities(5))
+
+    assert wait_for(lambda: indexer.client.insert.called)
+    time.sleep(0.1)
+    assert inserted_ids(indexer) == [[1, 2, 3, 4]]
+
+    indexer.flush_embedding()
+    assert inserted_ids(indexer) == [[1, 2, 3, 4], [5]]
+    assert indexer.inserted_count == 5
+
+
+def test_insert_flushes_by_timeout(make_indexer, monkeypatch):
+    """
+    Test that an incomplete batch is inserted after the flush interval.
+    """
+    monkeypatch.setattr("indexer.INSERT_FLUSH_INTERVAL", 0.1)
+    indexer = make_indexer()
+    indexer._submit_embedding(entities(1))
+
+    assert wait_for(lambda: indexer.client.insert.called)
+    assert inserted_ids(indexer) == [[1]]
+
+
+def test_file_completed_after_insert(make_indexer, tmp_path):
+    """
+    Test that a file leaves the checkpoint only once its entities are inserted.
+    """
+    indexer = make_indexer()
+    indexer.update_checkpoint(started=["/data/a.mp4"])
+    indexer._submit_embedding(entities(1))
+    indexer.insert_queue.put(("completed", "/data/a.mp4"))
+    time.sleep(0.1)
+
+    indexer.client.insert.assert_not_called()
+    assert indexer.pending_files == {"/data/a.mp4"}
+
+    indexer.flush_embedding()
+    assert inserted_ids(indexer) == [[1]]
+    assert indexer.pending_files == set()
+    with open(tmp_path / "checkpoint.json") as f:
+        assert json.load(f) == {"pending_files": []}
+
+
+def test_insert_error_keeps_file_pending(make_indexer, tmp_path):
+    """
+    Test that a file whose entities failed to be inserted stays in the checkpoint.
+    """
+    indexer = make_indexer()
+    indexer.client.insert.side_effect = Exception("db unavailable")
+    inserted_count = indexer.begin_ingest()
+    indexer.update_checkpoint(started=["/data/a.mp4"])
+    indexer._submit_embedding(entities(1))
+    indexer.insert_queue.put(("completed", "/data/a.mp4"))
+
+    with pytest.raises(RuntimeError, match="db unavailable"):
+        indexer.finish_ingest(inserted_count)
+    assert indexer.pending_files == {"/data/a.mp4"}
+    with open(tmp_path / "checkpoint.json") as f:
+        assert json.load(f) == {"pending_files": ["/data/a.mp4"]}
+    with pytest.raises(RuntimeError):
+        indexer._submit_embedding(entities(2))
+
+
+def test_partial_file_ingested_again_on_restart(make_indexer, tmp_path):
+    """
+    Test that the entities of a file interrupted by a restart are deleted and the file ingested again,
+    while a completed file is skipped.
+    """
+    id_map_path = str(tmp_path / "id_map.db")
+    indexer = make_indexer(IdMap(id_map_path))
+    indexer.id_map.add("/data/done.jpg", [1])
+    indexer.update_checkpoint(started=["/data/partial.jpg"])
+    indexer.id_map.add("/data/partial.jpg", [2, 3])
+    # restart before the entities of partial.jpg are all inserted
+
+    indexer = make_indexer(IdMap(id_map_path))
+    assert indexer.pending_files == {"/data/partial.jpg"}
+
+    def process_image(image_path, meta, do_detect_and_crop=True):
+        indexer.update_id_map(meta["file_path"], [4])
+        return entities(4)
+
+    indexer.process_image = mock.Mock(side_effect=process_image)
+    inserted_count = indexer.begin_ingest()
+    assert not indexer.ingest_file("/data/done.jpg", {"file_path": "/data/done.jpg"})
+    assert indexer.ingest_file("/data/partial.jpg", {"file_path": "/data/partial.jpg"})
+    assert indexer.finish_ingest(inserted_count) == {"insert_count": 1}
+
+    indexer.client.delete.assert_called_once()
+    assert sorted(indexer.client.delete.call_args.kwargs["ids"]) == [2, 3]
+    indexer.process_image.assert_called_once()
+    assert inserted_ids(indexer) == [[4]]
+    assert indexer.id_map.get("/data/partial.jpg") == [4]
+    assert indexer.id_map.get("/data/done.jpg") == [1]
+    assert indexer.pending_files == set()
@@ -48,7 +48,7 @@ def test_ingest_host_dir(mock_indexer):
     """
     Test the ingest endpoint.
     """
-    mock_indexer.add_embedding.return_value = "mock_db_response"
+    mock_job = mock.Mock(job_id="mock_job_id")
 
     request_data = {
         "file_dir": "/mock/host/dir",
@@ -56,13 +56,61 @@ def test_ingest_host_dir(mock_indexer):
         "do_detect_and_crop": True,
     }
 
-    with mock.patch("os.path.isdir", return_value=True):
+    with mock.patch("os.path.isdir", return_value=True), \
+            mock.patch("dataprep_visual.job_manager.submit", return_value=mock_job) as mock_submit:
         response = client.post("/v1/dataprep/ingest", json=request_data)
 
-    assert response.status_code == 200
+    assert response.status_code == 202
     assert response.json() == {
-        "message": "Files successfully processed. db returns mock_db_response"
+        "message": "Ingest job mock_job_id submitted.",
+        "job_id": "mock_job_id",
     }
+    assert mock_submit.call_args.kwargs == {"frame_interval": 15, "do_detect_and_crop": True}
+
+
+def test_get_job(mock_indexer):
+    """
+    Test the job progress endpoint.
+    """
+    mock_job = mock.Mock()
+    mock_job.to_dict.return_value = {"job_id": "mock_job_id", "status": "running"}
+
+    with mock.patch("dataprep_visual.job_manager.get", return_value=mock_job):
+        response = client.get("/v1/dataprep/jobs/mock_job_id")
+
+    assert response.status_code == 200
+    assert response.json() == {"job_id": "mock_job_id", "status": "running"}
+
+
+@pytest.mark.parametrize("insert_error", [None, RuntimeError("insert failed")])
+def test_job_file_completed_after_insert(insert_error):
+    """
+    Test that embedded files are completed only once their entities are inserted.
+    """
+    from jobs import IngestJobManager
+
+    job_indexer = mock.MagicMock()
+    job_indexer.begin_ingest.return_value = 0
+    job_indexer.ingest_file.side_effect = lambda file, meta, **kwargs: file != "skipped.png"
+    job_indexer.finish_ingest.side_effect = insert_error
+    job_manager = IngestJobManager(workers=2)
+    job = job_manager.submit(
+        job_indexer, lambda: [(f, {"file_path": f}) for f in ("video.mp4", "skipped.png")]
+    )
+    job_manager.shutdown()
+
+    files = {f["file_path"]: f["status"] for f in job.to_dict()["files"]}
+    assert files == {"video.mp4": "failed" if insert_error else "completed", "skipped.png": "skipped"}
+    assert job.status == ("failed" if insert_error else "completed")
+
+
+def test_get_job_notexist(mock_indexer):
+    """
+    Test the job progress endpoint with an unknown job id.
+    """
+    response = client.get("/v1/dataprep/jobs/notexist")
+
+    assert response.status_code == 404
 
 def test_ingest_host_dir_notexist(mock_indexer):
     """
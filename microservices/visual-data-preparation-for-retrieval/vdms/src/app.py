@@ -1,5 +1,6 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
+import asyncio
 import datetime
 import io
 import pathlib
@@ -16,7 +17,7 @@ from src.common import DataPrepException, Settings, Strings
 from src.core.db import VDMSClient
 from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
 from src.core.minio_client import MinioClient
-from src.core.util import get_minio_client, get_video_from_minio, read_config, store_video_metadata
+from src.core.util import get_config, get_minio_client, get_video_from_minio, store_video_metadata
 from src.core.validation import sanitize_model, validate_params
 from src.core.vclip import vCLIP
 from src.logger import logger
@@ -55,6 +56,30 @@ async def custom_exception_handler(request, exc):
 API Endpoints
 """
 
+# Embedding model shared by all requests
+_embedding_model: vCLIPEmbeddingsWrapper | vCLIP | None = None
+
+
+def get_embedding_model(config: dict) -> vCLIPEmbeddingsWrapper | vCLIP:
+    """
+    Returns the embedding model, created on first use: a client of the multimodal
+    embedding service if its endpoint is configured, else a local vCLIP model.
+    """
+    global _embedding_model
+    if _embedding_model is None:
+        if settings.MULTIMODAL_EMBEDDING_ENDPOINT:
+            _embedding_model = vCLIPEmbeddingsWrapper(
+                api_url=settings.MULTIMODAL_EMBEDDING_ENDPOINT,
+                model_name=settings.MULTIMODAL_EMBEDDING_MODEL_NAME,
+                num_frames=settings.MULTIMODAL_EMBEDDING_NUM_FRAMES,
+                batch_size=settings.MULTIMODAL_EMBEDDING_BATCH_SIZE,
+                concurrency=settings.MULTIMODAL_EMBEDDING_CONCURRENCY,
+            )
+        else:
+            _embedding_model = vCLIP(config["embeddings"])
+
+    return _embedding_model
+
 
 async def generate_embeddings(
     bucket_name: str,
@@ -84,7 +109,7 @@ async def generate_embeddings(
         DataPrepException: If there is an error in the embedding generation process
     """
     # Read configuration
-    config = read_config(settings.CONFIG_FILEPATH, type="yaml")
+    config = get_config()
     if config is None:
         raise Exception(Strings.config_error)
 
@@ -104,15 +129,7 @@ async def generate_embeddings(
     logger.info(f"Metadata generated and saved to {metadata_file}")
 
     # Setup embedding model
-    if settings.MULTIMODAL_EMBEDDING_ENDPOINT:
-        vclip_model = vCLIPEmbeddingsWrapper(
-            api_url=settings.MULTIMODAL_EMBEDDING_ENDPOINT,
-            model_name=settings.MULTIMODAL_EMBEDDING_MODEL_NAME,
-            num_frames=settings.MULTIMODAL_EMBEDDING_NUM_FRAMES,
-        )
-    else:
-        # Get the vclip model
-        vclip_model = vCLIP(config["embeddings"])
+    vclip_model = get_embedding_model(config)
 
     # Initialize VDMS db client
     vdms = VDMSClient(
@@ -124,8 +141,8 @@ async def generate_embeddings(
         embedding_dimensions=vector_dimension,
     )
 
-    # Store the video embeddings in VDMS vector DB
-    ids = vdms.store_embeddings()
+    # Store the video embeddings in VDMS vector DB, off the event loop
+    ids = await asyncio.to_thread(vdms.store_embeddings)
     logger.info(f"Embeddings created for videos: {ids}")
 
     return ids
@@ -273,7 +290,7 @@ async def process_minio_video(
     """
 
     try:
-        config = read_config(settings.CONFIG_FILEPATH, type="yaml")
+        config = get_config()
 
         # Not able to read config file is a fatal error.
         if config is None:
@@ -471,7 +488,7 @@ async def upload_and_process_video(
     """
 
     try:
-        config = read_config(settings.CONFIG_FILEPATH, type="yaml")
+        config = get_config()
 
         # Not able to read config file is a fatal error.
         if config is None:
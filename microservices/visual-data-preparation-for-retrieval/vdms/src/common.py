@@ -42,6 +42,8 @@ class Settings(BaseSettings):
     MULTIMODAL_EMBEDDING_MODEL_NAME: str = "openai/clip-vit-base-patch32"
     MULTIMODAL_EMBEDDING_NUM_FRAMES: int = 64
     MULTIMODAL_EMBEDDING_ENDPOINT: str = ""
+    MULTIMODAL_EMBEDDING_BATCH_SIZE: int = 16  # Video intervals per embedding request
+    MULTIMODAL_EMBEDDING_CONCURRENCY: int = 2  # Embedding requests in flight per video
 
 
 class Strings:
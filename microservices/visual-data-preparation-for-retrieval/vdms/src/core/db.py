@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import pathlib
+import uuid
 from typing import Any
 
 from langchain_community.vectorstores import VDMS
@@ -71,6 +72,10 @@ class VDMSClient:
         Reads the metadata json file. For each video in metdata file
         adds video metadata and its embeddings to the VDMS Vector DB.
 
+        The intervals of a video are embedded in batches, each decoding the video once,
+        and every batch is inserted in VDMS with a single bulk insert while the next
+        batches are embedded.
+
         Args:
             None
 
@@ -87,19 +92,33 @@ class VDMSClient:
         logger.info("Storing embeddings . . .")
         videos_ids: list = []
         try:
-            # Add video embeddings in db for each video
-            for _, (_, data) in enumerate(metadata.items()):
-                paths = [data["video_temp_path"]]
-                del data["video_temp_path"]
-                ids: list = self.video_db.add_videos(
-                    metadatas=[data],
-                    paths=paths,
-                    start_time=[data["timestamp"]],
-                    clip_duration=[data["clip_duration"]],
-                )
-                # Put list of ids returned into final videos_ids list.
-                if ids:
-                    videos_ids.extend(ids)
+            # Group the intervals of each video
+            videos: dict[str, list[dict]] = {}
+            for data in metadata.values():
+                path = str(data.pop("video_temp_path"))
+                data["video_path"] = path
+                videos.setdefault(path, []).append(data)
+
+            for path, intervals in videos.items():
+                stored = 0
+                for embeddings in self.video_embedder.embed_video_intervals(
+                    path,
+                    start_times=[data["timestamp"] for data in intervals],
+                    clip_durations=[data["clip_duration"] for data in intervals],
+                ):
+                    batch = intervals[stored : stored + len(embeddings)]
+                    stored += len(batch)
+                    ids: list = self.video_db.add_from(
+                        texts=["" for _ in batch],
+                        embeddings=embeddings,
+                        ids=[str(uuid.uuid4()) for _ in batch],
+                        metadatas=batch,
+                        batch_size=len(batch),
+                    )
+                    # Put list of ids returned into final videos_ids list.
+                    if ids:
+                        videos_ids.extend(ids)
+                logger.info(f"Stored embeddings of {stored} intervals of {path}")
 
             return videos_ids
         except Exception as ex:
@@ -1,7 +1,7 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 import numpy as np
 import torchvision.transforms as T
@@ -14,6 +14,16 @@ from src.logger import logger
 toPIL = T.ToPILImage()
 
 
+def interval_frame_indices(
+    num_frames: int, fps: float, start_time: float, clip_duration: float, num_frm: int
+) -> np.ndarray:
+    """Uniformly sampled frame indices of a video interval, within the video."""
+    start_idx = int(fps * start_time)
+    end_idx = start_idx + int(fps * clip_duration)
+    frame_idx = np.linspace(start_idx, end_idx, num=num_frm, endpoint=False, dtype=int)
+    return np.clip(frame_idx, 0, num_frames - 1)
+
+
 class vCLIPEmbeddings(BaseModel, Embeddings):
     """MeanCLIP Embeddings model."""
 
@@ -75,6 +85,43 @@ class vCLIPEmbeddings(BaseModel, Embeddings):
 
         return video_features
 
+    def embed_video_intervals(
+        self,
+        path: str,
+        start_times: List[float],
+        clip_durations: List[float],
+        batch_size: int = 16,
+    ) -> Iterator[List[List[float]]]:
+        """Embeds many intervals of a video, opening and decoding the video once.
+
+        Args:
+            path: Path of the video file.
+            start_times: Start time in seconds of each interval.
+            clip_durations: Duration in seconds of each interval.
+            batch_size: Number of intervals embedded per model call.
+
+        Yields:
+            The embeddings of the next ``batch_size`` intervals, in order.
+        """
+        import decord
+
+        decord.bridge.set_bridge("torch")
+        vr = VideoReader(path, ctx=cpu(0))
+        fps = vr.get_avg_fps()
+        for start in range(0, len(start_times), batch_size):
+            intervals_idx = [
+                interval_frame_indices(len(vr), fps, start_time, clip_duration, self.model.num_frm)
+                for start_time, clip_duration in zip(
+                    start_times[start : start + batch_size],
+                    clip_durations[start : start + batch_size],
+                )
+            ]
+            # Decode the frames of the batch in increasing order, each frame once
+            unique_idx = np.unique(np.concatenate(intervals_idx))
+            decoded = dict(zip(unique_idx.tolist(), vr.get_batch(unique_idx.tolist()).numpy()))
+            clips = [[decoded[idx] for idx in frame_idx.tolist()] for frame_idx in intervals_idx]
+            yield self.model.get_video_embeddings(clips).tolist()
+
     def load_video_for_vclip(self, vid_path, num_frm=4, **kwargs):
         # Load video with VideoReader
         import decord
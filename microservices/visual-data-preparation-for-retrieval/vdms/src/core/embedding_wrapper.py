@@ -1,11 +1,14 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any, Dict, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List
 
 import requests
 from langchain_core.embeddings import Embeddings
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+from requests.adapters import HTTPAdapter
 
 from src.common import Strings
 from src.logger import logger
@@ -17,11 +20,22 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
     api_url: str
     model_name: str
     num_frames: int
+    batch_size: int = 16  # video intervals per embedding request
+    concurrency: int = 2  # embedding requests in flight
+
+    _session: requests.Session = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        # Pooled keep-alive connections, reused by all requests of this wrapper
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(self.concurrency, 1))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     def embed_documents(self, texts: List[str]) -> List[List[float]]:
         logger.debug(f"Embedding documents: {texts}")
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}",
                 json={
                     "model": self.model_name,
@@ -41,7 +55,7 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
     def embed_query(self, text: str) -> List[float]:
         logger.debug(f"Embedding query: {text}")
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.api_url}",
                 json={
                     "model": self.model_name,
@@ -69,7 +83,7 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
                     "num_frames": self.num_frames,
                 }
                 logger.debug(f"Segment config for {path}: {segment_config}")
-                response = requests.post(
+                response = self._session.post(
                     f"{self.api_url}",
                     json={
                         "model": self.model_name,
@@ -90,3 +104,69 @@ class vCLIPEmbeddingsWrapper(BaseModel, Embeddings):
         except requests.RequestException as ex:
             logger.error(f"Error in embed_video: {ex}")
             raise Exception(Strings.embedding_error) from ex
+
+    def _embed_segments(self, path: str, segment_configs: List[dict]) -> List[List[float]]:
+        response = self._session.post(
+            f"{self.api_url}",
+            json={
+                "model": self.model_name,
+                "input": {
+                    "type": "video_file_segments",
+                    "video_path": path,
+                    "segment_configs": segment_configs,
+                },
+                "encoding_format": "float",
+            },
+        )
+        logger.debug(f"Response status code: {response.status_code}")
+        response.raise_for_status()
+        return response.json()["embedding"]
+
+    def embed_video_intervals(
+        self,
+        path: str,
+        start_times: List[float],
+        clip_durations: List[float],
+        batch_size: int | None = None,
+    ) -> Iterator[List[List[float]]]:
+        """Embeds many intervals of a video with batched requests.
+
+        Each request embeds ``batch_size`` intervals, read by the embedding service in one
+        pass over the video. Up to ``concurrency`` requests are in flight, so the next
+        batches are embedded while the caller stores the previous ones.
+
+        Args:
+            path: Path of the video file, readable by the embedding service.
+            start_times: Start time in seconds of each interval.
+            clip_durations: Duration in seconds of each interval.
+            batch_size: Number of intervals per request, ``self.batch_size`` by default.
+
+        Yields:
+            The embeddings of the next batch of intervals, in order.
+        """
+        batch_size = batch_size or self.batch_size
+        segment_configs = [
+            {
+                "startOffsetSec": start_time,
+                "clip_duration": clip_duration,
+                "num_frames": self.num_frames,
+            }
+            for start_time, clip_duration in zip(start_times, clip_durations)
+        ]
+        batches = [
+            segment_configs[start : start + batch_size]
+            for start in range(0, len(segment_configs), batch_size)
+        ]
+        logger.debug(f"Embedding {len(segment_configs)} intervals of {path}")
+        try:
+            with ThreadPoolExecutor(max_workers=max(self.concurrency, 1)) as executor:
+                in_flight = deque()
+                for batch in batches:
+                    if len(in_flight) >= max(self.concurrency, 1):
+                        yield in_flight.popleft().result()
+                    in_flight.append(executor.submit(self._embed_segments, path, batch))
+                while in_flight:
+                    yield in_flight.popleft().result()
+        except requests.RequestException as ex:
+            logger.error(f"Error in embed_video_intervals: {ex}")
+            raise Exception(Strings.embedding_error) from ex
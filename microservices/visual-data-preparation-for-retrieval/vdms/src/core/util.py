@@ -53,6 +53,18 @@ def read_config(config_file: str | pathlib.Path, type: str = "yaml") -> dict | N
     return config
 
 
+_config: dict | None = None
+
+
+def get_config() -> dict | None:
+    """Returns the application config. The config file is read once, on first use."""
+    global _config
+    if _config is None:
+        _config = read_config(settings.CONFIG_FILEPATH, type="yaml")
+
+    return _config
+
+
 def save_video_to_temp(data: io.BytesIO, filename: str, temp_dir: str) -> pathlib.Path:
     """Save the video data to a temporary directory.
 
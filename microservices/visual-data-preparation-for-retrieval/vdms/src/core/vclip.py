@@ -4,7 +4,6 @@
 import torch
 import torch.nn as nn
 import torchvision.transforms as T
-from einops import rearrange
 from transformers import AutoProcessor, AutoTokenizer, CLIPModel
 
 from src.logger import logger
@@ -37,15 +36,15 @@ class vCLIP(nn.Module):
         return image_features
 
     def get_video_embeddings(self, frames_batch):
-        """Input is list of list of frames in video."""
-        self.batch_size = len(frames_batch)
-        vid_embs = []
-        for frames in frames_batch:
+        """Input is list of list of frames in video. Frames of all videos are embedded together."""
+        lengths = [len(frames) for frames in frames_batch]
+        frames = [frame for video_frames in frames_batch for frame in video_frames]
+        with torch.no_grad():
             frame_embeddings = self.get_image_embeddings(frames)
-            frame_embeddings = rearrange(frame_embeddings, "(b n) d -> b n d", b=len(frames_batch))
-            # Normalize, mean aggregate and return normalized video_embeddings
-            frame_embeddings = frame_embeddings / frame_embeddings.norm(dim=-1, keepdim=True)
-            video_embeddings = frame_embeddings.mean(dim=1)
-            video_embeddings = video_embeddings / video_embeddings.norm(dim=-1, keepdim=True)
-            vid_embs.append(video_embeddings)
-        return torch.cat(vid_embs, dim=0)
+        # Normalize, mean aggregate and return normalized video_embeddings
+        frame_embeddings = frame_embeddings / frame_embeddings.norm(dim=-1, keepdim=True)
+        video_embeddings = torch.stack(
+            [clip.mean(dim=0) for clip in frame_embeddings.split(lengths)]
+        )
+        video_embeddings = video_embeddings / video_embeddings.norm(dim=-1, keepdim=True)
+        return video_embeddings
@@ -59,17 +59,44 @@ def test_vdms_client_conn(vdms_client):
 
 def test_store_embedding(vdms_client, mocker, tmp_path):
     """
-    Test create_embedding methods of VDMSClient
+    Test create_embeddings methods of VDMSClient
     """
     mock_data = {"video_temp_path": tmp_path, "timestamp": "time", "clip_duration": 30}
     mock_metadata = {"video": mock_data}
-    paths = [mock_data["video_temp_path"]]
     mocker.patch("src.core.db.read_config", return_value=mock_metadata)
-    vdms_client.store_embeddings()
+    vdms_client.video_embedder = mocker.MagicMock()
+    vdms_client.video_embedder.embed_video_intervals.return_value = iter([[[0.1, 0.2]]])
+    vdms_client.video_db.add_from.return_value = ["id"]
+
+    assert vdms_client.store_embeddings() == ["id"]
     src.core.db.read_config.assert_called_once_with(vdms_client.video_metadata_path, type="json")
-    vdms_client.video_db.add_videos.assert_called_once_with(
-        metadatas=[mock_data],
-        paths=paths,
-        start_time=[mock_data["timestamp"]],
-        clip_duration=[mock_data["clip_duration"]],
+    vdms_client.video_embedder.embed_video_intervals.assert_called_once_with(
+        str(tmp_path), start_times=["time"], clip_durations=[30]
     )
+    kwargs = vdms_client.video_db.add_from.call_args.kwargs
+    assert kwargs["embeddings"] == [[0.1, 0.2]]
+    assert kwargs["metadatas"] == [
+        {"timestamp": "time", "clip_duration": 30, "video_path": str(tmp_path)}
+    ]
+
+
+def test_store_embeddings_in_batches(vdms_client, mocker):
+    """
+    Test that the intervals of a video are embedded once and inserted batch by batch
+    """
+    mock_metadata = {
+        f"video_{i}": {"video_temp_path": "video.mp4", "timestamp": i * 30, "clip_duration": 10}
+        for i in range(3)
+    }
+    mocker.patch("src.core.db.read_config", return_value=mock_metadata)
+    vdms_client.video_embedder = mocker.MagicMock()
+    vdms_client.video_embedder.embed_video_intervals.return_value = iter([[[0.1], [0.2]], [[0.3]]])
+    vdms_client.video_db.add_from.side_effect = lambda **kwargs: kwargs["ids"]
+
+    ids = vdms_client.store_embeddings()
+
+    assert len(ids) == 3
+    vdms_client.video_embedder.embed_video_intervals.assert_called_once()
+    batches = [call.kwargs for call in vdms_client.video_db.add_from.call_args_list]
+    assert [batch["embeddings"] for batch in batches] == [[[0.1], [0.2]], [[0.3]]]
+    assert [meta["timestamp"] for meta in batches[1]["metadatas"]] == [60]
@@ -4,6 +4,7 @@
 import pytest
 
 from src.core.embedding import vCLIPEmbeddings
+from src.core.embedding_wrapper import vCLIPEmbeddingsWrapper
 
 
 def test_validate_environment():
@@ -29,3 +30,26 @@ def test_validate_environment_handle_import_error(mocker):
     mocker.patch("src.core.embedding.ValueError", side_effect=ImportError)
     with pytest.raises(ImportError):
         vCLIPEmbeddings.validate_environment(values)
+
+
+def test_wrapper_embeds_intervals_in_batches(mocker):
+    wrapper = vCLIPEmbeddingsWrapper(
+        api_url="http://embedding/embeddings", model_name="clip", num_frames=8, batch_size=2
+    )
+
+    def post(url, json):
+        response = mocker.MagicMock()
+        configs = json["input"]["segment_configs"]
+        response.json.return_value = {"embedding": [[c["startOffsetSec"]] for c in configs]}
+        return response
+
+    mocker.patch.object(wrapper._session, "post", side_effect=post)
+    batches = list(
+        wrapper.embed_video_intervals("video.mp4", start_times=[0, 30, 60], clip_durations=[10] * 3)
+    )
+
+    assert batches == [[[0], [30]], [[60]]]
+    assert wrapper._session.post.call_count == 2
+    request = wrapper._session.post.call_args_list[0].kwargs["json"]
+    assert request["input"]["type"] == "video_file_segments"
+    assert request["input"]["segment_configs"][0]["num_frames"] == 8
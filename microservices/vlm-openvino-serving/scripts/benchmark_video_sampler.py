@@ -0,0 +1,117 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Benchmark video loading of base64 video_url inputs with concurrent requests.
+
+Compares the previous path, which wrote each video to /tmp and decoded all of its
+frames, with the single pass sampler of src.utils.video_sampler.
+
+Usage (from the vlm-openvino-serving directory):
+    python scripts/benchmark_video_sampler.py --duration 60 --concurrency 1 5 20
+"""
+
+import argparse
+import base64
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+os.environ.setdefault("VLM_MODEL_NAME", "benchmark")
+os.environ.setdefault("http_proxy", "")
+os.environ.setdefault("https_proxy", "")
+os.environ.setdefault("no_proxy_env", "")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cv2
+import numpy as np
+from PIL import Image
+from src.utils.video_sampler import default_max_pixels, frame_indices, load_video_frames
+
+
+def make_clip(path: Path, duration: int, fps: int, width: int, height: int):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+    for i in range(duration * fps):
+        writer.write(np.roll(noise, i * 4, axis=1))
+    writer.release()
+
+
+def load_previous(data_url: str, fps: float):
+    """Previous path: write the video to /tmp, then decode every frame."""
+    video_path = Path(tempfile.gettempdir()) / f"{uuid.uuid4()}.mp4"
+    video_path.write_bytes(base64.b64decode(data_url.split(",")[1]))
+    try:
+        capture = cv2.VideoCapture(str(video_path))
+        total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_fps = capture.get(cv2.CAP_PROP_FPS)
+        decoded = []
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            decoded.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        capture.release()
+        indices = frame_indices(total_frames, video_fps, fps)
+        max_pixels = default_max_pixels(len(indices))
+        frames = []
+        for index in indices:
+            image = Image.fromarray(decoded[min(index, len(decoded) - 1)])
+            scale = min(1.0, (max_pixels / (image.width * image.height)) ** 0.5)
+            frames.append(
+                image.resize((int(image.width * scale), int(image.height * scale)))
+            )
+        return frames
+    finally:
+        video_path.unlink()
+
+
+def load_streaming(data_url: str, fps: float):
+    frames, _, _ = load_video_frames(data_url, fps=fps)
+    return frames
+
+
+def run(loader, data_url: str, fps: float, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: loader(data_url, fps), range(concurrency)))
+    elapsed = time.perf_counter() - start
+    assert all(len(frames) == len(results[0]) for frames in results)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=int, default=60, help="clip length in seconds")
+    parser.add_argument("--video-fps", type=int, default=30)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=float, default=2.0, help="sampling rate")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        clip = Path(workdir) / "clip.mp4"
+        make_clip(clip, args.duration, args.video_fps, args.width, args.height)
+        data_url = "data:video/mp4;base64," + base64.b64encode(clip.read_bytes()).decode()
+    print(
+        f"{args.duration}s clip, {args.width}x{args.height} at {args.video_fps} fps, "
+        f"{len(data_url) / 2**20:.1f} MiB base64, sampled at {args.fps} fps"
+    )
+    print(f"{'concurrency':>11} {'previous (s)':>13} {'streaming (s)':>14} {'speedup':>8}")
+    for concurrency in args.concurrency:
+        previous = run(load_previous, data_url, args.fps, concurrency)
+        streaming = run(load_streaming, data_url, args.fps, concurrency)
+        print(
+            f"{concurrency:>11} {previous:>13.2f} {streaming:>14.2f} "
+            f"{previous / streaming:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
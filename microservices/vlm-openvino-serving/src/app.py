@@ -8,14 +8,12 @@ import time
 import uuid
 import warnings
 from contextlib import asynccontextmanager
-from multiprocessing import Manager
 from pathlib import Path
-from threading import Thread
 
 import openvino_genai as ov_genai
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi_utils.tasks import repeat_every
 from optimum.intel.openvino import OVModelForVisualCausalLM
 from qwen_vl_utils import process_vision_info
@@ -34,8 +32,9 @@ from src.utils.data_models import (
     ModelsResponse,
 )
 from src.utils.utils import (
+    close_http_session,
     convert_model,
-    decode_and_save_video,
+    enable_vision_embedding_cache,
     get_device_property,
     get_devices,
     is_model_ready,
@@ -44,8 +43,16 @@ from src.utils.utils import (
     setup_seed,
     validate_video_inputs,
 )
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from src.utils.chat_session import ChatSession, conversation_turns
+from src.utils.image_cache import ImageCache
+from src.utils.metrics import RequestMetrics
+from src.utils.scheduler import (
+    FirstTokenStreamer,
+    GenerationJob,
+    QueueFullError,
+    RequestScheduler,
+)
+from src.utils.video_sampler import VIDEO_MIN_PIXELS, load_video_frames
 from starlette.responses import StreamingResponse
 from transformers import AutoProcessor, AutoTokenizer, TextIteratorStreamer
 
@@ -53,10 +60,21 @@ from transformers import AutoProcessor, AutoTokenizer, TextIteratorStreamer
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 
-manager = Manager()
-active_requests = manager.Value("i", 0)
-queued_requests = manager.Value("i", 0)
-request_lock = manager.Lock()
+# Request counters and latency histogram shared by the server workers
+request_metrics = RequestMetrics()
+
+# Runs chat completion requests on the model pipeline
+scheduler = RequestScheduler(
+    max_queue_size=settings.VLM_MAX_QUEUE_SIZE,
+    max_batch_size=settings.VLM_MAX_BATCH_SIZE,
+    batch_timeout=settings.VLM_BATCH_TIMEOUT_MS / 1000,
+    on_queue_size=request_metrics.set_queued,
+)
+
+# Conversation held in the KV cache of the VLM pipeline, and vision encoder outputs of
+# the optimum models by image content
+chat_session = ChatSession(settings.VLM_CHAT_SESSION_MAX_TURNS)
+vision_embedding_cache = ImageCache(settings.VLM_VISION_CACHE_SIZE_MB * 1024 * 1024)
 
 
 @asynccontextmanager
@@ -73,14 +91,16 @@ async def lifespan(app: FastAPI):
 
     @repeat_every(seconds=2)
     async def log_request_counts():
-        if active_requests.value > 0 or queued_requests.value > 0:
+        metrics = request_metrics.snapshot()
+        if metrics["active_requests"] > 0 or metrics["queued_requests"] > 0:
             logger.info(
-                f"Active requests: {active_requests.value}, Queued requests: {queued_requests.value}"
+                f"Active requests: {metrics['active_requests']}, Queued requests: {metrics['queued_requests']}"
             )
 
     log_task = asyncio.create_task(log_request_counts())
     yield
     log_task.cancel()
+    await close_http_session()
 
 
 app = FastAPI(lifespan=lifespan)
@@ -95,9 +115,10 @@ app.add_middleware(
     allow_headers=os.getenv("VLM_CORS_ALLOW_HEADERS", "*").split(","),
 )
 
-class RequestQueueMiddleware(BaseHTTPMiddleware):
+class RequestMetricsMiddleware:
     """
-    Middleware to manage request queuing and active request tracking.
+    ASGI middleware recording active requests, status codes and latency of chat completion
+    requests. The request body is not read, it is streamed to the endpoint untouched.
     """
 
     def __init__(self, app):
@@ -105,60 +126,43 @@ class RequestQueueMiddleware(BaseHTTPMiddleware):
         Initialize the middleware.
 
         Args:
-            app: The FastAPI application instance.
+            app: The ASGI application to wrap.
         """
-        super().__init__(app)
-        logger.info(f"RequestQueueMiddleware initialized in process: {os.getpid()}")
+        self.app = app
+        logger.info(f"RequestMetricsMiddleware initialized in process: {os.getpid()}")
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope, receive, send):
         """
-        Handle incoming requests and manage the request queue.
+        Handle an ASGI request, recording metrics for chat completion requests.
 
         Args:
-            request (Request): The incoming HTTP request.
-            call_next: The next middleware or endpoint to call.
-
-        Returns:
-            Response: The HTTP response.
+            scope: The ASGI connection scope.
+            receive: The ASGI receive channel.
+            send: The ASGI send channel.
         """
-        if request.url.path == "/v1/chat/completions":
-            method = request.method
-            url = request.url
-            headers = dict(request.headers)
-            query_params = dict(request.query_params)
-            body = await request.body()  # Read the body (if applicable)
-
-            # Log the complete request details
-            logger.debug(f"Request Method: {method}")
-            logger.debug(f"Request URL: {url}")
-            logger.debug(f"Request Headers: {headers}")
-            logger.debug(f"Request Query Params: {query_params}")
-            logger.debug(f"Request Body: {body.decode('utf-8') if body else 'No Body'}")
-            with request_lock:
-                queued_requests.value += 1
-                logger.info(
-                    f"Queued requests incremented: {queued_requests.value} (Process: {os.getpid()})"
-                )
-            try:
-                with request_lock:
-                    active_requests.value += 1
-                    queued_requests.value -= 1
-                    logger.info(
-                        f"Active requests incremented: {active_requests.value}, Queued requests decremented: {queued_requests.value} (Process: {os.getpid()})"
-                    )
-                response = await call_next(request)
-            finally:
-                with request_lock:
-                    active_requests.value -= 1
-                    logger.info(
-                        f"Active requests decremented: {active_requests.value} (Process: {os.getpid()})"
-                    )
-        else:
-            response = await call_next(request)
-        return response
+        if scope["type"] != "http" or scope["path"] != "/v1/chat/completions":
+            await self.app(scope, receive, send)
+            return
+
+        logger.debug(
+            f"Request: {scope['method']} {scope['path']} {scope['query_string'].decode('latin-1')}"
+        )
+        status_code = 500
+        started_at = request_metrics.request_started()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.request_finished(started_at, status_code)
 
-app.add_middleware(RequestQueueMiddleware)
+
+app.add_middleware(RequestMetricsMiddleware)
 
 
 @app.get("/v1/queue-status")
@@ -167,11 +171,13 @@ async def queue_status():
     Get the current status of the request queue.
 
     Returns:
-        JSONResponse: A JSON response containing the number of active and queued requests.
+        JSONResponse: A JSON response containing the number of active and queued requests
+        over all workers, and the scheduler state with the timing of recent requests of
+        this worker.
     """
-    with request_lock:
-        active = active_requests.value
-        queued = queued_requests.value
+    metrics = request_metrics.snapshot()
+    active = metrics["active_requests"]
+    queued = metrics["queued_requests"]
     logger.info(
         f"Queue status - Active requests: {active}, Queued requests: {queued} (Process: {os.getpid()})"
     )
@@ -180,10 +186,27 @@ async def queue_status():
         content={
             "active_requests": active,
             "queued_requests": queued,
+            "scheduler": scheduler.status(),
         },
     )
 
 
+if settings.VLM_METRICS_ENDPOINT_ENABLED:
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics():
+        """
+        Get request metrics of all workers in the Prometheus text format.
+
+        Returns:
+            PlainTextResponse: Request counters, gauges and the request latency histogram.
+        """
+        return PlainTextResponse(
+            request_metrics.prometheus(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+
 model_ready = False
 pipe, processor, model_dir = None, None, None
 
@@ -269,6 +292,8 @@ def initialize_model():
         else:
             pipe = ov_genai.VLMPipeline(model_dir, device=settings.VLM_DEVICE.upper(), **ov_config)
             processor = None  # No processor needed for this case
+        if processor is not None:
+            enable_vision_embedding_cache(pipe, vision_embedding_cache)
         model_ready = is_model_ready(model_dir)
         logger.debug("Model is ready")
     except Exception as e:
@@ -288,18 +313,185 @@ def safe_generate(pipe, generation_kwargs, streamer):
         pipe: The model pipeline.
         generation_kwargs: The generation configuration arguments.
         streamer: The streamer to handle output tokens.
+
+    Returns:
+        The generated token ids.
+
+    Raises:
+        Exception: The generation error, once the streamer is ended.
     """
     try:
-        pipe.generate(**generation_kwargs)
+        return pipe.generate(**generation_kwargs)
     except Exception as e:
         logger.error(f"Exception in thread during generation: {e}")
         streamer.end_of_stream = True  # Signal the streamer to stop
+        streamer.end()  # Unblock the response iterating over the streamer
         if ErrorMessages.GPU_OOM_ERROR_MESSAGE in str(e):
             logger.error("Detected GPU out-of-memory error, restarting server...")
             restart_server()
+        raise
+
+
+def count_generated_tokens(token_ids):
+    """
+    Count generated tokens, ignoring the padding of batched outputs.
+
+    Args:
+        token_ids: Generated token ids, without the prompt tokens.
+
+    Returns:
+        int: The number of generated tokens.
+    """
+    pad_token_id = processor.tokenizer.pad_token_id
+    if pad_token_id is None:
+        return int(token_ids.numel())
+    return int((token_ids != pad_token_id).sum())
+
+
+def run_generate(jobs):
+    """
+    Scheduler task running a single request with prepared processor inputs.
+
+    Streaming requests receive their output through the streamer in the generation
+    arguments, other requests are resolved with the decoded output.
+
+    Args:
+        jobs: The scheduled job, as a batch of one.
+    """
+    job = jobs[0]
+    setup_seed(job.payload["seed"])
+    generation_kwargs = job.payload["generation_kwargs"]
+    prompt_length = generation_kwargs["input_ids"].shape[1]
+    streamer = generation_kwargs.get("streamer")
+    if streamer is not None:
+        try:
+            output_ids = safe_generate(pipe, generation_kwargs, streamer)
+        except Exception as e:
+            job.fail(e)
+            return
+        job.finish(None, count_generated_tokens(output_ids[:, prompt_length:]))
+        return
+    output_ids = pipe.generate(**generation_kwargs, streamer=FirstTokenStreamer(jobs))
+    token_ids = output_ids[:, prompt_length:]
+    output = processor.batch_decode(
+        token_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False
+    )[0]
+    job.finish(output, count_generated_tokens(token_ids))
+
+
+def run_qwen_batch(jobs):
+    """
+    Scheduler task running compatible Qwen text and image requests in one generate call.
+
+    Jobs of a batch share the seed, the generation parameters and the image resolutions.
+
+    Args:
+        jobs: The scheduled jobs.
+    """
+    setup_seed(jobs[0].payload["seed"])
+    images = [image for job in jobs for image in job.payload["images"]]
+    # Batched prompts are padded on the left so generation continues each row. It is set
+    # per call, the processor is shared with requests that are not batched
+    inputs = processor(
+        text=[job.payload["text"] for job in jobs],
+        images=images or None,
+        padding=True,
+        padding_side="left",
+        return_tensors="pt",
+    )
+    output_ids = pipe.generate(
+        **inputs,
+        **jobs[0].payload["generation_kwargs"],
+        streamer=FirstTokenStreamer(jobs),
+    )
+    token_ids = output_ids[:, inputs["input_ids"].shape[1]:]
+    outputs = processor.batch_decode(
+        token_ids, skip_special_tokens=True, clean_up_tokenization_spaces=False
+    )
+    for job, output, row in zip(jobs, outputs, token_ids):
+        job.finish(output, count_generated_tokens(row))
+
+
+def run_vlm_pipeline(jobs):
+    """
+    Scheduler task running a single request on the OpenVINO GenAI VLM pipeline.
+
+    The pipeline runs in chat mode. A request continuing the conversation of the previous
+    request only prefills its new message, other requests restart the chat.
+
+    Args:
+        jobs: The scheduled job, as a batch of one.
+    """
+    job = jobs[0]
+    setup_seed(job.payload["seed"])
+    turns = job.payload["turns"]
+    if chat_session.enabled:
+        # Follow-up questions reuse the KV cache of the previous turns
+        chat_session.prepare(pipe, turns)
+    generate_kwargs = {"generation_config": job.payload["config"]}
+    if job.payload["images"] is not None:
+        generate_kwargs["images"] = job.payload["images"]
+    try:
+        output = pipe.generate(job.payload["prompt"], **generate_kwargs)
+    except Exception:
+        if chat_session.enabled:
+            chat_session.finish(pipe)
+        raise
+    if chat_session.enabled:
+        chat_session.record(turns, str(output))
+    generated_tokens = None
+    perf_metrics = getattr(output, "perf_metrics", None)
+    if perf_metrics is not None:
+        generated_tokens = perf_metrics.get_num_generated_tokens()
+        job.mark_first_token(job.started_at + perf_metrics.get_ttft().mean / 1000)
+    job.finish(output, generated_tokens)
+
+
+async def generate_from_inputs(request, inputs, seed):
+    """
+    Schedule a request with prepared processor inputs.
+
+    Args:
+        request: The incoming request.
+        inputs: The processor outputs for the request.
+        seed: The random seed of the request.
+
+    Returns:
+        StreamingResponse for streaming requests, otherwise the generated text.
+    """
+    generation_kwargs = dict(
+        **inputs,
+        max_new_tokens=request.max_completion_tokens,
+        top_p=request.top_p,
+        top_k=request.top_k,
+        do_sample=request.do_sample,
+        temperature=request.temperature,
+        eos_token_id=processor.tokenizer.eos_token_id,
+    )
+    if request.stream:
+        streamer = TextIteratorStreamer(
+            processor,
+            skip_special_tokens=True,
+            skip_prompt=True,
+            clean_up_tokenization_spaces=False,
+        )
+        generation_kwargs["streamer"] = streamer
+        job = scheduler.submit(
+            GenerationJob(
+                run_generate, {"seed": seed, "generation_kwargs": generation_kwargs}
+            )
+        )
+        return create_streaming_response(
+            streamer, request, settings.VLM_MODEL_NAME, job
+        )
+    return await scheduler.run(
+        GenerationJob(
+            run_generate, {"seed": seed, "generation_kwargs": generation_kwargs}
+        )
+    )
 
 
-def create_streaming_response(streamer, request, model_name):
+def create_streaming_response(streamer, request, model_name, job=None):
     """
     Create a StreamingResponse for the given streamer.
 
@@ -307,6 +499,7 @@ def create_streaming_response(streamer, request, model_name):
         streamer: The streamer to handle output tokens.
         request: The incoming request.
         model_name: The name of the model.
+        job: The scheduled job filling the streamer, used to record the first token time.
 
     Returns:
         StreamingResponse: The streaming response.
@@ -315,7 +508,14 @@ def create_streaming_response(streamer, request, model_name):
     async def event_stream():
         buffer = ""
         completion_id = str(uuid.uuid4())
-        for new_text in streamer:
+        tokens = iter(streamer)
+        while True:
+            # Wait for tokens off the event loop, the request may still be queued
+            new_text = await asyncio.to_thread(next, tokens, None)
+            if new_text is None:
+                break
+            if job is not None:
+                job.mark_first_token()
             buffer += new_text
             logger.debug(new_text)
             yield (
@@ -364,17 +564,18 @@ async def chat_completions(request: ChatRequest):
     """
     Handle chat completion requests.
 
+    Requests are run by the request scheduler. A request is rejected with status 429 when
+    the scheduler queue is full.
+
     Args:
         request (ChatRequest): The chat request containing messages, model, and generation parameters.
 
     Returns:
         JSONResponse or StreamingResponse: The chat completion response.
     """
-    temp_video_path = None  # Track the temporary video file path
     try:
         # Use the provided seed if available, otherwise use the default seed from settings
         seed = request.seed if request.seed is not None else settings.SEED
-        setup_seed(seed)
 
         global pipe, processor, model_dir
         logger.info("Received a chat completion request.")
@@ -428,14 +629,16 @@ async def chat_completions(request: ChatRequest):
                     elif isinstance(content, MessageContentVideoUrl):
                         logger.info("Found MessageContentVideoUrl")
                         video_url = content.video_url.get("url")
-                        if video_url.startswith("data:video/mp4;base64,"):
-                            logger.info("Decoding base64-encoded video URL")
-                            temp_video_path = decode_and_save_video(video_url)
-                            video_url = temp_video_path
                         max_pixels = content.max_pixels
                         fps = content.fps
+        # Keep base64 videos out of the logs
+        video_source = (
+            "base64 video"
+            if video_url and video_url.startswith("data:")
+            else video_url
+        )
         logger.debug(
-            f"len(image_urls)={len(image_urls)}, len(video_frames)={len(video_frames)}, video_url={video_url}, max_pixels={max_pixels}, fps={fps}, len(prompt): {len(prompt)}"
+            f"len(image_urls)={len(image_urls)}, len(video_frames)={len(video_frames)}, video_url={video_source}, max_pixels={max_pixels}, fps={fps}, len(prompt): {len(prompt)}"
         )
 
         if not prompt:
@@ -445,7 +648,7 @@ async def chat_completions(request: ChatRequest):
             )
         else:
             logger.info(
-                f"Processing request with {len(image_urls)} image(s), {len(video_frames)} video frame(s), video_url={video_url}, and a prompt."
+                f"Processing request with {len(image_urls)} image(s), {len(video_frames)} video frame(s), video_url={video_source}, and a prompt."
             )
 
         config_kwargs = {
@@ -503,52 +706,9 @@ async def chat_completions(request: ChatRequest):
                 logger.debug(f"formatted_prompt: {formatted_prompt}")
                 inputs = processor(formatted_prompt, return_tensors="pt")
 
-            streamer = TextIteratorStreamer(
-                processor,
-                skip_special_tokens=True,
-                skip_prompt=True,
-                clean_up_tokenization_spaces=False,
-            )
-            generation_kwargs = dict(
-                **inputs,
-                streamer=streamer,
-                max_new_tokens=request.max_completion_tokens,
-                top_p=request.top_p,
-                top_k=request.top_k,
-                do_sample=request.do_sample,
-                temperature=request.temperature,
-                eos_token_id=processor.tokenizer.eos_token_id,
-            )
-
-            thread = Thread(
-                target=safe_generate, args=(pipe, generation_kwargs, streamer)
-            )
-            thread.start()
-
-            if request.stream:
-                return create_streaming_response(
-                    streamer, request, settings.VLM_MODEL_NAME
-                )
-            else:
-                buffer = ""
-                for new_text in streamer:
-                    buffer += new_text
-                    logger.debug(new_text)
-                return ChatCompletionResponse(
-                    id=str(uuid.uuid4()),
-                    object="chat.completion",
-                    created=int(time.time()),
-                    model=request.model,
-                    choices=[
-                        ChatCompletionChoice(
-                            index=0,
-                            message=ChatCompletionDelta(
-                                role="assistant", content=str(buffer)
-                            ),
-                            finish_reason="stop",
-                        )
-                    ],
-                )
+            output = await generate_from_inputs(request, inputs, seed)
+            if isinstance(output, StreamingResponse):
+                return output
 
         elif ModelNames.QWEN in settings.VLM_MODEL_NAME.lower():
             logger.info(f"Using {ModelNames.QWEN} model for processing.")
@@ -557,6 +717,7 @@ async def chat_completions(request: ChatRequest):
                 tok = AutoTokenizer.from_pretrained(model_dir)
                 processor.chat_template = tok.chat_template
 
+            image_inputs, video_inputs, video_kwargs = None, None, {}
             if len(image_urls) == 0 and video_url is None and len(video_frames) == 0:
                 logger.info("processing as text prompt")
                 # Create formatted_messages only for MessageContentText or str
@@ -576,11 +737,6 @@ async def chat_completions(request: ChatRequest):
                     formatted_messages, tokenize=False, add_generation_prompt=True
                 )
                 logger.debug(f"text: {text}")
-                inputs = processor(
-                    text=[text],
-                    padding=True,
-                    return_tensors="pt",
-                )
             elif len(image_urls) > 0:
                 logger.info("processing as single/multiple image prompt")
                 messages = [
@@ -596,13 +752,6 @@ async def chat_completions(request: ChatRequest):
                     messages, tokenize=False, add_generation_prompt=True
                 )
                 image_inputs, video_inputs = process_vision_info(messages)
-                inputs = processor(
-                    text=[text],
-                    images=image_inputs,
-                    videos=video_inputs,
-                    padding=True,
-                    return_tensors="pt",
-                )
             elif len(video_frames) > 0:
                 logger.info("processing as video (list of image frames)")
                 messages = [
@@ -620,32 +769,40 @@ async def chat_completions(request: ChatRequest):
                 image_inputs, video_inputs, video_kwargs = process_vision_info(
                     messages, return_video_kwargs=True
                 )
-                inputs = processor(
-                    text=[text],
-                    images=image_inputs,
-                    videos=video_inputs,
-                    # fps=fps,
-                    padding=True,
-                    return_tensors="pt",
-                    **video_kwargs,
-                )
             elif video_url:
                 logger.info("processing as video_url")
-                # video_frames = await load_video(video_url)
-                video_content = {
-                    "type": "video",
-                    "video": video_url,
-                }
-                if max_pixels is not None:
-                    if isinstance(max_pixels, str):
-                        try:
-                            max_pixels = eval(max_pixels)
-                        except Exception as e:
-                            logger.error(f"Failed to evaluate max_pixels: {e}")
-                            raise ValueError(f"Invalid max_pixels format: {max_pixels}")
-                    video_content["max_pixels"] = max_pixels
-                if fps is not None:
-                    video_content["fps"] = fps
+                if isinstance(max_pixels, str):
+                    try:
+                        max_pixels = eval(max_pixels)
+                    except Exception as e:
+                        logger.error(f"Failed to evaluate max_pixels: {e}")
+                        raise ValueError(f"Invalid max_pixels format: {max_pixels}")
+                if video_url.startswith(("http://", "https://")):
+                    video_content = {
+                        "type": "video",
+                        "video": video_url,
+                    }
+                    if max_pixels is not None:
+                        video_content["max_pixels"] = max_pixels
+                    if fps is not None:
+                        video_content["fps"] = fps
+                else:
+                    # Sample base64 and local videos in a single streaming pass, without
+                    # writing them to disk or decoding frames that are not sampled
+                    sampled_frames, sample_fps, frame_max_pixels = await asyncio.to_thread(
+                        load_video_frames,
+                        video_url,
+                        fps,
+                        max_pixels,
+                        settings.VLM_VIDEO_SPOOL_MAX_MB * 1024 * 1024,
+                    )
+                    video_content = {
+                        "type": "video",
+                        "video": sampled_frames,
+                        "fps": sample_fps,
+                        "min_pixels": min(VIDEO_MIN_PIXELS, frame_max_pixels),
+                        "max_pixels": frame_max_pixels,
+                    }
 
                 messages = [
                     {
@@ -662,15 +819,6 @@ async def chat_completions(request: ChatRequest):
                 image_inputs, video_inputs, video_kwargs = process_vision_info(
                     messages, return_video_kwargs=True
                 )
-                inputs = processor(
-                    text=[text],
-                    images=image_inputs,
-                    videos=video_inputs,
-                    # fps=fps,
-                    padding=True,
-                    return_tensors="pt",
-                    **video_kwargs,
-                )
             else:
                 logger.error("Invalid input: No valid image, video, or text prompt provided.")
                 return JSONResponse(
@@ -678,68 +826,75 @@ async def chat_completions(request: ChatRequest):
                     content={"error": "Invalid input: No valid image, video, or text prompt provided."},
                 )
 
-            streamer = TextIteratorStreamer(
-                processor,
-                skip_special_tokens=True,
-                skip_prompt=True,
-                clean_up_tokenization_spaces=False,
-            )
-            generation_kwargs = dict(
-                **inputs,
-                streamer=streamer,
-                max_new_tokens=request.max_completion_tokens,
-                top_p=request.top_p,
-                top_k=request.top_k,
-                do_sample=request.do_sample,
-                temperature=request.temperature,
-                eos_token_id=processor.tokenizer.eos_token_id,
-            )
-
-            thread = Thread(
-                target=safe_generate, args=(pipe, generation_kwargs, streamer)
-            )
-            thread.start()
-
-            if request.stream:
-                return create_streaming_response(
-                    streamer, request, settings.VLM_MODEL_NAME
+            if not request.stream and not video_inputs:
+                # Text and image requests sharing generation parameters and image
+                # resolutions are batched into a single generate call
+                image_inputs = list(image_inputs or [])
+                batch_key = (
+                    tuple(getattr(image, "size", None) for image in image_inputs),
+                    seed,
+                    request.max_completion_tokens,
+                    request.top_p,
+                    request.top_k,
+                    request.do_sample,
+                    request.temperature,
                 )
-            else:
-                buffer = ""
-                for new_text in streamer:
-                    buffer += new_text
-                    logger.debug(new_text)
-                return ChatCompletionResponse(
-                    id=str(uuid.uuid4()),
-                    object="chat.completion",
-                    created=int(time.time()),
-                    model=request.model,
-                    choices=[
-                        ChatCompletionChoice(
-                            index=0,
-                            message=ChatCompletionDelta(
-                                role="assistant", content=str(buffer)
+                output = await scheduler.run(
+                    GenerationJob(
+                        run_qwen_batch,
+                        {
+                            "seed": seed,
+                            "text": text,
+                            "images": image_inputs,
+                            "generation_kwargs": dict(
+                                max_new_tokens=request.max_completion_tokens,
+                                top_p=request.top_p,
+                                top_k=request.top_k,
+                                do_sample=request.do_sample,
+                                temperature=request.temperature,
+                                eos_token_id=processor.tokenizer.eos_token_id,
                             ),
-                            finish_reason="stop",
-                        )
-                    ],
+                        },
+                        batch_key,
+                    )
+                )
+            else:
+                inputs = processor(
+                    text=[text],
+                    images=image_inputs,
+                    videos=video_inputs,
+                    padding=True,
+                    return_tensors="pt",
+                    **video_kwargs,
                 )
+                output = await generate_from_inputs(request, inputs, seed)
+                if isinstance(output, StreamingResponse):
+                    return output
 
         else:
             logger.info("Using default model pipeline for processing.")
+            image_tensors = None
             if len(image_urls) == 0:
                 logger.info("processing as text prompt")
                 logger.debug(f"prompt1: {prompt}")
                 if not prompt or not prompt.strip():
                     logger.error("Prompt is empty or invalid. Aborting generation.")
                     raise ValueError("Invalid prompt provided.")
-                output = pipe.generate(prompt, generation_config=config)
             else:
                 logger.info("processing as prompt + image")
                 images, image_tensors = await load_images(image_urls)
-                output = pipe.generate(
-                    prompt, images=image_tensors, generation_config=config
+            output = await scheduler.run(
+                GenerationJob(
+                    run_vlm_pipeline,
+                    {
+                        "seed": seed,
+                        "turns": conversation_turns(request.messages),
+                        "prompt": prompt,
+                        "images": image_tensors,
+                        "config": config,
+                    },
                 )
+            )
         logger.debug(f"output: {str(output)}")
         response = ChatCompletionResponse(
             id=str(uuid.uuid4()),
@@ -757,6 +912,13 @@ async def chat_completions(request: ChatRequest):
 
         logger.info("Chat completion request processed successfully.")
         return response
+    except QueueFullError as e:
+        logger.warning(f"Rejecting chat completion request: {e}")
+        return JSONResponse(
+            status_code=429,
+            content={"error": ErrorMessages.QUEUE_FULL_ERROR},
+            headers={"Retry-After": "1"},
+        )
     except ValueError as e:
         logger.info("ValueError encountered during chat completion request.")
         logger.error(f"{ErrorMessages.CHAT_COMPLETION_ERROR}: {e}")
@@ -771,14 +933,6 @@ async def chat_completions(request: ChatRequest):
             status_code=500,
             content={"error": f"{ErrorMessages.CHAT_COMPLETION_ERROR}: {e}"},
         )
-    finally:
-        # Clean up the temporary video file if it was created
-        if temp_video_path:
-            try:
-                os.remove(temp_video_path.replace("file://", ""))
-                logger.info(f"Temporary video file deleted: {temp_video_path}")
-            except Exception as e:
-                logger.error(f"Failed to delete temporary video file: {e}")
 
 
 @app.get("/v1/models", response_model=ModelsResponse)
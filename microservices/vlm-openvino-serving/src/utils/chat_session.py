@@ -0,0 +1,133 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from typing import List, Tuple
+
+from src.utils.common import logger
+from src.utils.data_models import Message, MessageContentImageUrl, MessageContentText
+from src.utils.image_cache import ImageCache
+
+Turn = Tuple[str, tuple]
+
+
+def conversation_turns(messages: List[Message]) -> List[Turn]:
+    """
+    Comparable form of chat messages. Text is stripped, other contents such as images are
+    represented by a hash of their content.
+
+    Args:
+        messages (List[Message]): The messages of a chat request.
+
+    Returns:
+        List[Turn]: A (role, parts) tuple per message.
+    """
+    turns = []
+    for message in messages:
+        if isinstance(message.content, str):
+            parts = (message.content.strip(),)
+        else:
+            parts = []
+            for content in message.content:
+                if isinstance(content, str):
+                    parts.append(content.strip())
+                elif isinstance(content, MessageContentText):
+                    parts.append(content.text.strip())
+                elif isinstance(content, MessageContentImageUrl):
+                    url = content.image_url.get("url", "")
+                    parts.append(ImageCache.key(url.encode("utf-8")))
+                else:
+                    parts.append(ImageCache.key(content.model_dump_json().encode("utf-8")))
+            parts = tuple(parts)
+        turns.append((message.role, parts))
+    return turns
+
+
+class ChatSession:
+    """
+    Conversation held in the KV cache of a pipeline in chat mode.
+
+    A request whose messages are the conversation of the previous request followed by its
+    answer and a new user message continues the chat, so only the new message is encoded
+    and prefilled. Any other request restarts the chat. The chat is restarted after
+    ``max_turns`` answers to bound the memory held by the KV cache. A ``max_turns`` of 0
+    disables chat mode.
+    """
+
+    def __init__(self, max_turns: int):
+        """
+        Args:
+            max_turns: Maximum number of answers kept in the KV cache.
+        """
+        self.max_turns = max_turns
+        self.history = None  # turns held in the KV cache, None outside chat mode
+        self.answers = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_turns > 0
+
+    def continues(self, turns: List[Turn]) -> bool:
+        """
+        Check whether a request continues the conversation held in the KV cache.
+
+        Args:
+            turns (List[Turn]): The conversation turns of the request.
+        """
+        return (
+            self.history is not None
+            and self.answers < self.max_turns
+            and len(turns) == len(self.history) + 1
+            and turns[-1][0] == "user"
+            and turns[:-1] == self.history
+        )
+
+    def prepare(self, pipe, turns: List[Turn]):
+        """
+        Continue or restart the chat before generating the answer to a request.
+
+        Args:
+            pipe: The pipeline supporting ``start_chat`` and ``finish_chat``.
+            turns (List[Turn]): The conversation turns of the request.
+        """
+        if self.continues(turns):
+            self.hits += 1
+            logger.debug(f"Continuing chat session after {self.answers} answer(s)")
+            return
+        self.misses += 1
+        self.finish(pipe)
+        pipe.start_chat()
+        self.history = []
+        self.answers = 0
+
+    def record(self, turns: List[Turn], answer: str):
+        """
+        Record the conversation held in the KV cache after generating an answer.
+
+        Args:
+            turns (List[Turn]): The conversation turns of the request.
+            answer (str): The generated answer.
+        """
+        self.history = list(turns) + [("assistant", (answer.strip(),))]
+        self.answers += 1
+
+    def finish(self, pipe):
+        """
+        Leave chat mode, releasing the KV cache of the conversation.
+        """
+        if self.history is not None:
+            self.history = None
+            self.answers = 0
+            pipe.finish_chat()
+
+    def stats(self) -> dict:
+        """
+        Chat session reuse counts.
+        """
+        return {
+            "answers": self.answers,
+            "max_turns": self.max_turns,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -55,6 +55,33 @@ class Settings(BaseSettings):
         default=None,
         json_schema_extra={"env": "OV_CONFIG"},
     )
+    VLM_MAX_QUEUE_SIZE: int = Field(
+        default=64, ge=1, json_schema_extra={"env": "VLM_MAX_QUEUE_SIZE"}
+    )
+    VLM_MAX_BATCH_SIZE: int = Field(
+        default=4, ge=1, json_schema_extra={"env": "VLM_MAX_BATCH_SIZE"}
+    )
+    VLM_BATCH_TIMEOUT_MS: int = Field(
+        default=20, ge=0, json_schema_extra={"env": "VLM_BATCH_TIMEOUT_MS"}
+    )
+    VLM_IMAGE_LOAD_CONCURRENCY: int = Field(
+        default=8, ge=1, json_schema_extra={"env": "VLM_IMAGE_LOAD_CONCURRENCY"}
+    )
+    VLM_IMAGE_CACHE_SIZE_MB: int = Field(
+        default=256, ge=0, json_schema_extra={"env": "VLM_IMAGE_CACHE_SIZE_MB"}
+    )
+    VLM_VISION_CACHE_SIZE_MB: int = Field(
+        default=512, ge=0, json_schema_extra={"env": "VLM_VISION_CACHE_SIZE_MB"}
+    )
+    VLM_CHAT_SESSION_MAX_TURNS: int = Field(
+        default=16, ge=0, json_schema_extra={"env": "VLM_CHAT_SESSION_MAX_TURNS"}
+    )
+    VLM_VIDEO_SPOOL_MAX_MB: int = Field(
+        default=64, ge=0, json_schema_extra={"env": "VLM_VIDEO_SPOOL_MAX_MB"}
+    )
+    VLM_METRICS_ENDPOINT_ENABLED: bool = Field(
+        default=True, json_schema_extra={"env": "VLM_METRICS_ENDPOINT_ENABLED"}
+    )
 
     @field_validator("VLM_LOG_LEVEL", mode="before")
     @classmethod
@@ -128,6 +155,7 @@ class ErrorMessages:
     GPU_OOM_ERROR_MESSAGE = "error code: -5"
     UNSUPPORTED_VIDEO_INPUT = "Video input is not supported for this model."
     UNSUPPORTED_VIDEO_URL_INPUT = "Video URL input is not supported for this model."
+    QUEUE_FULL_ERROR = "Too many requests waiting for the model, retry later"
 
 
 class ModelNames:
@@ -0,0 +1,86 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class ImageCache:
+    """
+    LRU cache of decoded images keyed by a hash of the encoded image bytes.
+
+    The same snapshot sent again, by URL, base64 or file path, is served without decoding
+    it again. Entries are evicted least recently used first once the cached images exceed
+    ``max_bytes``. A budget of 0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: Budget of the cached decoded images in bytes.
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data: bytes) -> str:
+        """
+        Content hash of encoded image bytes.
+        """
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached image, marking it as recently used.
+
+        Returns:
+            The cached value, or None if the image is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, size: int):
+        """
+        Cache a decoded image. Images larger than the budget are not cached.
+
+        Args:
+            key: Content hash of the encoded image.
+            value: Decoded image.
+            size: Memory held by the decoded image in bytes.
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def stats(self) -> dict:
+        """
+        Cache usage and hit counts.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
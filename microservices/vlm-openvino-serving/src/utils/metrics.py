@@ -0,0 +1,315 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import atexit
+import os
+import re
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Sequence
+
+from src.utils.common import logger
+
+# Upper bounds in seconds of the chat completion latency histogram
+DEFAULT_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+DEFAULT_MAX_WORKERS = 64
+
+# Layout of a worker slot, as unsigned 64-bit integers
+_PID = 0
+_ACTIVE = 1
+_QUEUED = 2
+_REQUESTS = 3
+_ERRORS = 4
+_REJECTED = 5
+_LATENCY_SUM_US = 6
+_LATENCY_COUNT = 7
+_BUCKETS = 8  # first histogram bucket, followed by the other buckets and +Inf
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _create(name: str, size: int) -> shared_memory.SharedMemory:
+    """
+    Create a shared memory block that outlives this process, so that the totals of the
+    worker are still counted after it exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a shared memory block owned by another worker, without letting the
+    resource tracker of this process unlink it at exit.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _unlink(name: str):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def _unlink_stale_slots():
+    """
+    Remove the slots left by servers that have stopped, named after their parent process.
+    """
+    try:
+        names = os.listdir("/dev/shm")
+    except OSError:
+        return
+    for name in names:
+        match = re.fullmatch(r"vlm_metrics_(\d+)_\d+", name)
+        if match and not _pid_alive(int(match.group(1))):
+            try:
+                _unlink(name)
+            except OSError:
+                pass
+
+
+class RequestMetrics:
+    """
+    Chat completion request metrics shared by the server workers.
+
+    Each worker process owns a slot, a small shared memory block named after the parent
+    process, which the gunicorn workers have in common. Only the owning worker writes its
+    slot, so counters are updated with plain 64-bit stores, without locks or IPC. Readers
+    sum the slots of all workers. Slots are kept when their worker exits, so that counters
+    never go down, and are removed by the next server. When shared memory is unavailable
+    the metrics only cover the current worker.
+    """
+
+    def __init__(
+        self,
+        namespace: Optional[str] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS,
+    ):
+        """
+        Args:
+            namespace: Prefix of the shared memory blocks, defaults to one per parent process.
+            max_workers: Maximum number of worker slots.
+            buckets: Sorted upper bounds in seconds of the latency histogram buckets.
+        """
+        self.namespace = namespace or f"vlm_metrics_{os.getppid()}"
+        self.max_workers = max_workers
+        self.buckets = tuple(buckets)
+        self._size = 8 * (_BUCKETS + len(self.buckets) + 1)
+        self._shm = None
+        self._slot = None
+        self._peers = {}
+        if namespace is None:
+            _unlink_stale_slots()
+        self._claim_slot()
+        atexit.register(self.close)
+
+    def _slot_name(self, index: int) -> str:
+        return f"{self.namespace}_{index}"
+
+    def _claim_slot(self):
+        """
+        Create the first free slot. Creation fails if the block exists, which makes the claim
+        atomic across workers. Slots of exited workers are taken over, keeping their totals.
+        """
+        try:
+            for index in range(self.max_workers):
+                try:
+                    shm = _create(self._slot_name(index), self._size)
+                except FileExistsError:
+                    shm = _attach(self._slot_name(index))
+                    values = shm.buf.cast("Q")
+                    if values[_PID] and _pid_alive(values[_PID]):
+                        values.release()
+                        shm.close()
+                        continue
+                    values[_ACTIVE] = 0
+                    values[_QUEUED] = 0
+                    values.release()
+                self._shm = shm
+                self._slot = shm.buf.cast("Q")
+                self._slot[_PID] = os.getpid()
+                logger.debug(f"Using request metrics slot {shm.name}")
+                return
+            logger.warning("No free request metrics slot, reporting this worker only")
+        except OSError as e:
+            logger.warning(f"Shared memory unavailable for request metrics: {e}")
+        self._slot = memoryview(bytearray(self._size)).cast("Q")
+        self._slot[_PID] = os.getpid()
+
+    def close(self):
+        """
+        Release the slot of this worker. Its counters stay in the totals of the other workers.
+        """
+        for shm in self._peers.values():
+            shm.close()
+        self._peers.clear()
+        if self._shm is not None:
+            self._slot[_ACTIVE] = 0
+            self._slot[_QUEUED] = 0
+            self._slot[_PID] = 0
+            self._slot.release()
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        """
+        Remove the slots of all workers of the namespace, once the server has stopped.
+        """
+        self.close()
+        for index in range(self.max_workers):
+            _unlink(self._slot_name(index))
+
+    def request_started(self) -> float:
+        """
+        Count a request as active.
+
+        Returns:
+            float: Start time to pass to ``request_finished``.
+        """
+        self._slot[_ACTIVE] += 1
+        return time.perf_counter()
+
+    def request_finished(self, started_at: float, status_code: int):
+        """
+        Record a completed request.
+
+        Args:
+            started_at: Value returned by ``request_started``.
+            status_code: HTTP status code of the response.
+        """
+        latency = time.perf_counter() - started_at
+        slot = self._slot
+        slot[_ACTIVE] -= 1
+        slot[_REQUESTS] += 1
+        if status_code == 429:
+            slot[_REJECTED] += 1
+        elif status_code >= 500:
+            slot[_ERRORS] += 1
+        slot[_LATENCY_SUM_US] += round(latency * 1e6)
+        slot[_LATENCY_COUNT] += 1
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if latency <= bound:
+                index = i
+                break
+        slot[_BUCKETS + index] += 1
+
+    def set_queued(self, queued: int):
+        """
+        Set the number of requests waiting for the model in this worker.
+        """
+        self._slot[_QUEUED] = queued
+
+    def _slots(self):
+        """
+        Yield the slot values of all workers, with whether the worker is alive. Only the
+        counters of exited workers are meaningful.
+        """
+        yield self._slot, True
+        if self._shm is None:
+            return
+        for index in range(self.max_workers):
+            name = self._slot_name(index)
+            if name == self._shm.name:
+                continue
+            shm = self._peers.get(name)
+            if shm is None:
+                try:
+                    shm = _attach(name)
+                except FileNotFoundError:
+                    continue
+                self._peers[name] = shm
+            values = shm.buf.cast("Q")
+            try:
+                yield values, bool(values[_PID]) and _pid_alive(values[_PID])
+            finally:
+                values.release()
+
+    def snapshot(self) -> dict:
+        """
+        Metrics aggregated over all workers.
+
+        Returns:
+            dict: Request gauges and counters, and the latency histogram with cumulative
+            bucket counts keyed by upper bound.
+        """
+        totals = [0] * len(self._slot)
+        workers = 0
+        for values, alive in self._slots():
+            if alive:
+                workers += 1
+                totals[_ACTIVE] += values[_ACTIVE]
+                totals[_QUEUED] += values[_QUEUED]
+            for i in range(_REQUESTS, len(totals)):
+                totals[i] += values[i]
+        cumulative, buckets = 0, {}
+        for i, bound in enumerate(self.buckets + (float("inf"),)):
+            cumulative += totals[_BUCKETS + i]
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        count = totals[_LATENCY_COUNT]
+        return {
+            "workers": workers,
+            "active_requests": totals[_ACTIVE],
+            "queued_requests": totals[_QUEUED],
+            "requests_total": totals[_REQUESTS],
+            "errors_total": totals[_ERRORS],
+            "rejected_total": totals[_REJECTED],
+            "latency": {
+                "count": count,
+                "sum": totals[_LATENCY_SUM_US] / 1e6,
+                "avg": totals[_LATENCY_SUM_US] / 1e6 / count if count else None,
+                "buckets": buckets,
+            },
+        }
+
+    def prometheus(self) -> str:
+        """
+        Metrics aggregated over all workers in the Prometheus text exposition format.
+        """
+        snapshot = self.snapshot()
+        latency = snapshot["latency"]
+        lines = [
+            "# HELP vlm_active_requests Chat completion requests being processed.",
+            "# TYPE vlm_active_requests gauge",
+            f"vlm_active_requests {snapshot['active_requests']}",
+            "# HELP vlm_queued_requests Chat completion requests waiting for the model.",
+            "# TYPE vlm_queued_requests gauge",
+            f"vlm_queued_requests {snapshot['queued_requests']}",
+            "# HELP vlm_requests_total Completed chat completion requests.",
+            "# TYPE vlm_requests_total counter",
+            f"vlm_requests_total {snapshot['requests_total']}",
+            "# HELP vlm_request_errors_total Chat completion requests failed with a server error.",
+            "# TYPE vlm_request_errors_total counter",
+            f"vlm_request_errors_total {snapshot['errors_total']}",
+            "# HELP vlm_requests_rejected_total Chat completion requests rejected with a full queue.",
+            "# TYPE vlm_requests_rejected_total counter",
+            f"vlm_requests_rejected_total {snapshot['rejected_total']}",
+            "# HELP vlm_request_latency_seconds Chat completion request latency.",
+            "# TYPE vlm_request_latency_seconds histogram",
+        ]
+        for bound, count in latency["buckets"].items():
+            lines.append(f'vlm_request_latency_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f"vlm_request_latency_seconds_sum {latency['sum']}")
+        lines.append(f"vlm_request_latency_seconds_count {latency['count']}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,322 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import asyncio
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable, List, Optional
+
+from src.utils.common import logger
+
+
+class QueueFullError(Exception):
+    """
+    Raised when a request is submitted while the admission queue is full.
+    """
+
+
+class GenerationJob:
+    """
+    A chat completion request waiting for, or running, generation.
+
+    The scheduler calls ``run`` with the list of jobs of a batch. ``run`` resolves each
+    job with ``finish`` or ``fail``; jobs left unresolved are failed by the scheduler.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[List["GenerationJob"]], None],
+        payload: Any = None,
+        batch_key: Optional[Hashable] = None,
+    ):
+        """
+        Args:
+            run: Callable generating outputs for a batch of jobs.
+            payload: Request specific data used by ``run``.
+            batch_key: Jobs with the same key may share a generate call. None if the job
+                must run alone.
+        """
+        self.id = str(uuid.uuid4())
+        self.run = run
+        self.payload = payload
+        self.batch_key = batch_key
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+        self.started_at = None
+        self.first_token_at = None
+        self.finished_at = None
+        self.generated_tokens = None
+        self.batch_size = 1
+
+    def mark_first_token(self, at: Optional[float] = None):
+        """
+        Record the time of the first generated token. Later calls are ignored.
+
+        Args:
+            at: ``time.perf_counter`` timestamp of the token, defaults to now.
+        """
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter() if at is None else at
+
+    def finish(self, result: Any = None, generated_tokens: Optional[int] = None):
+        """
+        Resolve the job with its result.
+
+        Args:
+            result: Generated output returned to the request handler.
+            generated_tokens: Number of generated tokens, if known.
+        """
+        self.finished_at = time.perf_counter()
+        self.generated_tokens = generated_tokens
+        if not self.future.done():
+            self.future.set_result(result)
+
+    def fail(self, error: BaseException):
+        """
+        Resolve the job with an error, raised in the request handler.
+        """
+        self.finished_at = time.perf_counter()
+        if not self.future.done():
+            self.future.set_exception(error)
+
+    def metrics(self) -> dict:
+        """
+        Timing of the job in seconds.
+
+        Returns:
+            dict: Queue time, time to first token, tokens per second and batch size.
+        """
+        queue_time = ttft = tokens_per_second = None
+        if self.started_at is not None:
+            queue_time = self.started_at - self.enqueued_at
+        first_token_at = self.first_token_at
+        if first_token_at is None and self.generated_tokens:
+            # no token timing available, the whole output arrived at once
+            first_token_at = self.finished_at
+        if first_token_at is not None:
+            ttft = first_token_at - self.enqueued_at
+        if self.generated_tokens and self.finished_at is not None and self.started_at is not None:
+            decode_start = self.first_token_at or self.started_at
+            if self.finished_at > decode_start:
+                tokens_per_second = self.generated_tokens / (self.finished_at - decode_start)
+        return {
+            "id": self.id,
+            "queue_time": queue_time,
+            "time_to_first_token": ttft,
+            "tokens_per_second": tokens_per_second,
+            "generated_tokens": self.generated_tokens,
+            "batch_size": self.batch_size,
+            "status": "failed" if self.future.done() and self.future.exception() else "completed",
+        }
+
+
+class FirstTokenStreamer:
+    """
+    Streamer for transformers ``generate`` recording the first token time of a batch.
+
+    ``generate`` calls ``put`` once with the prompt ids and then once per decoding step.
+    """
+
+    def __init__(self, jobs: List[GenerationJob]):
+        self.jobs = jobs
+        self._calls = 0
+
+    def put(self, value):
+        self._calls += 1
+        if self._calls == 2:
+            now = time.perf_counter()
+            for job in self.jobs:
+                job.mark_first_token(now)
+
+    def end(self):
+        pass
+
+
+class RequestScheduler:
+    """
+    Schedules chat completion requests on the shared model pipeline.
+
+    Requests are admitted into a bounded FIFO queue and run one batch at a time on a single
+    worker thread, so concurrent requests no longer contend for the pipeline. A queued job
+    with a batch key is run together with later queued jobs of the same key, up to
+    ``max_batch_size`` jobs, waiting at most ``batch_timeout`` seconds for them to arrive.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 64,
+        max_batch_size: int = 4,
+        batch_timeout: float = 0.02,
+        history_size: int = 100,
+        on_queue_size: Optional[Callable[[int], None]] = None,
+    ):
+        """
+        Args:
+            max_queue_size: Maximum number of jobs waiting in the queue.
+            max_batch_size: Maximum number of jobs run together.
+            batch_timeout: Seconds a batchable job waits for compatible jobs.
+            history_size: Number of completed jobs kept for ``status``.
+            on_queue_size: Called with the number of queued jobs when it changes.
+        """
+        if max_queue_size < 1 or max_batch_size < 1:
+            raise ValueError("Queue size and batch size must be at least 1")
+        self.max_queue_size = max_queue_size
+        self.max_batch_size = max_batch_size
+        self.batch_timeout = batch_timeout
+        self.on_queue_size = on_queue_size
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stopped = False
+        self._running = 0
+        self._rejected = 0
+        self._completed = 0
+        self._failed = 0
+        self._batches = 0
+        self._history = deque(maxlen=history_size)
+
+    def start(self):
+        """
+        Start the worker thread if it is not running.
+        """
+        with self._cond:
+            if self._worker is None or not self._worker.is_alive():
+                self._stopped = False
+                self._worker = threading.Thread(
+                    target=self._run, name="vlm-scheduler", daemon=True
+                )
+                self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the worker thread and fail queued jobs.
+        """
+        with self._cond:
+            self._stopped = True
+            jobs = list(self._queue)
+            self._queue.clear()
+            self._queue_size_changed()
+            self._cond.notify_all()
+        for job in jobs:
+            job.fail(RuntimeError("Scheduler stopped"))
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def submit(self, job: GenerationJob) -> GenerationJob:
+        """
+        Admit a job into the queue.
+
+        Raises:
+            QueueFullError: If ``max_queue_size`` jobs are already waiting.
+        """
+        self.start()
+        with self._cond:
+            if len(self._queue) >= self.max_queue_size:
+                self._rejected += 1
+                raise QueueFullError(
+                    f"Request queue is full ({self.max_queue_size} requests waiting)"
+                )
+            self._queue.append(job)
+            self._queue_size_changed()
+            self._cond.notify_all()
+        return job
+
+    async def run(self, job: GenerationJob) -> Any:
+        """
+        Admit a job and wait for its result without blocking the event loop.
+        """
+        self.submit(job)
+        return await asyncio.wrap_future(job.future)
+
+    def status(self) -> dict:
+        """
+        Queue state and timing of recently completed requests.
+        """
+        with self._cond:
+            history = list(self._history)
+            status = {
+                "queued": len(self._queue),
+                "running": self._running,
+                "max_queue_size": self.max_queue_size,
+                "max_batch_size": self.max_batch_size,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "batches": self._batches,
+            }
+        for key in ("queue_time", "time_to_first_token", "tokens_per_second"):
+            values = [m[key] for m in history if m[key] is not None]
+            status[f"avg_{key}"] = sum(values) / len(values) if values else None
+        status["recent_requests"] = history
+        return status
+
+    def _queue_size_changed(self):
+        # called with the condition lock held
+        if self.on_queue_size is not None:
+            self.on_queue_size(len(self._queue))
+
+    def _next_batch(self) -> Optional[List[GenerationJob]]:
+        """
+        Wait for the next job and coalesce compatible queued jobs with it.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._queue or self._stopped)
+            if self._stopped:
+                return None
+            batch = [self._queue.popleft()]
+            self._queue_size_changed()
+            key = batch[0].batch_key
+            if key is None or self.max_batch_size == 1:
+                return batch
+            deadline = time.monotonic() + self.batch_timeout
+            while len(batch) < self.max_batch_size:
+                for job in list(self._queue):
+                    if job.batch_key == key:
+                        self._queue.remove(job)
+                        self._queue_size_changed()
+                        batch.append(job)
+                        if len(batch) == self.max_batch_size:
+                            break
+                remaining = deadline - time.monotonic()
+                if len(batch) == self.max_batch_size or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+                if self._stopped:
+                    break
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started_at = time.perf_counter()
+            for job in batch:
+                job.started_at = started_at
+                job.batch_size = len(batch)
+            with self._cond:
+                self._running = len(batch)
+                self._batches += 1
+            logger.debug(f"Running batch of {len(batch)} request(s)")
+            try:
+                batch[0].run(batch)
+            except BaseException as e:
+                logger.error(f"Error running batch of {len(batch)} request(s): {e}")
+                for job in batch:
+                    job.fail(e)
+            for job in batch:
+                if not job.future.done():
+                    job.fail(RuntimeError("Generation finished without a result"))
+            with self._cond:
+                self._running = 0
+                for job in batch:
+                    metrics = job.metrics()
+                    if metrics["status"] == "failed":
+                        self._failed += 1
+                    else:
+                        self._completed += 1
+                    self._history.append(metrics)
@@ -1,10 +1,10 @@
 # Copyright (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import asyncio
 import base64
 import os
 import random
-import uuid
 from io import BytesIO
 from pathlib import Path
 from typing import Dict, List
@@ -27,6 +27,7 @@ from optimum.utils.save_utils import maybe_load_preprocessors
 from PIL import Image
 from src.utils.common import ErrorMessages, ModelNames, logger, settings
 from src.utils.data_models import MessageContentVideoUrl
+from src.utils.image_cache import ImageCache
 from transformers import AutoTokenizer
 
 # Only include proxies if they are defined
@@ -40,6 +41,10 @@ if settings.no_proxy_env:
 
 logger.debug(f"proxies: {proxies}")
 
+# Decoded images shared by requests, keyed by image content
+image_cache = ImageCache(settings.VLM_IMAGE_CACHE_SIZE_MB * 1024 * 1024)
+_http_session, _http_session_loop = None, None
+
 
 def convert_model(
     model_id: str, cache_dir: str, model_type: str = "vlm", weight_format: str = "int4"
@@ -108,66 +113,123 @@ def convert_model(
         raise RuntimeError(f"Error occurred during model conversion: {e}")
 
 
-async def load_images(image_urls_or_files: List[str]):
+async def get_http_session() -> aiohttp.ClientSession:
     """
-    Load images from URLs, base64 strings, or file paths.
+    Get the process wide HTTP session, reusing pooled connections across requests.
+
+    The session is created on first use, and again when used from another event loop.
+
+    Returns:
+        aiohttp.ClientSession: The shared HTTP session.
+    """
+    global _http_session, _http_session_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _http_session_loop is not loop:
+        _http_session = aiohttp.ClientSession()
+        _http_session_loop = loop
+    return _http_session
+
+
+async def close_http_session():
+    """
+    Close the process wide HTTP session.
+    """
+    global _http_session, _http_session_loop
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session, _http_session_loop = None, None
+
+
+def get_proxy(image_url_or_file: str):
+    """
+    Get the proxy to use for an image URL.
 
     Args:
-        image_urls_or_files (List[str]): A list of image sources (URLs, base64 strings, or file paths).
+        image_url_or_file (str): The image source.
 
     Returns:
-        Tuple[List[Image.Image], List[ov.Tensor]]: A tuple containing a list of PIL images and a list of OpenVINO tensors.
+        str: The proxy URL, or None if no proxy is used.
+    """
+    use_proxy = True
+    if proxies.get("no_proxy"):
+        no_proxy_list = proxies["no_proxy"].split(",")
+        for no_proxy in no_proxy_list:
+            if no_proxy in image_url_or_file:
+                use_proxy = False
+                break
+
+    if str(image_url_or_file).startswith("http"):
+        return proxies.get("http") if use_proxy else None
+    elif str(image_url_or_file).startswith("https"):
+        return proxies.get("https") if use_proxy else None
+    return None
+
+
+def decode_image(data: bytes):
+    """
+    Decode an encoded image into a PIL image and an OpenVINO tensor.
+
+    Args:
+        data (bytes): The encoded image.
+
+    Returns:
+        Tuple[Image.Image, ov.Tensor]: The RGB image and its (1, height, width, 3) tensor.
+    """
+    image = Image.open(BytesIO(data)).convert("RGB")
+    # View the pixel buffer as signed bytes without a per pixel copy
+    image_data = np.asarray(image).view(np.byte)[np.newaxis]
+    return image, ov.Tensor(image_data)
+
+
+async def load_image(image_url_or_file: str, semaphore: asyncio.Semaphore):
+    """
+    Load a single image from a URL, a base64 string, or a file path.
+
+    Decoded images are cached by content, a cached image is returned without decoding it.
+
+    Args:
+        image_url_or_file (str): The image source.
+        semaphore (asyncio.Semaphore): Limits the number of images loaded concurrently.
+
+    Returns:
+        Tuple[Image.Image, ov.Tensor]: The PIL image and its OpenVINO tensor.
 
     Raises:
-        RuntimeError: If an error occurs while loading an image.
+        RuntimeError: If an error occurs while loading the image.
         ValueError: If the base64 data is invalid.
     """
-    images = []
-    image_tensors = []
-    for image_url_or_file in image_urls_or_files:
+    async with semaphore:
         try:
             logger.info(
                 f"Loading image from: {image_url_or_file if not image_url_or_file.startswith('data:image/jpeg;base64') else 'base64 image'}"
             )
-            use_proxy = True
-            if proxies.get("no_proxy"):
-                no_proxy_list = proxies["no_proxy"].split(",")
-                for no_proxy in no_proxy_list:
-                    if no_proxy in image_url_or_file:
-                        use_proxy = False
-                        break
-
-            if str(image_url_or_file).startswith("http"):
-                proxy = proxies.get("http") if use_proxy else None
-            elif str(image_url_or_file).startswith("https"):
-                proxy = proxies.get("https") if use_proxy else None
-            else:
-                proxy = None
-
             if str(image_url_or_file).startswith("http") or str(
                 image_url_or_file
             ).startswith("https"):
+                proxy = get_proxy(image_url_or_file)
                 logger.debug(f"Using proxy: {proxy}")
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        image_url_or_file, proxy=proxy, allow_redirects=True
-                    ) as response:
-                        response.raise_for_status()  # Raise an HTTPError for bad responses
-                        image = Image.open(BytesIO(await response.read())).convert(
-                            "RGB"
-                        )
+                session = await get_http_session()
+                async with session.get(
+                    image_url_or_file, proxy=proxy, allow_redirects=True
+                ) as response:
+                    response.raise_for_status()  # Raise an HTTPError for bad responses
+                    data = await response.read()
             elif str(image_url_or_file).startswith("data:image/jpeg;base64,"):
-                decoded_image = base64.b64decode(image_url_or_file.split(",")[1])
-                image = Image.open(BytesIO(decoded_image)).convert("RGB")
+                data = base64.b64decode(image_url_or_file.split(",")[1])
             else:
-                image = Image.open(image_url_or_file).convert("RGB")
-            image_data = (
-                np.array(image.getdata())
-                .reshape(1, image.size[1], image.size[0], 3)
-                .astype(np.byte)
+                data = await asyncio.to_thread(Path(image_url_or_file).read_bytes)
+
+            key = image_cache.key(data)
+            cached = image_cache.get(key)
+            if cached is not None:
+                logger.debug(f"Image cache hit: {key}")
+                return cached
+            image, image_tensor = await asyncio.to_thread(decode_image, data)
+            # The PIL image and the tensor each hold a copy of the pixels
+            image_cache.put(
+                key, (image, image_tensor), 2 * image.size[0] * image.size[1] * 3
             )
-            images.append(image)
-            image_tensors.append(ov.Tensor(image_data))
+            return image, image_tensor
         except aiohttp.ClientError as e:
             logger.error(f"{ErrorMessages.REQUEST_ERROR}: {e}")
             raise RuntimeError(f"{ErrorMessages.REQUEST_ERROR}: {e}")
@@ -181,9 +243,91 @@ async def load_images(image_urls_or_files: List[str]):
         except Exception as e:
             logger.error(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
             raise RuntimeError(f"{ErrorMessages.LOAD_IMAGE_ERROR}: {e}")
+
+
+async def load_images(image_urls_or_files: List[str]):
+    """
+    Load images from URLs, base64 strings, or file paths.
+
+    Images are loaded concurrently, at most VLM_IMAGE_LOAD_CONCURRENCY at a time.
+
+    Args:
+        image_urls_or_files (List[str]): A list of image sources (URLs, base64 strings, or file paths).
+
+    Returns:
+        Tuple[List[Image.Image], List[ov.Tensor]]: A tuple containing a list of PIL images and a list of OpenVINO tensors.
+
+    Raises:
+        RuntimeError: If an error occurs while loading an image.
+        ValueError: If the base64 data is invalid.
+    """
+    semaphore = asyncio.Semaphore(settings.VLM_IMAGE_LOAD_CONCURRENCY)
+    results = await asyncio.gather(
+        *(load_image(source, semaphore) for source in image_urls_or_files)
+    )
+    images = [image for image, _ in results]
+    image_tensors = [image_tensor for _, image_tensor in results]
     return images, image_tensors
 
 
+def vision_inputs_key(*inputs) -> str:
+    """
+    Content hash of vision encoder inputs.
+
+    Args:
+        *inputs: Tensors, arrays or other values passed to the vision encoder.
+
+    Returns:
+        str: The hash of the inputs.
+    """
+    parts = []
+    for value in inputs:
+        if isinstance(value, torch.Tensor):
+            value = value.detach().cpu().numpy()
+        if isinstance(value, np.ndarray):
+            parts.append(f"{value.dtype}{value.shape}".encode("utf-8"))
+            parts.append(np.ascontiguousarray(value).tobytes())
+        else:
+            parts.append(repr(value).encode("utf-8"))
+    return ImageCache.key(b"|".join(parts))
+
+
+def enable_vision_embedding_cache(model, cache: ImageCache) -> bool:
+    """
+    Cache the vision encoder outputs of an optimum visual language model by content.
+
+    Images sent again in later turns of a conversation are not encoded again.
+
+    Args:
+        model: The OVModelForVisualCausalLM model.
+        cache (ImageCache): The cache of vision embeddings.
+
+    Returns:
+        bool: True if the model exposes a vision encoder that is now cached.
+    """
+    get_vision_embeddings = getattr(model, "get_vision_embeddings", None)
+    if get_vision_embeddings is None or cache.max_bytes == 0:
+        return False
+
+    def cached_get_vision_embeddings(pixel_values, *args, **kwargs):
+        key = vision_inputs_key(
+            pixel_values, *args, *(item for name in sorted(kwargs) for item in (name, kwargs[name]))
+        )
+        embeddings = cache.get(key)
+        if embeddings is None:
+            embeddings = get_vision_embeddings(pixel_values, *args, **kwargs)
+            size = getattr(embeddings, "nbytes", None)
+            if size is None and isinstance(embeddings, torch.Tensor):
+                size = embeddings.numel() * embeddings.element_size()
+            if size is not None:
+                cache.put(key, embeddings, size)
+        return embeddings
+
+    model.get_vision_embeddings = cached_get_vision_embeddings
+    logger.info("Vision embedding cache enabled")
+    return True
+
+
 def get_devices():
     """
     Retrieves a list of available devices from the OpenVINO core.
@@ -323,30 +467,3 @@ def validate_video_inputs(content, model_name):
     ):
         return ErrorMessages.UNSUPPORTED_VIDEO_URL_INPUT
     return None
-
-
-def decode_and_save_video(base64_video: str, output_dir: Path = Path("/tmp")) -> str:
-    """
-    Decode a base64-encoded video and save it locally.
-
-    Args:
-        base64_video (str): The base64-encoded video string.
-        output_dir (Path): The directory to save the decoded video.
-
-    Returns:
-        str: The file path of the saved video.
-    """
-    try:
-        output_dir.mkdir(parents=True, exist_ok=True)
-        video_data = base64.b64decode(base64_video.split(",")[1])
-        video_path = output_dir / f"{uuid.uuid4()}.mp4"
-        with open(video_path, "wb") as video_file:
-            video_file.write(video_data)
-        logger.info(f"Video saved locally at: {video_path}")
-        return f"file://{video_path}"
-    except base64.binascii.Error as e:
-        logger.error(f"Invalid base64 video data: {e}")
-        raise ValueError("Invalid base64 video data")
-    except Exception as e:
-        logger.error(f"Error decoding and saving video: {e}")
-        raise RuntimeError(f"Error decoding and saving video: {e}")
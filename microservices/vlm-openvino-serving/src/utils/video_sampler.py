@@ -0,0 +1,235 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import math
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+from src.utils.common import logger
+
+# Video sampling defaults of qwen_vl_utils, applied by Qwen2.5-VL to video files
+FRAME_FACTOR = 2
+DEFAULT_FPS = 2.0
+FPS_MIN_FRAMES = 4
+FPS_MAX_FRAMES = 768
+VIDEO_MIN_PIXELS = 128 * 28 * 28
+VIDEO_MAX_PIXELS = 768 * 28 * 28
+VIDEO_TOTAL_PIXELS = int(
+    float(os.environ.get("VIDEO_MAX_PIXELS", 128000 * 28 * 28 * 0.9))
+)
+
+BASE64_CHUNK_SIZE = 4 * 1024 * 1024  # base64 characters, a multiple of 4
+
+
+@contextmanager
+def decoded_video_file(data_url: str, max_memory: int) -> Iterator[str]:
+    """
+    Decode a base64 data URL chunk by chunk into an anonymous in-memory file, or into a
+    temporary file on disk when the video is larger than ``max_memory`` bytes.
+
+    Args:
+        data_url (str): The data URL, such as ``data:video/mp4;base64,...``.
+        max_memory (int): Largest video, in bytes, kept in memory.
+
+    Yields:
+        str: A path of the decoded video readable by OpenCV, valid until the context exits.
+
+    Raises:
+        ValueError: If the base64 data is invalid.
+    """
+    payload = data_url.split(",", 1)[1]
+    if any(whitespace in payload for whitespace in ("\n", "\r", " ")):
+        payload = "".join(payload.split())
+    in_memory = len(payload) // 4 * 3 <= max_memory and hasattr(os, "memfd_create")
+    if in_memory:
+        fd = os.memfd_create("vlm-video", os.MFD_CLOEXEC)
+        path = f"/proc/self/fd/{fd}"
+    else:
+        fd, path = tempfile.mkstemp(suffix=".mp4")
+    try:
+        with os.fdopen(fd, "wb", closefd=False) as file:
+            for start in range(0, len(payload), BASE64_CHUNK_SIZE):
+                file.write(base64.b64decode(payload[start : start + BASE64_CHUNK_SIZE]))
+        yield path
+    except base64.binascii.Error as e:
+        logger.error(f"Invalid base64 video data: {e}")
+        raise ValueError("Invalid base64 video data")
+    finally:
+        os.close(fd)
+        if not in_memory:
+            os.remove(path)
+
+
+def frame_indices(total_frames: int, video_fps: float, fps: float) -> np.ndarray:
+    """
+    Indices of the frames sampled from a video, as Qwen2.5-VL samples video files.
+
+    Args:
+        total_frames (int): Number of frames of the video.
+        video_fps (float): Frame rate of the video.
+        fps (float): Requested sampling rate.
+
+    Returns:
+        np.ndarray: Sorted frame indices.
+
+    Raises:
+        ValueError: If the video is too short to sample.
+    """
+    nframes = total_frames / video_fps * fps
+    min_frames = math.ceil(FPS_MIN_FRAMES / FRAME_FACTOR) * FRAME_FACTOR
+    max_frames = math.floor(min(FPS_MAX_FRAMES, total_frames) / FRAME_FACTOR) * FRAME_FACTOR
+    nframes = min(max(nframes, min_frames), max_frames)
+    nframes = math.floor(nframes / FRAME_FACTOR) * FRAME_FACTOR
+    if not FRAME_FACTOR <= nframes <= total_frames:
+        raise ValueError(
+            f"Cannot sample {nframes} frames from a video of {total_frames} frames"
+        )
+    return np.linspace(0, total_frames - 1, nframes).round().astype(int)
+
+
+def default_max_pixels(nframes: int) -> int:
+    """
+    Pixel budget of a video frame when the request does not set max_pixels.
+    """
+    return int(
+        max(
+            min(VIDEO_MAX_PIXELS, VIDEO_TOTAL_PIXELS / nframes * FRAME_FACTOR),
+            VIDEO_MIN_PIXELS * 1.05,
+        )
+    )
+
+
+def _downscale(frame: np.ndarray, max_pixels: Optional[int]) -> np.ndarray:
+    height, width = frame.shape[:2]
+    if max_pixels and height * width > max_pixels:
+        # Downscale right away, frames are resized to max_pixels by the processor anyway
+        scale = math.sqrt(max_pixels / (height * width))
+        frame = cv2.resize(
+            frame,
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    return frame
+
+
+def _to_image(frame: np.ndarray, max_pixels: Optional[int]) -> Image.Image:
+    return Image.fromarray(cv2.cvtColor(_downscale(frame, max_pixels), cv2.COLOR_BGR2RGB))
+
+
+def sample_video_frames(
+    path: str,
+    fps: Optional[float] = None,
+    max_pixels: Optional[int] = None,
+) -> Tuple[List[Image.Image], float, int]:
+    """
+    Decode and sample the frames of a video in a single pass.
+
+    Frames between sampled frames are skipped without being converted, and decoding stops
+    at the last sampled frame.
+
+    Args:
+        path (str): Path of the video.
+        fps (Optional[float]): Sampling rate, 2 frames per second by default.
+        max_pixels (Optional[int]): Pixel budget of a frame, derived from the number of
+            sampled frames by default.
+
+    Returns:
+        Tuple[List[Image.Image], float, int]: The sampled RGB frames, their sampling rate
+        and the pixel budget of a frame.
+
+    Raises:
+        ValueError: If the video cannot be decoded or is too short to sample.
+    """
+    fps = fps or DEFAULT_FPS
+    capture = cv2.VideoCapture(str(path))
+    try:
+        if not capture.isOpened():
+            raise ValueError("Unable to decode video")
+        total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
+        video_fps = capture.get(cv2.CAP_PROP_FPS)
+        if total_frames > 0 and video_fps > 0:
+            frames = _sample_by_index(capture, total_frames, video_fps, fps, max_pixels)
+            sample_fps = len(frames) / total_frames * video_fps
+        else:
+            frames = _sample_by_time(capture, fps, max_pixels)
+            sample_fps = fps
+    finally:
+        capture.release()
+    if len(frames) < FRAME_FACTOR:
+        raise ValueError("Video is too short to sample")
+    max_pixels = max_pixels or default_max_pixels(len(frames))
+    logger.debug(
+        f"Sampled {len(frames)} frames at {sample_fps:.2f} fps, max_pixels={max_pixels}"
+    )
+    return frames, sample_fps, max_pixels
+
+
+def _sample_by_index(capture, total_frames, video_fps, fps, max_pixels):
+    indices = frame_indices(total_frames, video_fps, fps)
+    max_pixels = max_pixels or default_max_pixels(len(indices))
+    frames = []
+    position = 0
+    for index in indices:
+        while position <= index:
+            if not capture.grab():
+                # the container may overstate the frame count
+                return frames[: len(frames) // FRAME_FACTOR * FRAME_FACTOR]
+            position += 1
+        ok, frame = capture.retrieve()
+        if ok:
+            frames.append(_to_image(frame, max_pixels))
+    return frames[: len(frames) // FRAME_FACTOR * FRAME_FACTOR]
+
+
+def _sample_by_time(capture, fps, max_pixels):
+    # Frame count or rate unknown, sample by timestamp. Until the number of frames is known,
+    # frames are kept at VIDEO_MAX_PIXELS, the largest default budget
+    provisional_max_pixels = max_pixels or VIDEO_MAX_PIXELS
+    frames = []
+    next_time = 0.0
+    while len(frames) < FPS_MAX_FRAMES and capture.grab():
+        timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        if timestamp + 1e-6 < next_time:
+            continue
+        ok, frame = capture.retrieve()
+        if ok:
+            frames.append(_downscale(frame, provisional_max_pixels))
+            next_time += 1 / fps
+    frames = frames[: len(frames) // FRAME_FACTOR * FRAME_FACTOR]
+    max_pixels = max_pixels or default_max_pixels(max(len(frames), 1))
+    return [_to_image(frame, max_pixels) for frame in frames]
+
+
+def load_video_frames(
+    video_url: str,
+    fps: Optional[float] = None,
+    max_pixels: Optional[int] = None,
+    max_memory: int = 64 * 1024 * 1024,
+) -> Tuple[List[Image.Image], float, int]:
+    """
+    Sample the frames of a base64 data URL or local video, keeping base64 videos up to
+    ``max_memory`` bytes in memory.
+
+    Args:
+        video_url (str): A ``data:video/...;base64,`` URL, a ``file://`` URL or a path.
+        fps (Optional[float]): Sampling rate, 2 frames per second by default.
+        max_pixels (Optional[int]): Pixel budget of a frame.
+        max_memory (int): Largest base64 video, in bytes, decoded in memory rather than
+            into a temporary file.
+
+    Returns:
+        Tuple[List[Image.Image], float, int]: The sampled RGB frames, their sampling rate
+        and the pixel budget of a frame.
+    """
+    if video_url.startswith("data:"):
+        with decoded_video_file(video_url, max_memory) as path:
+            return sample_video_frames(path, fps, max_pixels)
+    if video_url.startswith("file://"):
+        video_url = video_url[len("file://") :]
+    return sample_video_frames(video_url, fps, max_pixels)
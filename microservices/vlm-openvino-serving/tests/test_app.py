@@ -81,6 +81,32 @@ def test_queue_status():
     assert response.status_code == 200
     assert "active_requests" in response.json()
     assert "queued_requests" in response.json()
+    assert "queued" in response.json()["scheduler"]
+
+
+def test_metrics():
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "vlm_active_requests" in response.text
+    assert "vlm_request_latency_seconds_bucket" in response.text
+
+
+def test_chat_completions_queue_full():
+    from src.utils.scheduler import QueueFullError
+
+    payload = {
+        "model": "mock_model",
+        "messages": [{"role": "user", "content": "Hello, how are you?"}],
+        "stream": False,
+    }
+    with mock.patch(
+        "src.app.scheduler.submit", side_effect=QueueFullError("queue is full")
+    ):
+        response = client.post("/v1/chat/completions", json=payload)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert response.json() == {"error": ErrorMessages.QUEUE_FULL_ERROR}
 
 
 def test_chat_completions():
@@ -151,12 +177,37 @@ def test_safe_generate_calls_restart_server(mock_restart_server):
     mock_streamer.end_of_stream = False
 
     # Call safe_generate with mocked pipe and streamer
-    safe_generate(pipe=mock_pipe, generation_kwargs={}, streamer=mock_streamer)
+    with pytest.raises(RuntimeError):
+        safe_generate(pipe=mock_pipe, generation_kwargs={}, streamer=mock_streamer)
 
-    # Assert that restart_server was called
+    # Assert that the streamer was ended and restart_server was called
+    mock_streamer.end.assert_called_once()
     mock_restart_server.assert_called_once()
 
 
+@mock.patch("src.app.setup_seed")
+def test_run_generate_streaming_error_fails_job(mock_setup_seed):
+    import numpy as np
+    from src.app import run_generate
+
+    error = RuntimeError("Generation error")
+    pipe = mock.Mock()
+    pipe.generate.side_effect = error
+    streamer = mock.Mock()
+    job = mock.Mock(
+        payload={
+            "seed": 42,
+            "generation_kwargs": {"input_ids": np.zeros((1, 3), dtype=int), "streamer": streamer},
+        }
+    )
+    with mock.patch("src.app.pipe", pipe):
+        run_generate([job])
+
+    streamer.end.assert_called_once()
+    job.fail.assert_called_once_with(error)
+    job.finish.assert_not_called()
+
+
 @mock.patch(
     "src.app.OVModelForVisualCausalLM.from_pretrained",
     side_effect=RuntimeError("Model loading error"),
@@ -202,9 +253,9 @@ def test_chat_completions_image_loading_error(mock_load_images):
 
 
 @mock.patch(
-    "src.app.decode_and_save_video", side_effect=RuntimeError("Video decoding error")
+    "src.app.load_video_frames", side_effect=RuntimeError("Video decoding error")
 )
-def test_chat_completions_video_decoding_error(mock_decode_and_save_video):
+def test_chat_completions_video_decoding_error(mock_load_video_frames):
     with mock.patch("src.app.settings.VLM_MODEL_NAME", "Qwen/Qwen2.5-VL-7B-Instruct"):
         from src.app import app  # Re-import app with updated settings
 
@@ -722,6 +773,35 @@ def test_chat_completions_default_model_text_prompt(mock_generate):
     mock_generate.assert_called_once()
 
 
+@mock.patch("src.app.pipe.generate", return_value="The car is red.")
+def test_chat_completions_default_model_follow_up_reuses_chat(mock_generate):
+    from src.app import chat_session
+
+    question = {"role": "user", "content": "What color is the car?"}
+    with mock.patch("src.app.settings.VLM_MODEL_NAME", "mock_model"):
+        first = client.post(
+            "/v1/chat/completions",
+            json={"model": "mock_model", "messages": [question]},
+        )
+        hits = chat_session.hits
+        follow_up = client.post(
+            "/v1/chat/completions",
+            json={
+                "model": "mock_model",
+                "messages": [
+                    question,
+                    {"role": "assistant", "content": "The car is red."},
+                    {"role": "user", "content": "Is it moving?"},
+                ],
+            },
+        )
+    assert first.status_code == 200
+    assert follow_up.status_code == 200
+    assert chat_session.hits == hits + 1
+    # only the new question is sent to the pipeline in chat mode
+    assert mock_generate.call_args.args[0] == "Is it moving?"
+
+
 @mock.patch("src.app.load_images", side_effect=RuntimeError("Image loading error"))
 def test_chat_completions_image_loading_error_handling(mock_load_images):
     payload = {
@@ -753,3 +833,30 @@ def test_chat_completions_generation_error(mock_generate):
     response = client.post("/v1/chat/completions", json=payload)
     assert response.status_code == 500
     assert "Generation error" in response.json()["error"]
+
+
+@mock.patch("src.app.FirstTokenStreamer")
+@mock.patch("src.app.setup_seed")
+def test_run_qwen_batch_pads_left_per_call(mock_setup_seed, mock_streamer):
+    import numpy as np
+    from src.app import run_qwen_batch
+
+    processor = mock.MagicMock()
+    processor.tokenizer.padding_side = "right"
+    processor.tokenizer.pad_token_id = 0
+    processor.return_value = {"input_ids": np.zeros((2, 3), dtype=int)}
+    processor.batch_decode.return_value = ["first", "second"]
+    pipe = mock.Mock()
+    pipe.generate.return_value = np.ones((2, 5), dtype=int)
+    jobs = [
+        mock.Mock(payload={"seed": 42, "text": text, "images": [], "generation_kwargs": {}})
+        for text in ("a", "b")
+    ]
+    with mock.patch("src.app.processor", processor), mock.patch("src.app.pipe", pipe):
+        run_qwen_batch(jobs)
+
+    assert processor.call_args.kwargs["padding_side"] == "left"
+    # the shared processor keeps its padding side for requests that are not batched
+    assert processor.tokenizer.padding_side == "right"
+    jobs[0].finish.assert_called_once_with("first", 2)
+    jobs[1].finish.assert_called_once_with("second", 2)
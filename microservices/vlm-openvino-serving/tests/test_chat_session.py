@@ -0,0 +1,94 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from unittest import mock
+
+# Mock environment variables before importing anything from src.utils
+mock.patch.dict(
+    os.environ,
+    {
+        "http_proxy": "http://mock-proxy",
+        "https_proxy": "https://mock-proxy",
+        "no_proxy_env": "localhost,127.0.0.1",
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_COMPRESSION_WEIGHT_FORMAT": "int8",
+        "VLM_DEVICE": "CPU",
+        "SEED": "42",
+    },
+).start()
+
+from src.utils.chat_session import ChatSession, conversation_turns
+from src.utils.data_models import Message
+
+
+def messages(*contents):
+    roles = ["user", "assistant"]
+    return [
+        Message(role=roles[i % 2], content=content) for i, content in enumerate(contents)
+    ]
+
+
+def test_conversation_turns_hash_images():
+    image = [
+        {"type": "text", "text": " Describe the video "},
+        {"type": "image_url", "image_url": {"url": "data:image/jpeg;base64,AAAA"}},
+    ]
+    turns = conversation_turns(messages(image))
+    assert turns[0][0] == "user"
+    assert turns[0][1][0] == "Describe the video"
+    assert turns[0][1][1] != "data:image/jpeg;base64,AAAA"
+    assert turns == conversation_turns(messages(image))
+
+
+def test_follow_up_continues_chat():
+    pipe = mock.Mock()
+    session = ChatSession(max_turns=4)
+
+    first = conversation_turns(messages("Summarize the video"))
+    session.prepare(pipe, first)
+    session.record(first, "A car drives by. ")
+    follow_up = conversation_turns(
+        messages("Summarize the video", "A car drives by.", "What color is the car?")
+    )
+    assert session.continues(follow_up)
+    session.prepare(pipe, follow_up)
+    session.record(follow_up, "Red.")
+
+    pipe.start_chat.assert_called_once()
+    pipe.finish_chat.assert_not_called()
+    assert session.stats()["hits"] == 1
+    assert session.stats()["misses"] == 1
+
+
+def test_other_conversation_restarts_chat():
+    pipe = mock.Mock()
+    session = ChatSession(max_turns=4)
+    first = conversation_turns(messages("Summarize the video"))
+    session.prepare(pipe, first)
+    session.record(first, "A car drives by.")
+
+    edited = conversation_turns(
+        messages("Summarize the video", "A truck drives by.", "What color is it?")
+    )
+    assert not session.continues(edited)
+    session.prepare(pipe, edited)
+    assert pipe.start_chat.call_count == 2
+    pipe.finish_chat.assert_called_once()
+
+
+def test_max_turns_restarts_chat():
+    pipe = mock.Mock()
+    session = ChatSession(max_turns=1)
+    first = conversation_turns(messages("Hi"))
+    session.prepare(pipe, first)
+    session.record(first, "Hello")
+    assert not session.continues(conversation_turns(messages("Hi", "Hello", "Bye")))
+
+
+def test_finish_outside_chat_mode():
+    pipe = mock.Mock()
+    session = ChatSession(max_turns=0)
+    assert not session.enabled
+    session.finish(pipe)
+    pipe.finish_chat.assert_not_called()
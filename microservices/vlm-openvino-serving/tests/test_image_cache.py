@@ -0,0 +1,52 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from src.utils.image_cache import ImageCache
+
+
+def test_key_is_content_hash():
+    assert ImageCache.key(b"snapshot") == ImageCache.key(b"snapshot")
+    assert ImageCache.key(b"snapshot") != ImageCache.key(b"snapshot2")
+
+
+def test_get_and_stats():
+    cache = ImageCache(100)
+    assert cache.get("a") is None
+    cache.put("a", "image a", 10)
+    assert cache.get("a") == "image a"
+    assert cache.stats() == {
+        "entries": 1,
+        "bytes": 10,
+        "max_bytes": 100,
+        "hits": 1,
+        "misses": 1,
+    }
+
+
+def test_evicts_least_recently_used_within_budget():
+    cache = ImageCache(100)
+    cache.put("a", "image a", 40)
+    cache.put("b", "image b", 40)
+    cache.get("a")
+    cache.put("c", "image c", 40)
+    assert cache.get("b") is None
+    assert cache.get("a") == "image a"
+    assert cache.get("c") == "image c"
+    assert cache.stats()["bytes"] == 80
+
+
+def test_replace_entry_updates_size():
+    cache = ImageCache(100)
+    cache.put("a", "image a", 40)
+    cache.put("a", "image a2", 60)
+    assert cache.get("a") == "image a2"
+    assert cache.stats()["bytes"] == 60
+
+
+def test_oversized_and_disabled():
+    cache = ImageCache(100)
+    cache.put("a", "image a", 101)
+    assert cache.get("a") is None
+    disabled = ImageCache(0)
+    disabled.put("a", "image a", 1)
+    assert disabled.get("a") is None
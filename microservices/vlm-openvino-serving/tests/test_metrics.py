@@ -0,0 +1,197 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import multiprocessing
+import os
+import time
+import uuid
+from unittest import mock
+
+# Mock environment variables before importing anything from src.utils
+mock.patch.dict(
+    os.environ,
+    {
+        "http_proxy": "http://mock-proxy",
+        "https_proxy": "https://mock-proxy",
+        "no_proxy_env": "localhost,127.0.0.1",
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_COMPRESSION_WEIGHT_FORMAT": "int8",
+        "VLM_DEVICE": "CPU",
+        "SEED": "42",
+    },
+).start()
+
+import pytest
+from src.utils.metrics import RequestMetrics
+
+
+@pytest.fixture
+def namespace():
+    return f"vlm_metrics_test_{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def metrics(namespace):
+    metrics = RequestMetrics(namespace=namespace, max_workers=4, buckets=(0.1, 1.0))
+    yield metrics
+    metrics.unlink()
+
+
+def record(metrics, latency, status_code):
+    with mock.patch("src.utils.metrics.time.perf_counter", return_value=100.0):
+        started_at = metrics.request_started()
+    with mock.patch(
+        "src.utils.metrics.time.perf_counter", return_value=100.0 + latency
+    ):
+        metrics.request_finished(started_at, status_code)
+
+
+def worker(namespace, ready, done):
+    metrics = RequestMetrics(namespace=namespace, max_workers=4, buckets=(0.1, 1.0))
+    record(metrics, 0.5, 200)
+    record(metrics, 2.0, 429)
+    metrics.request_started()
+    metrics.set_queued(3)
+    ready.set()
+    done.wait(10)
+    metrics.close()
+
+
+def test_counters_and_histogram(metrics):
+    record(metrics, 0.05, 200)
+    record(metrics, 0.5, 500)
+    metrics.request_started()
+    metrics.set_queued(2)
+    snapshot = metrics.snapshot()
+    assert snapshot["workers"] == 1
+    assert snapshot["active_requests"] == 1
+    assert snapshot["queued_requests"] == 2
+    assert snapshot["requests_total"] == 2
+    assert snapshot["errors_total"] == 1
+    assert snapshot["rejected_total"] == 0
+    assert snapshot["latency"]["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 2}
+    assert snapshot["latency"]["sum"] == pytest.approx(0.55)
+    assert snapshot["latency"]["avg"] == pytest.approx(0.275)
+
+
+def test_prometheus_format(metrics):
+    record(metrics, 5.0, 200)
+    text = metrics.prometheus()
+    assert "# TYPE vlm_request_latency_seconds histogram" in text
+    assert 'vlm_request_latency_seconds_bucket{le="1.0"} 0' in text
+    assert 'vlm_request_latency_seconds_bucket{le="+Inf"} 1' in text
+    assert "vlm_request_latency_seconds_count 1" in text
+    assert "vlm_requests_total 1" in text
+    assert text.endswith("\n")
+
+
+def test_aggregates_across_processes(metrics, namespace):
+    context = multiprocessing.get_context("fork")
+    ready, done = context.Event(), context.Event()
+    process = context.Process(target=worker, args=(namespace, ready, done))
+    process.start()
+    try:
+        assert ready.wait(10)
+        record(metrics, 0.05, 200)
+        snapshot = metrics.snapshot()
+        assert snapshot["workers"] == 2
+        assert snapshot["requests_total"] == 3
+        assert snapshot["rejected_total"] == 1
+        assert snapshot["active_requests"] == 1
+        assert snapshot["queued_requests"] == 3
+        assert snapshot["latency"]["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+    finally:
+        done.set()
+        process.join(10)
+    # the exited worker is no longer counted, but its counters are kept
+    snapshot = metrics.snapshot()
+    assert snapshot["workers"] == 1
+    assert snapshot["requests_total"] == 3
+    assert snapshot["rejected_total"] == 1
+    assert snapshot["active_requests"] == 0
+    assert snapshot["queued_requests"] == 0
+    assert snapshot["latency"]["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 3}
+
+
+def test_counters_kept_after_worker_killed(metrics, namespace):
+    context = multiprocessing.get_context("fork")
+    ready, done = context.Event(), context.Event()
+    process = context.Process(target=worker, args=(namespace, ready, done))
+    process.start()
+    assert ready.wait(10)
+    before = metrics.snapshot()
+    process.kill()
+    process.join(10)
+
+    after = metrics.snapshot()
+    assert after["workers"] == 1
+    assert after["active_requests"] == 0
+    assert after["queued_requests"] == 0
+    for key in ("requests_total", "errors_total", "rejected_total"):
+        assert after[key] == before[key]
+    assert after["latency"] == before["latency"]
+
+    # a new worker takes over the slot and keeps counting from its totals
+    replacement = RequestMetrics(namespace=namespace, max_workers=4, buckets=(0.1, 1.0))
+    try:
+        record(replacement, 0.05, 200)
+        snapshot = metrics.snapshot()
+        assert snapshot["workers"] == 2
+        assert snapshot["requests_total"] == before["requests_total"] + 1
+    finally:
+        replacement.close()
+
+
+def test_takes_over_slot_of_exited_worker(namespace):
+    first = RequestMetrics(namespace=namespace, max_workers=1)
+    record(first, 0.5, 200)
+    first.request_started()
+    with mock.patch("src.utils.metrics._pid_alive", return_value=False):
+        second = RequestMetrics(namespace=namespace, max_workers=1)
+    try:
+        assert second._shm is not None
+        snapshot = second.snapshot()
+        assert snapshot["requests_total"] == 1
+        assert snapshot["active_requests"] == 0
+    finally:
+        second.close()
+        first.unlink()
+
+
+def test_fallback_without_free_slot(metrics, namespace):
+    others = [RequestMetrics(namespace=namespace, max_workers=4) for _ in range(3)]
+    fallback = RequestMetrics(namespace=namespace, max_workers=4)
+    try:
+        assert fallback._shm is None
+        record(fallback, 0.5, 200)
+        assert fallback.snapshot()["requests_total"] == 1
+    finally:
+        fallback.close()
+        for other in others:
+            other.close()
+
+
+def test_load_overhead_below_manager_proxies(metrics):
+    requests = 2000
+    start = time.perf_counter()
+    for _ in range(requests):
+        metrics.request_finished(metrics.request_started(), 200)
+    shared_memory_time = (time.perf_counter() - start) / requests
+
+    # previous middleware bookkeeping with multiprocessing.Manager proxies
+    with multiprocessing.Manager() as manager:
+        active, queued, lock = manager.Value("i", 0), manager.Value("i", 0), manager.Lock()
+        start = time.perf_counter()
+        for _ in range(requests // 10):
+            with lock:
+                queued.value += 1
+            with lock:
+                active.value += 1
+                queued.value -= 1
+            with lock:
+                active.value -= 1
+        manager_time = (time.perf_counter() - start) / (requests // 10)
+
+    assert metrics.snapshot()["requests_total"] == requests
+    assert shared_memory_time < 50e-6, f"{shared_memory_time * 1e6:.1f} us per request"
+    assert shared_memory_time * 10 < manager_time
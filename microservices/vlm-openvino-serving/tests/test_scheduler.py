@@ -0,0 +1,148 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+import threading
+from unittest import mock
+
+# Mock environment variables before importing anything from src.utils
+mock.patch.dict(
+    os.environ,
+    {
+        "http_proxy": "http://mock-proxy",
+        "https_proxy": "https://mock-proxy",
+        "no_proxy_env": "localhost,127.0.0.1",
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_COMPRESSION_WEIGHT_FORMAT": "int8",
+        "VLM_DEVICE": "CPU",
+        "SEED": "42",
+    },
+).start()
+
+import pytest
+from src.utils.scheduler import (
+    FirstTokenStreamer,
+    GenerationJob,
+    QueueFullError,
+    RequestScheduler,
+)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = RequestScheduler(max_queue_size=4, max_batch_size=3, batch_timeout=0.5)
+    yield scheduler
+    scheduler.stop(timeout=5)
+
+
+def echo(jobs):
+    for job in jobs:
+        job.finish((job.payload, len(jobs)), generated_tokens=2)
+
+
+def blocking_job(release):
+    def run(jobs):
+        release.wait(5)
+        jobs[0].finish("done")
+
+    return GenerationJob(run)
+
+
+def test_invalid_sizes():
+    with pytest.raises(ValueError):
+        RequestScheduler(max_queue_size=0)
+    with pytest.raises(ValueError):
+        RequestScheduler(max_batch_size=0)
+
+
+def test_run_returns_result(scheduler):
+    job = scheduler.submit(GenerationJob(echo, "hello"))
+    assert job.future.result(5) == ("hello", 1)
+    status = scheduler.status()
+    assert status["completed"] == 1
+    assert status["recent_requests"][0]["generated_tokens"] == 2
+    assert status["avg_queue_time"] is not None
+
+
+def test_queue_full_rejects(scheduler):
+    release = threading.Event()
+    running = scheduler.submit(blocking_job(release))
+    while scheduler.status()["running"] == 0:
+        pass
+    queued = [scheduler.submit(GenerationJob(echo, i)) for i in range(4)]
+    with pytest.raises(QueueFullError):
+        scheduler.submit(GenerationJob(echo, 4))
+    assert scheduler.status()["rejected"] == 1
+    release.set()
+    assert running.future.result(5) == "done"
+    assert [job.future.result(5)[0] for job in queued] == [0, 1, 2, 3]
+
+
+def test_batches_jobs_with_same_key(scheduler):
+    release = threading.Event()
+    scheduler.submit(blocking_job(release))
+    while scheduler.status()["running"] == 0:
+        pass
+    jobs = [
+        scheduler.submit(GenerationJob(echo, i, batch_key=key))
+        for i, key in enumerate(["a", "b", "a", "a"])
+    ]
+    release.set()
+    results = [job.future.result(5) for job in jobs]
+    # jobs 0, 2 and 3 share a key and run together, job 1 runs alone
+    assert [size for _, size in results] == [3, 1, 3, 3]
+    assert jobs[0].batch_size == 3
+    assert scheduler.status()["batches"] == 3
+
+
+def test_unkeyed_jobs_run_alone(scheduler):
+    jobs = [scheduler.submit(GenerationJob(echo, i)) for i in range(3)]
+    assert [job.future.result(5) for job in jobs] == [(0, 1), (1, 1), (2, 1)]
+
+
+def test_error_fails_batch(scheduler):
+    def fail(jobs):
+        raise RuntimeError("generation error")
+
+    job = scheduler.submit(GenerationJob(fail))
+    with pytest.raises(RuntimeError, match="generation error"):
+        job.future.result(5)
+    assert scheduler.status()["failed"] == 1
+
+
+def test_unresolved_job_fails(scheduler):
+    job = scheduler.submit(GenerationJob(lambda jobs: None))
+    with pytest.raises(RuntimeError):
+        job.future.result(5)
+
+
+def test_stop_fails_queued_jobs():
+    scheduler = RequestScheduler(max_queue_size=4)
+    release = threading.Event()
+    running = scheduler.submit(blocking_job(release))
+    while scheduler.status()["running"] == 0:
+        pass
+    queued = scheduler.submit(GenerationJob(echo))
+    threading.Timer(0.1, release.set).start()
+    scheduler.stop(timeout=5)
+    assert running.future.result(5) == "done"
+    with pytest.raises(RuntimeError):
+        queued.future.result(5)
+
+
+@pytest.mark.asyncio
+async def test_async_run(scheduler):
+    assert await scheduler.run(GenerationJob(echo, "async")) == ("async", 1)
+
+
+def test_first_token_streamer():
+    jobs = [GenerationJob(echo), GenerationJob(echo)]
+    streamer = FirstTokenStreamer(jobs)
+    streamer.put("prompt ids")
+    assert jobs[0].first_token_at is None
+    streamer.put("first token")
+    first_token_at = jobs[0].first_token_at
+    assert first_token_at is not None and jobs[1].first_token_at == first_token_at
+    streamer.put("second token")
+    streamer.end()
+    assert jobs[0].first_token_at == first_token_at
@@ -25,15 +25,20 @@ mock.patch.dict(
 
 import base64
 import tempfile
+from io import BytesIO
 from pathlib import Path
 
+import numpy as np
 import pytest
+import torch
 from src.utils.common import ErrorMessages, ModelNames
 from src.utils.data_models import MessageContentVideoUrl
+from PIL import Image
+from src.utils import utils
+from src.utils.image_cache import ImageCache
 from src.utils.utils import load_images  # Add this import
 from src.utils.utils import (
     convert_model,
-    decode_and_save_video,
     get_device_property,
     get_devices,
     is_model_ready,
@@ -97,20 +102,6 @@ def test_load_model_config():
     assert config == {}
 
 
-def test_decode_and_save_video():
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tmp_path = Path(tmp_dir)
-        valid_base64_video = (
-            "data:video/mp4;base64," + base64.b64encode(b"mock_video_data").decode()
-        )
-        video_path = decode_and_save_video(valid_base64_video, tmp_path)
-        assert Path(video_path.replace("file://", "")).exists()
-
-        invalid_base64_video = "data:video/mp4;base64,invalid_data"
-        with pytest.raises(ValueError):
-            decode_and_save_video(invalid_base64_video, tmp_path)
-
-
 def test_validate_video_inputs():
     content = MessageContentVideoUrl(
         type="video_url", video_url={"url": "http://example.com/video.mp4"}
@@ -189,6 +180,71 @@ def test_load_images_general_error(mocker):
         asyncio.run(load_images(["http://example.com/image.jpg"]))
 
 
+def encode_test_image(color, size=(64, 48)):
+    buffer = BytesIO()
+    Image.new("RGB", size, color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_load_images_tensor_layout():
+    image_url = "data:image/jpeg;base64," + base64.b64encode(
+        encode_test_image((200, 10, 30))
+    ).decode("utf-8")
+    images, image_tensors = asyncio.run(load_images([image_url]))
+    assert images[0].size == (64, 48)
+    data = image_tensors[0].data
+    assert data.shape == (1, 48, 64, 3)
+    assert data.dtype == np.int8
+    assert data[0, 0, 0].view(np.uint8).tolist() == [200, 10, 30]
+
+
+def test_load_images_keeps_order_and_uses_cache(mocker):
+    decode_spy = mocker.spy(utils, "decode_image")
+    mocker.patch.object(utils, "image_cache", ImageCache(64 * 1024 * 1024))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        for i, color in enumerate([(255, 0, 0), (0, 255, 0), (255, 0, 0)]):
+            path = Path(tmpdir) / f"image{i}.png"
+            path.write_bytes(encode_test_image(color))
+            paths.append(str(path))
+        images, image_tensors = asyncio.run(load_images(paths))
+        assert [image.getpixel((0, 0)) for image in images] == [
+            (255, 0, 0),
+            (0, 255, 0),
+            (255, 0, 0),
+        ]
+        images_again, _ = asyncio.run(load_images(paths[:1]))
+
+    # identical files are decoded once, concurrent duplicates may both miss the cache
+    assert decode_spy.call_count <= 3
+    assert images_again[0] is images[0] or images_again[0] is images[2]
+    assert utils.image_cache.stats()["hits"] >= 1
+
+
+def test_enable_vision_embedding_cache():
+    model = mock.Mock()
+    model.get_vision_embeddings.side_effect = lambda pixel_values, grid_thw: np.ones(
+        (4, 8), dtype=np.float32
+    )
+    encoder = model.get_vision_embeddings
+    cache = ImageCache(1024 * 1024)
+    assert utils.enable_vision_embedding_cache(model, cache)
+
+    pixel_values = torch.zeros((2, 3))
+    first = model.get_vision_embeddings(pixel_values, grid_thw=torch.tensor([[1, 2, 2]]))
+    again = model.get_vision_embeddings(pixel_values, grid_thw=torch.tensor([[1, 2, 2]]))
+    model.get_vision_embeddings(torch.ones((2, 3)), grid_thw=torch.tensor([[1, 2, 2]]))
+
+    assert again is first
+    assert encoder.call_count == 2
+    assert cache.stats()["bytes"] == 2 * first.nbytes
+
+
+def test_enable_vision_embedding_cache_without_encoder():
+    model = mock.Mock(spec=[])
+    assert not utils.enable_vision_embedding_cache(model, ImageCache(1024))
+
+
 def test_get_device_property_invalid_device():
     assert get_device_property("INVALID_DEVICE") == {}
 
@@ -209,11 +265,3 @@ def test_load_model_config_general_error(mocker):
         RuntimeError, match="Error loading model configuration: Mocked general error"
     ):
         load_model_config("mock_model")
-
-
-def test_decode_and_save_video_general_error(mocker):
-    mocker.patch("base64.b64decode", side_effect=Exception("Mocked general error"))
-    with pytest.raises(
-        RuntimeError, match="Error decoding and saving video: Mocked general error"
-    ):
-        decode_and_save_video("data:video/mp4;base64,valid_data")
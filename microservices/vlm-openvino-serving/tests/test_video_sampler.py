@@ -0,0 +1,153 @@
+# Copyright (C) 2025 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import base64
+import os
+from unittest import mock
+
+# Mock environment variables before importing anything from src.utils
+mock.patch.dict(
+    os.environ,
+    {
+        "http_proxy": "http://mock-proxy",
+        "https_proxy": "https://mock-proxy",
+        "no_proxy_env": "localhost,127.0.0.1",
+        "VLM_MODEL_NAME": "mock_model",
+        "VLM_COMPRESSION_WEIGHT_FORMAT": "int8",
+        "VLM_DEVICE": "CPU",
+        "SEED": "42",
+    },
+).start()
+
+import cv2
+import numpy as np
+import pytest
+from src.utils import video_sampler
+from src.utils.video_sampler import (
+    decoded_video_file,
+    frame_indices,
+    load_video_frames,
+    sample_video_frames,
+)
+
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory):
+    """A 3 second 30 fps clip whose frame i has the gray level 2 * i."""
+    path = tmp_path_factory.mktemp("video") / "clip.mp4"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (320, 240))
+    for i in range(90):
+        writer.write(np.full((240, 320, 3), 2 * i, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+@pytest.fixture(scope="module")
+def video_data_url(video_path):
+    return "data:video/mp4;base64," + base64.b64encode(video_path.read_bytes()).decode()
+
+
+def test_frame_indices_follow_requested_fps():
+    indices = frame_indices(total_frames=1800, video_fps=30, fps=2)
+    assert len(indices) == 120
+    assert indices[0] == 0 and indices[-1] == 1799
+
+
+def test_frame_indices_minimum_and_too_short():
+    assert len(frame_indices(total_frames=30, video_fps=30, fps=0.5)) == 4
+    with pytest.raises(ValueError):
+        frame_indices(total_frames=1, video_fps=30, fps=2)
+
+
+def test_sample_base64_without_temp_file(video_data_url, tmp_path):
+    with mock.patch("tempfile.tempdir", str(tmp_path)):
+        frames, sample_fps, max_pixels = load_video_frames(video_data_url, fps=2)
+    assert list(tmp_path.iterdir()) == []
+    assert len(frames) == 6
+    assert sample_fps == pytest.approx(2)
+    assert frames[0].mode == "RGB" and frames[0].size == (320, 240)
+    # first and last frames are sampled
+    assert frames[0].getpixel((0, 0))[0] < 8
+    assert frames[-1].getpixel((0, 0))[0] > 170
+    assert max_pixels > 0
+
+
+def test_large_video_spills_to_temp_file(video_path, video_data_url, tmp_path):
+    from_file, _, _ = load_video_frames(f"file://{video_path}", fps=4)
+    with mock.patch("tempfile.tempdir", str(tmp_path)):
+        with decoded_video_file(video_data_url, max_memory=1024) as path:
+            assert os.path.dirname(path) == str(tmp_path)
+            from_spilled, _, _ = sample_video_frames(path, fps=4)
+    assert list(tmp_path.iterdir()) == []
+    assert len(from_spilled) == len(from_file) == 12
+    assert [frame.getpixel((0, 0)) for frame in from_spilled] == [
+        frame.getpixel((0, 0)) for frame in from_file
+    ]
+
+
+def test_max_pixels_downscales_frames(video_path):
+    frames, _, max_pixels = sample_video_frames(str(video_path), fps=2, max_pixels=160 * 120)
+    assert max_pixels == 160 * 120
+    assert frames[0].size[0] * frames[0].size[1] <= 160 * 120
+
+
+def test_stops_at_last_sampled_frame(video_path):
+    capture = mock.Mock(wraps=cv2.VideoCapture(str(video_path)))
+    with mock.patch("src.utils.video_sampler.cv2.VideoCapture", return_value=capture):
+        with mock.patch(
+            "src.utils.video_sampler.frame_indices", return_value=np.array([0, 10])
+        ):
+            frames, _, _ = sample_video_frames(str(video_path), fps=2)
+    assert len(frames) == 2
+    assert capture.grab.call_count == 11
+    assert capture.retrieve.call_count == 2
+
+
+def test_sample_by_time_downscales_retrieved_frames():
+    class Capture:
+        """Stream of 1920x1080 frames at 10 fps, of unknown frame count and rate."""
+
+        def __init__(self):
+            self.position = 0
+            self.retrieved = []
+
+        def isOpened(self):
+            return True
+
+        def get(self, prop):
+            return self.position * 100.0 if prop == cv2.CAP_PROP_POS_MSEC else 0
+
+        def grab(self):
+            self.position += 1
+            return self.position <= 30
+
+        def retrieve(self):
+            self.retrieved.append(np.zeros((1080, 1920, 3), dtype=np.uint8))
+            return True, self.retrieved[-1]
+
+        def release(self):
+            pass
+
+    capture = Capture()
+    with mock.patch("src.utils.video_sampler.cv2.VideoCapture", return_value=capture):
+        with mock.patch(
+            "src.utils.video_sampler._downscale", wraps=video_sampler._downscale
+        ) as downscale:
+            frames, sample_fps, max_pixels = sample_video_frames("stream", fps=2)
+    assert len(frames) == 6
+    assert sample_fps == 2
+    # each frame is downscaled as it is retrieved, before the frame budget is known
+    kept = [call.args[0] for call in downscale.call_args_list[: len(capture.retrieved)]]
+    assert all(frame is retrieved for frame, retrieved in zip(kept, capture.retrieved))
+    assert all(
+        call.args[1] == video_sampler.VIDEO_MAX_PIXELS
+        for call in downscale.call_args_list[: len(capture.retrieved)]
+    )
+    assert frames[0].size[0] * frames[0].size[1] <= max_pixels
+
+
+def test_invalid_input():
+    with pytest.raises(ValueError, match="Invalid base64 video data"):
+        load_video_frames("data:video/mp4;base64,invalid_data")
+    with pytest.raises(ValueError, match="Unable to decode video"):
+        load_video_frames("data:video/mp4;base64," + base64.b64encode(b"not a video").decode())